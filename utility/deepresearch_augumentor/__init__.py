@@ -1,4 +1,4 @@
-from .main import augment_research_report
+from .main import augment_research_report, augment_research_report_async
 
 __version__ = "0.1.0"
-__all__ = ['augment_research_report'] 
\ No newline at end of file
+__all__ = ['augment_research_report', 'augment_research_report_async']
@@ -49,7 +49,19 @@ def build_app(one_file=False):
         "main.py",
         "config_manager.py",
         "debug_wrapper.py",
-        "utils.py"
+        "utils.py",
+        "extraction_cache.py",
+        "report_writer.py",
+        "run_journal.py",
+        "retry_policy.py",
+        "deadline.py",
+        "circuit_breaker.py",
+        "rate_limiter.py",
+        "key_pool.py",
+        "reference_parser.py",
+        "pipeline.py",
+        "url_rewrites.py",
+        "latency_store.py"
     ])
     
     # Execute PyInstaller
@@ -0,0 +1,183 @@
+"""
+Circuit breakers for reference extraction.
+
+A breaker is kept per provider endpoint (e.g. r.jina.ai) and per reference
+host. After a number of consecutive transient failures (timeouts, 5xx,
+429, dropped connections) it opens: further URLs using that provider or
+host fail fast, or are rerouted to the next extractor of a chain, instead of
+each paying the full timeout and retries. After a cool-down the breaker
+half-opens and lets a single probe request through; its outcome closes the
+breaker again or re-opens it for another cool-down.
+
+When a request goes through an API provider, a failure is charged to the
+provider unless the provider reports it as the target site's own
+(ExtractionError.upstream), so a provider outage does not trip the
+breakers of every healthy site it was asked to fetch.
+"""
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from extractors.errors import ExtractionError
+from retry_policy import RetryPolicy, RETRYABLE_KINDS
+
+# Breaker states
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+# Failure kind of requests refused by an open breaker (never retried)
+CIRCUIT_OPEN = "circuit_open"
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker with a cool-down and a single half-open probe."""
+
+    def __init__(self, name: str, failure_threshold: int = 5, cooldown: float = 30.0):
+        """
+        Args:
+            name: Provider endpoint or host the breaker protects
+            failure_threshold: Consecutive failures that open the breaker
+            cooldown: Seconds the breaker stays open before allowing a probe
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.times_opened = 0
+        self.fast_failed = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a request may go through now; counts refusals."""
+        with self._lock:
+            if self.state == OPEN and time.monotonic() - self._opened_at >= self.cooldown:
+                self.state = HALF_OPEN
+                self._probe_in_flight = False
+            if self.state == CLOSED:
+                return True
+            if self.state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self.fast_failed += 1
+            return False
+
+    def release(self) -> None:
+        """Give back a half-open probe slot that ended up not being used."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = CLOSED
+            self.consecutive_failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.consecutive_failures += 1
+            if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    self.times_opened += 1
+                self.state = OPEN
+                self._opened_at = time.monotonic()
+                self._probe_in_flight = False
+
+
+class CircuitBreakerRegistry:
+    """The breakers of one run, created on demand per provider endpoint and host."""
+
+    def __init__(self, failure_threshold: int = 5, cooldown: float = 30.0, retry_policy: Optional[RetryPolicy] = None):
+        """
+        Args:
+            failure_threshold: Consecutive failures that open a breaker
+            cooldown: Seconds a breaker stays open before a probe is allowed
+            retry_policy: Used to classify errors as transient or not
+        """
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self.breakers.get(name)
+            if breaker is None:
+                breaker = CircuitBreaker(name, self.failure_threshold, self.cooldown)
+                self.breakers[name] = breaker
+            return breaker
+
+    @staticmethod
+    def keys_for(url: Optional[str] = None, provider_host: Optional[str] = None) -> List[str]:
+        """Breaker names protecting a request: the provider endpoint, then the target host."""
+        keys = []
+        if provider_host:
+            keys.append(provider_host)
+        if url:
+            host = (urlparse(url).hostname or "").lower()
+            if host and host not in keys:
+                keys.append(host)
+        return keys
+
+    def acquire(self, keys: List[str]) -> Tuple[List[CircuitBreaker], Optional[ExtractionError]]:
+        """
+        Ask every breaker in keys to let a request through.
+
+        Returns:
+            Tuple of (breakers to report the outcome to, None) if allowed, or
+            ([], error) naming the open breaker
+        """
+        granted = []
+        for key in keys:
+            breaker = self.get(key)
+            if not breaker.allow():
+                for other in granted:
+                    other.release()
+                return [], ExtractionError(f"Circuit open for {key}: skipped after repeated failures",
+                                           kind=CIRCUIT_OPEN)
+            granted.append(breaker)
+        return granted, None
+
+    def record(self, breakers: List[CircuitBreaker], extracted_text: Optional[str], error=None,
+               target_keys: Optional[List[str]] = None) -> None:
+        """
+        Report a request outcome. Only transient failures count against a
+        breaker; a permanent error (e.g. 404) shows the endpoint is answering.
+
+        Args:
+            target_keys: For a request relayed by a provider, the breakers
+                         among breakers that protect the target site. A
+                         failure counts against them only when error.upstream
+                         is set, and against the others only when it is not;
+                         a breaker not charged gives back its probe slot.
+                         None when the request went to the target directly.
+        """
+        failed = (extracted_text is None and error is not None
+                  and self.retry_policy.classify(error) in RETRYABLE_KINDS)
+        upstream = bool(getattr(error, "upstream", False))
+        for breaker in breakers:
+            if not failed:
+                breaker.record_success()
+            elif target_keys is None or (breaker.name in target_keys) == upstream:
+                breaker.record_failure()
+            elif breaker.name in target_keys:
+                breaker.release()
+            else:
+                # The provider answered; the failure is the target's
+                breaker.record_success()
+
+    def summary_lines(self) -> List[str]:
+        """One line per breaker that opened or refused requests during the run."""
+        lines = []
+        with self._lock:
+            breakers = sorted(self.breakers.values(), key=lambda b: b.name)
+        for breaker in breakers:
+            if breaker.times_opened or breaker.fast_failed:
+                lines.append(f"{breaker.name}: {breaker.state}, opened {breaker.times_opened}x, "
+                             f"{breaker.fast_failed} requests fast-failed")
+        return lines
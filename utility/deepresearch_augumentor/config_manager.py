@@ -13,6 +13,7 @@ class ConfigManager:
         # Ensure directory exists
         os.makedirs(config_dir, exist_ok=True)
         
+        self.config_dir = config_dir
         self.config_file = os.path.join(config_dir, "config.json")
         self.config = self._load_config()
     
@@ -37,8 +38,25 @@ class ConfigManager:
             os.chmod(self.config_file, stat.S_IRUSR | stat.S_IWUSR)  # User read/write only
     
     def get_api_key(self, key_name):
-        """Get API key, returning None if not found"""
-        return self.config.get(key_name)
+        """Get API key, returning None if not found (the first key if several are stored)"""
+        value = self.config.get(key_name)
+        if isinstance(value, list):
+            return value[0] if value else None
+        return value
+    
+    def get_api_keys(self, key_name):
+        """Get every stored key for a provider as a list"""
+        value = self.config.get(key_name)
+        if not value:
+            return []
+        return list(value) if isinstance(value, list) else [value]
+    
+    def set_api_keys(self, key_name, values):
+        """Set a pool of API keys (a single key is stored as a plain string)"""
+        values = list(dict.fromkeys(values))
+        self.config[key_name] = values[0] if len(values) == 1 else values
+        self._save_config()
+        return True
     
     def set_api_key(self, key_name, value):
         """Set API key"""
@@ -52,4 +70,14 @@ class ConfigManager:
             del self.config[key_name]
             self._save_config()
             return True
-        return False 
\ No newline at end of file
+        return False
+    
+    def get_setting(self, name, default=None):
+        """Get a non-secret setting, returning default if not set"""
+        return self.config.get(name, default)
+    
+    def set_setting(self, name, value):
+        """Set a non-secret setting"""
+        self.config[name] = value
+        self._save_config()
+        return True
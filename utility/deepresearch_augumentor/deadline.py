@@ -0,0 +1,54 @@
+"""
+Run-wide deadline for reference extraction.
+
+A Deadline bounds the wall time of a whole augmentation run. Outstanding
+URLs are skipped once it expires, and per-request timeouts and retry
+backoffs are shrunk so that no single fetch can run past it.
+"""
+import math
+import time
+from typing import Optional
+
+# Reason recorded for references that were not fetched before the deadline
+DEADLINE_REACHED = "Not fetched: run deadline reached"
+
+
+class Deadline:
+    """Wall-clock budget shared by every fetch of a run."""
+
+    def __init__(self, seconds: float, min_request_timeout: float = 1.0):
+        """
+        Args:
+            seconds: Total time allowed for the run, starting now
+            min_request_timeout: Smallest timeout worth starting a request with;
+                                 below this the deadline counts as expired
+        """
+        self.seconds = seconds
+        self.min_request_timeout = min_request_timeout
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        """Seconds left before the deadline (never negative)."""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() < self.min_request_timeout
+
+    def request_timeout(self, request_timeout: Optional[float]):
+        """
+        Shrink a per-request timeout so the request cannot outlive the deadline.
+
+        Whole seconds are kept because the Jina extractor sends the timeout
+        as an integer header. They are rounded down, so the request ends by
+        the deadline; requests are not started once it is expired, so the
+        floor of 1 second only applies in the last second before it.
+        """
+        remaining = max(1, math.floor(self.remaining()))
+        if request_timeout is None:
+            return remaining
+        return max(1, min(request_timeout, remaining))
+
+    def allows_wait(self, delay: float) -> bool:
+        """Whether sleeping for delay seconds still leaves time for another request."""
+        return self.remaining() - delay >= self.min_request_timeout
@@ -7,7 +7,7 @@ the Reference Augmentor. It captures detailed information about the extraction
 process, saves artifacts for inspection, and provides verbose logging.
 
 Usage:
-    python debug_wrapper.py input_file [--extractor jina|firecrawl|local_bs4] [--mode default|body-only|article|main-content] [--output output_file] [--timeout seconds]
+    python debug_wrapper.py input_file [--extractor jina|firecrawl|local_bs4] [--mode default|body-only|article|main-content] [--output output_file] [--timeout seconds] [--concurrency N]
 """
 
 import os
@@ -49,7 +49,11 @@ def create_debug_dir(extractor_type):
     return debug_dir
 
 
-def run_with_debug(input_file, extractor_type, output_file=None, timeout=15, extraction_mode="default", extractor_config=None):
+def run_with_debug(input_file, extractor_type, output_file=None, timeout=15, extraction_mode="default", extractor_config=None,
+                   concurrency=1, cache=None, journal=None, retry_policy=None, retry_budget=None,
+                   deadline=None, breakers=None, politeness=None, rate_limits=None,
+                   key_pools=None, canonicalize_urls=True, parse_pool=None, url_rewrites=None,
+                   timeouts=None):
     """Run the augmentation with debugging enabled."""
     # Create debug directory
     debug_dir = create_debug_dir(extractor_type)
@@ -162,7 +166,21 @@ def run_with_debug(input_file, extractor_type, output_file=None, timeout=15, ext
                 extractor_config=extractor_config,
                 extraction_mode=extraction_mode,
                 request_timeout=timeout,
-                verbose=True  # Always verbose in debug mode
+                verbose=True,  # Always verbose in debug mode
+                concurrency=concurrency,
+                cache=cache,
+                journal=journal,
+                retry_policy=retry_policy,
+                retry_budget=retry_budget,
+                deadline=deadline,
+                breakers=breakers,
+                politeness=politeness,
+                rate_limits=rate_limits,
+                key_pools=key_pools,
+                canonicalize_urls=canonicalize_urls,
+                parse_pool=parse_pool,
+                url_rewrites=url_rewrites,
+                timeouts=timeouts
             )
             
             # Save the result
@@ -183,6 +201,15 @@ def run_with_debug(input_file, extractor_type, output_file=None, timeout=15, ext
                 
             logger.info(f"Processing completed in {end_time - start_time:.2f} seconds")
             
+            # Save the per-host timeouts learned from latency history
+            if timeouts is not None:
+                learned = timeouts.learned()
+                with open(os.path.join(debug_dir, "learned_timeouts.json"), 'w', encoding='utf-8') as f:
+                    json.dump(learned, f, indent=2)
+                for row in learned:
+                    logger.info(f"Timeout for {row['host']} ({row['extractor']}): {row['timeout']}s "
+                                f"({row['source']}, {row['samples']} samples)")
+            
             # If output file specified, write the result there
             if output_file:
                 with open(output_file, 'w', encoding='utf-8') as f:
@@ -237,9 +264,10 @@ def main():
                         default="local_bs4", help="Content extraction method")
     parser.add_argument("--output", help="Output file path (default: print to stdout)")
     parser.add_argument("--timeout", type=int, default=15, help="HTTP request timeout in seconds")
+    parser.add_argument("--concurrency", type=int, default=1, help="Number of URLs to extract in parallel")
     # Add extraction mode argument with choices from predefined modes
     parser.add_argument("--mode", choices=list(EXTRACTION_MODES.keys()), default="default",
-                      help="Content extraction mode (Jina API only)")
+                      help="Content extraction mode (Jina and local_bs4)")
     
     args = parser.parse_args()
     
@@ -269,7 +297,8 @@ def main():
             args.output,
             args.timeout,
             args.mode,
-            extractor_config
+            extractor_config,
+            concurrency=args.concurrency
         )
         
         if not args.output:
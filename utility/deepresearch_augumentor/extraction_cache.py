@@ -0,0 +1,145 @@
+"""
+Persistent on-disk cache for extracted reference content.
+
+Entries live in a SQLite database under the ReferenceAugmentor config
+directory. They are keyed by normalized URL, extractor type, the effective
+extraction mode settings and the local extraction settings (HTML parser,
+page size and PDF page caps), expire after a TTL, and are evicted
+least-recently-used first once the cache grows past its size cap.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+from utils import normalize_url
+
+# Extractor settings that change what gets extracted for a URL
+MODE_SETTING_KEYS = ('target_selector', 'remove_selector', 'links_handling', 'links_summary')
+# Local extraction settings that change the text of a page
+LOCAL_SETTING_KEYS = ('html_parser', 'max_bytes', 'max_pdf_pages')
+
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+
+
+class ExtractionCache:
+    """SQLite-backed cache of successful extractions with TTL and LRU eviction."""
+    
+    def __init__(self, cache_dir: str, ttl_seconds: float = DEFAULT_TTL_SECONDS,
+                 max_bytes: int = DEFAULT_MAX_BYTES, refresh: bool = False):
+        """
+        Args:
+            cache_dir: Directory holding the cache database
+            ttl_seconds: Age after which an entry is treated as missing
+            max_bytes: Total content size above which old entries are evicted
+            refresh: Ignore existing entries on lookup but still store new results
+        """
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, "extraction_cache.sqlite")
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.refresh = refresh
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " key TEXT PRIMARY KEY,"
+                " url TEXT NOT NULL,"
+                " extractor TEXT NOT NULL,"
+                " content TEXT NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " created REAL NOT NULL,"
+                " last_access REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access)")
+    
+    @classmethod
+    def from_config(cls, config, refresh: bool = False, ttl_seconds: Optional[float] = None) -> "ExtractionCache":
+        """
+        Build a cache in the ConfigManager directory using its cache settings.
+        
+        Args:
+            config: ConfigManager instance
+            refresh: Ignore existing entries on lookup
+            ttl_seconds: Override for the configured CACHE_TTL_SECONDS
+        """
+        if ttl_seconds is None:
+            ttl_seconds = config.get_setting("CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS)
+        return cls(
+            os.path.join(config.config_dir, "cache"),
+            ttl_seconds=ttl_seconds,
+            max_bytes=config.get_setting("CACHE_MAX_BYTES", DEFAULT_MAX_BYTES),
+            refresh=refresh
+        )
+    
+    @staticmethod
+    def make_key(url: str, extractor_type: str, extractor_config: Optional[Dict] = None) -> str:
+        """Build the cache key for a URL extracted with the given extractor and mode settings."""
+        extractor_config = extractor_config or {}
+        settings = {name: extractor_config.get(name) for name in MODE_SETTING_KEYS + LOCAL_SETTING_KEYS}
+        raw = json.dumps([normalize_url(url), extractor_type, settings], sort_keys=True)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+    
+    def get(self, key: str) -> Optional[str]:
+        """Return cached content for key, or None if missing, expired or refreshing."""
+        if self.refresh:
+            return None
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT content, created FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            content, created = row
+            if now - created > self.ttl_seconds:
+                with self._conn:
+                    self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                return None
+            with self._conn:
+                self._conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (now, key))
+        return content
+    
+    def put(self, key: str, url: str, extractor_type: str, content: str) -> None:
+        """Store content for key and evict least-recently-used entries over the size cap."""
+        size = len(content.encode('utf-8'))
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, url, extractor, content, size, created, last_access)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, url, extractor_type, content, size, now, now)
+            )
+            self._evict()
+    
+    def _evict(self) -> None:
+        """Delete expired entries, then oldest-accessed ones until under max_bytes."""
+        self._conn.execute("DELETE FROM entries WHERE created < ?", (time.time() - self.ttl_seconds,))
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._conn.execute("SELECT key, size FROM entries ORDER BY last_access").fetchall():
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+    
+    def stats(self) -> Dict[str, int]:
+        """Return the number of entries and total content bytes currently stored."""
+        with self._lock:
+            count, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        return {"entries": count, "bytes": total}
+    
+    def clear(self) -> None:
+        """Remove every cached entry."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM entries")
+    
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -18,7 +18,19 @@ from config_manager import ConfigManager
 from extractors import JinaAIExtractor
 from main import EXTRACTION_MODES
 
-def extract_with_mode(url: str, mode: str, api_key: str, timeout: int = 15, verbose: bool = True) -> Tuple[Optional[str], Optional[str]]:
+# Shared extractor so repeated calls reuse its pooled keep-alive session
+_shared_extractor: Optional[JinaAIExtractor] = None
+
+
+def get_shared_extractor() -> JinaAIExtractor:
+    """Return the module-wide JinaAIExtractor, creating it on first use."""
+    global _shared_extractor
+    if _shared_extractor is None:
+        _shared_extractor = JinaAIExtractor()
+    return _shared_extractor
+
+def extract_with_mode(url: str, mode: str, api_key: str, timeout: int = 15, verbose: bool = True,
+                      extractor: Optional[JinaAIExtractor] = None) -> Tuple[Optional[str], Optional[str]]:
     """
     Extract content from a URL using a specific extraction mode.
     
@@ -28,6 +40,7 @@ def extract_with_mode(url: str, mode: str, api_key: str, timeout: int = 15, verb
         api_key: Jina API key
         timeout: Request timeout in seconds
         verbose: Whether to display detailed information
+        extractor: JinaAIExtractor to use (default: the shared pooled instance)
         
     Returns:
         Tuple of (extracted_content, error_message)
@@ -44,8 +57,8 @@ def extract_with_mode(url: str, mode: str, api_key: str, timeout: int = 15, verb
     
     start_time = time.time()
     
-    # Create extractor and config
-    extractor = JinaAIExtractor()
+    # Reuse the pooled extractor and build the config
+    extractor = extractor or get_shared_extractor()
     extractor_config = {'api_key': api_key}
     
     # Apply mode settings if available
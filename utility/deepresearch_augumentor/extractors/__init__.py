@@ -1,9 +1,13 @@
 from .jina_extractor import JinaAIExtractor
 from .firecrawl_extractor import FirecrawlExtractor
 from .local_bs4_extractor import BeautifulSoupExtractor
+from .errors import ExtractionError
+from .chain_extractor import ExtractorChain
 
 __all__ = [
     'JinaAIExtractor',
     'FirecrawlExtractor',
-    'BeautifulSoupExtractor'
+    'BeautifulSoupExtractor',
+    'ExtractionError',
+    'ExtractorChain'
 ] 
\ No newline at end of file
@@ -0,0 +1,37 @@
+"""
+Helpers shared by the asyncio implementations of the extractors.
+
+aiohttp is optional: when it is not installed, extractors fall back to the
+thread-based ContentExtractorInterface.extract_text_async.
+"""
+from contextlib import asynccontextmanager
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+def aiohttp_available() -> bool:
+    """Return True if aiohttp can be used for native async requests."""
+    return aiohttp is not None
+
+
+@asynccontextmanager
+async def client_session(session=None):
+    """
+    Yield the given aiohttp session, or a temporary one closed on exit.
+    
+    Args:
+        session: An existing aiohttp.ClientSession to reuse, or None
+    """
+    if session is not None:
+        yield session
+        return
+    async with aiohttp.ClientSession() as temp_session:
+        yield temp_session
+
+
+def client_timeout(timeout):
+    """Build an aiohttp total timeout from a number of seconds (None = no limit)."""
+    return aiohttp.ClientTimeout(total=timeout) if timeout else None
@@ -1,10 +1,113 @@
+import asyncio
+import threading
 from abc import ABC, abstractmethod
 from typing import Tuple, Optional, Dict, Any
+from .http import create_session, DEFAULT_POOL_SIZE
+from .errors import ExtractionError, RATE_LIMITED, PERMANENT
 
 
 class ContentExtractorInterface(ABC):
     """Abstract base class defining the interface for all content extractors."""
     
+    _session = None
+    _session_lock = threading.Lock()
+    
+    # Host of the third-party API the extractor calls, if any; used to key
+    # the provider circuit breaker
+    provider_host: Optional[str] = None
+    
+    # HostScheduler applied to direct fetches of reference pages, if any
+    politeness = None
+    
+    # RateLimits pacing calls to provider_host, if any
+    rate_limits = None
+    
+    # KeyPool per provider host rotating API keys, if any
+    key_pools = None
+    
+    # ParsePool converting directly fetched pages in worker processes, if any
+    parse_pool = None
+    
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE):
+        """
+        Args:
+            pool_size: Size of the keep-alive connection pool, normally the run's concurrency
+        """
+        self.pool_size = pool_size
+    
+    @property
+    def session(self):
+        """Long-lived pooled requests.Session, created on first use."""
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    self._session = create_session(getattr(self, 'pool_size', DEFAULT_POOL_SIZE))
+        return self._session
+    
+    def use_politeness(self, scheduler) -> None:
+        """
+        Route this extractor's direct page fetches through a HostScheduler.
+        
+        Only extractors that download reference pages themselves use it.
+        """
+        self.politeness = scheduler
+    
+    def use_rate_limits(self, rate_limits) -> None:
+        """Pace this extractor's API calls with a RateLimits instance."""
+        self.rate_limits = rate_limits
+    
+    def use_parse_pool(self, pool) -> None:
+        """
+        Convert this extractor's directly fetched pages in a ParsePool.
+        
+        Only extractors that parse pages locally use it.
+        """
+        self.parse_pool = pool
+    
+    def _wait_for_rate_limit(self) -> None:
+        """Block until the provider's rate limit allows another request."""
+        if self.rate_limits is not None and self.provider_host:
+            self.rate_limits.acquire(self.provider_host)
+    
+    async def _wait_for_rate_limit_async(self) -> None:
+        if self.rate_limits is not None and self.provider_host:
+            await self.rate_limits.acquire_async(self.provider_host)
+    
+    def use_key_pools(self, key_pools) -> None:
+        """Draw API keys from the KeyPool registered for provider_host."""
+        self.key_pools = key_pools
+    
+    def _choose_api_key(self, api_key: Optional[str]):
+        """
+        Pick the API key for the next request.
+        
+        Returns:
+            Tuple of (api_key, error); error is set when every key of the
+            provider's pool is quarantined
+        """
+        pool = self.key_pools.get(self.provider_host) if self.key_pools else None
+        if pool is None or not len(pool):
+            return api_key, None
+        key = pool.acquire()
+        if key is None:
+            retry_after = pool.available_in()
+            kind = RATE_LIMITED if retry_after is not None else PERMANENT
+            return None, ExtractionError(f"All {self.provider_host} API keys are quarantined",
+                                         kind=kind, retry_after=retry_after)
+        return key, None
+    
+    def _report_api_key(self, api_key: Optional[str], status_code: int, error=None) -> None:
+        """Tell the provider's key pool which HTTP status a key received."""
+        pool = self.key_pools.get(self.provider_host) if self.key_pools else None
+        if pool is not None:
+            pool.report(api_key, status_code, getattr(error, "retry_after", None))
+    
+    def close(self) -> None:
+        """Close the pooled session and release its connections."""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+    
     @abstractmethod
     def extract_text(self, url: str, api_key: Optional[str] = None, **kwargs) -> Tuple[Optional[str], Optional[str]]:
         """
@@ -20,4 +123,24 @@ class ContentExtractorInterface(ABC):
             - If successful: (text_content, None)
             - If failed: (None, error_description)
         """
-        pass 
\ No newline at end of file
+        pass
+    
+    async def extract_text_async(self, url: str, api_key: Optional[str] = None, **kwargs) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Coroutine version of extract_text.
+        
+        Extractors with a native asyncio implementation override this. The
+        default runs the blocking extract_text in a worker thread so every
+        extractor can be awaited.
+        
+        Args:
+            url: The URL to extract content from
+            api_key: Optional API key for services requiring authentication
+            **kwargs: Additional extractor-specific parameters
+                - session: Optional aiohttp.ClientSession to reuse
+            
+        Returns:
+            A tuple of (extracted_text, error_message)
+        """
+        kwargs.pop('session', None)
+        return await asyncio.to_thread(self.extract_text, url, api_key, **kwargs)
@@ -0,0 +1,345 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Tuple, Optional, List, Dict
+
+from .base import ContentExtractorInterface
+from .http import DEFAULT_POOL_SIZE
+from .errors import ExtractionError, PERMANENT, SKIPPED, TRANSIENT_KINDS
+
+# Chain modes
+FALLBACK = "fallback"
+HEDGE = "hedge"
+CHAIN_MODES = (FALLBACK, HEDGE)
+
+
+class LatencyTracker:
+    """Sliding window of recent successful latencies of the primary extractor."""
+
+    def __init__(self, window: int = 100, min_samples: int = 5, default: float = 2.0):
+        """
+        Args:
+            window: Number of recent samples kept
+            min_samples: Samples needed before percentiles are trusted
+            default: Latency assumed until min_samples have been seen
+        """
+        self.samples = deque(maxlen=window)
+        self.min_samples = min_samples
+        self.default = default
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self.samples.append(seconds)
+
+    def percentile(self, percent: float) -> float:
+        """Nearest-rank percentile of the recorded latencies, in seconds."""
+        with self._lock:
+            if len(self.samples) < self.min_samples:
+                return self.default
+            ordered = sorted(self.samples)
+        rank = round(percent / 100 * (len(ordered) - 1))
+        return ordered[min(len(ordered) - 1, max(0, rank))]
+
+
+class ExtractorChain(ContentExtractorInterface):
+    """
+    Several extractors tried for the same URL, e.g. Jina with a local fallback.
+
+    In fallback mode members are tried in order until one succeeds. In hedge
+    mode the next member is also started when the running one has not
+    answered within the given percentile of the primary's recent latency;
+    the first success wins and the slower request is cancelled (async) or
+    its result discarded (sync, where a running thread cannot be stopped).
+    
+    When `breakers` is set to a CircuitBreakerRegistry, members whose
+    provider breaker is open are skipped, rerouting URLs to the next member.
+    """
+    
+    breakers = None
+
+    def __init__(self, members: List[Tuple[str, ContentExtractorInterface]], mode: str = FALLBACK,
+                 hedge_percentile: float = 95.0, hedge_delay: float = 2.0,
+                 pool_size: int = DEFAULT_POOL_SIZE):
+        """
+        Args:
+            members: (name, extractor) pairs, primary first
+            mode: "fallback" or "hedge"
+            hedge_percentile: Percentile of primary latency after which the next member is started
+            hedge_delay: Hedge delay used until enough latencies have been observed
+            pool_size: Size of each member's connection pool
+        """
+        super().__init__(pool_size=pool_size)
+        if not members:
+            raise ValueError("An extractor chain needs at least one extractor")
+        if mode not in CHAIN_MODES:
+            raise ValueError(f"Unsupported chain mode: {mode}. Supported modes are: {', '.join(CHAIN_MODES)}")
+        self.members = members
+        self.mode = mode
+        self.hedge_percentile = hedge_percentile
+        self.latency = LatencyTracker(default=hedge_delay)
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    @property
+    def names(self) -> List[str]:
+        return [name for name, _ in self.members]
+
+    def hedge_after(self) -> float:
+        """Seconds to wait for a running member before starting the next one."""
+        return self.latency.percentile(self.hedge_percentile)
+
+    def use_politeness(self, scheduler) -> None:
+        """Route every member's direct page fetches through the same HostScheduler."""
+        super().use_politeness(scheduler)
+        for _, extractor in self.members:
+            extractor.use_politeness(scheduler)
+
+    def use_rate_limits(self, rate_limits) -> None:
+        """Pace every member's API calls with the same RateLimits."""
+        super().use_rate_limits(rate_limits)
+        for _, extractor in self.members:
+            extractor.use_rate_limits(rate_limits)
+
+    def use_parse_pool(self, pool) -> None:
+        """Convert every member's directly fetched pages in the same ParsePool."""
+        super().use_parse_pool(pool)
+        for _, extractor in self.members:
+            extractor.use_parse_pool(pool)
+
+    def use_key_pools(self, key_pools) -> None:
+        """Let every member draw API keys from the same pools."""
+        super().use_key_pools(key_pools)
+        for _, extractor in self.members:
+            extractor.use_key_pools(key_pools)
+
+    def close(self) -> None:
+        """Close every member's pooled session and the hedging thread pool."""
+        for _, extractor in self.members:
+            extractor.close()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def extract_text(self, url: str, api_key: Optional[str] = None, **kwargs) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Extract text from a URL with the chain's members.
+
+        Args:
+            url: The URL to extract content from
+            api_key: API key of the primary extractor
+            **kwargs: Passed to every member
+                - api_keys: Optional dict of API keys by extractor name
+
+        Returns:
+            A tuple of (extracted_text, error_message); on failure the error
+            lists every member's error
+        """
+        api_keys = kwargs.pop('api_keys', None) or {}
+        if self.mode == HEDGE and len(self.members) > 1:
+            return self._extract_hedged(url, api_key, api_keys, kwargs)
+
+        errors = []
+        for index, (name, extractor) in enumerate(self.members):
+            granted, refusal = self._acquire(extractor)
+            if refusal is not None:
+                errors.append((name, refusal))
+                continue
+            member_kwargs = self._member_kwargs(index, name, api_key, api_keys, kwargs)
+            start_time = time.time()
+            text, error = self._call(extractor, url, member_kwargs, granted)
+            if text is not None:
+                if index == 0:
+                    self.latency.record(time.time() - start_time)
+                return text, None
+            errors.append((name, error))
+        return None, self._combined_error(errors)
+
+    async def extract_text_async(self, url: str, api_key: Optional[str] = None, **kwargs) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Coroutine version of extract_text; losing hedged requests are cancelled.
+
+        Args:
+            url: The URL to extract content from
+            api_key: API key of the primary extractor
+            **kwargs: Passed to every member
+                - api_keys: Optional dict of API keys by extractor name
+                - session: Optional aiohttp.ClientSession to reuse
+
+        Returns:
+            A tuple of (extracted_text, error_message)
+        """
+        api_keys = kwargs.pop('api_keys', None) or {}
+        hedged = self.mode == HEDGE and len(self.members) > 1
+
+        errors = []
+        running = {}
+        next_index = 0
+        launched_at = 0.0
+        while next_index < len(self.members) or running:
+            # Start the next member when nothing is running (fallback) or,
+            # in hedge mode, when the running one has been too slow
+            if next_index < len(self.members) and (not running or (
+                    hedged and time.monotonic() - launched_at >= self.hedge_after())):
+                name, extractor = self.members[next_index]
+                granted, refusal = self._acquire(extractor)
+                if refusal is not None:
+                    errors.append((name, refusal))
+                    next_index += 1
+                    continue
+                member_kwargs = self._member_kwargs(next_index, name, api_key, api_keys, kwargs)
+                task = asyncio.ensure_future(self._call_async(extractor, url, member_kwargs, granted))
+                launched_at = time.monotonic()
+                running[task] = (next_index, name, launched_at)
+                next_index += 1
+            if not running:
+                continue
+
+            timeout = None
+            if hedged and next_index < len(self.members):
+                timeout = max(0.0, launched_at + self.hedge_after() - time.monotonic())
+            done, _ = await asyncio.wait(running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+            for task in done:
+                index, name, started = running.pop(task)
+                text, error = task.result()
+                if text is not None:
+                    self._record_primary_latency(index, started, running)
+                    for other in running:
+                        other.cancel()
+                    await asyncio.gather(*running, return_exceptions=True)
+                    return text, None
+                errors.append((name, error))
+        return None, self._combined_error(errors)
+
+    def _extract_hedged(self, url: str, api_key: Optional[str], api_keys: Dict, kwargs: Dict):
+        """Run members in worker threads, starting the next one when the current is slow."""
+        executor = self._get_executor()
+        errors = []
+        running = {}
+        next_index = 0
+        launched_at = 0.0
+        while next_index < len(self.members) or running:
+            if next_index < len(self.members) and (
+                    not running or time.monotonic() - launched_at >= self.hedge_after()):
+                name, extractor = self.members[next_index]
+                granted, refusal = self._acquire(extractor)
+                if refusal is not None:
+                    errors.append((name, refusal))
+                    next_index += 1
+                    continue
+                member_kwargs = self._member_kwargs(next_index, name, api_key, api_keys, kwargs)
+                future = executor.submit(self._call, extractor, url, member_kwargs, granted)
+                launched_at = time.monotonic()
+                running[future] = (next_index, name, launched_at)
+                next_index += 1
+            if not running:
+                continue
+
+            timeout = None
+            if next_index < len(self.members):
+                timeout = max(0.0, launched_at + self.hedge_after() - time.monotonic())
+            done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                index, name, started = running.pop(future)
+                text, error = future.result()
+                if text is not None:
+                    self._record_primary_latency(index, started, running)
+                    # Requests already running finish in the background and are ignored
+                    for other in running:
+                        other.cancel()
+                    return text, None
+                errors.append((name, error))
+        return None, self._combined_error(errors)
+
+    def _record_primary_latency(self, winner: int, started: float, running: Dict) -> None:
+        """
+        Record the primary's latency once a member has succeeded.
+
+        When a hedge wins while the primary is still running, the time the
+        primary has taken so far is recorded as a lower bound; recording only
+        the primary's own wins would keep just its fast samples, and the
+        hedge delay would drift down until nearly every request is hedged.
+        """
+        now = time.monotonic()
+        if winner == 0:
+            self.latency.record(now - started)
+            return
+        for index, _, primary_started in running.values():
+            if index == 0:
+                self.latency.record(now - primary_started)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    workers = max(2, self.pool_size * len(self.members))
+                    self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hedge")
+        return self._executor
+
+    @staticmethod
+    def _member_kwargs(index: int, name: str, api_key: Optional[str], api_keys: Dict, kwargs: Dict) -> Dict:
+        """Keyword arguments for one member, with that member's own API key."""
+        member_kwargs = dict(kwargs)
+        member_kwargs['api_key'] = api_keys.get(name, api_key if index == 0 else None)
+        return member_kwargs
+
+    def _acquire(self, extractor: ContentExtractorInterface):
+        """Ask the member's provider breaker for permission; returns (granted, refusal error)."""
+        if self.breakers is None:
+            return [], None
+        return self.breakers.acquire(self.breakers.keys_for(provider_host=extractor.provider_host))
+
+    def _call(self, extractor: ContentExtractorInterface, url: str, kwargs: Dict, granted=()):
+        # The outcome is reported here, so hedged requests that lose the race still count
+        try:
+            text, error = extractor.extract_text(url, **kwargs)
+        except Exception as e:
+            text, error = None, str(e)
+        if granted:
+            self.breakers.record(granted, text, error, target_keys=[])
+        return text, error
+
+    async def _call_async(self, extractor: ContentExtractorInterface, url: str, kwargs: Dict, granted=()):
+        try:
+            text, error = await extractor.extract_text_async(url, **kwargs)
+        except asyncio.CancelledError:
+            for breaker in granted:
+                breaker.release()
+            raise
+        except Exception as e:
+            text, error = None, str(e)
+        if granted:
+            self.breakers.record(granted, text, error, target_keys=[])
+        return text, error
+
+    def _combined_error(self, errors: List[Tuple[str, Optional[str]]]) -> ExtractionError:
+        """
+        Join the members' errors into one.
+
+        The chain is worth retrying if any member failed transiently, so the
+        first transient kind wins, even over a member that skipped the
+        response. Otherwise, when some errors are plain strings the kind is
+        left unset and the retry policy classifies the message; failing
+        that, SKIPPED wins over PERMANENT.
+        The error is upstream (the target site's) when a member fetching the
+        target directly, or a provider relaying the target's response,
+        failed transiently.
+        """
+        message = "; ".join(f"{name}: {error}" for name, error in errors)
+        kinds = [getattr(error, 'kind', None) for _, error in errors]
+        kind = next((k for k in kinds if k in TRANSIENT_KINDS), None)
+        if kind is None and kinds and all(kinds):
+            kind = SKIPPED if SKIPPED in kinds else PERMANENT
+        retry_after = [error.retry_after for _, error in errors if getattr(error, 'retry_after', None) is not None]
+        members = dict(self.members)
+        upstream = any(
+            getattr(error, 'kind', None) not in (None, PERMANENT, SKIPPED)
+            and (members[name].provider_host is None or getattr(error, 'upstream', False))
+            for name, error in errors
+        )
+        return ExtractionError(message, kind=kind, retry_after=min(retry_after) if retry_after else None,
+                               upstream=upstream)
@@ -0,0 +1,116 @@
+"""
+Charset resolution for downloaded pages.
+
+The encoding is taken, in order, from a byte order mark, the charset of
+the Content-Type header, a <meta charset> (or http-equiv / XML
+declaration) in the first few KB, or a successful UTF-8 decode of a
+sample. Statistical detection is the last resort and only ever looks at a
+bounded sample, so its cost does not grow with the page.
+"""
+import codecs
+import re
+from typing import Optional, Tuple
+
+from requests.compat import chardet
+
+# Bytes searched for a <meta charset> declaration
+META_SNIFF_BYTES = 4096
+
+# Bytes checked for valid UTF-8 and given to statistical detection
+DETECT_SAMPLE_BYTES = 64 * 1024
+
+# Used when nothing else gives an answer
+FALLBACK_ENCODING = "windows-1252"
+
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+_META_CHARSET = re.compile(
+    rb"""<meta[^>]+?charset\s*=\s*["']?\s*([a-zA-Z0-9_:.+-]+)"""
+    rb"""|<\?xml[^>]+?encoding\s*=\s*["']([a-zA-Z0-9_:.+-]+)""",
+    re.IGNORECASE,
+)
+
+# Labels browsers treat as another encoding (WHATWG Encoding Standard)
+_ALIASES = {
+    "iso-8859-1": "windows-1252",
+    "latin1": "windows-1252",
+    "latin-1": "windows-1252",
+    "us-ascii": "windows-1252",
+    "ascii": "windows-1252",
+    "x-user-defined": "windows-1252",
+}
+
+
+def normalize_encoding(label: Optional[str], in_markup: bool = False) -> Optional[str]:
+    """
+    Canonical Python codec name for an encoding label, or None if unknown.
+
+    Args:
+        label: The label, e.g. "ISO-8859-1" or "utf8"
+        in_markup: The label was read from the page itself
+    """
+    if not label:
+        return None
+    label = label.strip().strip("\"'").lower()
+    label = _ALIASES.get(label, label)
+    try:
+        codec = codecs.lookup(label)
+    except LookupError:
+        return None
+    # A page cannot really be UTF-16 if it declares so in ASCII-compatible bytes
+    if in_markup and codec.name.startswith(("utf-16", "utf-32")):
+        return "utf-8"
+    return codec.name
+
+
+def _is_utf8(sample: bytes, truncated: bool) -> bool:
+    try:
+        sample.decode("utf-8")
+        return True
+    except UnicodeDecodeError as e:
+        # A multi-byte character cut off at the end of the sample is fine
+        return truncated and e.start >= len(sample) - 3 and e.reason == "unexpected end of data"
+
+
+def resolve_encoding(raw: bytes, declared: Optional[str] = None) -> Tuple[str, str]:
+    """
+    Work out how to decode a page.
+
+    Args:
+        raw: The response body
+        declared: Charset from the Content-Type header, if any
+
+    Returns:
+        Tuple of (codec name, source), source being one of "bom", "header",
+        "meta", "utf-8", "detected" or "fallback"
+    """
+    for bom, encoding in _BOMS:
+        if raw.startswith(bom):
+            return encoding, "bom"
+    encoding = normalize_encoding(declared)
+    if encoding:
+        return encoding, "header"
+    match = _META_CHARSET.search(raw, 0, META_SNIFF_BYTES)
+    if match:
+        encoding = normalize_encoding((match.group(1) or match.group(2)).decode("ascii"), in_markup=True)
+        if encoding:
+            return encoding, "meta"
+    sample = raw[:DETECT_SAMPLE_BYTES]
+    if _is_utf8(sample, truncated=len(raw) > len(sample)):
+        return "utf-8", "utf-8"
+    encoding = normalize_encoding(chardet.detect(sample).get("encoding"))
+    if encoding:
+        return encoding, "detected"
+    return FALLBACK_ENCODING, "fallback"
+
+
+def decode_page(raw: bytes, declared: Optional[str] = None) -> str:
+    """Decode a response body with its resolved encoding; undecodable bytes are replaced."""
+    encoding, _ = resolve_encoding(raw, declared)
+    return raw.decode(encoding, errors="replace")
@@ -0,0 +1,92 @@
+"""
+Content-type dispatch for local extraction.
+
+Downloaded pages are handled according to their media type:
+
+- HTML (and XHTML / XML): parsed and rendered as text or Markdown
+- plain text, Markdown (e.g. raw files on GitHub) and JSON: passed
+  through with only whitespace normalisation
+- PDF: text extracted page by page with pypdf, up to a page cap; needs
+  pypdf (pip install pypdf), otherwise PDFs are skipped, so a chain can
+  fall back to an API extractor for them
+
+Anything else is not extracted.
+"""
+import io
+import re
+from typing import Optional
+
+try:
+    import pypdf
+    PDF_AVAILABLE = True
+except ImportError:
+    pypdf = None
+    PDF_AVAILABLE = False
+
+HTML = "html"
+TEXT = "text"
+PDF = "pdf"
+
+HTML_TYPES = ("text/html", "application/xhtml+xml", "text/xml", "application/xml")
+PLAIN_TEXT_TYPES = ("text/plain", "text/markdown", "text/x-markdown", "application/json")
+PDF_TYPES = ("application/pdf", "application/x-pdf")
+
+DEFAULT_MAX_PDF_PAGES = 50
+
+
+def content_kind(media_type: str) -> Optional[str]:
+    """
+    How a media type is extracted.
+
+    Returns:
+        HTML, TEXT or PDF, or None if it cannot be extracted here
+    """
+    if media_type in HTML_TYPES or media_type.endswith("+xml"):
+        return HTML
+    if media_type in PDF_TYPES:
+        return PDF if PDF_AVAILABLE else None
+    if media_type in PLAIN_TEXT_TYPES or media_type.startswith("text/") or media_type.endswith("+json"):
+        return TEXT
+    return None
+
+
+def unsupported_reason(media_type: str) -> str:
+    """Why content of media_type is not extracted, for a skipped error."""
+    if media_type in PDF_TYPES:
+        return "PDF extraction needs pypdf (pip install pypdf)"
+    return f"{media_type} content is not text"
+
+
+def normalize_text(text: str) -> str:
+    """Normalise line endings and trailing whitespace, and collapse runs of blank lines."""
+    text = text.replace("\r\n", "\n").replace("\r", "\n").replace("\x00", "")
+    text = re.sub(r"[ \t]+\n", "\n", text)
+    return re.sub(r"\n{3,}", "\n\n", text).strip()
+
+
+def pdf_to_text(raw: bytes, max_pages: Optional[int] = DEFAULT_MAX_PDF_PAGES) -> str:
+    """
+    Extract the text of a PDF page by page.
+
+    Pages are read one at a time, so only the first max_pages are ever
+    decoded however long the document is.
+
+    Args:
+        raw: The PDF file
+        max_pages: Pages to extract (None or 0 for all)
+
+    Returns:
+        The text of the pages, separated by blank lines, with a note when
+        the document was cut short
+    """
+    reader = pypdf.PdfReader(io.BytesIO(raw))
+    total = len(reader.pages)
+    limit = min(total, max_pages) if max_pages else total
+    pages = []
+    for number in range(limit):
+        text = normalize_text(reader.pages[number].extract_text() or "")
+        if text:
+            pages.append(text)
+    if limit < total:
+        pages.append(f"[PDF truncated: first {limit} of {total} pages extracted]")
+    return "\n\n".join(pages)
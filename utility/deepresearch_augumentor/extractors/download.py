@@ -0,0 +1,237 @@
+"""
+Bounded downloads of reference pages.
+
+Responses are streamed rather than read whole: the Content-Type and
+Content-Length headers are checked before any of the body is read, the
+first chunk is sniffed when the type is missing or generic, and the
+download is abandoned as soon as it passes the size cap. A reference that
+turns out to be a video, dataset or disk image then costs one round trip
+instead of hundreds of megabytes of memory and bandwidth. Which types are
+downloaded is decided by content_types.content_kind.
+
+Refused responses are reported as ExtractionErrors of kind SKIPPED, which
+are never retried and are counted as skipped rather than failed.
+"""
+import contextlib
+from typing import Iterable, Optional, Tuple
+
+from .content_types import content_kind, unsupported_reason
+from .errors import ExtractionError, SKIPPED, http_error
+
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+
+CHUNK_SIZE = 64 * 1024
+
+# Content-Type values that say nothing about the content; the body is sniffed instead
+GENERIC_TYPES = ("", "application/octet-stream", "binary/octet-stream", "application/unknown")
+
+# Leading bytes of common binary formats
+_MAGIC_NUMBERS = (
+    (b"%PDF-", "application/pdf"),
+    (b"PK\x03\x04", "application/zip"),
+    (b"\x1f\x8b", "application/gzip"),
+    (b"7z\xbc\xaf\x27\x1c", "application/x-7z-compressed"),
+    (b"Rar!", "application/vnd.rar"),
+    (b"\x89PNG", "image/png"),
+    (b"GIF8", "image/gif"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"\x1a\x45\xdf\xa3", "video/webm"),
+    (b"OggS", "audio/ogg"),
+    (b"ID3", "audio/mpeg"),
+    (b"\x7fELF", "application/x-executable"),
+    (b"MZ", "application/x-msdownload"),
+)
+
+_TEXT_BOMS = (b"\xef\xbb\xbf", b"\xff\xfe", b"\xfe\xff")
+
+
+class Download:
+    """A downloaded response body."""
+
+    __slots__ = ("body", "media_type", "charset")
+
+    def __init__(self, body: bytes, media_type: str, charset: Optional[str] = None):
+        """
+        Args:
+            body: The raw response body
+            media_type: Declared media type, or the sniffed one when none was declared
+            charset: Charset declared in the Content-Type header, if any
+        """
+        self.body = body
+        self.media_type = media_type
+        self.charset = charset
+
+
+def format_size(size: int) -> str:
+    """Human-readable byte count, e.g. "12.5 MB"."""
+    for unit in ("bytes", "KB", "MB"):
+        if size < 1024 or unit == "MB":
+            return f"{size} {unit}" if unit == "bytes" else f"{size:.1f} {unit}"
+        size /= 1024.0
+
+
+def _header(headers, name: str) -> str:
+    value = headers.get(name) if headers is not None else None
+    return value if isinstance(value, str) else ""
+
+
+def media_type(headers) -> str:
+    """The media type of a Content-Type header, lower-cased, without parameters."""
+    return _header(headers, "Content-Type").split(";")[0].strip().lower()
+
+
+def declared_charset(headers) -> Optional[str]:
+    """The charset parameter of a Content-Type header, if any."""
+    for parameter in _header(headers, "Content-Type").split(";")[1:]:
+        name, _, value = parameter.partition("=")
+        if name.strip().lower() == "charset" and value.strip(' "\''):
+            return value.strip(' "\'').lower()
+    return None
+
+
+def content_length(headers) -> Optional[int]:
+    """The Content-Length header as an int, if present and valid."""
+    value = _header(headers, "Content-Length").strip()
+    return int(value) if value.isdigit() else None
+
+
+def sniff_content_type(head: bytes) -> str:
+    """
+    Guess the media type of a body from its first bytes.
+
+    Returns:
+        The media type of a recognized binary format, "text/html" for
+        markup, "application/octet-stream" for other binary data and
+        "text/plain" otherwise
+    """
+    for magic, sniffed in _MAGIC_NUMBERS:
+        if head.startswith(magic):
+            return sniffed
+    if head[4:8] == b"ftyp":
+        return "video/mp4"
+    if head[0x8001:0x8006] == b"CD001":
+        return "application/x-iso9660-image"
+    if head.startswith(_TEXT_BOMS[1:]):
+        # UTF-16 text contains NUL bytes
+        return "text/plain"
+    sample = head[:1024].lstrip(b"\xef\xbb\xbf \t\r\n").lower()
+    if sample.startswith((b"<!doctype html", b"<html", b"<head", b"<body", b"<?xml")) or b"<html" in sample:
+        return "text/html"
+    if b"\x00" in head[:1024]:
+        return "application/octet-stream"
+    return "text/plain"
+
+
+def skipped(reason: str) -> ExtractionError:
+    return ExtractionError(f"Skipped: {reason}", kind=SKIPPED)
+
+
+def check_headers(headers, max_bytes: int) -> Optional[ExtractionError]:
+    """
+    Decide from the response headers alone whether to read the body.
+
+    Returns:
+        A SKIPPED error for content that cannot be extracted or a declared
+        size over max_bytes, else None
+    """
+    declared = media_type(headers)
+    if declared not in GENERIC_TYPES and content_kind(declared) is None:
+        return skipped(unsupported_reason(declared))
+    length = content_length(headers)
+    if length is not None and max_bytes and length > max_bytes:
+        return skipped(f"{format_size(length)} exceeds the {format_size(max_bytes)} download limit")
+    return None
+
+
+class BodyReader:
+    """Accumulates a streamed body, sniffing the first chunk and enforcing the size cap."""
+
+    def __init__(self, headers, max_bytes: int):
+        self.media_type = media_type(headers)
+        self.charset = declared_charset(headers)
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._chunks = []
+
+    def feed(self, chunk: bytes) -> Optional[ExtractionError]:
+        """
+        Add the next chunk.
+
+        Returns:
+            A SKIPPED error if the download should be abandoned, else None
+        """
+        if not chunk:
+            return None
+        if not self._chunks and self.media_type in GENERIC_TYPES:
+            self.media_type = sniff_content_type(chunk)
+            if content_kind(self.media_type) is None:
+                return skipped(unsupported_reason(self.media_type))
+        self.size += len(chunk)
+        if self.max_bytes and self.size > self.max_bytes:
+            return skipped(f"response exceeds the {format_size(self.max_bytes)} download limit")
+        self._chunks.append(chunk)
+        return None
+
+    def result(self) -> Download:
+        return Download(b"".join(self._chunks), self.media_type or "text/html", self.charset)
+
+
+def read_body(headers, chunks: Iterable[bytes], max_bytes: int) -> Tuple[Optional[Download], Optional[ExtractionError]]:
+    """
+    Read a streamed body within the size cap, sniffing it if the headers
+    do not give its type; check_headers should have accepted the headers.
+
+    Args:
+        headers: The response headers
+        chunks: The body, chunk by chunk
+        max_bytes: Size cap (0 for none)
+
+    Returns:
+        Tuple of (download, error); exactly one is None
+    """
+    reader = BodyReader(headers, max_bytes)
+    for chunk in chunks:
+        error = reader.feed(chunk)
+        if error is not None:
+            return None, error
+    return reader.result(), None
+
+
+def fetch(session, url: str, headers, timeout, max_bytes: int = DEFAULT_MAX_BYTES):
+    """
+    Download url with a requests session, streaming and within the limits.
+
+    Returns:
+        Tuple of (download, error); exactly one is None. Network exceptions propagate.
+    """
+    response = session.get(url, headers=headers, timeout=timeout, stream=True)
+    with contextlib.closing(response):
+        if response.status_code != 200:
+            return None, http_error(f"HTTP error: {response.status_code}", response.status_code,
+                                    getattr(response, "headers", None))
+        error = check_headers(response.headers, max_bytes)
+        if error is not None:
+            return None, error
+        return read_body(response.headers, response.iter_content(CHUNK_SIZE), max_bytes)
+
+
+async def fetch_async(session, url: str, headers, timeout, max_bytes: int = DEFAULT_MAX_BYTES):
+    """
+    Coroutine version of fetch for an aiohttp session; timeout is an aiohttp.ClientTimeout.
+
+    Returns:
+        Tuple of (download, error); exactly one is None. Network exceptions propagate.
+    """
+    async with session.get(url, headers=headers, timeout=timeout) as response:
+        if response.status != 200:
+            return None, http_error(f"HTTP error: {response.status}", response.status,
+                                    getattr(response, "headers", None))
+        error = check_headers(response.headers, max_bytes)
+        if error is not None:
+            return None, error
+        reader = BodyReader(response.headers, max_bytes)
+        async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+            error = reader.feed(chunk)
+            if error is not None:
+                return None, error
+        return reader.result(), None
@@ -0,0 +1,89 @@
+"""
+Structured error messages returned by the extractors.
+
+Extractors return (None, error) on failure. ExtractionError is a str, so
+existing callers that print or search the message keep working, while the
+retry logic can read the HTTP status, the failure kind and any Retry-After
+hint without parsing text.
+
+An extractor that relays requests through an API provider sets upstream on
+errors that describe the target site's own response, as opposed to a
+failure of the provider, so circuit breakers can tell the two apart.
+"""
+import email.utils
+import time
+from typing import Optional
+
+# Failure kinds
+TIMEOUT = "timeout"
+RATE_LIMITED = "rate_limited"
+SERVER_ERROR = "server_error"
+CONNECTION = "connection"
+PERMANENT = "permanent"
+# Responses deliberately not extracted (non-text content, over the size cap)
+SKIPPED = "skipped"
+
+# Kinds worth retrying: the same request may succeed later
+TRANSIENT_KINDS = (TIMEOUT, RATE_LIMITED, SERVER_ERROR, CONNECTION)
+
+
+class ExtractionError(str):
+    """Error message carrying the HTTP status code, failure kind and Retry-After delay."""
+    
+    def __new__(cls, message: str, status_code: Optional[int] = None, kind: Optional[str] = None,
+                retry_after: Optional[float] = None, upstream: bool = False):
+        error = super().__new__(cls, message)
+        error.status_code = status_code
+        error.kind = kind or kind_for_status(status_code)
+        error.retry_after = retry_after
+        error.upstream = upstream
+        return error
+
+
+def kind_for_status(status_code: Optional[int]) -> Optional[str]:
+    """Map an HTTP status code to a failure kind (None if there is no status)."""
+    if status_code is None:
+        return None
+    if status_code == 429:
+        return RATE_LIMITED
+    if status_code in (408, 504):
+        return TIMEOUT
+    if status_code >= 500:
+        return SERVER_ERROR
+    return PERMANENT
+
+
+def parse_retry_after(value) -> Optional[float]:
+    """
+    Parse a Retry-After header value into seconds.
+    
+    Accepts delta-seconds or an HTTP date; returns None for missing or
+    malformed values.
+    """
+    if isinstance(value, (int, float)):
+        return max(0.0, float(value))
+    if not isinstance(value, str) or not value.strip():
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at is None:
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+def http_error(message: str, status_code: int, headers=None) -> ExtractionError:
+    """Build an ExtractionError for an HTTP error response."""
+    retry_after = None
+    if headers is not None:
+        try:
+            retry_after = parse_retry_after(headers.get("Retry-After"))
+        except Exception:
+            retry_after = None
+    return ExtractionError(message, status_code=status_code, retry_after=retry_after)
@@ -1,12 +1,21 @@
 import os
+import asyncio
 import requests
 from typing import Tuple, Optional, Dict, Any
+from . import aio
+from .errors import ExtractionError, http_error, TIMEOUT, CONNECTION
 from .base import ContentExtractorInterface
 
+# Note: Update the endpoint and payload structure based on
+# actual Firecrawl API documentation
+FIRECRAWL_EXTRACT_URL = "https://api.firecrawl.dev/v1/extract"  # Example endpoint
+
 
 class FirecrawlExtractor(ContentExtractorInterface):
     """Content extractor using Firecrawl API."""
     
+    provider_host = "api.firecrawl.dev"
+    
     def extract_text(self, url: str, api_key: Optional[str] = None, **kwargs) -> Tuple[Optional[str], Optional[str]]:
         """
         Extract text content from a URL using Firecrawl API.
@@ -19,34 +28,96 @@ class FirecrawlExtractor(ContentExtractorInterface):
         Returns:
             Tuple of (extracted_text, error_message)
         """
+        api_key, key_error = self._choose_api_key(api_key)
+        if key_error is not None:
+            return None, key_error
         api_key = api_key or os.environ.get("FIRECRAWL_API_KEY")
         
         if not api_key:
             return None, "Firecrawl API key not provided. Set FIRECRAWL_API_KEY environment variable."
         
-        headers = {
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json",
-            "Accept": "application/json"
-        }
-        
         try:
-            # Note: Update the endpoint and payload structure based on 
-            # actual Firecrawl API documentation
-            response = requests.post(
-                "https://api.firecrawl.dev/v1/extract",  # Example endpoint
-                headers=headers,
-                json={"url": url}
+            self._wait_for_rate_limit()
+            response = self.session.post(
+                FIRECRAWL_EXTRACT_URL,
+                headers=self._build_headers(api_key),
+                json={"url": url},
+                timeout=kwargs.get('timeout')
             )
             
             if response.status_code == 200:
-                json_response = response.json()
-                if "content" in json_response:
-                    return json_response["content"], None
-                else:
-                    return None, f"Response format error: {json_response}"
+                self._report_api_key(api_key, 200)
+                return self._parse_content(response.json())
             else:
-                return None, f"API error: {response.status_code} - {response.text}"
+                error = http_error(f"API error: {response.status_code} - {response.text}",
+                                   response.status_code, getattr(response, "headers", None))
+                self._report_api_key(api_key, response.status_code, error)
+                return None, error
         
+        except requests.exceptions.Timeout as e:
+            return None, ExtractionError(f"Exception while calling Firecrawl API: {str(e)}", kind=TIMEOUT)
+        except requests.exceptions.ConnectionError as e:
+            return None, ExtractionError(f"Exception while calling Firecrawl API: {str(e)}", kind=CONNECTION)
         except Exception as e:
-            return None, f"Exception while calling Firecrawl API: {str(e)}" 
\ No newline at end of file
+            return None, f"Exception while calling Firecrawl API: {str(e)}"
+    
+    async def extract_text_async(self, url: str, api_key: Optional[str] = None, **kwargs) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Extract text content from a URL using Firecrawl API without blocking the event loop.
+        
+        Accepts the same parameters as extract_text, plus an optional
+        'session' (aiohttp.ClientSession) to reuse across calls.
+        
+        Returns:
+            Tuple of (extracted_text, error_message)
+        """
+        if not aio.aiohttp_available():
+            return await super().extract_text_async(url, api_key, **kwargs)
+        
+        api_key, key_error = self._choose_api_key(api_key)
+        if key_error is not None:
+            return None, key_error
+        api_key = api_key or os.environ.get("FIRECRAWL_API_KEY")
+        
+        if not api_key:
+            return None, "Firecrawl API key not provided. Set FIRECRAWL_API_KEY environment variable."
+        
+        try:
+            await self._wait_for_rate_limit_async()
+            async with aio.client_session(kwargs.get('session')) as session:
+                async with session.post(
+                    FIRECRAWL_EXTRACT_URL,
+                    headers=self._build_headers(api_key),
+                    json={"url": url},
+                    timeout=aio.client_timeout(kwargs.get('timeout'))
+                ) as response:
+                    if response.status == 200:
+                        self._report_api_key(api_key, 200)
+                        return self._parse_content(await response.json(content_type=None))
+                    else:
+                        error = http_error(f"API error: {response.status} - {await response.text()}",
+                                           response.status, getattr(response, "headers", None))
+                        self._report_api_key(api_key, response.status, error)
+                        return None, error
+        
+        except asyncio.TimeoutError:
+            return None, ExtractionError(f"Request timed out after {kwargs.get('timeout')} seconds", kind=TIMEOUT)
+        except aio.aiohttp.ClientConnectionError as e:
+            return None, ExtractionError(f"Exception while calling Firecrawl API: {str(e)}", kind=CONNECTION)
+        except Exception as e:
+            return None, f"Exception while calling Firecrawl API: {str(e)}"
+    
+    def _build_headers(self, api_key: str) -> Dict[str, str]:
+        """Build the Firecrawl request headers."""
+        return {
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json",
+            "Accept": "application/json"
+        }
+    
+    def _parse_content(self, json_response: Any) -> Tuple[Optional[str], Optional[str]]:
+        """Pull the extracted content out of a successful Firecrawl response."""
+        if "content" in json_response:
+            return json_response["content"], None
+        else:
+            return None, f"Response format error: {json_response}"
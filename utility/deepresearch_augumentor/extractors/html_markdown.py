@@ -0,0 +1,242 @@
+"""
+HTML to Markdown conversion for local extraction.
+
+Implements the options the Jina Reader API takes as headers, so the
+extraction modes (body-only, article, clean-text, ...) work without an API
+call:
+
+- target_selector: CSS selector(s) of the content to keep; the whole body
+  is used when nothing matches
+- remove_selector: CSS selector(s) of elements to drop first
+- links_handling: "default" keeps [text](url) links, "discarded" keeps only
+  the link text, "referenced" writes [text][n] with the URLs listed at the end
+- links_summary: append a "Links/Buttons:" list of every link
+
+Only the subtrees the target_selector keeps are parsed when the selectors
+allow it (see html_parsing.parse_html).
+"""
+import re
+from typing import List, Optional, Tuple, Union
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup, NavigableString, Comment, Doctype, ProcessingInstruction, Declaration
+
+from .html_parsing import parse_html
+
+# Elements that never carry readable content
+SKIP_TAGS = {
+    "script", "style", "noscript", "template", "svg", "canvas", "iframe", "object", "embed",
+    "head", "meta", "link", "input", "select", "textarea", "button",
+}
+
+# Elements rendered as separate blocks
+BLOCK_TAGS = {
+    "address", "article", "aside", "body", "dd", "details", "dialog", "div", "dl", "dt",
+    "fieldset", "figcaption", "figure", "footer", "form", "header", "hgroup", "html", "main",
+    "nav", "section", "summary",
+}
+
+LINK_STYLES = ("default", "discarded", "referenced")
+
+# Placeholders protecting list indentation and code blocks from whitespace clean-up
+_INDENT = "\x00"
+_LITERAL = "\x01"
+
+
+def _outer_space(raw: str, rendered: str) -> str:
+    """Keep the whitespace around an inline element's text outside its markup."""
+    return (" " if raw[:1].isspace() else "") + rendered + (" " if raw[-1:].isspace() else "")
+
+
+class _MarkdownRenderer:
+    """Walks a parsed document and renders it as Markdown."""
+
+    def __init__(self, base_url: str, links_handling: str):
+        self.base_url = base_url
+        self.links_handling = links_handling
+        self.links: List[Tuple[str, str]] = []
+        self._link_numbers = {}
+        self._literals: List[str] = []
+
+    def render(self, roots) -> str:
+        text = "\n\n".join(self._children(root) if root.name in ("[document]", "html", "body")
+                           else self._node(root) for root in roots)
+        text = re.sub(r"[ \t]*\n[ \t]*", "\n", text)
+        text = re.sub(r"[ \t]{2,}", " ", text)
+        text = re.sub(r"\n{3,}", "\n\n", text).strip()
+        text = text.replace(_INDENT, " ")
+        return re.sub(_LITERAL + r"(\d+)" + _LITERAL, lambda m: self._literals[int(m.group(1))], text)
+
+    def _children(self, node) -> str:
+        return "".join(self._node(child) for child in node.children)
+
+    def _node(self, node) -> str:
+        if isinstance(node, (Comment, Doctype, ProcessingInstruction, Declaration)):
+            return ""
+        if isinstance(node, NavigableString):
+            return re.sub(r"\s+", " ", str(node))
+        name = node.name
+        if name in SKIP_TAGS:
+            return ""
+        if len(name) == 2 and name[0] == "h" and name[1] in "123456":
+            text = re.sub(r"\s+", " ", self._children(node)).strip()
+            return f"\n\n{'#' * int(name[1])} {text}\n\n" if text else ""
+        if name == "p":
+            return f"\n\n{self._children(node).strip()}\n\n"
+        if name == "br":
+            return "\n"
+        if name == "hr":
+            return "\n\n---\n\n"
+        if name == "a":
+            return self._link(node)
+        if name == "img":
+            return self._image(node)
+        if name in ("strong", "b"):
+            return self._wrap(node, "**")
+        if name in ("em", "i"):
+            return self._wrap(node, "*")
+        if name in ("s", "del", "strike"):
+            return self._wrap(node, "~~")
+        if name == "code":
+            text = node.get_text()
+            return f"`{text}`" if text.strip() else ""
+        if name == "pre":
+            return self._literal("```\n" + node.get_text().strip("\n") + "\n```")
+        if name in ("ul", "ol"):
+            return self._list(node, ordered=name == "ol")
+        if name == "blockquote":
+            body = self._children(node).strip()
+            body = re.sub(r"\n{3,}", "\n\n", re.sub(r"[ \t]*\n[ \t]*", "\n", body))
+            return "\n\n" + "\n".join(f"> {line}" if line else ">" for line in body.split("\n")) + "\n\n"
+        if name == "table":
+            return self._table(node)
+        if name in BLOCK_TAGS:
+            return f"\n\n{self._children(node).strip()}\n\n"
+        return self._children(node)
+
+    def _wrap(self, node, marker: str) -> str:
+        raw = self._children(node)
+        text = raw.strip()
+        if not text:
+            return " " if raw else ""
+        return _outer_space(raw, f"{marker}{text}{marker}")
+
+    def _literal(self, text: str) -> str:
+        self._literals.append(text)
+        return f"\n\n{_LITERAL}{len(self._literals) - 1}{_LITERAL}\n\n"
+
+    def _link(self, node) -> str:
+        raw = re.sub(r"\s+", " ", self._children(node))
+        text = raw.strip()
+        href = (node.get("href") or "").strip()
+        if not href or href.startswith(("#", "javascript:")) or self.links_handling == "discarded":
+            return raw
+        url = urljoin(self.base_url, href)
+        if not text:
+            return ""
+        self.links.append((text, url))
+        if self.links_handling == "referenced":
+            number = self._link_numbers.setdefault(url, len(self._link_numbers) + 1)
+            return _outer_space(raw, f"[{text}][{number}]")
+        return _outer_space(raw, f"[{text}]({url})")
+
+    def _image(self, node) -> str:
+        src = (node.get("src") or "").strip()
+        if self.links_handling == "discarded" or not src or src.startswith("data:"):
+            return ""
+        alt = re.sub(r"\s+", " ", node.get("alt") or "").strip()
+        return f"![{alt}]({urljoin(self.base_url, src)})"
+
+    def _list(self, node, ordered: bool) -> str:
+        items = []
+        number = int(node.get("start", 1)) if ordered and str(node.get("start", "")).isdigit() else 1
+        for item in node.find_all("li", recursive=False):
+            body = re.sub(r"\n{2,}", "\n", self._children(item).strip())
+            if not body:
+                continue
+            marker = f"{number}. " if ordered else "- "
+            indent = _INDENT * len(marker)
+            lines = [line.strip(" \t") for line in body.split("\n")]
+            items.append(marker + lines[0] + "".join(f"\n{indent}{line}" for line in lines[1:] if line))
+            number += 1
+        return "\n\n" + "\n".join(items) + "\n\n" if items else ""
+
+    def _table(self, node) -> str:
+        rows = []
+        for row in node.find_all("tr"):
+            cells = [re.sub(r"\s+", " ", self._children(cell)).strip().replace("|", "\\|")
+                     for cell in row.find_all(["th", "td"], recursive=False)]
+            if any(cells):
+                rows.append(cells)
+        if not rows:
+            return ""
+        width = max(len(cells) for cells in rows)
+        lines = []
+        for index, cells in enumerate(rows):
+            cells = cells + [""] * (width - len(cells))
+            lines.append("| " + " | ".join(cells) + " |")
+            if index == 0:
+                lines.append("|" + " --- |" * width)
+        return "\n\n" + "\n".join(lines) + "\n\n"
+
+    def links_footer(self, links_summary) -> str:
+        """Reference definitions (referenced style) or the links summary, if requested."""
+        if self.links_handling == "referenced" and self._link_numbers:
+            return "\n\n" + "\n".join(f"[{number}]: {url}" for url, number in self._link_numbers.items())
+        if links_summary and links_summary != "none" and self.links:
+            unique = list(dict.fromkeys(self.links))
+            return "\n\nLinks/Buttons:\n" + "\n".join(f"- [{text}]({url})" for text, url in unique)
+        return ""
+
+
+def select_content(soup: BeautifulSoup, target_selector: Optional[str] = None,
+                   remove_selector: Optional[str] = None) -> list:
+    """
+    Apply remove_selector to soup, then return the outermost elements
+    matching target_selector (or the body when nothing matches).
+    """
+    if remove_selector:
+        for element in soup.select(remove_selector):
+            element.decompose()
+    if target_selector:
+        matches = soup.select(target_selector)
+        matched = {id(element) for element in matches}
+        outermost = [element for element in matches
+                     if not any(id(parent) in matched for parent in element.parents)]
+        if outermost:
+            return outermost
+    return [soup.body or soup]
+
+
+def html_to_markdown(html: Union[str, bytes], base_url: str = "", target_selector: Optional[str] = None,
+                     remove_selector: Optional[str] = None, links_handling: Optional[str] = None,
+                     links_summary=None, parser: Optional[str] = None,
+                     encoding: Optional[str] = None) -> str:
+    """
+    Convert an HTML document to Markdown, in the style of the Jina Reader.
+
+    Args:
+        html: The HTML document, as text or bytes
+        base_url: URL of the document, used to resolve relative links
+        target_selector: CSS selector(s) of the content to keep
+        remove_selector: CSS selector(s) of elements to remove
+        links_handling: "default", "discarded" or "referenced"
+        links_summary: Whether to append a list of every link
+        parser: HTML parser backend (see html_parsing.resolve_backend)
+        encoding: Encoding of bytes input
+
+    Returns:
+        The Markdown text
+    """
+    links_handling = links_handling or "default"
+    if links_handling not in LINK_STYLES:
+        raise ValueError(f"Unsupported links_handling: {links_handling}. "
+                         f"Supported values are: {', '.join(LINK_STYLES)}")
+    soup, partial = parse_html(html, parser, target_selector, encoding, remove_selector)
+    roots = select_content(soup, target_selector, remove_selector)
+    if partial and roots[0] is soup:
+        # Everything matching was removed; fall back to the page body like a full parse
+        soup, _ = parse_html(html, parser, encoding=encoding)
+        roots = select_content(soup, None, remove_selector)
+    renderer = _MarkdownRenderer(base_url, links_handling)
+    return renderer.render(roots) + renderer.links_footer(links_summary)
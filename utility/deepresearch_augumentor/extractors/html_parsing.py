@@ -0,0 +1,225 @@
+"""
+HTML parser backends for local extraction.
+
+BeautifulSoup can build its tree with several parsers. The C-accelerated
+lxml parser is used when it is installed (pip install lxml) and Python's
+built-in html.parser otherwise; either can be forced by name.
+
+When an extraction mode only wants part of a page (a target_selector made
+of simple tag, .class and #id selectors, such as "article,main,.content"),
+only the matching subtrees are built, which skips most of the work on large
+pages with heavy navigation and sidebars. The mode's remove selector must be
+simple too: while parsing, the elements it matches are tracked (not built)
+so that targets nested inside them are dropped, as a full parse would.
+
+Pages may be given as bytes with their resolved encoding: lxml then
+decodes them itself, without a full-size str copy in Python.
+"""
+import re
+from typing import Callable, List, Optional, Tuple, Union
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml  # noqa: F401
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+# Backends in order of preference for "auto"
+PARSER_BACKENDS = ("lxml", "html.parser")
+
+AUTO = "auto"
+
+# Python codecs that strip a byte order mark; lxml does not know their names
+_BOM_CODECS = ("utf-8-sig", "utf-16", "utf-32")
+
+# tag, .class, #id, tag.class or tag#id - the selectors a strainer can match
+_SIMPLE_SELECTOR = re.compile(r"^([a-zA-Z][a-zA-Z0-9-]*)?(?:([.#])([A-Za-z_][\w-]*))?$")
+
+
+def available_backends() -> List[str]:
+    """Names of the parser backends usable in this environment, fastest first."""
+    return [name for name in PARSER_BACKENDS if name != "lxml" or LXML_AVAILABLE]
+
+
+def resolve_backend(name: Optional[str] = None) -> str:
+    """
+    Pick the parser backend to use.
+
+    Args:
+        name: "lxml", "html.parser", or None / "auto" for the fastest installed one
+
+    Returns:
+        The backend name to pass to BeautifulSoup
+
+    Raises:
+        ValueError: If the backend is unknown or not installed
+    """
+    if name in (None, AUTO):
+        return available_backends()[0]
+    if name not in PARSER_BACKENDS:
+        raise ValueError(f"Unsupported HTML parser: {name}. "
+                         f"Supported values are: {AUTO}, {', '.join(PARSER_BACKENDS)}")
+    if name not in available_backends():
+        raise ValueError(f"HTML parser '{name}' is not installed (pip install {name})")
+    return name
+
+
+def _selector_matcher(part: str) -> Optional[Callable]:
+    """Matcher for one simple selector, or None if the selector is not simple."""
+    match = _SIMPLE_SELECTOR.match(part)
+    if match is None or not any(match.groups()):
+        return None
+    tag, kind, value = match.groups()
+    tag = tag.lower() if tag else None
+
+    def matches(name, attrs) -> bool:
+        if tag is not None and name != tag:
+            return False
+        if kind == "#":
+            return attrs.get("id") == value
+        if kind == ".":
+            classes = attrs.get("class") or ""
+            if isinstance(classes, str):
+                classes = classes.split()
+            return value in classes
+        return True
+
+    return matches
+
+
+def element_matcher(selector: Optional[str]) -> Optional[Callable]:
+    """
+    Build a function of (tag name, attributes) that tells whether a tag matches selector.
+
+    Args:
+        selector: Comma-separated CSS selectors
+
+    Returns:
+        The matcher, or None when a selector is too complex to match on a
+        single tag (descendant combinators, attribute or pseudo selectors)
+    """
+    if not selector:
+        return None
+    matchers = [_selector_matcher(part.strip()) for part in selector.split(",") if part.strip()]
+    if not matchers or any(matcher is None for matcher in matchers):
+        return None
+    return lambda name, attrs: any(matcher(name, attrs or {}) for matcher in matchers)
+
+
+def content_strainer(target_selector: Optional[str]) -> Optional[SoupStrainer]:
+    """
+    Build a SoupStrainer that keeps only the subtrees target_selector selects.
+
+    Args:
+        target_selector: Comma-separated CSS selectors
+
+    Returns:
+        A SoupStrainer, or None when a selector is too complex for partial
+        parsing (descendant combinators, attribute or pseudo selectors) and
+        the whole tree has to be built
+    """
+    matcher = element_matcher(target_selector)
+    return SoupStrainer(matcher) if matcher is not None else None
+
+
+class _PartialSoup(BeautifulSoup):
+    """
+    BeautifulSoup that builds only the subtrees its strainer keeps and also
+    drops those nested in an element the removed matcher selects.
+
+    The elements outside the kept subtrees are not built, but their open
+    tags are tracked the way the tree builder would nest them, so a target
+    inside e.g. <aside class="sidebar"> is recognised and skipped.
+    """
+
+    def __init__(self, *args, removed: Callable, **kwargs):
+        self._removed = removed
+        super().__init__(*args, **kwargs)
+
+    def reset(self):
+        super().reset()
+        # (tag name, inside a removed element) for the open tags not built
+        self._skipped_open = []
+
+    def handle_starttag(self, name, namespace, nsprefix, attrs, *args, **kwargs):
+        if len(self.tagStack) > 1:
+            return super().handle_starttag(name, namespace, nsprefix, attrs, *args, **kwargs)
+        inside_removed = bool(self._skipped_open) and self._skipped_open[-1][1]
+        tag = None
+        if not inside_removed:
+            tag = super().handle_starttag(name, namespace, nsprefix, attrs, *args, **kwargs)
+        if tag is None and not self.builder.can_be_empty_element(name):
+            self._skipped_open.append((name, inside_removed or self._removed(name, attrs)))
+        return tag
+
+    def handle_endtag(self, name, nsprefix=None):
+        if len(self.tagStack) > 1:
+            return super().handle_endtag(name, nsprefix)
+        # Close the most recent open tag of that name, like _popToTag
+        for index in range(len(self._skipped_open) - 1, -1, -1):
+            if self._skipped_open[index][0] == name:
+                del self._skipped_open[index:]
+                break
+        return super().handle_endtag(name, nsprefix)
+
+
+def make_soup(markup: Union[str, bytes], backend: str, encoding: Optional[str] = None,
+              parse_only: Optional[SoupStrainer] = None,
+              removed: Optional[Callable] = None) -> BeautifulSoup:
+    """
+    Parse markup with a resolved backend.
+
+    Args:
+        markup: The document, as text or as bytes in the given encoding
+        backend: A name returned by resolve_backend
+        encoding: Encoding of bytes markup (see charset.resolve_encoding)
+        parse_only: Optional SoupStrainer limiting the tree that is built
+        removed: With parse_only, matcher (see element_matcher) of elements
+                 whose kept subtrees are dropped as well
+    """
+    soup_class, options = BeautifulSoup, {}
+    if parse_only is not None and removed is not None:
+        soup_class, options = _PartialSoup, {"removed": removed}
+    if isinstance(markup, bytes):
+        if backend == "lxml" and encoding and encoding not in _BOM_CODECS:
+            return soup_class(markup, backend, from_encoding=encoding, parse_only=parse_only, **options)
+        # html.parser works on str; decode once, replacing bad bytes, so
+        # BeautifulSoup does not guess at the encoding over the whole page
+        markup = markup.decode(encoding or "utf-8", errors="replace")
+    return soup_class(markup, backend, parse_only=parse_only, **options)
+
+
+def parse_html(html: Union[str, bytes], parser: Optional[str] = None,
+               target_selector: Optional[str] = None,
+               encoding: Optional[str] = None,
+               remove_selector: Optional[str] = None) -> Tuple[BeautifulSoup, bool]:
+    """
+    Parse an HTML document, building only the target subtrees when possible.
+
+    Args:
+        html: The HTML document, as text or bytes
+        parser: Backend name, or None / "auto" for the fastest installed one
+        target_selector: CSS selector(s) of the content that will be used
+        encoding: Encoding of bytes input
+        remove_selector: CSS selector(s) of elements that will be removed;
+                         targets inside them are left out of a partial parse
+
+    Returns:
+        Tuple of (soup, partial). partial is True when the soup holds only
+        the subtrees matching target_selector; it is False (and the whole
+        document was parsed) when partial parsing was not possible or
+        nothing matched
+    """
+    backend = resolve_backend(parser)
+    strainer = content_strainer(target_selector)
+    removed = element_matcher(remove_selector)
+    if remove_selector and removed is None:
+        # Which targets sit inside removed elements is only known from the full tree
+        strainer = None
+    if strainer is not None:
+        soup = make_soup(html, backend, encoding, strainer, removed)
+        if soup.find(True) is not None:
+            return soup, True
+    return make_soup(html, backend, encoding), False
@@ -0,0 +1,34 @@
+"""
+Pooled HTTP sessions shared by the extractors.
+
+Each extractor keeps one requests.Session for its whole lifetime so that
+repeated calls to the same API host reuse keep-alive TCP+TLS connections
+instead of opening a new one per reference.
+"""
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+
+DEFAULT_POOL_SIZE = 10
+
+
+def create_session(pool_size: int = DEFAULT_POOL_SIZE) -> requests.Session:
+    """
+    Create a requests.Session with a connection pool sized for pool_size workers.
+    
+    The session advertises every compression scheme urllib3 can decode
+    (gzip, deflate and, when installed, brotli/zstd).
+    
+    Args:
+        pool_size: Maximum number of connections kept open per host
+    
+    Returns:
+        A configured requests.Session
+    """
+    pool_size = max(1, pool_size)
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update(make_headers(accept_encoding=True))
+    return session
@@ -1,13 +1,20 @@
 import os
+import asyncio
 import requests
 from typing import Tuple, Optional, Dict, Any
 import json
+from . import aio
+from .errors import ExtractionError, http_error, TIMEOUT, CONNECTION
 from .base import ContentExtractorInterface
 
+JINA_READER_URL = "https://r.jina.ai/"
+
 
 class JinaAIExtractor(ContentExtractorInterface):
     """Content extractor using Jina AI Reader API."""
     
+    provider_host = "r.jina.ai"
+    
     def extract_text(self, url: str, api_key: Optional[str] = None, **kwargs) -> Tuple[Optional[str], Optional[str]]:
         """
         Extract text content from a URL using Jina AI Reader API.
@@ -33,11 +40,99 @@ class JinaAIExtractor(ContentExtractorInterface):
             Tuple of (extracted_text, error_message)
         """
         # Get your Jina AI API key for free: https://jina.ai/?sui=apikey
+        api_key, key_error = self._choose_api_key(api_key)
+        if key_error is not None:
+            return None, key_error
         api_key = api_key or os.environ.get("JINA_API_KEY")
         
         if not api_key:
             return None, "Jina AI API key not provided. Set JINA_API_KEY environment variable."
         
+        timeout = kwargs.get('timeout', 10)
+        headers = self._build_headers(api_key, **kwargs)
+        
+        # Log the request details if debugging is enabled
+        if kwargs.get('debug'):
+            print(f"Request headers: {headers}")
+        
+        try:
+            self._wait_for_rate_limit()
+            response = self.session.post(
+                JINA_READER_URL,
+                headers=headers,
+                json={"url": url},
+                timeout=timeout  # Use the timeout for the request itself
+            )
+            
+            try:
+                json_response = response.json()
+            except:
+                json_response = None
+            result = self._parse_response(response.status_code, json_response, response.text, getattr(response, "headers", None))
+            self._report_api_key(api_key, response.status_code, result[1])
+            return result
+        
+        except requests.exceptions.Timeout:
+            return None, ExtractionError(f"Request timed out after {timeout} seconds", kind=TIMEOUT)
+        except requests.exceptions.ConnectionError:
+            return None, ExtractionError("Connection error. Please check your internet connection.", kind=CONNECTION)
+        except Exception as e:
+            return None, f"Exception while calling Jina AI Reader API: {str(e)}"
+    
+    async def extract_text_async(self, url: str, api_key: Optional[str] = None, **kwargs) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Extract text content from a URL using Jina AI Reader API without blocking the event loop.
+        
+        Accepts the same parameters as extract_text, plus an optional
+        'session' (aiohttp.ClientSession) to reuse across calls.
+        
+        Returns:
+            Tuple of (extracted_text, error_message)
+        """
+        if not aio.aiohttp_available():
+            return await super().extract_text_async(url, api_key, **kwargs)
+        
+        api_key, key_error = self._choose_api_key(api_key)
+        if key_error is not None:
+            return None, key_error
+        api_key = api_key or os.environ.get("JINA_API_KEY")
+        
+        if not api_key:
+            return None, "Jina AI API key not provided. Set JINA_API_KEY environment variable."
+        
+        timeout = kwargs.get('timeout', 10)
+        headers = self._build_headers(api_key, **kwargs)
+        
+        if kwargs.get('debug'):
+            print(f"Request headers: {headers}")
+        
+        try:
+            await self._wait_for_rate_limit_async()
+            async with aio.client_session(kwargs.get('session')) as session:
+                async with session.post(
+                    JINA_READER_URL,
+                    headers=headers,
+                    json={"url": url},
+                    timeout=aio.client_timeout(timeout)
+                ) as response:
+                    text = await response.text()
+                    try:
+                        json_response = json.loads(text)
+                    except ValueError:
+                        json_response = None
+                    result = self._parse_response(response.status, json_response, text, getattr(response, "headers", None))
+                    self._report_api_key(api_key, response.status, result[1])
+                    return result
+        
+        except asyncio.TimeoutError:
+            return None, ExtractionError(f"Request timed out after {timeout} seconds", kind=TIMEOUT)
+        except aio.aiohttp.ClientConnectionError:
+            return None, ExtractionError("Connection error. Please check your internet connection.", kind=CONNECTION)
+        except Exception as e:
+            return None, f"Exception while calling Jina AI Reader API: {str(e)}"
+    
+    def _build_headers(self, api_key: str, **kwargs) -> Dict[str, str]:
+        """Translate extractor kwargs into Jina Reader request headers."""
         # Extract parameters from kwargs with defaults
         timeout = kwargs.get('timeout', 10)
         target_selector = kwargs.get('target_selector', None)
@@ -100,36 +195,20 @@ class JinaAIExtractor(ContentExtractorInterface):
             else:
                 headers["X-With-Links-Summary"] = "true"
         
-        # Log the request details if debugging is enabled
-        if kwargs.get('debug'):
-            print(f"Request headers: {headers}")
-        
-        try:
-            response = requests.post(
-                "https://r.jina.ai/",
-                headers=headers,
-                json={"url": url},
-                timeout=timeout  # Use the timeout for the request itself
-            )
-            
-            if response.status_code == 200:
-                json_response = response.json()
-                if "data" in json_response and "content" in json_response["data"]:
-                    return json_response["data"]["content"], None
-                else:
-                    return None, f"Response format error: {json_response}"
+        return headers
+    
+    def _parse_response(self, status_code: int, json_response: Optional[Any], text: str,
+                        headers=None) -> Tuple[Optional[str], Optional[str]]:
+        """Turn a Jina Reader HTTP response into (extracted_text, error_message)."""
+        if status_code == 200:
+            if json_response and "data" in json_response and "content" in json_response["data"]:
+                return json_response["data"]["content"], None
             else:
-                error_message = f"API error: {response.status_code}"
-                try:
-                    error_details = response.json()
-                    error_message += f" - {json.dumps(error_details)}"
-                except:
-                    error_message += f" - {response.text}"
-                return None, error_message
-        
-        except requests.exceptions.Timeout:
-            return None, f"Request timed out after {timeout} seconds"
-        except requests.exceptions.ConnectionError:
-            return None, "Connection error. Please check your internet connection."
-        except Exception as e:
-            return None, f"Exception while calling Jina AI Reader API: {str(e)}" 
\ No newline at end of file
+                return None, f"Response format error: {json_response if json_response is not None else text}"
+        else:
+            error_message = f"API error: {status_code}"
+            try:
+                error_message += f" - {json.dumps(json_response)}" if json_response is not None else f" - {text}"
+            except (TypeError, ValueError):
+                error_message += f" - {text}"
+            return None, http_error(error_message, status_code, headers)
@@ -1,7 +1,14 @@
+import asyncio
+import contextlib
 import requests
-from bs4 import BeautifulSoup
 from typing import Tuple, Optional, Dict, Any
+from . import aio
+from .errors import ExtractionError, TIMEOUT, CONNECTION
 from .base import ContentExtractorInterface
+from .download import DEFAULT_MAX_BYTES, fetch, fetch_async
+from .parse_pool import render_download
+
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
 
 
 class BeautifulSoupExtractor(ContentExtractorInterface):
@@ -17,38 +24,109 @@ class BeautifulSoupExtractor(ContentExtractorInterface):
             **kwargs: Additional parameters
                 - timeout: Request timeout in seconds
                 - user_agent: Custom User-Agent string
+                - target_selector: CSS selector(s) of the content to keep
+                - remove_selector: CSS selector(s) of elements to remove
+                - links_handling: "default", "discarded" or "referenced"
+                - links_summary: Whether to append a list of the page's links
+                - html_parser: "lxml", "html.parser" or "auto" (default: lxml if installed)
+                - max_bytes: Largest response body to download (default: 10 MB)
+                - max_pdf_pages: Pages extracted from a PDF (default: 50)
+        
+        The response is streamed and handled by media type (Content-Type,
+        or the first bytes when the type is missing): HTML is parsed, plain
+        text and Markdown pass through, PDFs are extracted page by page
+        (with pypdf installed). Other content and bodies over max_bytes are
+        abandoned early and reported as skipped.
+        
+        Without any of the selector / link options the page is returned as
+        plain text; with them (i.e. in an extraction mode) it is returned as
+        Markdown, like the Jina Reader's output.
+        
+        When a HostScheduler is attached (use_politeness), robots.txt is
+        honoured and the request waits for a free per-host slot. When a
+        ParsePool is attached (use_parse_pool), the page is converted in a
+        worker process.
         
         Returns:
             Tuple of (extracted_text, error_message)
         """
         timeout = kwargs.get('timeout', 10)
-        user_agent = kwargs.get('user_agent', 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')
+        user_agent = kwargs.get('user_agent', DEFAULT_USER_AGENT)
         
         headers = {
             "User-Agent": user_agent
         }
         
+        slot = contextlib.nullcontext()
+        if self.politeness is not None:
+            refusal = self.politeness.check(url)
+            if refusal is not None:
+                return None, refusal
+            slot = self.politeness.slot(url)
+        
+        try:
+            with slot:
+                download, error = fetch(self.session, url, headers, timeout,
+                                        kwargs.get('max_bytes', DEFAULT_MAX_BYTES))
+            if error is not None:
+                return None, error
+            
+            if self.parse_pool is not None:
+                return self.parse_pool.convert(download.body, download.charset, url, kwargs,
+                                               download.media_type), None
+            return render_download(download.body, download.charset, url, kwargs, download.media_type), None
+        
+        except requests.exceptions.Timeout as e:
+            return None, ExtractionError(f"Exception while extracting content: {str(e)}", kind=TIMEOUT)
+        except requests.exceptions.ConnectionError as e:
+            return None, ExtractionError(f"Exception while extracting content: {str(e)}", kind=CONNECTION)
+        except Exception as e:
+            return None, f"Exception while extracting content: {str(e)}"
+    
+    async def extract_text_async(self, url: str, api_key: Optional[str] = None, **kwargs) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Download a URL without blocking the event loop and extract its text.
+        
+        Accepts the same parameters as extract_text, plus an optional
+        'session' (aiohttp.ClientSession) to reuse across calls. Parsing is
+        CPU-bound and runs in a worker thread, or in the ParsePool if attached.
+        
+        Returns:
+            Tuple of (extracted_text, error_message)
+        """
+        if not aio.aiohttp_available():
+            return await super().extract_text_async(url, api_key, **kwargs)
+        
+        timeout = kwargs.get('timeout', 10)
+        headers = {
+            "User-Agent": kwargs.get('user_agent', DEFAULT_USER_AGENT)
+        }
+        
+        slot = contextlib.nullcontext()
+        if self.politeness is not None:
+            refusal = await self.politeness.check_async(url)
+            if refusal is not None:
+                return None, refusal
+            slot = self.politeness.slot_async(url)
+        
         try:
-            response = requests.get(url, headers=headers, timeout=timeout)
+            async with slot, aio.client_session(kwargs.get('session')) as session:
+                download, error = await fetch_async(session, url, headers, aio.client_timeout(timeout),
+                                                    kwargs.get('max_bytes', DEFAULT_MAX_BYTES))
+            if error is not None:
+                return None, error
             
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                # Remove script and style elements
-                for script in soup(["script", "style"]):
-                    script.extract()
-                
-                # Extract text content
-                text = soup.get_text(separator='\n')
-                
-                # Clean up whitespace
-                lines = (line.strip() for line in text.splitlines())
-                chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-                text = '\n'.join(chunk for chunk in chunks if chunk)
-                
-                return text, None
-            else:
-                return None, f"HTTP error: {response.status_code}"
+            if self.parse_pool is not None:
+                return await self.parse_pool.convert_async(download.body, download.charset, url, kwargs,
+                                                           download.media_type), None
+            return await asyncio.to_thread(render_download, download.body, download.charset, url, kwargs,
+                                           download.media_type), None
         
+        except asyncio.TimeoutError:
+            return None, ExtractionError(
+                f"Exception while extracting content: Request timed out after {timeout} seconds", kind=TIMEOUT
+            )
+        except aio.aiohttp.ClientConnectionError as e:
+            return None, ExtractionError(f"Exception while extracting content: {str(e)}", kind=CONNECTION)
         except Exception as e:
-            return None, f"Exception while extracting content: {str(e)}" 
\ No newline at end of file
+            return None, f"Exception while extracting content: {str(e)}"
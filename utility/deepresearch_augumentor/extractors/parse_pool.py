@@ -0,0 +1,179 @@
+"""
+Page conversion for local extraction, optionally in a process pool.
+
+Turning HTML into text or Markdown is CPU-bound and holds the GIL, so with
+many concurrent downloads the I/O threads end up taking turns on one core.
+A ParsePool moves that stage into worker processes: download threads hand
+over the raw response bytes (the encoding is resolved in the worker, see
+charset.py), and a bounded
+number of pages may wait for a worker, so downloads slow down instead of
+piling up in memory when parsing falls behind.
+
+Workers are spawned rather than forked: by the time pages arrive the run
+has download threads holding locks (connection pools, the cache, logging),
+and a forked child can inherit one of them locked and hang. Runs call
+start() before any download thread exists, so the pool is not created
+from one of them either.
+"""
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional, Union
+
+from .charset import resolve_encoding
+from .content_types import PDF, TEXT, DEFAULT_MAX_PDF_PAGES, content_kind, normalize_text, pdf_to_text
+from .html_markdown import html_to_markdown
+from .html_parsing import make_soup, resolve_backend
+
+# Extraction mode options that switch the output to Markdown
+MARKDOWN_OPTIONS = ('target_selector', 'remove_selector', 'links_handling', 'links_summary')
+
+# Options that affect conversion; only these are sent to a worker process
+CONVERT_OPTIONS = MARKDOWN_OPTIONS + ('html_parser', 'max_pdf_pages')
+
+
+def html_to_text(html: Union[str, bytes], parser: Optional[str] = None, encoding: Optional[str] = None) -> str:
+    """Convert an HTML document (text, or bytes in encoding) to whitespace-normalised plain text."""
+    soup = make_soup(html, resolve_backend(parser), encoding)
+
+    # Remove script and style elements
+    for script in soup(["script", "style"]):
+        script.extract()
+
+    # Extract text content
+    text = soup.get_text(separator='\n')
+
+    # Clean up whitespace
+    lines = (line.strip() for line in text.splitlines())
+    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+    return '\n'.join(chunk for chunk in chunks if chunk)
+
+
+def render_page(html: Union[str, bytes], url: str, options: Dict[str, Any],
+                encoding: Optional[str] = None) -> str:
+    """
+    Render a page as Markdown when an extraction mode asks for it, else as plain text.
+
+    Args:
+        html: The HTML document, as text or bytes
+        url: URL of the page, used to resolve relative links
+        options: Extraction options (see CONVERT_OPTIONS); others are ignored
+        encoding: Encoding of bytes input
+    """
+    markdown_options = {key: options.get(key) for key in MARKDOWN_OPTIONS}
+    parser = options.get('html_parser')
+    if not any(value is not None for value in markdown_options.values()):
+        return html_to_text(html, parser, encoding)
+    return html_to_markdown(html, url, parser=parser, encoding=encoding, **markdown_options)
+
+
+def render_download(raw: bytes, declared_charset: Optional[str], url: str, options: Dict[str, Any],
+                    media_type: str = "text/html") -> str:
+    """
+    Extract the text of a downloaded page according to its media type.
+
+    This is also the worker entry point of a ParsePool.
+
+    Args:
+        raw: The response body
+        declared_charset: Charset from the Content-Type header, if any
+        url: URL of the page
+        options: Extraction options
+        media_type: Media type of the body (see content_types.content_kind)
+    """
+    kind = content_kind(media_type)
+    if kind == PDF:
+        return pdf_to_text(raw, options.get('max_pdf_pages', DEFAULT_MAX_PDF_PAGES))
+    encoding, _ = resolve_encoding(raw, declared_charset)
+    if kind == TEXT:
+        return normalize_text(raw.decode(encoding, errors='replace'))
+    return render_page(raw, url, options, encoding)
+
+
+class ParsePool:
+    """Converts downloaded pages in worker processes."""
+
+    def __init__(self, workers: Optional[int] = None, max_pending: Optional[int] = None):
+        """
+        Args:
+            workers: Worker processes (default: the CPU count); 0 converts
+                     pages in the calling thread
+            max_pending: Pages allowed to wait for or be in a worker before
+                         download threads block (default: twice the workers)
+        """
+        self.workers = os.cpu_count() or 1 if workers is None else max(0, workers)
+        self.max_pending = max_pending or max(1, 2 * self.workers)
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._executor = None
+        self._lock = threading.Lock()
+        self._broken = False
+
+    @classmethod
+    def for_concurrency(cls, concurrency: int) -> Optional["ParsePool"]:
+        """
+        Default pool for a run with the given download concurrency.
+
+        Returns:
+            A pool with no more workers than downloads, or None when there is
+            no second core or download to overlap with
+        """
+        workers = min(os.cpu_count() or 1, concurrency)
+        return cls(workers) if workers > 1 else None
+
+    def start(self) -> None:
+        """Create the worker pool now rather than on the first page."""
+        self._get_executor()
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        with self._lock:
+            if self._executor is None and not self._broken and self.workers:
+                try:
+                    self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                         mp_context=multiprocessing.get_context("spawn"))
+                except (OSError, NotImplementedError, ImportError, ValueError):
+                    # No multiprocessing support here (e.g. no /dev/shm)
+                    self._broken = True
+            return self._executor
+
+    def convert(self, raw: bytes, encoding: Optional[str], url: str, options: Dict[str, Any],
+                media_type: str = "text/html") -> str:
+        """
+        Render a downloaded page in a worker process, blocking until it is done.
+
+        Falls back to converting in the calling thread if worker processes
+        cannot be used.
+
+        Args:
+            raw: The response body
+            encoding: Charset declared in the Content-Type header, if any
+            url: URL of the page
+            options: Extraction options; only CONVERT_OPTIONS are sent to the worker
+            media_type: Media type of the body
+        """
+        options = {key: options[key] for key in CONVERT_OPTIONS if options.get(key) is not None}
+        with self._slots:
+            executor = self._get_executor()
+            if executor is not None:
+                try:
+                    return executor.submit(render_download, raw, encoding, url, options, media_type).result()
+                except BrokenProcessPool:
+                    # A worker died (e.g. killed for memory); convert in-thread from now on
+                    with self._lock:
+                        self._broken = True
+                        self._executor = None
+        return render_download(raw, encoding, url, options, media_type)
+
+    async def convert_async(self, raw: bytes, encoding: Optional[str], url: str,
+                            options: Dict[str, Any], media_type: str = "text/html") -> str:
+        """convert() without blocking the event loop."""
+        return await asyncio.to_thread(self.convert, raw, encoding, url, options, media_type)
+
+    def close(self) -> None:
+        """Shut the worker processes down."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
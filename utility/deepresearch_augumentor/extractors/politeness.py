@@ -0,0 +1,215 @@
+"""
+Per-host politeness for extractors that fetch reference pages directly.
+
+HostScheduler caps the number of concurrent requests per host, spaces
+request starts to the same host by a minimum interval (or the host's
+robots.txt Crawl-delay when that is longer), and fetches each host's
+robots.txt once to honour its Disallow rules. Extractors that call a
+third-party API (Jina, Firecrawl) do not use it.
+"""
+import asyncio
+import threading
+import time
+from contextlib import contextmanager, asynccontextmanager
+from typing import Dict, List, Optional
+from urllib import robotparser
+from urllib.parse import urlparse
+
+from .errors import ExtractionError, PERMANENT
+from .http import create_session
+
+# Product token matched against robots.txt User-agent lines
+ROBOTS_USER_AGENT = "ReferenceAugmentor"
+
+
+class _HostState:
+    """Concurrency slots, spacing reservation and robots.txt rules of one host."""
+
+    def __init__(self, max_concurrent: int):
+        self.semaphore = threading.BoundedSemaphore(max_concurrent)
+        self.max_concurrent = max_concurrent
+        self.async_semaphore = None
+        self.next_start = 0.0
+        self.robots = None
+        self.robots_loaded = False
+        self.lock = threading.Lock()
+        self.robots_lock = threading.Lock()
+
+
+class HostScheduler:
+    """Per-host concurrency cap, request spacing and robots.txt rules."""
+
+    def __init__(self, max_per_host: int = 2, min_interval: float = 0.5, respect_robots: bool = True,
+                 robots_timeout: float = 5.0, max_crawl_delay: float = 30.0):
+        """
+        Args:
+            max_per_host: Maximum concurrent requests to one host
+            min_interval: Minimum seconds between request starts to one host
+            respect_robots: Whether to fetch robots.txt and obey Disallow / Crawl-delay
+            robots_timeout: Timeout for fetching robots.txt, in seconds
+            max_crawl_delay: Upper bound applied to a host's Crawl-delay, in seconds
+        """
+        self.max_per_host = max(1, max_per_host)
+        self.min_interval = max(0.0, min_interval)
+        self.respect_robots = respect_robots
+        self.robots_timeout = robots_timeout
+        self.max_crawl_delay = max_crawl_delay
+        self.disallowed = 0
+        self._hosts: Dict[str, _HostState] = {}
+        self._lock = threading.Lock()
+        self._session = None
+
+    @staticmethod
+    def host_key(url: str) -> str:
+        parsed = urlparse(url)
+        return f"{parsed.scheme.lower()}://{parsed.netloc.lower()}"
+
+    def _state(self, url: str) -> _HostState:
+        key = self.host_key(url)
+        with self._lock:
+            state = self._hosts.get(key)
+            if state is None:
+                state = _HostState(self.max_per_host)
+                self._hosts[key] = state
+            return state
+
+    def _load_robots(self, url: str, state: _HostState) -> None:
+        """Fetch and parse the host's robots.txt the first time the host is seen."""
+        if not self.respect_robots or state.robots_loaded:
+            return
+        with state.robots_lock:
+            if state.robots_loaded:
+                return
+            parser = robotparser.RobotFileParser()
+            try:
+                if self._session is None:
+                    self._session = create_session(1)
+                response = self._session.get(f"{self.host_key(url)}/robots.txt", timeout=self.robots_timeout)
+                if response.status_code == 200 and isinstance(response.text, str):
+                    parser.parse(response.text.splitlines())
+                    state.robots = parser
+                elif response.status_code in (401, 403):
+                    parser.disallow_all = True
+                    state.robots = parser
+            except Exception:
+                # An unreachable robots.txt does not block the fetch itself
+                state.robots = None
+            state.robots_loaded = True
+
+    def check(self, url: str) -> Optional[ExtractionError]:
+        """Return an error if robots.txt disallows url, else None."""
+        state = self._state(url)
+        self._load_robots(url, state)
+        if state.robots is not None and not state.robots.can_fetch(ROBOTS_USER_AGENT, url):
+            with self._lock:
+                self.disallowed += 1
+            return ExtractionError("Disallowed by robots.txt", kind=PERMANENT)
+        return None
+
+    async def check_async(self, url: str) -> Optional[ExtractionError]:
+        """Coroutine version of check; robots.txt is fetched in a worker thread."""
+        state = self._state(url)
+        if self.respect_robots and not state.robots_loaded:
+            await asyncio.to_thread(self._load_robots, url, state)
+        return self.check(url)
+
+    def _interval(self, state: _HostState) -> float:
+        interval = self.min_interval
+        if state.robots is not None:
+            crawl_delay = state.robots.crawl_delay(ROBOTS_USER_AGENT)
+            if crawl_delay:
+                interval = max(interval, min(float(crawl_delay), self.max_crawl_delay))
+        return interval
+
+    def _reserve(self, state: _HostState) -> float:
+        """Reserve the host's next start time; returns how long to wait for it."""
+        with state.lock:
+            now = time.monotonic()
+            start = max(now, state.next_start)
+            state.next_start = start + self._interval(state)
+            return start - now
+
+    @contextmanager
+    def slot(self, url: str):
+        """Hold one of the host's concurrency slots, starting no earlier than its spacing allows."""
+        state = self._state(url)
+        state.semaphore.acquire()
+        try:
+            delay = self._reserve(state)
+            if delay > 0:
+                time.sleep(delay)
+            yield
+        finally:
+            state.semaphore.release()
+
+    @asynccontextmanager
+    async def slot_async(self, url: str):
+        """Coroutine version of slot."""
+        state = self._state(url)
+        if state.async_semaphore is None:
+            state.async_semaphore = asyncio.Semaphore(state.max_concurrent)
+        async with state.async_semaphore:
+            delay = self._reserve(state)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            yield
+
+    def close(self) -> None:
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+
+def interleave_by_host(urls: List[str], indexes: List[int]) -> List[int]:
+    """
+    Reorder indexes round-robin across hosts, keeping report order within a host.
+
+    Submitting work in this order keeps workers spread over many hosts, so
+    the per-host cap and spacing of one busy domain do not serialize the run.
+    """
+    by_host: Dict[str, List[int]] = {}
+    for i in indexes:
+        by_host.setdefault(HostScheduler.host_key(urls[i]), []).append(i)
+    queues = list(by_host.values())
+    ordered = []
+    for position in range(max((len(queue) for queue in queues), default=0)):
+        for queue in queues:
+            if position < len(queue):
+                ordered.append(queue[position])
+    return ordered
+
+
+def longest_expected_first(urls: List[str], indexes: List[int], expected: Dict[int, float],
+                           max_per_host: int = 1) -> List[int]:
+    """
+    Reorder indexes so the work expected to take longest starts first.
+
+    A host's URLs run at most max_per_host at a time, so together they take
+    about their summed expected time divided by max_per_host. Each URL is
+    ranked by the work left on its host from it onwards (or its own
+    duration, if longer), the host's slowest URLs first: hosts with the
+    most work start early and their URLs are spread through the order
+    rather than queued back to back, and no long job is left to start
+    last while the other workers sit idle.
+
+    Args:
+        urls: Every URL of the run
+        indexes: Indexes of the URLs to order
+        expected: Expected duration in seconds of each index
+        max_per_host: Concurrent requests allowed per host
+
+    Returns:
+        The indexes in dispatch order; ties keep their original order
+    """
+    by_host: Dict[str, List[int]] = {}
+    for i in indexes:
+        by_host.setdefault(HostScheduler.host_key(urls[i]), []).append(i)
+    rank = {}
+    for queue in by_host.values():
+        queue.sort(key=lambda i: -expected[i])
+        remaining = sum(expected[i] for i in queue)
+        for i in queue:
+            rank[i] = max(expected[i], remaining / max(1, max_per_host))
+            remaining -= expected[i]
+    position = {i: n for n, i in enumerate(indexes)}
+    return sorted(indexes, key=lambda i: (-rank[i], position[i]))
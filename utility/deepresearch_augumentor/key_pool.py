@@ -0,0 +1,150 @@
+"""
+API key pools for the Jina and Firecrawl extractors.
+
+Several keys can be stored per provider. Each request uses the least
+recently used key that is not quarantined, spreading load (and the
+per-key rate limits) across the pool. A key is quarantined after an
+HTTP 401/402 (for the rest of the run) or 429 (until its Retry-After, or
+one minute). Per-key usage counters are kept in key_usage.json in the
+config directory, indexed by a fingerprint rather than the key itself, and
+shown by --show-keys.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+from rate_limiter import FileLock
+
+# provider host -> ConfigManager key name
+PROVIDER_KEY_NAMES = {
+    "r.jina.ai": "JINA_API_KEY",
+    "api.firecrawl.dev": "FIRECRAWL_API_KEY",
+}
+
+# Statuses that quarantine a key, and for how long (None = rest of the run)
+QUARANTINE_STATUSES = {401: None, 402: None, 429: 60.0}
+
+
+def key_fingerprint(key: str) -> str:
+    """Stable identifier of a key that does not reveal it."""
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+
+
+def mask_key(key: str) -> str:
+    """Mask a key for display, keeping its first and last four characters."""
+    return key[:4] + "*" * (len(key) - 8) + key[-4:] if len(key) > 8 else "*" * len(key)
+
+
+class KeyUsage:
+    """Per-key request counters persisted across runs."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._pending: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def count(self, key: str, field: str) -> None:
+        with self._lock:
+            counters = self._pending.setdefault(key_fingerprint(key), {})
+            counters[field] = counters.get(field, 0) + 1
+            counters["last_used"] = time.time()
+
+    def load(self) -> Dict[str, Dict[str, float]]:
+        """Counters saved so far, by key fingerprint."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def for_key(self, key: str) -> Dict[str, float]:
+        return self.load().get(key_fingerprint(key), {})
+
+    def save(self) -> None:
+        """Add this run's counts to the file, under a lock shared with other runs."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path + ".lock", "a+") as lock_handle, FileLock(lock_handle):
+            saved = self.load()
+            for fingerprint, counters in pending.items():
+                entry = saved.setdefault(fingerprint, {})
+                for field, value in counters.items():
+                    entry[field] = value if field == "last_used" else entry.get(field, 0) + value
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(saved, f)
+
+
+class KeyPool:
+    """Rotates requests over a provider's API keys, skipping quarantined ones."""
+
+    def __init__(self, keys: List[str], usage: Optional[KeyUsage] = None,
+                 rate_limit_quarantine: float = QUARANTINE_STATUSES[429]):
+        """
+        Args:
+            keys: API keys of one provider
+            usage: Optional KeyUsage receiving per-key counters
+            rate_limit_quarantine: Quarantine after a 429 without Retry-After, in seconds
+        """
+        self.keys = list(dict.fromkeys(key for key in keys if key))
+        self.usage = usage
+        self.rate_limit_quarantine = rate_limit_quarantine
+        self.quarantines = 0
+        self._last_used = {key: 0.0 for key in self.keys}
+        self._quarantined_until = {key: 0.0 for key in self.keys}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def acquire(self) -> Optional[str]:
+        """Return the least recently used available key, or None if all are quarantined."""
+        with self._lock:
+            now = time.monotonic()
+            available = [key for key in self.keys if self._quarantined_until[key] <= now]
+            if not available:
+                return None
+            key = min(available, key=self._last_used.__getitem__)
+            self._last_used[key] = now
+        if self.usage is not None:
+            self.usage.count(key, "requests")
+        return key
+
+    def available_in(self) -> Optional[float]:
+        """Seconds until a quarantined key is released (None if none ever will be)."""
+        with self._lock:
+            now = time.monotonic()
+            until = min(self._quarantined_until.values(), default=float("inf"))
+        return None if until == float("inf") else max(0.0, until - now)
+
+    def report(self, key: Optional[str], status_code: Optional[int], retry_after: Optional[float] = None) -> None:
+        """Record the HTTP status a key received, quarantining it if needed."""
+        if key not in self._quarantined_until:
+            return
+        if status_code in QUARANTINE_STATUSES:
+            duration = QUARANTINE_STATUSES[status_code]
+            if status_code == 429:
+                duration = retry_after if retry_after is not None else self.rate_limit_quarantine
+            with self._lock:
+                self._quarantined_until[key] = (float("inf") if duration is None
+                                                else time.monotonic() + duration)
+                self.quarantines += 1
+            if self.usage is not None:
+                self.usage.count(key, f"http_{status_code}")
+        elif status_code == 200 and self.usage is not None:
+            self.usage.count(key, "ok")
+
+
+def pools_from_config(config, usage: Optional[KeyUsage] = None) -> Dict[str, KeyPool]:
+    """Build a KeyPool per provider host from the keys stored in ConfigManager."""
+    pools = {}
+    for host, key_name in PROVIDER_KEY_NAMES.items():
+        keys = config.get_api_keys(key_name)
+        if keys:
+            pools[host] = KeyPool(keys, usage)
+    return pools
@@ -0,0 +1,246 @@
+"""
+Per-host request timeouts learned from historical latency.
+
+Every successful or timed-out fetch records how long it took, by host and
+extractor, in a small SQLite database under the ReferenceAugmentor config
+directory. The timeout of the next request to that host is then the 95th
+percentile of its recent latencies times a safety factor, clamped between
+a floor and a ceiling: a fast host that hangs is given up on after a few
+seconds, while a slow but reliable one (large PDFs) gets the time it
+usually needs. Hosts with too little history use the --timeout value.
+
+A timed-out request is recorded with the time it was allowed, which pulls
+the percentile up, so a host whose pages keep timing out is given longer
+on the next attempt rather than being cut off at the same point.
+
+The same history gives the expected duration of each fetch, which runs
+use to start the longest jobs first (see
+extractors.politeness.longest_expected_first).
+"""
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+# Recent samples kept per (host, extractor)
+DEFAULT_MAX_SAMPLES = 200
+
+DEFAULT_PERCENTILE = 95.0
+DEFAULT_FACTOR = 1.5
+DEFAULT_FLOOR = 3.0
+DEFAULT_CEILING = 60.0
+DEFAULT_MIN_SAMPLES = 5
+
+
+def percentile(samples: List[float], percent: float) -> float:
+    """Nearest-rank percentile of a non-empty list of samples."""
+    ordered = sorted(samples)
+    rank = round(percent / 100 * (len(ordered) - 1))
+    return ordered[min(len(ordered) - 1, max(0, rank))]
+
+
+def host_of(url: str) -> str:
+    """Lower-cased host name of url ("" if it has none)."""
+    return (urlparse(url).hostname or "").lower()
+
+
+class LatencyStore:
+    """SQLite-backed record of recent request latencies per host and extractor."""
+
+    def __init__(self, store_dir: str, max_samples: int = DEFAULT_MAX_SAMPLES):
+        """
+        Args:
+            store_dir: Directory holding the latency database
+            max_samples: Recent samples kept per host and extractor
+        """
+        os.makedirs(store_dir, exist_ok=True)
+        self.path = os.path.join(store_dir, "latency.sqlite")
+        self.max_samples = max_samples
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS samples ("
+                " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+                " host TEXT NOT NULL,"
+                " extractor TEXT NOT NULL,"
+                " seconds REAL NOT NULL,"
+                " timed_out INTEGER NOT NULL,"
+                " recorded REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS samples_key ON samples (host, extractor, id)")
+
+    def record(self, host: str, extractor: str, seconds: float, timed_out: bool = False) -> None:
+        """Add a sample and drop the oldest ones beyond max_samples."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO samples (host, extractor, seconds, timed_out, recorded) VALUES (?, ?, ?, ?, ?)",
+                (host, extractor, seconds, int(timed_out), time.time())
+            )
+            self._conn.execute(
+                "DELETE FROM samples WHERE host = ? AND extractor = ? AND id NOT IN"
+                " (SELECT id FROM samples WHERE host = ? AND extractor = ? ORDER BY id DESC LIMIT ?)",
+                (host, extractor, host, extractor, self.max_samples)
+            )
+
+    def samples(self, host: str, extractor: str) -> List[float]:
+        """Recent latencies of host with extractor, oldest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seconds FROM samples WHERE host = ? AND extractor = ? ORDER BY id DESC LIMIT ?",
+                (host, extractor, self.max_samples)
+            ).fetchall()
+        return [seconds for seconds, in reversed(rows)]
+
+    def host_means(self, extractor: str) -> Dict[str, float]:
+        """Mean recent latency of every host with samples for extractor."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT host, AVG(seconds) FROM samples WHERE extractor = ? GROUP BY host", (extractor,)
+            ).fetchall()
+        return dict(rows)
+
+    def clear(self) -> None:
+        """Forget every sample."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM samples")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class AdaptiveTimeouts:
+    """
+    Request timeouts derived from a LatencyStore. Thread-safe.
+
+    Samples of each host are read from the store once per run and kept in
+    memory, so picking a timeout does not touch the database.
+    """
+
+    def __init__(self, store: LatencyStore, default: float, factor: float = DEFAULT_FACTOR,
+                 percent: float = DEFAULT_PERCENTILE, floor: float = DEFAULT_FLOOR,
+                 ceiling: float = DEFAULT_CEILING, min_samples: int = DEFAULT_MIN_SAMPLES):
+        """
+        Args:
+            store: Where latencies are read from and recorded to
+            default: Timeout of hosts with fewer than min_samples samples
+            factor: Multiplier applied to the percentile
+            percent: Percentile of recent latencies the timeout is based on
+            floor: Shortest learned timeout, in seconds
+            ceiling: Longest learned timeout, in seconds
+            min_samples: Samples needed before a host's timeout is learned
+        """
+        self.store = store
+        self.default = default
+        self.factor = factor
+        self.percent = percent
+        self.floor = floor
+        self.ceiling = max(floor, ceiling)
+        self.min_samples = min_samples
+        self._windows: Dict[Tuple[str, str], deque] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config, default: float, ceiling: Optional[float] = None) -> "AdaptiveTimeouts":
+        """
+        Build adaptive timeouts over the latency store in the ConfigManager directory.
+
+        The ADAPTIVE_TIMEOUT_FACTOR, ADAPTIVE_TIMEOUT_FLOOR and
+        ADAPTIVE_TIMEOUT_CEILING settings override the defaults (1.5, 3 and
+        60 seconds).
+
+        Args:
+            config: ConfigManager instance
+            default: Timeout of hosts without enough history (--timeout)
+            ceiling: Lower ceiling to apply, e.g. an explicit --timeout, which
+                     a learned timeout must not exceed
+        """
+        floor = config.get_setting("ADAPTIVE_TIMEOUT_FLOOR", DEFAULT_FLOOR)
+        configured = config.get_setting("ADAPTIVE_TIMEOUT_CEILING", DEFAULT_CEILING)
+        if ceiling is not None:
+            floor, configured = min(floor, ceiling), min(configured, ceiling)
+        return cls(
+            LatencyStore(os.path.join(config.config_dir, "latency")),
+            default,
+            factor=config.get_setting("ADAPTIVE_TIMEOUT_FACTOR", DEFAULT_FACTOR),
+            floor=floor,
+            ceiling=configured
+        )
+
+    def _window(self, key: Tuple[str, str]) -> deque:
+        """In-memory samples of key, loaded from the store on first use; call under _lock."""
+        window = self._windows.get(key)
+        if window is None:
+            window = deque(self.store.samples(*key), maxlen=self.store.max_samples)
+            self._windows[key] = window
+        return window
+
+    def timeout_for(self, url: str, extractor: str) -> int:
+        """
+        Timeout in whole seconds for the next request to url's host with extractor.
+
+        Whole seconds are returned because the Jina extractor sends the
+        timeout as an integer header.
+        """
+        with self._lock:
+            samples = list(self._window((host_of(url), extractor)))
+        return self._timeout(samples)
+
+    def _timeout(self, samples: List[float]) -> int:
+        if len(samples) < self.min_samples:
+            return math.ceil(self.default)
+        learned = percentile(samples, self.percent) * self.factor
+        return math.ceil(min(self.ceiling, max(self.floor, learned)))
+
+    def expected_seconds(self, targets: List[Tuple[str, str]]) -> List[float]:
+        """
+        Expected duration of fetching each (url, extractor) target.
+
+        A target's estimate is the mean recent latency of its host with
+        that extractor. Hosts without history are assumed to be typical:
+        they get the median of the known hosts' means.
+
+        Returns:
+            One estimate in seconds per target
+        """
+        means = {extractor: self.store.host_means(extractor) for extractor in {name for _, name in targets}}
+        estimates = []
+        for url, extractor in targets:
+            known = means[extractor]
+            mean = known.get(host_of(url))
+            if mean is None:
+                mean = percentile(list(known.values()), 50) if known else 1.0
+            estimates.append(mean)
+        return estimates
+
+    def record(self, url: str, extractor: str, seconds: float, timed_out: bool = False) -> None:
+        """Record the latency of a request that succeeded or timed out."""
+        key = (host_of(url), extractor)
+        with self._lock:
+            self._window(key).append(seconds)
+        self.store.record(key[0], key[1], seconds, timed_out)
+
+    def learned(self) -> List[Dict]:
+        """The timeout of every host and extractor seen this run, with the samples behind it."""
+        with self._lock:
+            windows = {key: list(window) for key, window in self._windows.items()}
+        rows = []
+        for (host, extractor), samples in sorted(windows.items()):
+            learned = len(samples) >= self.min_samples
+            rows.append({
+                "host": host,
+                "extractor": extractor,
+                "samples": len(samples),
+                "p%g_seconds" % self.percent: round(percentile(samples, self.percent), 3) if samples else None,
+                "timeout": self._timeout(samples),
+                "source": "learned" if learned else "default",
+            })
+        return rows
+
+    def close(self) -> None:
+        self.store.close()
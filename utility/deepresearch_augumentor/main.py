@@ -1,7 +1,10 @@
 import os
 import sys
 import time
-from typing import Optional, Dict, List, Tuple
+import asyncio
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, TimeoutError as FuturesTimeoutError
+from typing import Optional, Dict, List, Tuple, Iterable
 
 # Try to import tqdm, create a simple fallback if not available
 try:
@@ -27,6 +30,7 @@ except ImportError:
 
 # Import ConfigManager for API key handling
 from config_manager import ConfigManager
+from deadline import Deadline, DEADLINE_REACHED
 
 # Predefined extraction modes with appropriate selectors
 EXTRACTION_MODES = {
@@ -99,14 +103,15 @@ BASIC USAGE:
     (On Windows, use ReferenceAugmentor.exe)
 
 ARGUMENTS:
-    input_file                Path to the report file with references to process
+    input_file                Path to the report file with references to process,
+                              or - to read it from standard input
 
 OPTIONS:
     --extractor EXTRACTOR     Specify the content extraction method to use
                               Choices: jina, firecrawl, local_bs4
                               Default: local_bs4
 
-    --mode MODE               Content extraction mode (works with Jina API only)
+    --mode MODE               Content extraction mode (Jina and local_bs4)
                               Choices:
                                 • default: Extract full page content
                                 • body-only: Extract only the body content, removing navigation elements
@@ -121,9 +126,36 @@ OPTIONS:
     --output OUTPUT           Output file path to save the augmented report
                               If not specified, prints to stdout
 
-    --timeout TIMEOUT         HTTP request timeout in seconds
+    --timeout TIMEOUT         HTTP request timeout in seconds, for hosts without
+                              enough latency history (see ADAPTIVE TIMEOUTS);
+                              when given, also the longest learned timeout
                               Default: 15
 
+    --concurrency N           Number of URLs to extract in parallel
+                              Default: 1 (sequential)
+
+    --stream                  With --output, write each reference section to the
+                              file as soon as it is extracted instead of at the end
+                              (the table of contents is written as a trailer)
+
+    --pipeline                Fetch references while the input is still being read:
+                              each page is handed to a worker as soon as it is cited.
+                              Useful for large reports piped in from other tools:
+                              generate_report | python main.py - --pipeline --concurrency 8
+
+    --resume                  Continue an interrupted run of the same input file:
+                              URLs already extracted successfully are taken from
+                              its journal instead of being fetched again
+                              (not available when reading from standard input)
+
+    --no-cache                Do not read or write the extraction cache
+
+    --refresh                 Ignore cached content and re-fetch every URL
+                              (fresh results are still written to the cache)
+
+    --cache-ttl SECONDS       Maximum age of cached content
+                              Default: CACHE_TTL_SECONDS from config, or 7 days
+
     --usage                   Display this usage guide
     
     --quiet                   Suppress progress information (show only errors)
@@ -139,6 +171,15 @@ API KEY MANAGEMENT:
 
     (Or use `python main.py --set-jina-key ...` during development)
 
+    Several keys per provider can be stored to multiply throughput:
+
+    ./ReferenceAugmentor --set-jina-key KEY_1 KEY_2 KEY_3
+
+    Requests then rotate over the keys, least recently used first. A key
+    that gets HTTP 401/402 is set aside for the rest of the run, and one
+    that gets HTTP 429 until its Retry-After has passed. --show-keys lists
+    per-key usage counters.
+
     API keys are stored in a configuration file:
     - Windows: %APPDATA%\\ReferenceAugmentor\\config.json
     - macOS/Linux: ~/.referenceaugmentor/config.json
@@ -151,12 +192,18 @@ EXAMPLES:
         # Use Jina extractor with body-only mode to focus on main content
         python main.py report.txt --extractor jina --mode body-only
 
+        # Clean article text as Markdown, extracted locally without an API key
+        python main.py report.txt --mode clean-article
+
         # Save output to a file
         python main.py report.txt --extractor jina --mode article --output augmented_report.txt
 
         # Increase timeout for slow connections
         python main.py report.txt --extractor jina --timeout 30
 
+        # Fetch up to 8 references at once
+        python main.py report.txt --extractor jina --concurrency 8
+
     Using the packaged executable (macOS/Linux):
         # Basic usage with local extraction
         ./ReferenceAugmentor report.txt
@@ -167,6 +214,178 @@ EXAMPLES:
         # Save output to a file
         ./ReferenceAugmentor report.txt --extractor jina --mode article --output augmented_report.txt
 
+RESUMING INTERRUPTED RUNS:
+    Every finished URL is appended to a journal for the input file in:
+    - Windows: %APPDATA%\\ReferenceAugmentor\\journals\\
+    - macOS/Linux: ~/.referenceaugmentor/journals/
+
+    If a run is interrupted, re-run the same command with --resume. URLs that
+    were already extracted are taken from the journal; failed ones are retried.
+    The journal is only reused when the extractor and mode are unchanged.
+    Reports read from standard input (-) are not journaled.
+
+EXTRACTOR CHAINS:
+    --extractor accepts a comma-separated chain, primary first:
+
+    python main.py report.txt --extractor jina,local_bs4
+
+    By default each URL is tried with the next extractor only when the
+    previous one fails. With --hedge the next extractor is also started when
+    the primary has not answered within its recent 95th percentile latency
+    (--hedge-percentile); whichever succeeds first is used and the other
+    request is abandoned. Each extractor in the chain uses its own API key.
+
+DEADLINE:
+    --deadline SECONDS bounds the total run time. Per-request timeouts shrink
+    as the deadline approaches, no retries are started that cannot finish in
+    time, and references still outstanding when it expires are skipped. The
+    output is still a complete report; skipped references are marked
+    "Not fetched: run deadline reached".
+
+RETRIES:
+    Timeouts, rate limiting (HTTP 429), server errors (5xx) and dropped
+    connections are retried with exponential backoff and jitter; a
+    Retry-After header from the server is honoured. Other errors (404, 403,
+    unsupported content) fail immediately.
+
+    --max-retries N      Retries per URL after the first attempt (default: 2)
+    --retry-budget N     Total retries allowed for the whole run
+                         (default: enough to fully retry half the URLs, min 10)
+
+RATE LIMITS (jina, firecrawl):
+    API calls are paced to stay under each plan's requests-per-minute limit
+    instead of triggering HTTP 429 storms. The budget is shared by all runs
+    on this machine. Set the limits in config.json:
+
+    JINA_REQUESTS_PER_MINUTE       (default: 200)
+    FIRECRAWL_REQUESTS_PER_MINUTE  (default: 20)
+    JINA_BURST / FIRECRAWL_BURST   Requests allowed back-to-back (default: 5 seconds' worth)
+
+    A value of 0 disables limiting for that provider; --no-rate-limit
+    disables it for the run.
+
+POLITENESS (local_bs4):
+    When pages are fetched directly, requests to the same host are limited
+    and spaced out, and each host's robots.txt is fetched once and obeyed
+    (Disallow rules and Crawl-delay). Parallel runs interleave hosts so one
+    slow domain does not hold up the others.
+
+    --per-host N          Concurrent requests per host (default: 2)
+    --host-delay SECONDS  Minimum spacing between requests to a host (default: 0.5)
+    --ignore-robots       Do not fetch or obey robots.txt
+
+PARSING PAGES (local_bs4):
+    Pages are parsed with lxml when it is installed (pip install lxml), which
+    is several times faster than Python's built-in html.parser on large
+    pages; otherwise html.parser is used. With an extraction mode whose
+    target and remove selectors are made of simple tag, .class or #id
+    selectors (as in every built-in mode), only the matching parts of each
+    page are parsed.
+
+    --html-parser NAME    auto (default), lxml or html.parser
+
+    Converting pages is CPU-bound, so with --concurrency above 1 it runs in
+    a pool of worker processes, one per CPU core (up to --concurrency),
+    while the download threads only do network I/O. When parsing falls
+    behind, downloads wait rather than piling up pages in memory.
+
+    --parse-workers N     Worker processes (0 parses in the download threads)
+
+    Pages are streamed. Responses whose Content-Type (or, when it is missing,
+    first bytes) shows content that cannot be extracted, such as video,
+    images, archives or disk images, and responses larger than the size
+    limit, are abandoned before they are downloaded in full; they appear in
+    the output and the summary as skipped, with the reason.
+
+    Plain text and Markdown (e.g. raw files on GitHub) are kept as they are.
+    PDFs are extracted page by page when pypdf is installed (pip install
+    pypdf), up to a page limit; without it they are skipped, so a chain such
+    as local_bs4,jina can hand them to the next extractor.
+
+    --max-page-size MB    Largest page downloaded (default: 10; 0 for no limit)
+    --max-pdf-pages N     Pages extracted from a PDF (default: 50; 0 for all)
+
+CIRCUIT BREAKERS:
+    When a provider endpoint (r.jina.ai, api.firecrawl.dev) or a reference
+    host fails repeatedly with timeouts, 5xx, 429 or connection errors, its
+    circuit breaker opens: remaining URLs for it fail fast, or move on to the
+    next extractor of a chain, instead of waiting for every timeout. After a
+    cool-down a single probe request is let through; success closes the
+    breaker. Failures of requests made through a provider count against the
+    provider, not against the reference's host, unless they come from the
+    site itself. Breakers that opened are listed in the run summary.
+
+    --breaker-threshold N       Consecutive failures that open a breaker (default: 5)
+    --breaker-cooldown SECONDS  Time before an open breaker probes again (default: 30)
+
+WHICH LINKS ARE FETCHED:
+    Links are taken from the report's reference section, recognized by a
+    heading such as "References", "Sources", "Bibliography" or "Works Cited"
+    (Markdown "##", underlined, bold, plain or HTML). Markdown links, HTML
+    links, numbered entries ([1], 1., [^1]:) and bare URLs are understood.
+    Footnote definitions ([^1]: https://...) count wherever they appear.
+    Inline links in the body are only fetched when the report has neither.
+
+DUPLICATE URLS:
+    Spellings of the same page are fetched only once. URLs that differ only
+    in http/https, a "www." or mobile/AMP prefix, a trailing slash, the
+    order of query parameters, tracking parameters (utm_*, fbclid, gclid,
+    ...), a #fragment or AMP markers are merged; the appendix lists every
+    spelling cited under the fetched URL, and the summary shows how many
+    fetches were saved. Use --keep-url-variants to fetch each spelling.
+
+ADAPTIVE TIMEOUTS:
+    The latency of every fetch is recorded per host and extractor in
+    latency/latency.sqlite under the config directory. Once a host has 5
+    samples, its requests time out after the 95th percentile of its recent
+    latencies times 1.5, kept between 3 and 60 seconds, instead of after
+    --timeout: fast hosts that hang are abandoned sooner, slow but reliable
+    ones get the time they need. ADAPTIVE_TIMEOUT_FACTOR, _FLOOR and
+    _CEILING in config.json change these values. --debug writes the learned
+    timeouts to learned_timeouts.json. A --timeout given on the command line
+    caps every learned timeout. Use --no-adaptive-timeouts to apply
+    --timeout to every request.
+
+    With --concurrency, the same history orders the work: references whose
+    hosts are slowest start first, spread across hosts, so the run does not
+    end waiting on one slow download that started last. Hosts without
+    history are assumed typical. Without adaptive timeouts, references are
+    interleaved round-robin across hosts. --pipeline fetches references in
+    the order they are found.
+
+URL REWRITES:
+    Some references have a lighter machine-readable equivalent, which is
+    fetched instead while the report keeps citing the original URL:
+    - github.com/.../blob/...   raw.githubusercontent.com file
+    - arxiv.org/abs/ID          arXiv API entry (title, authors, abstract)
+    - *.wikipedia.org/wiki/...  the article's wikitext
+    - YouTube videos            oEmbed metadata (title, channel)
+    These endpoints serve plain text, XML or JSON, so they are fetched by
+    the local extractor even when --extractor is jina or firecrawl. The
+    summary lists how often each rule was used and an estimate of the bytes
+    it saved, from the typical size of the page it replaced (the original
+    page is never downloaded, so this is not measured).
+    
+    Add rules under URL_REWRITE_RULES in config.json, e.g.
+        "URL_REWRITE_RULES": [{"name": "docs-source",
+            "pattern": "^https://docs[.]example[.]com/(.+)[.]html$",
+            "replace": "https://docs.example.com/_sources/\\1.txt",
+            "direct": true, "page_bytes": 80000}]
+    page_bytes, the typical size of the page a rule avoids, is required.
+    A rule named like a built-in one replaces it; {"name": "youtube-oembed",
+    "enabled": false} turns one off. --no-url-rewrites fetches every URL as
+    cited.
+
+CACHING:
+    Successful extractions are cached so re-running on a revised report does
+    not re-fetch unchanged references. Entries are keyed by normalized URL,
+    extractor and extraction mode settings, and stored in:
+    - Windows: %APPDATA%\\ReferenceAugmentor\\cache\\
+    - macOS/Linux: ~/.referenceaugmentor/cache/
+
+    The size cap (CACHE_MAX_BYTES, default 200 MB) and TTL (CACHE_TTL_SECONDS)
+    can be set in config.json; least-recently-used entries are evicted first.
+
 DEBUGGING:
     For troubleshooting issues, use the --debug flag with the main script or executable:
     
@@ -178,7 +397,8 @@ DEBUGGING:
     - macOS/Linux: ~/.referenceaugmentor/debug/run_[extractor]_[timestamp]/
 
 NOTES:
-    - The extraction modes feature only works with the Jina extractor
+    - The extraction modes work with the Jina and local_bs4 extractors; local_bs4
+      applies the selectors itself and returns Markdown, without an API call
     - Use '--mode body-only' to target just the main content and ignore navigation elements
     - Use '--mode clean-text' to get content with minimal links (links are converted to plain text)
     - Use '--mode referenced-links' for clean content with numbered link references at the end
@@ -189,12 +409,39 @@ NOTES:
     print(usage_text)
 
 
-def get_extractor(extractor_type: str):
+EXTRACTOR_TYPES = ("jina", "firecrawl", "local_bs4")
+
+# extractor_config keys passed through to local_bs4 when set
+LOCAL_EXTRACTOR_OPTIONS = ("html_parser", "max_bytes", "max_pdf_pages")
+
+
+def parse_extractor_chain(extractor_type: str) -> List[str]:
+    """
+    Split an extractor specification such as "jina,local_bs4" into extractor names.
+    
+    Raises:
+        ValueError: If a name is not recognized
+    """
+    names = [name.strip() for name in extractor_type.split(",") if name.strip()]
+    for name in names or [extractor_type]:
+        if name not in EXTRACTOR_TYPES:
+            raise ValueError(f"Unsupported extractor type: {name}. " 
+                             f"Supported types are: {', '.join(EXTRACTOR_TYPES)}")
+    return names
+
+
+def get_extractor(extractor_type: str, pool_size: int = 10, chain_mode: str = "fallback",
+                  hedge_percentile: float = 95.0):
     """
     Factory function to get the appropriate content extractor.
     
     Args:
-        extractor_type: Type of extractor to use (e.g., "jina", "firecrawl", "local_bs4")
+        extractor_type: Type of extractor to use (e.g., "jina", "firecrawl", "local_bs4"),
+                        or a comma-separated chain such as "jina,local_bs4"
+        pool_size: Size of the extractor's keep-alive connection pool
+        chain_mode: For chains, "fallback" (try in order) or "hedge" (race slow requests)
+        hedge_percentile: For hedged chains, percentile of primary latency after
+                          which the next extractor is started
     
     Returns:
         ContentExtractorInterface instance
@@ -203,19 +450,698 @@ def get_extractor(extractor_type: str):
         ValueError: If extractor_type is not recognized
     """
     # Import extractors here to allow --usage to work without dependencies
-    from extractors import JinaAIExtractor, FirecrawlExtractor, BeautifulSoupExtractor
+    from extractors import JinaAIExtractor, FirecrawlExtractor, BeautifulSoupExtractor, ExtractorChain
     
     extractors = {
-        "jina": JinaAIExtractor(),
-        "firecrawl": FirecrawlExtractor(),
-        "local_bs4": BeautifulSoupExtractor()
+        "jina": JinaAIExtractor,
+        "firecrawl": FirecrawlExtractor,
+        "local_bs4": BeautifulSoupExtractor
     }
     
-    if extractor_type not in extractors:
-        raise ValueError(f"Unsupported extractor type: {extractor_type}. " 
-                         f"Supported types are: {', '.join(extractors.keys())}")
+    names = parse_extractor_chain(extractor_type)
+    if len(names) == 1:
+        return extractors[names[0]](pool_size=pool_size)
+    
+    members = [(name, extractors[name](pool_size=pool_size)) for name in names]
+    return ExtractorChain(members, mode=chain_mode, hedge_percentile=hedge_percentile, pool_size=pool_size)
+
+
+def _apply_extraction_mode(extractor_type: str, extraction_mode: str, extractor_config: Dict) -> None:
+    """
+    Copy the selector settings of an extraction mode into extractor_config.
+    
+    Jina and local_bs4 support these options (alone or in a chain); local_bs4
+    then returns Markdown instead of plain text. Values already present in
+    extractor_config are never overridden.
+    """
+    names = extractor_type.split(",")
+    if ("jina" in names or "local_bs4" in names) and extraction_mode in EXTRACTION_MODES:
+        mode_config = EXTRACTION_MODES[extraction_mode]
+        # Only override if not already specified in extractor_config
+        if 'target_selector' in mode_config and 'target_selector' not in extractor_config:
+            extractor_config['target_selector'] = mode_config['target_selector']
+        if 'remove_selector' in mode_config and 'remove_selector' not in extractor_config:
+            extractor_config['remove_selector'] = mode_config['remove_selector']
+        if 'links_handling' in mode_config and 'links_handling' not in extractor_config:
+            extractor_config['links_handling'] = mode_config['links_handling']
+        if 'links_summary' in mode_config and 'links_summary' not in extractor_config:
+            extractor_config['links_summary'] = mode_config['links_summary']
+
+
+def _extract_kwargs(extractor_config: Dict, request_timeout: int) -> Dict:
+    """Build the keyword arguments passed to extract_text / extract_text_async."""
+    kwargs = {
+        'api_key': extractor_config.get('api_key'),
+        'timeout': request_timeout,
+        'target_selector': extractor_config.get('target_selector'),
+        'remove_selector': extractor_config.get('remove_selector'),
+        'links_handling': extractor_config.get('links_handling'),
+        'links_summary': extractor_config.get('links_summary')
+    }
+    # Extractor chains take one key per member
+    if extractor_config.get('api_keys'):
+        kwargs['api_keys'] = extractor_config['api_keys']
+    # Options only the local extractor understands
+    for key in LOCAL_EXTRACTOR_OPTIONS:
+        if extractor_config.get(key) is not None:
+            kwargs[key] = extractor_config[key]
+    return kwargs
+
+
+class _RunContext:
+    """Everything a worker needs to extract one URL during a run."""
+    
+    def __init__(self, extractor, extractor_type: str, extractor_config: Dict, request_timeout: int,
+                 retry_policy=None, retry_budget=None, cache=None, deadline=None, breakers=None,
+                 politeness=None, rate_limits=None, key_pools=None, parse_pool=None, url_rewrites=None,
+                 timeouts=None):
+        from retry_policy import RetryPolicy
+        self.extractor = extractor
+        self.extractor_type = extractor_type
+        self.extractor_config = extractor_config
+        self.request_timeout = request_timeout
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.retry_budget = retry_budget
+        self.cache = cache
+        self.deadline = deadline
+        self.breakers = breakers
+        self.politeness = politeness
+        self.rate_limits = rate_limits
+        self.key_pools = key_pools
+        self.parse_pool = parse_pool
+        self.url_rewrites = url_rewrites
+        self.timeouts = timeouts
+        # Local extractor for URLs rewritten to machine-readable endpoints
+        self.direct_extractor = None
+        self.owns_direct_extractor = False
+        provider_host = getattr(extractor, "provider_host", None)
+        self.provider_host = provider_host if isinstance(provider_host, str) else None
+        # Set when the run is abandoned; workers then stop before their next attempt
+        self.stopped = False
+    
+    @property
+    def deadline_expired(self) -> bool:
+        return self.deadline is not None and self.deadline.expired
+    
+    def attempt_timeout(self, url: Optional[str] = None, extractor=None):
+        """
+        Per-request timeout for the next attempt, shrunk to fit the run deadline.
+        
+        With adaptive timeouts it is learned from the latency history of
+        url's host with extractor; otherwise it is request_timeout.
+        """
+        timeout = self.request_timeout
+        if self.timeouts is not None and url is not None:
+            timeout = self.timeouts.timeout_for(url, self.extractor_name(extractor))
+        if self.deadline is None:
+            return timeout
+        return self.deadline.request_timeout(timeout)
+    
+    def extractor_name(self, extractor=None) -> str:
+        """Name latencies of extractor are recorded under."""
+        if extractor in (None, self.extractor):
+            return self.extractor_type
+        return "local_bs4"
+    
+    def record_latency(self, url: str, extractor, extracted_text: Optional[str], error: Optional[str],
+                       elapsed: float, timeout) -> None:
+        """Add a successful or timed-out attempt to the latency history."""
+        if self.timeouts is None:
+            return
+        from extractors.errors import TIMEOUT
+        timed_out = extracted_text is None and self.retry_policy.classify(error, elapsed, timeout) == TIMEOUT
+        if extracted_text is not None or timed_out:
+            self.timeouts.record(url, self.extractor_name(extractor), elapsed, timed_out)
+    
+    def route(self, url: str):
+        """
+        Apply the URL rewrite rules to a cited URL.
+        
+        Returns:
+            Tuple of (URL to fetch, rule applied or None)
+        """
+        if self.url_rewrites is None:
+            return url, None
+        return self.url_rewrites.rewrite(url)
+    
+    def fetch_target(self, url: str) -> Tuple[str, str]:
+        """The URL actually fetched for a cited URL and the name of the extractor fetching it."""
+        fetch_url, rule = self.url_rewrites.match(url) if self.url_rewrites is not None else (url, None)
+        return fetch_url, self.extractor_name(self.extractor_for(rule))
+    
+    def dispatch_order(self, urls: List[str], indexes: List[int]) -> List[int]:
+        """
+        Order in which concurrent workers are handed URLs.
+        
+        With adaptive timeouts, the longest expected fetches (by the latency
+        history of their hosts) go first; otherwise URLs are interleaved
+        round-robin across hosts.
+        """
+        from extractors.politeness import interleave_by_host, longest_expected_first
+        if self.timeouts is None:
+            return interleave_by_host(urls, indexes)
+        expected = self.timeouts.expected_seconds([self.fetch_target(urls[i]) for i in indexes])
+        max_per_host = getattr(self.politeness, "max_per_host", 1)
+        return longest_expected_first(urls, indexes, dict(zip(indexes, expected)),
+                                      max_per_host if isinstance(max_per_host, int) else 1)
+    
+    def extractor_for(self, rule):
+        """The extractor fetching URLs rewritten by rule (None for no rule)."""
+        if rule is not None and rule.direct and self.direct_extractor is not None:
+            return self.direct_extractor
+        return self.extractor
+    
+    def acquire_breakers(self, url: str, extractor=None):
+        """
+        Check the provider and host circuit breakers for url.
+        
+        Args:
+            extractor: The extractor that will fetch url (default: the run's)
+        
+        Returns:
+            Tuple of (breakers to report the outcome to, refusal error or None)
+        """
+        if self.breakers is None:
+            return [], None
+        provider_host = self.provider_host if extractor in (None, self.extractor) else None
+        return self.breakers.acquire(self.breakers.keys_for(url, provider_host))
+    
+    def record_breakers(self, granted, extracted_text: Optional[str], error: Optional[str],
+                        extractor=None) -> None:
+        """
+        Report the outcome of a request to the breakers acquire_breakers granted.
+        
+        When the run's extractor relays requests (an API provider or a chain),
+        the target host's breaker is only charged with failures the extractor
+        attributes to the target site; see CircuitBreakerRegistry.record.
+        """
+        if not granted:
+            return
+        from extractors import ExtractorChain
+        relayed = extractor in (None, self.extractor) and (
+            self.provider_host is not None or isinstance(self.extractor, ExtractorChain))
+        target_keys = [breaker.name for breaker in granted if breaker.name != self.provider_host] if relayed else None
+        self.breakers.record(granted, extracted_text, error, target_keys)
+    
+    def extract_kwargs(self, timeout) -> Dict:
+        """Build the keyword arguments passed to extract_text / extract_text_async."""
+        return _extract_kwargs(self.extractor_config, timeout)
+    
+    def close(self) -> None:
+        """Release the extractors' pooled connections, the host scheduler, the parse pool and the cache."""
+        self.extractor.close()
+        if self.owns_direct_extractor:
+            self.direct_extractor.close()
+        self.politeness.close()
+        if self.parse_pool is not None:
+            self.parse_pool.close()
+        if self.cache is not None:
+            self.cache.close()
+
+
+def _local_extractor(extractor):
+    """
+    The local_bs4 extractor of a run, creating one if the run has none.
+    
+    Returns:
+        Tuple of (extractor, created)
+    """
+    from extractors import BeautifulSoupExtractor, ExtractorChain
+    if isinstance(extractor, BeautifulSoupExtractor):
+        return extractor, False
+    if isinstance(extractor, ExtractorChain):
+        for name, member in extractor.members:
+            if name == "local_bs4":
+                return member, False
+    return BeautifulSoupExtractor(), True
+
+
+def _make_run_context(extractor, extractor_type: str, extractor_config: Dict, request_timeout: int,
+                      url_count: int, concurrency: int = 1, **options) -> _RunContext:
+    """
+    Build the run context, with a default retry budget sized for url_count
+    URLs, default circuit breakers, a default per-host scheduler, the
+    built-in URL rewrite rules and, for concurrent runs of local_bs4, a
+    default parse pool.
+    
+    Args:
+        concurrency: Number of URLs extracted in parallel
+        options: retry_policy, retry_budget, cache, deadline, breakers,
+                 politeness, rate_limits, key_pools, parse_pool,
+                 url_rewrites and timeouts, passed to _RunContext
+    """
+    from retry_policy import RetryBudget
+    from extractors import ExtractorChain
+    ctx = _RunContext(extractor, extractor_type, extractor_config, request_timeout, **options)
+    if ctx.retry_budget is None:
+        ctx.retry_budget = RetryBudget.for_urls(url_count, ctx.retry_policy.max_retries)
+    if ctx.breakers is None:
+        from circuit_breaker import CircuitBreakerRegistry
+        ctx.breakers = CircuitBreakerRegistry(retry_policy=ctx.retry_policy)
+    if isinstance(extractor, ExtractorChain):
+        # Chains check provider breakers per member so they can reroute
+        extractor.breakers = ctx.breakers
+    if ctx.politeness is None:
+        from extractors.politeness import HostScheduler
+        ctx.politeness = HostScheduler()
+    extractor.use_politeness(ctx.politeness)
+    if ctx.rate_limits is not None:
+        extractor.use_rate_limits(ctx.rate_limits)
+    if ctx.key_pools:
+        extractor.use_key_pools(ctx.key_pools)
+    if ctx.parse_pool is None and "local_bs4" in [name.strip() for name in extractor_type.split(",")]:
+        from extractors.parse_pool import ParsePool
+        ctx.parse_pool = ParsePool.for_concurrency(concurrency)
+    if ctx.parse_pool is not None:
+        # Before any download thread starts (see extractors.parse_pool)
+        ctx.parse_pool.start()
+        extractor.use_parse_pool(ctx.parse_pool)
+    if ctx.url_rewrites is None:
+        from url_rewrites import UrlRewriter
+        ctx.url_rewrites = UrlRewriter()
+    if ctx.url_rewrites.has_direct_rules:
+        ctx.direct_extractor, ctx.owns_direct_extractor = _local_extractor(extractor)
+        if ctx.owns_direct_extractor:
+            ctx.direct_extractor.use_politeness(ctx.politeness)
+            if ctx.parse_pool is not None:
+                ctx.direct_extractor.use_parse_pool(ctx.parse_pool)
+    return ctx
+
+
+def _retry_delay(ctx: _RunContext, extracted_text: Optional[str], error: Optional[str], elapsed: float,
+                 attempts: int, timeout, log) -> Optional[float]:
+    """
+    Log the outcome of one extraction attempt and ask the retry policy what to do next.
+    
+    Returns:
+        Seconds to wait before retrying, or None if the retry loop should stop
+    """
+    # If successful, break the retry loop
+    if extracted_text is not None:
+        log(f"  ✓ Success: Got {len(extracted_text)} characters in {elapsed:.2f}s")
+        return None
+    
+    log(f"  ✗ Error: {error} ({elapsed:.2f}s)")
+    
+    if ctx.deadline_expired:
+        log("  Not retrying: run deadline reached")
+        return None
+    if ctx.stopped:
+        return None
+    
+    delay, kind, reason = ctx.retry_policy.next_delay(
+        error, attempts, ctx.retry_budget, elapsed, timeout
+    )
+    if delay is None:
+        if kind != "permanent" and reason:
+            log(f"  Not retrying ({kind}): {reason}")
+        return None
+    if ctx.deadline is not None and not ctx.deadline.allows_wait(delay):
+        log(f"  Not retrying ({kind}): run deadline too close")
+        return None
     
-    return extractors[extractor_type]
+    log(f"  {kind.replace('_', ' ').capitalize()}, will retry in {delay:.1f}s...")
+    return delay
+
+
+def _extract_with_retries(ctx: _RunContext, url: str, log,
+                          extractor=None) -> Tuple[Optional[str], Optional[str], int]:
+    """
+    Extract content for a single URL, retrying transient failures per the run's RetryPolicy.
+    
+    Args:
+        ctx: The run context (extractor, config, retry policy and budget)
+        url: The URL to extract content from
+        log: Callable receiving progress lines (print, or a buffer's append)
+        extractor: Extractor to use instead of the run's (see _RunContext.extractor_for)
+    
+    Returns:
+        Tuple of (extracted_text, error_message, attempts)
+    """
+    extractor = extractor or ctx.extractor
+    attempts = 0
+    extracted_text, error = None, None
+    while True:
+        # Nothing more is started once the run deadline has passed
+        if ctx.deadline_expired:
+            return None, error or DEADLINE_REACHED, attempts
+        
+        # Fail fast while the provider or host is known to be down
+        granted, refusal = ctx.acquire_breakers(url, extractor)
+        if refusal is not None:
+            log(f"  ✗ {refusal}")
+            return None, refusal, attempts
+        
+        # If this is a retry, let the user know
+        if attempts > 0:
+            log(f"  Retry {attempts}/{ctx.retry_policy.max_retries}...")
+        
+        timeout = ctx.attempt_timeout(url, extractor)
+        start_time = time.time()
+        try:
+            extracted_text, error = extractor.extract_text(url=url, **ctx.extract_kwargs(timeout))
+        except Exception as e:
+            # Catch any unexpected exceptions
+            extracted_text, error = None, str(e)
+            log(f"  ✗ Exception: {error}")
+        elapsed = time.time() - start_time
+        attempts += 1
+        ctx.record_breakers(granted, extracted_text, error, extractor)
+        ctx.record_latency(url, extractor, extracted_text, error, elapsed, timeout)
+        
+        delay = _retry_delay(ctx, extracted_text, error, elapsed, attempts, timeout, log)
+        if delay is None:
+            return extracted_text, error, attempts
+        time.sleep(delay)
+
+
+async def _extract_with_retries_async(ctx: _RunContext, url: str, log, session=None,
+                                      extractor=None) -> Tuple[Optional[str], Optional[str], int]:
+    """
+    Coroutine version of _extract_with_retries using extractor.extract_text_async.
+    
+    Args:
+        session: Optional aiohttp.ClientSession shared by all requests of the run
+        extractor: Extractor to use instead of the run's
+    """
+    extractor = extractor or ctx.extractor
+    attempts = 0
+    extracted_text, error = None, None
+    while True:
+        if ctx.deadline_expired:
+            return None, error or DEADLINE_REACHED, attempts
+        
+        granted, refusal = ctx.acquire_breakers(url, extractor)
+        if refusal is not None:
+            log(f"  ✗ {refusal}")
+            return None, refusal, attempts
+        
+        if attempts > 0:
+            log(f"  Retry {attempts}/{ctx.retry_policy.max_retries}...")
+        
+        timeout = ctx.attempt_timeout(url, extractor)
+        start_time = time.time()
+        try:
+            extracted_text, error = await extractor.extract_text_async(
+                url=url, session=session, **ctx.extract_kwargs(timeout)
+            )
+        except asyncio.CancelledError:
+            for breaker in granted:
+                breaker.release()
+            raise
+        except Exception as e:
+            extracted_text, error = None, str(e)
+            log(f"  ✗ Exception: {error}")
+        elapsed = time.time() - start_time
+        attempts += 1
+        ctx.record_breakers(granted, extracted_text, error, extractor)
+        ctx.record_latency(url, extractor, extracted_text, error, elapsed, timeout)
+        
+        delay = _retry_delay(ctx, extracted_text, error, elapsed, attempts, timeout, log)
+        if delay is None:
+            return extracted_text, error, attempts
+        await asyncio.sleep(delay)
+
+
+def _extract_url(ctx: _RunContext, url: str, log) -> Tuple[Optional[str], Optional[str], int, bool]:
+    """
+    Extract one URL, serving it from the extraction cache when possible.
+    
+    The cache is keyed on the cited URL; a matching URL rewrite rule only
+    changes what is fetched.
+    
+    Returns:
+        Tuple of (extracted_text, error_message, attempts, from_cache)
+    """
+    cache = ctx.cache
+    cache_key = None
+    if cache is not None:
+        cache_key = cache.make_key(url, ctx.extractor_type, ctx.extractor_config)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            log(f"  ✓ Cache hit: {len(cached)} characters")
+            return cached, None, 0, True
+    
+    fetch_url, rule = ctx.route(url)
+    if rule is not None:
+        log(f"  → Rewritten by {rule.name}: {fetch_url}")
+    extracted_text, error, attempts = _extract_with_retries(ctx, fetch_url, log, ctx.extractor_for(rule))
+    if rule is not None:
+        ctx.url_rewrites.record(rule, extracted_text)
+    if cache is not None and extracted_text is not None:
+        cache.put(cache_key, url, ctx.extractor_type, extracted_text)
+    return extracted_text, error, attempts, False
+
+
+async def _extract_url_async(ctx: _RunContext, url: str, log, session=None) -> Tuple[Optional[str], Optional[str], int, bool]:
+    """Coroutine version of _extract_url."""
+    cache = ctx.cache
+    cache_key = None
+    if cache is not None:
+        cache_key = cache.make_key(url, ctx.extractor_type, ctx.extractor_config)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            log(f"  ✓ Cache hit: {len(cached)} characters")
+            return cached, None, 0, True
+    
+    fetch_url, rule = ctx.route(url)
+    if rule is not None:
+        log(f"  → Rewritten by {rule.name}: {fetch_url}")
+    extracted_text, error, attempts = await _extract_with_retries_async(ctx, fetch_url, log, session,
+                                                                        ctx.extractor_for(rule))
+    if rule is not None:
+        ctx.url_rewrites.record(rule, extracted_text)
+    if cache is not None and extracted_text is not None:
+        cache.put(cache_key, url, ctx.extractor_type, extracted_text)
+    return extracted_text, error, attempts, False
+
+
+class _ExtractionProgress:
+    """
+    Collects per-URL results in report order and keeps the run counters.
+    
+    When a writer (StreamingReportWriter) is given, results are handed to it
+    as they finish instead of being kept in url_contents.
+    """
+    
+    def __init__(self, urls: List[str], verbose: bool, writer=None, journal=None):
+        self.urls = urls
+        self.verbose = verbose
+        self.writer = writer
+        self.journal = journal
+        self.total_urls = len(urls)
+        self.url_contents = [None] * self.total_urls
+        self.done = [False] * self.total_urls
+        self.failed_urls = 0
+        self.skipped_urls = 0
+        self.processed_urls = 0
+        self.cache_hits = 0
+        self.resumed = 0
+        self.fetches_saved = 0
+    
+    def add_url(self, url: str) -> Optional[int]:
+        """
+        Append a URL found while the run is in progress (pipelined runs).
+        
+        Returns:
+            Its index, or None if the journal already holds its content
+        """
+        index = len(self.urls)
+        self.urls.append(url)
+        self.url_contents.append(None)
+        self.done.append(False)
+        self.total_urls += 1
+        content = self.journal.resumable(url) if self.journal is not None else None
+        if content is None:
+            return index
+        self._store(index, content, None)
+        self.processed_urls += 1
+        self.resumed += 1
+        return None
+    
+    def resume_from_journal(self) -> None:
+        """Fill in URLs that a previous interrupted run already extracted successfully."""
+        if self.journal is None:
+            return
+        for i, url in enumerate(self.urls):
+            content = self.journal.resumable(url)
+            if content is not None:
+                self._store(i, content, None)
+                self.processed_urls += 1
+                self.resumed += 1
+    
+    def record(self, index: int, extracted_text: Optional[str], error: Optional[str], attempts: int,
+               from_cache: bool = False) -> None:
+        """Store a finished URL in its original slot and update the counters."""
+        if extracted_text is None and attempts == 0 and error == DEADLINE_REACHED:
+            # The worker found the deadline already passed before fetching
+            self.skip(index, error)
+            return
+        if self.journal is not None:
+            self.journal.record(self.urls[index], extracted_text, error)
+        self._store(index, extracted_text, error)
+        self.processed_urls += 1
+        if from_cache:
+            self.cache_hits += 1
+        
+        # Count failures for reporting; refused downloads (non-text, too
+        # large) are skipped rather than failed
+        if extracted_text is None:
+            from extractors.errors import SKIPPED
+            if getattr(error, "kind", None) == SKIPPED:
+                self.skipped_urls += 1
+                if self.verbose:
+                    print(f"  - {error}")
+                return
+            self.failed_urls += 1
+            if self.verbose:
+                print(f"  ✗ Failed to extract content after {attempts} attempts")
+    
+    def skip(self, index: int, reason: str = "Skipped by user") -> None:
+        """Mark an unfinished URL as skipped."""
+        self._store(index, None, reason)
+        self.skipped_urls += 1
+        self.processed_urls += 1
+    
+    def pending(self) -> List[int]:
+        """Indexes of URLs that have no result yet."""
+        return [i for i, done in enumerate(self.done) if not done]
+    
+    def _store(self, index: int, extracted_text: Optional[str], error: Optional[str]) -> None:
+        self.done[index] = True
+        if self.writer is not None:
+            self.writer.add(index, self.urls[index], extracted_text, error)
+        else:
+            self.url_contents[index] = (self.urls[index], extracted_text, error)
+    
+    def print_url_block(self, index: int, lines: List[str]) -> None:
+        """Print the buffered log of a URL finished by a concurrent worker."""
+        print(f"\nURL {index+1}/{self.total_urls}: {self.urls[index]}")
+        for line in lines:
+            print(line)
+    
+    def print_progress(self, process_time: float) -> None:
+        print(f"  Completed in {process_time:.2f}s")
+        successful = self.processed_urls - self.failed_urls - self.skipped_urls
+        print(f"  Progress: {self.processed_urls}/{self.total_urls} URLs processed ({successful} successful, {self.failed_urls} failed, {self.skipped_urls} skipped)")
+    
+    def print_summary(self, retry_budget=None, deadline=None, breakers=None, politeness=None,
+                      rate_limits=None, key_pools=None, url_rewrites=None) -> None:
+        successful = self.total_urls - self.failed_urls - self.skipped_urls
+        print(f"\nExtraction complete: {self.total_urls} URLs processed")
+        print(f"  {successful} successful, {self.failed_urls} failed, {self.skipped_urls} skipped")
+        if self.fetches_saved:
+            print(f"  {self.fetches_saved} fetches saved by merging URL variants")
+        if self.cache_hits:
+            print(f"  {self.cache_hits} served from cache")
+        if self.resumed:
+            print(f"  {self.resumed} resumed from journal")
+        if retry_budget is not None and retry_budget.used:
+            limit = "" if retry_budget.max_retries is None else f"/{retry_budget.max_retries}"
+            note = " (budget exhausted)" if retry_budget.exhausted else ""
+            print(f"  {retry_budget.used}{limit} retries used{note}")
+        if deadline is not None and deadline.expired:
+            print(f"  Run deadline of {deadline.seconds:g}s reached; unfinished references are marked in the output")
+        if politeness is not None and politeness.disallowed:
+            print(f"  {politeness.disallowed} disallowed by robots.txt")
+        if rate_limits is not None:
+            for host, waited in sorted(rate_limits.waited.items()):
+                print(f"  Waited {waited:.1f}s for the {host} rate limit")
+        for host, pool in sorted((key_pools or {}).items()):
+            if pool.quarantines:
+                print(f"  {pool.quarantines} {host} API key quarantines ({len(pool)} keys in pool)")
+        rewrite_lines = url_rewrites.summary_lines() if url_rewrites is not None else []
+        if rewrite_lines:
+            print("  URL rewrites:")
+            for line in rewrite_lines:
+                print(f"    {line}")
+        breaker_lines = breakers.summary_lines() if breakers is not None else []
+        if breaker_lines:
+            print("  Circuit breakers:")
+            for line in breaker_lines:
+                print(f"    {line}")
+
+
+def _build_extractor(extractor_type: str, extractor_config: Optional[Dict], extraction_mode: str,
+                     concurrency: int):
+    """Resolve the extractor configuration and build the extractor."""
+    # Initialize configuration if not provided
+    if extractor_config is None:
+        extractor_config = {}
+    
+    # Apply extraction mode settings if applicable for the extractor type
+    _apply_extraction_mode(extractor_type, extraction_mode, extractor_config)
+    
+    # Get the appropriate extractor, with a connection pool sized for the run
+    chain_options = {key: extractor_config[key] for key in ('chain_mode', 'hedge_percentile')
+                     if key in extractor_config}
+    extractor = get_extractor(extractor_type, pool_size=max(1, concurrency), **chain_options)
+    return extractor_config, extractor
+
+
+def _prepare_run(report_text: str, extractor_type: str, extractor_config: Optional[Dict],
+                 extraction_mode: str, verbose: bool, concurrency: int, canonicalize_urls: bool = True):
+    """Resolve configuration, build the extractor, parse the report and merge URL variants."""
+    # Import utils here to allow --usage to work without dependencies
+    from utils import parse_report, canonicalize_references
+    
+    extractor_config, extractor = _build_extractor(extractor_type, extractor_config, extraction_mode, concurrency)
+    
+    # Parse the report to get original content and URLs
+    original_content, cited_urls = parse_report(report_text)
+    
+    # Fetch each page once however many ways it is spelled in the report
+    if canonicalize_urls:
+        urls, aliases = canonicalize_references(cited_urls)
+    else:
+        urls, aliases = cited_urls, {}
+    
+    if verbose:
+        print(f"Found {len(urls)} URLs to process")
+        if len(cited_urls) > len(urls):
+            print(f"  ({len(cited_urls)} cited; {len(cited_urls) - len(urls)} variant spellings merged)")
+        if len(urls) > 5:
+            print("This might take some time. Processing in progress...")
+    
+    return extractor_config, extractor, original_content, urls, aliases
+
+
+def _unexpected_error_result(e: Exception) -> Tuple[tuple, str]:
+    """The failed (result, log line) recorded for a URL whose worker raised e."""
+    error = f"Unexpected error: {type(e).__name__}: {e}"
+    return (None, error, 0, False), f"  ✗ {error}"
+
+
+def _worker_result(future):
+    """
+    The (result, log lines, seconds) of a finished worker future.
+    
+    An exception escaping a worker is turned into a failed result for its
+    URL, so one unexpected error does not abort the run and lose the rest.
+    """
+    try:
+        return future.result()
+    except Exception as e:
+        result, line = _unexpected_error_result(e)
+        return result, [line], 0.0
+
+
+def _finish_workers(ctx: _RunContext, executor, futures, verbose: bool) -> None:
+    """
+    Cancel queued work and wait, bounded, for requests still in flight.
+    
+    Running threads cannot be stopped; they keep using the run's sessions,
+    cache and pools, so ctx must not be closed under them. They give up
+    before their next attempt once ctx.stopped is set, so the wait is at
+    most about one request timeout.
+    """
+    ctx.stopped = True
+    executor.shutdown(wait=False, cancel_futures=True)
+    running = [future for future in futures if not future.done()]
+    if running:
+        if verbose:
+            print(f"Waiting for {len(running)} requests in flight...")
+        wait(running, timeout=ctx.request_timeout)
 
 
 def augment_research_report(
@@ -224,7 +1150,22 @@ def augment_research_report(
     extractor_config: Optional[Dict] = None,
     extraction_mode: str = "default",
     request_timeout: int = 15,
-    verbose: bool = True
+    verbose: bool = True,
+    concurrency: int = 1,
+    cache=None,
+    stream_to: Optional[str] = None,
+    journal=None,
+    retry_policy=None,
+    retry_budget=None,
+    deadline: Optional[float] = None,
+    breakers=None,
+    politeness=None,
+    rate_limits=None,
+    key_pools=None,
+    canonicalize_urls: bool = True,
+    parse_pool=None,
+    url_rewrites=None,
+    timeouts=None
 ) -> str:
     """
     Augments a research report with content fetched from its reference links
@@ -235,144 +1176,466 @@ def augment_research_report(
         extractor_type: Identifier for the content extraction method
                       (e.g., "jina", "firecrawl", "local_bs4")
         extractor_config: Configuration dictionary for the chosen extractor.
-                        Should contain 'api_key' if using jina or firecrawl.
+                        Should contain 'api_key' if using jina or firecrawl,
+                        or 'api_keys' (by extractor name) for a chain such as
+                        "jina,local_bs4". 'chain_mode' ("fallback" or "hedge")
+                        and 'hedge_percentile' configure chains.
         extraction_mode: Predefined mode for content extraction (default, body-only, article, main-content)
         request_timeout: Timeout in seconds for HTTP requests
         verbose: Whether to show detailed progress information
+        concurrency: Number of URLs to extract in parallel (1 = sequential)
+        cache: Optional ExtractionCache used to skip re-fetching unchanged references
+        stream_to: Optional output path. When set, each reference section is
+                   written to this file as soon as it is extracted (table of
+                   contents as a trailer) and the path is returned instead of
+                   the report text.
+        journal: Optional RunJournal. Every finished result is appended to it,
+                 and URLs it already holds successful content for are not
+                 fetched again.
+        retry_policy: Optional RetryPolicy deciding which failures are retried
+                      and how long to back off (default: RetryPolicy())
+        retry_budget: Optional RetryBudget capping the total number of retries
+                      of the run (default: one sized for the number of URLs)
+        deadline: Optional wall-time budget for the whole run, in seconds.
+                  Request timeouts shrink as it approaches, and references
+                  not fetched in time are marked as such in the output.
+        breakers: Optional CircuitBreakerRegistry. By default each run gets
+                  one that opens after 5 consecutive transient failures of a
+                  provider endpoint or reference host, for 30 seconds.
+        politeness: Optional HostScheduler for extractors that fetch pages
+                    directly (local_bs4). By default at most 2 concurrent
+                    requests per host, 0.5s apart, honouring robots.txt.
+        rate_limits: Optional RateLimits pacing Jina / Firecrawl API calls to
+                     the plan's requests-per-minute (see RateLimits.from_config)
+        key_pools: Optional dict of provider host to KeyPool. Jina / Firecrawl
+                   requests then rotate over the pool's keys, overriding the
+                   single api_key in extractor_config.
+        canonicalize_urls: Whether to merge spellings of the same page
+                           (http/https, www., trailing slash, tracking
+                           parameters, fragments, AMP/mobile variants) into
+                           one fetch. Every original spelling is still listed
+                           in the appendix.
+        parse_pool: Optional ParsePool converting pages fetched by local_bs4
+                    in worker processes. By default, with concurrency > 1,
+                    one with a worker per CPU core (up to concurrency).
+        url_rewrites: Optional UrlRewriter routing cited URLs to lightweight
+                      endpoints (see UrlRewriter.from_config). By default
+                      the built-in rules for GitHub, arXiv, Wikipedia and
+                      YouTube; UrlRewriter([]) disables rewriting.
+        timeouts: Optional AdaptiveTimeouts. Each request then gets a
+                  timeout learned from the latency history of its host
+                  (request_timeout until there is enough history), and its
+                  latency is added to that history.
     
     Returns:
-        A string containing the original report followed by appended content
+        A string containing the original report followed by appended content,
+        or the output path when stream_to is set
     """
-    # Import utils here to allow --usage to work without dependencies
-    from utils import parse_report, format_output
+    from utils import format_output
     
-    # Initialize configuration if not provided
-    if extractor_config is None:
-        extractor_config = {}
+    run_deadline = Deadline(deadline) if deadline is not None else None
+    extractor_config, extractor, original_content, urls, aliases = _prepare_run(
+        report_text, extractor_type, extractor_config, extraction_mode, verbose, concurrency,
+        canonicalize_urls
+    )
     
-    # Apply extraction mode settings if applicable for the extractor type
-    # (only Jina currently supports these options)
-    if extractor_type == "jina" and extraction_mode in EXTRACTION_MODES:
-        mode_config = EXTRACTION_MODES[extraction_mode]
-        # Only override if not already specified in extractor_config
-        if 'target_selector' in mode_config and 'target_selector' not in extractor_config:
-            extractor_config['target_selector'] = mode_config['target_selector']
-        if 'remove_selector' in mode_config and 'remove_selector' not in extractor_config:
-            extractor_config['remove_selector'] = mode_config['remove_selector']
-        if 'links_handling' in mode_config and 'links_handling' not in extractor_config:
-            extractor_config['links_handling'] = mode_config['links_handling']
-        if 'links_summary' in mode_config and 'links_summary' not in extractor_config:
-            extractor_config['links_summary'] = mode_config['links_summary']
-    
-    # Get the appropriate extractor
-    extractor = get_extractor(extractor_type)
+    writer = None
+    if stream_to:
+        from report_writer import StreamingReportWriter
+        writer = StreamingReportWriter(stream_to, original_content, urls, max_buffered=max(16, 2 * concurrency),
+                                       aliases=aliases)
     
-    # Parse the report to get original content and URLs
-    original_content, urls = parse_report(report_text)
-    
-    if verbose:
-        print(f"Found {len(urls)} URLs to process")
-        if len(urls) > 5:
-            print("This might take some time. Processing in progress...")
-    
-    # Extract content for each URL
-    url_contents = []
+    # Extract content for each URL not already recovered from the journal
+    progress = _ExtractionProgress(urls, verbose, writer, journal)
+    progress.fetches_saved = sum(len(spellings) - 1 for spellings in aliases.values())
+    progress.resume_from_journal()
+    todo = progress.pending()
     total_urls = len(urls)
-    failed_urls = 0
-    skipped_urls = 0
-    max_retries = 2
+    ctx = _make_run_context(extractor, extractor_type, extractor_config, request_timeout, len(todo),
+                            retry_policy=retry_policy, retry_budget=retry_budget, cache=cache,
+                            deadline=run_deadline, breakers=breakers, politeness=politeness,
+                            rate_limits=rate_limits, key_pools=key_pools, parse_pool=parse_pool,
+                            url_rewrites=url_rewrites, timeouts=timeouts,
+                            concurrency=concurrency)
     
-    for i, url in enumerate(tqdm(urls, desc="Extracting content", unit="URL", disable=not verbose)):
-        try:
-            if verbose:
-                print(f"\nURL {i+1}/{total_urls}: {url}")
-                process_start = time.time()
-            
-            retry_count = 0
-            while retry_count <= max_retries:
-                # If this is a retry, let the user know
-                if retry_count > 0 and verbose:
-                    print(f"  Retry {retry_count}/{max_retries}...")
-                
+    try:
+        if verbose and progress.resumed:
+            print(f"Resuming: {progress.resumed} URLs recovered from journal, {len(todo)} remaining")
+        
+        if concurrency <= 1 or len(todo) <= 1:
+            log = print if verbose else (lambda line: None)
+            for i in tqdm(todo, desc="Extracting content", unit="URL", disable=not verbose):
+                url = urls[i]
+                if ctx.deadline_expired:
+                    progress.skip(i, DEADLINE_REACHED)
+                    continue
                 try:
-                    # Start a timer for this extraction
-                    start_time = time.time()
-                    
-                    # Try to extract content with timeout
-                    extracted_text, error = extractor.extract_text(
-                        url=url,
-                        api_key=extractor_config.get('api_key'),
-                        timeout=request_timeout,
-                        target_selector=extractor_config.get('target_selector'),
-                        remove_selector=extractor_config.get('remove_selector'),
-                        links_handling=extractor_config.get('links_handling'),
-                        links_summary=extractor_config.get('links_summary')
-                    )
-                    
-                    # Calculate how long the extraction took
-                    elapsed = time.time() - start_time
-                    
-                    # If successful, break the retry loop
-                    if extracted_text is not None:
-                        if verbose:
-                            content_length = len(extracted_text)
-                            print(f"  ✓ Success: Got {content_length} characters in {elapsed:.2f}s")
-                        break
-                    
-                    # If there was an error but not a timeout, maybe retry
                     if verbose:
-                        print(f"  ✗ Error: {error} ({elapsed:.2f}s)")
+                        print(f"\nURL {i+1}/{total_urls}: {url}")
+                    process_start = time.time()
                     
-                    if "timeout" in str(error).lower() or elapsed >= request_timeout * 0.9:
-                        # If we've timed out, we might want to try one more time
-                        if verbose and retry_count < max_retries:
-                            print(f"  Request timed out, will retry...")
-                    else:
-                        # For other errors, don't retry
-                        break
+                    extracted_text, error, attempts, from_cache = _extract_url(ctx, url, log)
+                    progress.record(i, extracted_text, error, attempts, from_cache)
                     
-                except Exception as e:
-                    # Catch any unexpected exceptions
-                    error = str(e)
+                    # Show overall progress
                     if verbose:
-                        print(f"  ✗ Exception: {error}")
+                        progress.print_progress(time.time() - process_start)
                 
-                retry_count += 1
-            
-            # Add the result to our list (could be None if all retries failed)
-            url_contents.append((url, extracted_text, error))
-            
-            # Count failures for reporting
-            if extracted_text is None:
-                failed_urls += 1
+                except KeyboardInterrupt:
+                    # Allow the user to skip a URL if it's taking too long
+                    if verbose:
+                        print("\nSkipping this URL due to user interruption...")
+                    progress.skip(i)
+        else:
+            if verbose:
+                print(f"Extracting with {min(concurrency, len(todo))} parallel workers")
             
-            if verbose and extracted_text is None:
-                print(f"  ✗ Failed to extract content after {retry_count} attempts")
+            def worker(url):
+                # Buffer log lines so each URL's output is printed as one block
+                lines = []
+                process_start = time.time()
+                result = _extract_url(ctx, url, lines.append)
+                return result, lines, time.time() - process_start
             
-            # Show overall progress
-            if verbose:
-                process_time = time.time() - process_start
-                print(f"  Completed in {process_time:.2f}s")
-                
-                # Provide progress summary
-                successful = i + 1 - failed_urls - skipped_urls
-                print(f"  Progress: {i+1}/{total_urls} URLs processed ({successful} successful, {failed_urls} failed, {skipped_urls} skipped)")
-        
-        except KeyboardInterrupt:
-            # Allow the user to skip a URL if it's taking too long
-            if verbose:
-                print("\nSkipping this URL due to user interruption...")
-            skipped_urls += 1
-            url_contents.append((url, None, "Skipped by user"))
+            executor = ThreadPoolExecutor(max_workers=min(concurrency, len(todo)))
+            # Start the longest jobs first and spread them across hosts, so one
+            # busy domain cannot hold every worker and no straggler starts last
+            futures = {executor.submit(worker, urls[i]): i for i in ctx.dispatch_order(urls, todo)}
+            wait_limit = run_deadline.remaining() if run_deadline is not None else None
+            try:
+                for future in tqdm(as_completed(futures, timeout=wait_limit), total=len(todo),
+                                   desc="Extracting content", unit="URL", disable=not verbose):
+                    i = futures[future]
+                    result, lines, process_time = _worker_result(future)
+                    if verbose:
+                        progress.print_url_block(i, lines)
+                    progress.record(i, *result)
+                    if verbose:
+                        progress.print_progress(process_time)
+            except KeyboardInterrupt:
+                # Abandon everything that has not finished yet
+                if verbose:
+                    print("\nSkipping remaining URLs due to user interruption...")
+                for i in progress.pending():
+                    progress.skip(i)
+            except FuturesTimeoutError:
+                # Requests still in flight cannot outlive the deadline by more
+                # than their shrunken timeout; their results are discarded
+                for i in progress.pending():
+                    progress.skip(i, DEADLINE_REACHED)
+            finally:
+                _finish_workers(ctx, executor, futures, verbose)
+    finally:
+        # Release the extractor's pooled connections, also when the run fails
+        ctx.close()
     
     # Show final statistics if verbose
     if verbose:
-        successful = total_urls - failed_urls - skipped_urls
-        print(f"\nExtraction complete: {total_urls} URLs processed")
-        print(f"  {successful} successful, {failed_urls} failed, {skipped_urls} skipped")
+        progress.print_summary(ctx.retry_budget, run_deadline, ctx.breakers, ctx.politeness,
+                               ctx.rate_limits, ctx.key_pools, ctx.url_rewrites)
+    
+    if writer is not None:
+        writer.close()
+        return stream_to
     
     # Format the final output
-    return format_output(original_content, url_contents)
+    return format_output(original_content, progress.url_contents, aliases=aliases)
+
+
+async def augment_research_report_async(
+    report_text: str,
+    extractor_type: str = "local_bs4",
+    extractor_config: Optional[Dict] = None,
+    extraction_mode: str = "default",
+    request_timeout: int = 15,
+    verbose: bool = True,
+    concurrency: int = 10,
+    cache=None,
+    stream_to: Optional[str] = None,
+    journal=None,
+    retry_policy=None,
+    retry_budget=None,
+    deadline: Optional[float] = None,
+    breakers=None,
+    politeness=None,
+    rate_limits=None,
+    key_pools=None,
+    canonicalize_urls: bool = True,
+    parse_pool=None,
+    url_rewrites=None,
+    timeouts=None
+) -> str:
+    """
+    Coroutine version of augment_research_report.
+    
+    All requests run on the calling event loop through the extractors'
+    extract_text_async, so the augmentor can be awaited from asyncio
+    services. At most `concurrency` URLs are in flight at once, sharing a
+    single aiohttp session when aiohttp is installed.
+    
+    Args:
+        Same as augment_research_report; concurrency defaults to 10.
+    
+    Returns:
+        A string containing the original report followed by appended content
+    """
+    from utils import format_output
+    from extractors import aio
+    
+    run_deadline = Deadline(deadline) if deadline is not None else None
+    extractor_config, extractor, original_content, urls, aliases = _prepare_run(
+        report_text, extractor_type, extractor_config, extraction_mode, verbose, concurrency,
+        canonicalize_urls
+    )
+    
+    writer = None
+    if stream_to:
+        from report_writer import StreamingReportWriter
+        writer = StreamingReportWriter(stream_to, original_content, urls, max_buffered=max(16, 2 * concurrency),
+                                       aliases=aliases)
+    
+    progress = _ExtractionProgress(urls, verbose, writer, journal)
+    progress.fetches_saved = sum(len(spellings) - 1 for spellings in aliases.values())
+    progress.resume_from_journal()
+    ctx = _make_run_context(extractor, extractor_type, extractor_config, request_timeout,
+                            len(progress.pending()), retry_policy=retry_policy,
+                            retry_budget=retry_budget, cache=cache, deadline=run_deadline,
+                            breakers=breakers, politeness=politeness, rate_limits=rate_limits,
+                            key_pools=key_pools, parse_pool=parse_pool, url_rewrites=url_rewrites,
+                            timeouts=timeouts, concurrency=concurrency)
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    
+    async def worker(i, url, session):
+        async with semaphore:
+            lines = []
+            process_start = time.time()
+            try:
+                result = await _extract_url_async(ctx, url, lines.append, session)
+            except Exception as e:
+                # As in the threaded run: fail this URL, keep the others
+                result, line = _unexpected_error_result(e)
+                lines.append(line)
+        process_time = time.time() - process_start
+        if verbose:
+            progress.print_url_block(i, lines)
+        progress.record(i, *result)
+        if verbose:
+            progress.print_progress(process_time)
+    
+    async def run_all(session=None):
+        order = ctx.dispatch_order(urls, progress.pending())
+        tasks = [asyncio.ensure_future(worker(i, urls[i], session)) for i in order]
+        if not tasks:
+            return
+        wait_limit = run_deadline.remaining() if run_deadline is not None else None
+        _, unfinished = await asyncio.wait(tasks, timeout=wait_limit)
+        for task in unfinished:
+            task.cancel()
+        for i, result in zip(order, await asyncio.gather(*tasks, return_exceptions=True)):
+            if isinstance(result, Exception) and not progress.done[i]:
+                progress.record(i, *_unexpected_error_result(result)[0])
+        for i in progress.pending():
+            progress.skip(i, DEADLINE_REACHED)
+    
+    try:
+        if urls and aio.aiohttp_available():
+            connector = aio.aiohttp.TCPConnector(limit=max(1, concurrency))
+            async with aio.aiohttp.ClientSession(connector=connector) as session:
+                await run_all(session)
+        else:
+            await run_all()
+    finally:
+        # Every task has finished or been cancelled, so nothing uses ctx any more
+        ctx.close()
+    
+    if verbose:
+        progress.print_summary(ctx.retry_budget, run_deadline, ctx.breakers, ctx.politeness,
+                               ctx.rate_limits, ctx.key_pools, ctx.url_rewrites)
+    
+    if writer is not None:
+        writer.close()
+        return stream_to
+    
+    return format_output(original_content, progress.url_contents, aliases=aliases)
+
+
+def augment_research_report_pipelined(
+    report_chunks: Iterable[str],
+    extractor_type: str = "local_bs4",
+    extractor_config: Optional[Dict] = None,
+    extraction_mode: str = "default",
+    request_timeout: int = 15,
+    verbose: bool = True,
+    concurrency: int = 4,
+    cache=None,
+    stream_to: Optional[str] = None,
+    journal=None,
+    retry_policy=None,
+    retry_budget=None,
+    deadline: Optional[float] = None,
+    breakers=None,
+    politeness=None,
+    rate_limits=None,
+    key_pools=None,
+    canonicalize_urls: bool = True,
+    parse_pool=None,
+    url_rewrites=None,
+    timeouts=None
+) -> str:
+    """
+    Augment a report that is read incrementally, fetching while parsing.
+    
+    Each page is handed to a worker as soon as the parser finds its first
+    citation, so network I/O overlaps with reading the input (e.g. a report
+    piped in from another tool). Duplicates are merged on the fly. With
+    stream_to the report is passed through to the output file as it is
+    read and reference sections follow as they finish.
+    
+    Unlike augment_research_report, pages are fetched in citation order
+    rather than interleaved across hosts (the per-host politeness limits
+    still apply), and the first spelling of a page is the one fetched.
+    
+    Args:
+        report_chunks: The report in consecutive pieces, e.g.
+                       pipeline.read_report_chunks("-") for standard input
+        Other arguments: same as augment_research_report; concurrency
+                         defaults to 4. Without retry_budget, the default
+                         budget grows with the number of URLs found.
+    
+    Returns:
+        The original report followed by appended content, or the output
+        path when stream_to is set
+    """
+    from utils import format_output
+    from pipeline import ReferenceStream
+    import queue
+    
+    run_deadline = Deadline(deadline) if deadline is not None else None
+    extractor_config, extractor = _build_extractor(extractor_type, extractor_config, extraction_mode, concurrency)
+    stream = ReferenceStream(canonicalize_urls, keep_text=not stream_to)
+    
+    urls = []
+    writer = None
+    if stream_to:
+        from report_writer import StreamingReportWriter
+        writer = StreamingReportWriter(stream_to, None, urls, max_buffered=max(16, 2 * concurrency),
+                                       aliases=stream.aliases)
+    progress = _ExtractionProgress(urls, verbose, writer, journal)
+    ctx = _make_run_context(extractor, extractor_type, extractor_config, request_timeout, 0,
+                            retry_policy=retry_policy, retry_budget=retry_budget, cache=cache,
+                            deadline=run_deadline, breakers=breakers, politeness=politeness,
+                            rate_limits=rate_limits, key_pools=key_pools, parse_pool=parse_pool,
+                            url_rewrites=url_rewrites, timeouts=timeouts,
+                            concurrency=concurrency)
+    
+    def worker(url):
+        lines = []
+        process_start = time.time()
+        result = _extract_url(ctx, url, lines.append)
+        return result, lines, time.time() - process_start
+    
+    executor = ThreadPoolExecutor(max_workers=max(1, concurrency))
+    futures = {}
+    finished = queue.Queue()
+    
+    def submit(new_urls):
+        for url in new_urls:
+            index = progress.add_url(url)
+            if retry_budget is None:
+                ctx.retry_budget.extend_for_urls(len(urls), ctx.retry_policy.max_retries)
+            if index is None:
+                continue
+            if ctx.deadline_expired:
+                progress.skip(index, DEADLINE_REACHED)
+                continue
+            if verbose:
+                print(f"Found URL {index+1}: {url}")
+            future = executor.submit(worker, url)
+            futures[future] = index
+            future.add_done_callback(finished.put)
+    
+    def record(future):
+        i = futures.pop(future)
+        result, lines, process_time = _worker_result(future)
+        if verbose:
+            progress.print_url_block(i, lines)
+        progress.record(i, *result)
+        if verbose:
+            progress.print_progress(process_time)
+    
+    try:
+        for chunk in report_chunks:
+            if writer is not None:
+                writer.write_original(chunk)
+            submit(stream.feed(chunk))
+            # Record what has finished meanwhile, so streamed sections keep flowing
+            while not finished.empty():
+                record(finished.get())
+        submit(stream.close())
+        if writer is not None:
+            writer.begin_appendix()
+        
+        while futures:
+            timeout = run_deadline.remaining() if run_deadline is not None else None
+            try:
+                record(finished.get(timeout=timeout))
+            except queue.Empty:
+                # Requests still in flight are abandoned at the deadline
+                for i in progress.pending():
+                    progress.skip(i, DEADLINE_REACHED)
+                break
+    except KeyboardInterrupt:
+        if verbose:
+            print("\nSkipping remaining URLs due to user interruption...")
+        for i in progress.pending():
+            progress.skip(i)
+    finally:
+        _finish_workers(ctx, executor, list(futures), verbose)
+        # Release the extractor's pooled connections, also when the run fails
+        ctx.close()
+    
+    progress.fetches_saved = stream.fetches_saved
+    
+    if verbose:
+        progress.print_summary(ctx.retry_budget, run_deadline, ctx.breakers, ctx.politeness,
+                               ctx.rate_limits, ctx.key_pools, ctx.url_rewrites)
+    
+    if writer is not None:
+        writer.close()
+        return stream_to
+    
+    return format_output(stream.text, progress.url_contents, aliases=stream.aliases)
+
+
+def _set_api_keys(config, key_name: str, provider: str, values: List[str]) -> None:
+    """Store one API key, or a pool of keys given as separate or comma-separated values."""
+    keys = [key.strip() for value in values for key in value.split(",") if key.strip()]
+    if len(keys) == 1:
+        config.set_api_key(key_name, keys[0])
+        print(f"{provider} API key has been set successfully.")
+    else:
+        config.set_api_keys(key_name, keys)
+        print(f"{len(keys)} {provider} API keys have been set successfully.")
+
+
+def _format_key_usage(counters: Dict) -> str:
+    """Summarize a key's usage counters for --show-keys."""
+    if not counters:
+        return ""
+    parts = [f"{int(counters.get('requests', 0))} requests", f"{int(counters.get('ok', 0))} ok"]
+    for field in sorted(counters):
+        if field.startswith("http_"):
+            parts.append(f"{int(counters[field])} x HTTP {field[5:]}")
+    return f"  ({', '.join(parts)})"
+
+
+def _extractor_arg(value: str) -> str:
+    """argparse type for --extractor: a single extractor or a comma-separated chain."""
+    import argparse
+    try:
+        return ",".join(parse_extractor_chain(value))
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
 
 
 def main():
@@ -388,20 +1651,76 @@ def main():
     parser = argparse.ArgumentParser(description="Reference Augmentor - Enhance research reports with referenced content")
     
     # Standard arguments
-    parser.add_argument("input_file", nargs="?", help="Path to the input report file")
-    parser.add_argument("--extractor", choices=["jina", "firecrawl", "local_bs4"], 
-                        default="local_bs4", help="Content extraction method")
+    parser.add_argument("input_file", nargs="?", help="Path to the input report file, or - for standard input")
+    parser.add_argument("--extractor", type=_extractor_arg, default="local_bs4",
+                        help="Content extraction method (jina, firecrawl, local_bs4), "
+                             "or a comma-separated fallback chain such as jina,local_bs4")
+    parser.add_argument("--hedge", action="store_true",
+                        help="With an extractor chain, start the next extractor when the primary is slow "
+                             "instead of only after it fails")
+    parser.add_argument("--hedge-percentile", type=float, default=95.0, metavar="P",
+                        help="Primary latency percentile after which a hedged request is started (default: 95)")
     parser.add_argument("--output", help="Output file path (default: print to stdout)")
-    parser.add_argument("--timeout", type=int, default=15, help="HTTP request timeout in seconds")
+    parser.add_argument("--timeout", type=int, help="HTTP request timeout in seconds (default: 15)")
+    parser.add_argument("--concurrency", type=int, default=1, help="Number of URLs to extract in parallel")
+    parser.add_argument("--no-adaptive-timeouts", action="store_true",
+                        help="Use --timeout for every request instead of timeouts learned per host")
+    
+    parser.add_argument("--deadline", type=float, metavar="SECONDS",
+                        help="Wall-time budget for the whole run; unfinished references are marked")
+    parser.add_argument("--max-retries", type=int, default=2, help="Retries per URL for transient failures")
+    parser.add_argument("--retry-budget", type=int, metavar="N", help="Total retries allowed across the run")
+    
+    parser.add_argument("--per-host", type=int, default=2, metavar="N",
+                        help="Maximum concurrent requests to one host (local_bs4)")
+    parser.add_argument("--host-delay", type=float, default=0.5, metavar="SECONDS",
+                        help="Minimum spacing between requests to one host (local_bs4)")
+    parser.add_argument("--ignore-robots", action="store_true",
+                        help="Do not fetch or obey robots.txt (local_bs4)")
+    parser.add_argument("--no-rate-limit", action="store_true",
+                        help="Do not pace Jina/Firecrawl calls to the configured requests-per-minute")
+    parser.add_argument("--breaker-threshold", type=int, default=5, metavar="N",
+                        help="Consecutive failures that open a provider/host circuit breaker")
+    parser.add_argument("--breaker-cooldown", type=float, default=30.0, metavar="SECONDS",
+                        help="How long an open circuit breaker fast-fails before probing again")
+    
+    parser.add_argument("--parse-workers", type=int, metavar="N",
+                        help="Processes converting pages for local_bs4 (default: one per CPU core, "
+                             "up to --concurrency; 0 parses in the download threads)")
+    parser.add_argument("--max-page-size", type=float, default=10.0, metavar="MB",
+                        help="Largest page local_bs4 downloads, in MB (default: 10; 0 for no limit)")
+    parser.add_argument("--max-pdf-pages", type=int, default=50, metavar="N",
+                        help="Pages local_bs4 extracts from a PDF (default: 50; 0 for all)")
+    parser.add_argument("--html-parser", choices=["auto", "lxml", "html.parser"], default="auto",
+                        help="HTML parser for local_bs4 (default: lxml when installed, else html.parser)")
+    parser.add_argument("--no-url-rewrites", action="store_true",
+                        help="Fetch cited URLs as they are, without the URL rewrite rules")
+    parser.add_argument("--keep-url-variants", action="store_true",
+                        help="Fetch every spelling of a URL separately instead of merging variants")
+    
+    parser.add_argument("--resume", action="store_true",
+                        help="Resume an interrupted run of this input file from its journal")
+    parser.add_argument("--stream", action="store_true",
+                        help="Write reference sections to --output as they complete (TOC at the end)")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="Start fetching references while the input is still being read")
+    
+    # Extraction cache options
+    cache_group = parser.add_argument_group('Extraction Cache')
+    cache_group.add_argument("--no-cache", action="store_true", help="Do not read or write the extraction cache")
+    cache_group.add_argument("--refresh", action="store_true", help="Re-fetch every URL, ignoring cached content")
+    cache_group.add_argument("--cache-ttl", type=float, metavar="SECONDS", help="Maximum age of cached content in seconds")
     # Add extraction mode argument with choices from predefined modes
     parser.add_argument("--mode", choices=list(EXTRACTION_MODES.keys()), default="default",
-                      help="Content extraction mode (Jina API only)")
+                      help="Content extraction mode (Jina and local_bs4)")
     parser.add_argument("--usage", action="store_true", help="Display detailed usage guide")
     
     # API key management arguments
     key_group = parser.add_argument_group('API Key Management')
-    key_group.add_argument("--set-jina-key", metavar="KEY", help="Set Jina API key")
-    key_group.add_argument("--set-firecrawl-key", metavar="KEY", help="Set Firecrawl API key")
+    key_group.add_argument("--set-jina-key", metavar="KEY", nargs="+",
+                           help="Set Jina API key(s); several keys form a rotating pool")
+    key_group.add_argument("--set-firecrawl-key", metavar="KEY", nargs="+",
+                           help="Set Firecrawl API key(s); several keys form a rotating pool")
     key_group.add_argument("--clear-keys", action="store_true", help="Clear all stored API keys")
     key_group.add_argument("--show-keys", action="store_true", help="Show currently stored API keys (masked)")
     
@@ -412,19 +1731,21 @@ def main():
     parser.add_argument("--quiet", action="store_true", help="Suppress progress information (show only errors)")
     
     args = parser.parse_args()
+    # An explicit --timeout also caps the timeouts learned per host
+    timeout_given = args.timeout is not None
+    if not timeout_given:
+        args.timeout = 15
     
     # Initialize config manager
     config = ConfigManager()
     
     # Handle API key management commands
     if args.set_jina_key:
-        config.set_api_key("JINA_API_KEY", args.set_jina_key)
-        print("Jina API key has been set successfully.")
+        _set_api_keys(config, "JINA_API_KEY", "Jina", args.set_jina_key)
         return
         
     if args.set_firecrawl_key:
-        config.set_api_key("FIRECRAWL_API_KEY", args.set_firecrawl_key)
-        print("Firecrawl API key has been set successfully.")
+        _set_api_keys(config, "FIRECRAWL_API_KEY", "Firecrawl", args.set_firecrawl_key)
         return
         
     if args.clear_keys:
@@ -434,21 +1755,20 @@ def main():
         return
         
     if args.show_keys:
-        jina_key = config.get_api_key("JINA_API_KEY")
-        firecrawl_key = config.get_api_key("FIRECRAWL_API_KEY")
+        from key_pool import KeyUsage, mask_key
+        usage = KeyUsage(os.path.join(config.config_dir, "key_usage.json"))
         
         print("Currently stored API keys:")
-        if jina_key:
-            masked_key = jina_key[:4] + "*" * (len(jina_key) - 8) + jina_key[-4:] if len(jina_key) > 8 else "*" * len(jina_key)
-            print(f"JINA_API_KEY: {masked_key}")
-        else:
-            print("JINA_API_KEY: Not set")
-            
-        if firecrawl_key:
-            masked_key = firecrawl_key[:4] + "*" * (len(firecrawl_key) - 8) + firecrawl_key[-4:] if len(firecrawl_key) > 8 else "*" * len(firecrawl_key)
-            print(f"FIRECRAWL_API_KEY: {masked_key}")
-        else:
-            print("FIRECRAWL_API_KEY: Not set")
+        for key_name in ("JINA_API_KEY", "FIRECRAWL_API_KEY"):
+            keys = config.get_api_keys(key_name)
+            if not keys:
+                print(f"{key_name}: Not set")
+            elif len(keys) == 1:
+                print(f"{key_name}: {mask_key(keys[0])}{_format_key_usage(usage.for_key(keys[0]))}")
+            else:
+                print(f"{key_name}: {len(keys)} keys")
+                for number, key in enumerate(keys, 1):
+                    print(f"  {number}. {mask_key(key)}{_format_key_usage(usage.for_key(key))}")
         return
     
     # Check for usage flag
@@ -459,70 +1779,204 @@ def main():
     # Ensure input file is provided for normal operation
     if not args.input_file:
         parser.error("Input file is required unless using API key management commands")
+    if args.stream and not args.output:
+        parser.error("--stream requires --output")
+    if args.debug and (args.pipeline or args.input_file == "-"):
+        parser.error("--debug requires an input file and cannot be combined with --pipeline")
+    if args.resume and args.input_file == "-":
+        parser.error("--resume requires an input file; standard input is not journaled")
+    if args.html_parser != "auto":
+        from extractors.html_parsing import available_backends
+        if args.html_parser not in available_backends():
+            parser.error(f"--html-parser {args.html_parser} is not installed (pip install {args.html_parser})")
     
     try:
-        # Read input file
-        with open(args.input_file, 'r', encoding='utf-8') as f:
-            report_text = f.read()
+        # Read input file, or leave it to be read while fetching
+        report_text = None
+        if args.pipeline:
+            from pipeline import read_report_chunks
+            report_chunks = read_report_chunks(args.input_file)
+        elif args.input_file == "-":
+            report_text = sys.stdin.read()
+        else:
+            with open(args.input_file, 'r', encoding='utf-8') as f:
+                report_text = f.read()
         
         # Create extractor config with API keys
         extractor_config = {}
-        if args.extractor == "jina":
-            api_key = config.get_api_key("JINA_API_KEY")
-            if not api_key:
-                print("Jina API key not found in configuration.")
-                print("Please set it using: --set-jina-key YOUR_API_KEY")
-                return
-            extractor_config['api_key'] = api_key
-        elif args.extractor == "firecrawl":
-            api_key = config.get_api_key("FIRECRAWL_API_KEY")
-            if not api_key:
-                print("Firecrawl API key not found in configuration.")
-                print("Please set it using: --set-firecrawl-key YOUR_API_KEY")
-                return
-            extractor_config['api_key'] = api_key
+        extractor_names = parse_extractor_chain(args.extractor)
+        api_keys = {}
+        for name in extractor_names:
+            if name == "jina":
+                api_key = config.get_api_key("JINA_API_KEY")
+                if not api_key:
+                    print("Jina API key not found in configuration.")
+                    print("Please set it using: --set-jina-key YOUR_API_KEY")
+                    return
+                api_keys[name] = api_key
+            elif name == "firecrawl":
+                api_key = config.get_api_key("FIRECRAWL_API_KEY")
+                if not api_key:
+                    print("Firecrawl API key not found in configuration.")
+                    print("Please set it using: --set-firecrawl-key YOUR_API_KEY")
+                    return
+                api_keys[name] = api_key
         
-        # Handle debug mode
-        if args.debug:
-            from debug_wrapper import run_with_debug
-            try:
-                result, debug_dir = run_with_debug(
-                    args.input_file,
-                    args.extractor,
-                    args.output,
-                    args.timeout,
-                    args.mode,
-                    extractor_config
-                )
-                
-                if not args.output:
-                    print(result)
-                    
-                print(f"\nDebug artifacts saved to {debug_dir}")
-                
-            except Exception as e:
-                print(f"Error in debug mode: {str(e)}", file=sys.stderr)
-                traceback.print_exc()
-                sys.exit(1)
-            return
+        if len(extractor_names) > 1:
+            extractor_config['chain_mode'] = "hedge" if args.hedge else "fallback"
+            extractor_config['hedge_percentile'] = args.hedge_percentile
+            if api_keys:
+                extractor_config['api_keys'] = api_keys
+        elif api_keys:
+            extractor_config['api_key'] = api_keys[extractor_names[0]]
+        if "local_bs4" in extractor_names:
+            if args.html_parser != "auto":
+                extractor_config['html_parser'] = args.html_parser
+            extractor_config['max_bytes'] = int(max(0.0, args.max_page_size) * 1024 * 1024)
+            extractor_config['max_pdf_pages'] = max(0, args.max_pdf_pages)
         
-        # Process the report (normal mode)
-        augmented_report = augment_research_report(
-            report_text=report_text,
-            extractor_type=args.extractor,
-            extractor_config=extractor_config,
-            extraction_mode=args.mode,
-            request_timeout=args.timeout,
-            verbose=not args.quiet
-        )
-        
-        # Output the result
-        if args.output:
-            with open(args.output, 'w', encoding='utf-8') as f:
-                f.write(augmented_report)
-            print(f"Augmented report written to {args.output}")
-        else:
-            print(augmented_report)
+        # Open the extraction cache unless disabled
+        cache = None
+        if not args.no_cache:
+            from extraction_cache import ExtractionCache
+            cache = ExtractionCache.from_config(config, refresh=args.refresh, ttl_seconds=args.cache_ttl)
+        
+        # Journal every result so an interrupted run can be resumed; standard
+        # input cannot be read again, so those runs are not journaled
+        journal = None
+        if args.input_file != "-":
+            from run_journal import RunJournal
+            journal = RunJournal.for_input(
+                config.config_dir, args.input_file,
+                {"extractor": args.extractor, "mode": args.mode},
+                resume=args.resume
+            )
+            if args.resume and not journal.resuming:
+                print("No resumable journal found for this input file; starting from scratch.")
+        
+        # Retry transient failures with backoff, within a run-wide budget
+        from retry_policy import RetryPolicy, RetryBudget
+        retry_policy = RetryPolicy(max_retries=max(0, args.max_retries))
+        retry_budget = RetryBudget(args.retry_budget) if args.retry_budget is not None else None
+        from circuit_breaker import CircuitBreakerRegistry
+        breakers = CircuitBreakerRegistry(max(1, args.breaker_threshold), args.breaker_cooldown, retry_policy)
+        from extractors.politeness import HostScheduler
+        politeness = HostScheduler(args.per_host, args.host_delay, respect_robots=not args.ignore_robots)
+        
+        # Convert pages fetched by local_bs4 in worker processes
+        parse_pool = None
+        if args.parse_workers is not None:
+            from extractors.parse_pool import ParsePool
+            parse_pool = ParsePool(args.parse_workers)
+        
+        # Route references to lightweight endpoints (built-in and configured rules)
+        from url_rewrites import UrlRewriter
+        url_rewrites = UrlRewriter([]) if args.no_url_rewrites else UrlRewriter.from_config(config)
+        
+        # Time requests out per host, from the latency history of earlier runs
+        timeouts = None
+        if not args.no_adaptive_timeouts:
+            from latency_store import AdaptiveTimeouts
+            timeouts = AdaptiveTimeouts.from_config(config, args.timeout,
+                                                    ceiling=args.timeout if timeout_given else None)
+        
+        # Spread requests over every stored key of each provider
+        from key_pool import KeyUsage, pools_from_config
+        key_usage = KeyUsage(os.path.join(config.config_dir, "key_usage.json"))
+        key_pools = pools_from_config(config, key_usage)
+        
+        # Stay under the provider plans' request rates, shared with other runs
+        rate_limits = None
+        if not args.no_rate_limit:
+            from rate_limiter import RateLimits
+            rate_limits = RateLimits.from_config(config, {host: len(pool) for host, pool in key_pools.items()})
+        
+        try:
+            # Handle debug mode
+            if args.debug:
+                from debug_wrapper import run_with_debug
+                try:
+                    result, debug_dir = run_with_debug(
+                        args.input_file,
+                        args.extractor,
+                        args.output,
+                        args.timeout,
+                        args.mode,
+                        extractor_config,
+                        concurrency=args.concurrency,
+                        cache=cache,
+                        journal=journal,
+                        retry_policy=retry_policy,
+                        retry_budget=retry_budget,
+                        deadline=args.deadline,
+                        breakers=breakers,
+                        politeness=politeness,
+                        rate_limits=rate_limits,
+                        key_pools=key_pools,
+                        canonicalize_urls=not args.keep_url_variants,
+                        parse_pool=parse_pool,
+                        url_rewrites=url_rewrites,
+                        timeouts=timeouts
+                    )
+                    
+                    if not args.output:
+                        print(result)
+                        
+                    print(f"\nDebug artifacts saved to {debug_dir}")
+                    
+                except Exception as e:
+                    print(f"Error in debug mode: {str(e)}", file=sys.stderr)
+                    traceback.print_exc()
+                    sys.exit(1)
+                return
+            
+            # Process the report (normal mode)
+            if args.pipeline:
+                run, report_input = augment_research_report_pipelined, {"report_chunks": report_chunks}
+            else:
+                run, report_input = augment_research_report, {"report_text": report_text}
+            augmented_report = run(
+                **report_input,
+                extractor_type=args.extractor,
+                extractor_config=extractor_config,
+                extraction_mode=args.mode,
+                request_timeout=args.timeout,
+                verbose=not args.quiet,
+                concurrency=args.concurrency,
+                cache=cache,
+                stream_to=args.output if args.stream else None,
+                journal=journal,
+                retry_policy=retry_policy,
+                retry_budget=retry_budget,
+                deadline=args.deadline,
+                breakers=breakers,
+                politeness=politeness,
+                rate_limits=rate_limits,
+                key_pools=key_pools,
+                canonicalize_urls=not args.keep_url_variants,
+                parse_pool=parse_pool,
+                url_rewrites=url_rewrites,
+                timeouts=timeouts
+            )
+            
+            # Output the result
+            if args.stream:
+                print(f"Augmented report written to {args.output}")
+            elif args.output:
+                with open(args.output, 'w', encoding='utf-8') as f:
+                    f.write(augmented_report)
+                print(f"Augmented report written to {args.output}")
+            else:
+                print(augmented_report)
+        finally:
+            # Save what the run learned and release its files, also when it fails
+            if journal is not None:
+                journal.close()
+            key_usage.save()
+            if timeouts is not None:
+                timeouts.close()
+            if cache is not None:
+                cache.close()
             
     except Exception as e:
         print(f"Error: {str(e)}", file=sys.stderr)
@@ -530,6 +1984,8 @@ def main():
 
 
 if __name__ == "__main__":
+    # Parse pool workers re-run this module in frozen (PyInstaller) builds
+    multiprocessing.freeze_support()
     # Check for usage flag without requiring argparse
     if "--usage" in sys.argv:
         print_usage()
@@ -0,0 +1,109 @@
+"""
+Incremental input for pipelined runs.
+
+ReferenceStream reads a report piece by piece, parses references as their
+lines arrive and deduplicates them on the fly (with the same URL
+canonicalization as batch runs), so each new page can be handed to a fetch
+worker while the rest of the report is still being read or generated.
+"""
+import sys
+from typing import Dict, Iterator, List, Optional
+
+from reference_parser import ReferenceParser
+from utils import canonicalize_url, clean_url
+
+# Characters read at a time from a file; stdin is read line by line so
+# references are seen as soon as the producer writes them
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+
+def read_report_chunks(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+    """
+    Read a report incrementally.
+
+    Args:
+        path: Report file path, or "-" for standard input
+        chunk_size: Characters per chunk when reading a file
+
+    Yields:
+        Consecutive pieces of the report
+    """
+    if path == "-":
+        yield from iter(sys.stdin.readline, "")
+        return
+    with open(path, 'r', encoding='utf-8') as f:
+        yield from iter(lambda: f.read(chunk_size), "")
+
+
+class ReferenceStream:
+    """Finds the pages to fetch in a report that is still being read."""
+
+    def __init__(self, canonicalize_urls: bool = True, keep_text: bool = True):
+        """
+        Args:
+            canonicalize_urls: Merge spellings of the same page (see utils.canonicalize_url)
+            keep_text: Keep the report text for the final output; not needed
+                       when it is passed straight through to a writer
+        """
+        self.canonicalize_urls = canonicalize_urls
+        self.keep_text = keep_text
+        self.urls: List[str] = []
+        self.aliases: Dict[str, List[str]] = {}
+        self._parser = ReferenceParser()
+        self._by_key: Dict[str, str] = {}
+        self._parts: List[str] = []
+
+    @property
+    def text(self) -> str:
+        """The report read so far (empty unless keep_text)."""
+        return "".join(self._parts)
+
+    @property
+    def fetches_saved(self) -> int:
+        """Distinct spellings merged into a page fetched under another spelling."""
+        return sum(len(spellings) - 1 for spellings in self.aliases.values())
+
+    def feed(self, chunk: str) -> List[str]:
+        """
+        Read the next piece of the report.
+
+        Returns:
+            URLs of pages cited for the first time in it, to be fetched
+        """
+        if self.keep_text:
+            self._parts.append(chunk)
+        return self._add(reference.url for reference in self._parser.feed(chunk))
+
+    def close(self) -> List[str]:
+        """
+        Finish reading.
+
+        Returns:
+            New pages cited in the last line, plus the body links of a
+            report without a reference section
+        """
+        return self._add(reference.url for reference in self._parser.close())
+
+    def _add(self, cited_urls) -> List[str]:
+        new_urls = []
+        for url in cited_urls:
+            fetch_url = self._merge(url)
+            if fetch_url is not None:
+                new_urls.append(fetch_url)
+        return new_urls
+
+    def _merge(self, url: str) -> Optional[str]:
+        """Record one citation; returns the URL to fetch if it is a new page."""
+        key = canonicalize_url(url) if self.canonicalize_urls else url
+        fetch_url = self._by_key.get(key)
+        if fetch_url is not None:
+            if url not in self.aliases[fetch_url]:
+                self.aliases[fetch_url].append(url)
+            return None
+        # Unlike a batch run the first spelling is fetched, as the request
+        # starts before any better spelling can be seen
+        fetch_url = clean_url(url) if self.canonicalize_urls else url
+        self._by_key[key] = fetch_url
+        self.urls.append(fetch_url)
+        self.aliases[fetch_url] = [url]
+        return fetch_url
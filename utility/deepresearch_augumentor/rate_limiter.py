@@ -0,0 +1,195 @@
+"""
+Client-side rate limiting for the Jina and Firecrawl APIs.
+
+Each provider gets a token bucket refilled at its plan's requests-per-minute
+rate. Bucket state lives in a small file under the config directory and is
+updated under an exclusive file lock, so several runs on the same machine
+share one budget instead of each assuming it has the whole quota.
+
+Requests reserve a token even when the bucket is empty and then wait until
+that token is due, which keeps requests flowing at exactly the configured
+rate without polling. The bucket goes at most one burst into debt: once it
+is that far behind, callers wait for room before reserving, so many
+processes queueing at once cannot push each other's waits out without bound.
+"""
+import asyncio
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# provider host -> (config setting, default requests per minute)
+PROVIDER_LIMITS = {
+    "r.jina.ai": ("JINA_REQUESTS_PER_MINUTE", 200),
+    "api.firecrawl.dev": ("FIRECRAWL_REQUESTS_PER_MINUTE", 20),
+}
+
+# Seconds of full-rate traffic a bucket may hold, i.e. its burst size
+DEFAULT_BURST_SECONDS = 5
+
+
+class FileLock:
+    """Exclusive lock on an open file, shared by threads and processes."""
+
+    def __init__(self, handle):
+        self.handle = handle
+
+    def __enter__(self):
+        if fcntl is not None:
+            fcntl.flock(self.handle.fileno(), fcntl.LOCK_EX)
+        else:
+            self.handle.seek(0)
+            msvcrt.locking(self.handle.fileno(), msvcrt.LK_LOCK, 1)
+        return self
+
+    def __exit__(self, *exc_info):
+        if fcntl is not None:
+            fcntl.flock(self.handle.fileno(), fcntl.LOCK_UN)
+        else:
+            self.handle.seek(0)
+            msvcrt.locking(self.handle.fileno(), msvcrt.LK_UNLCK, 1)
+        return False
+
+
+class TokenBucket:
+    """Token bucket whose state is stored in a file shared between processes."""
+
+    def __init__(self, path: str, requests_per_minute: float, burst: Optional[float] = None):
+        """
+        Args:
+            path: File holding the bucket state
+            requests_per_minute: Sustained request rate allowed
+            burst: Maximum tokens the bucket can hold (default: 5 seconds' worth);
+                   at least 1, since a request always needs a whole token
+        """
+        self.path = path
+        self.rate = requests_per_minute / 60.0
+        self.capacity = max(1.0, burst if burst is not None else self.rate * DEFAULT_BURST_SECONDS)
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    def try_reserve(self) -> Tuple[bool, float]:
+        """
+        Take one token, going at most one burst into debt.
+
+        Returns:
+            (True, seconds to wait before the reserved request may be sent), or
+            (False, seconds until a token can be reserved) if the bucket is
+            already a full burst in debt
+        """
+        with self._lock, open(self.path, "a+") as handle, FileLock(handle):
+            handle.seek(0)
+            try:
+                state = json.loads(handle.read() or "{}")
+            except ValueError:
+                state = {}
+            now = time.time()
+            tokens = max(-self.capacity, float(state.get("tokens", self.capacity)))
+            updated = float(state.get("updated", now))
+            tokens = min(self.capacity, tokens + max(0.0, now - updated) * self.rate)
+            if tokens - 1 < -self.capacity:
+                return False, (-self.capacity - (tokens - 1)) / self.rate
+            tokens -= 1
+            handle.seek(0)
+            handle.truncate()
+            handle.write(json.dumps({"tokens": tokens, "updated": now}))
+            handle.flush()
+        return True, max(0.0, -tokens / self.rate)
+
+    def reserve(self) -> float:
+        """
+        Take one token, first waiting for room if the bucket is a full burst in debt.
+
+        Returns:
+            Seconds to wait before the reserved request may be sent
+        """
+        while True:
+            reserved, delay = self.try_reserve()
+            if reserved:
+                return delay
+            time.sleep(delay)
+
+
+class RateLimits:
+    """Token buckets by provider host; hosts without a bucket are not limited."""
+
+    def __init__(self, buckets: Dict[str, TokenBucket]):
+        self.buckets = buckets
+        self.waited: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config, key_counts: Optional[Dict[str, int]] = None) -> "RateLimits":
+        """
+        Build the provider buckets from ConfigManager settings.
+
+        JINA_REQUESTS_PER_MINUTE and FIRECRAWL_REQUESTS_PER_MINUTE set the
+        plan ceilings per API key (0 disables limiting for that provider);
+        the optional JINA_BURST / FIRECRAWL_BURST settings cap short bursts.
+
+        Raises:
+            ValueError: If a burst setting is negative
+
+        Args:
+            config: ConfigManager instance
+            key_counts: Number of API keys in each provider's pool; the
+                        provider's rate is multiplied by it
+        """
+        key_counts = key_counts or {}
+        buckets = {}
+        for host, (setting, default) in PROVIDER_LIMITS.items():
+            requests_per_minute = config.get_setting(setting, default)
+            if not requests_per_minute or requests_per_minute <= 0:
+                continue
+            requests_per_minute *= max(1, key_counts.get(host, 1))
+            burst_setting = setting.replace("REQUESTS_PER_MINUTE", "BURST")
+            burst = config.get_setting(burst_setting)
+            if burst is not None and burst < 0:
+                raise ValueError(f"{burst_setting} must not be negative, got {burst}")
+            path = os.path.join(config.config_dir, "ratelimits", f"{host}.json")
+            buckets[host] = TokenBucket(path, requests_per_minute, burst)
+        return cls(buckets)
+
+    def _record_wait(self, host: str, delay: float) -> None:
+        if delay > 0:
+            with self._lock:
+                self.waited[host] = self.waited.get(host, 0.0) + delay
+
+    def acquire(self, host: Optional[str]) -> float:
+        """Block until a request to host is within its rate; returns the time waited."""
+        bucket = self.buckets.get(host)
+        if bucket is None:
+            return 0.0
+        waited = 0.0
+        while True:
+            reserved, delay = bucket.try_reserve()
+            if delay > 0:
+                time.sleep(delay)
+            waited += delay
+            if reserved:
+                break
+        self._record_wait(host, waited)
+        return waited
+
+    async def acquire_async(self, host: Optional[str]) -> float:
+        """Coroutine version of acquire."""
+        bucket = self.buckets.get(host)
+        if bucket is None:
+            return 0.0
+        waited = 0.0
+        while True:
+            reserved, delay = await asyncio.to_thread(bucket.try_reserve)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            waited += delay
+            if reserved:
+                break
+        self._record_wait(host, waited)
+        return waited
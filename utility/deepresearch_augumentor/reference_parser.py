@@ -0,0 +1,296 @@
+"""
+Single-pass parser for the references of a research report.
+
+The report is read line by line, in chunks of any size, so multi-megabyte
+exports never need to be matched as one string and parsing time grows
+linearly with the input. The parser recognizes the reference section by
+its heading (References, Sources, Bibliography, Works Cited, ... as a
+Markdown, setext, bold, plain or HTML heading) and, within it, Markdown
+links `[title](url)`, HTML `<a href="url">title</a>`, numbered entries
+(`[3] ...`, `3. ...`, `[^3]: ...`) and bare URLs.
+
+Markdown footnote and link definitions (`[^3]: url`, `[label]: url`) are
+references wherever they appear. Links in the body of the report are
+inline context, not references, and are only used when the report has
+neither a recognizable reference section nor such definitions.
+"""
+import re
+from typing import Iterable, Iterator, List, Optional
+
+# Same URL shape parse_report has always matched: stops at whitespace,
+# angle brackets and unbalanced parentheses, and drops trailing punctuation
+URL_PATTERN = r'https?://[^\s()<>]+(?:\([\w\d]+\)|(?:[^,.;:!?()"\'\s<>]))'
+
+_LINK_RE = re.compile(
+    r'\[(?P<md_text>[^\[\]\n]*)\]\(\s*<?(?P<md_url>' + URL_PATTERN + r')'
+    r'|<a\b[^<>]*?\bhref\s*=\s*["\'](?P<href>https?://[^"\'\s>]+)["\'][^<>]*>(?P<a_text>[^<]*)'
+    r'|(?P<bare>' + URL_PATTERN + r')',
+    re.IGNORECASE,
+)
+
+SECTION_TITLES = (
+    "references", "reference list", "sources", "sources cited", "bibliography", "works cited",
+    "citations", "footnotes", "notes", "endnotes", "further reading", "links",
+)
+_TITLES = "|".join(re.escape(title) for title in SECTION_TITLES)
+
+# "## References", "## 7. Sources:", "**Bibliography**", "References:", "<h2>Sources</h2>"
+_MD_HEADING_RE = re.compile(r'^(#{1,6})\s+(.*?)\s*#*\s*$')
+_SECTION_TITLE_RE = re.compile(r'^(?:\d+[.)]?\s+)?(?:\*\*|__)?(?:' + _TITLES + r')(?:\*\*|__)?\s*:?\s*(?:\*\*|__)?$',
+                               re.IGNORECASE)
+_HTML_HEADING_RE = re.compile(r'^<h([1-6])[^>]*>\s*(.*?)\s*</h\1>$', re.IGNORECASE)
+_SETEXT_UNDERLINE_RE = re.compile(r'^(?:=+|-+)$')
+
+# Entry numbering at the start of a line: "[3]", "[^3]:", "3.", "3)", optionally after a list bullet
+_NUMBER_RE = re.compile(r'^(?:[-*+]\s+)?(?:\[\^?(\d{1,5})\]:?|(\d{1,5})[.)])\s*')
+# Markdown footnote / link reference definition: "[^3]: url", "[label]: url"
+_DEFINITION_RE = re.compile(r'^\[\^?([^\]\n]+)\]:\s*(?=<?https?://)')
+
+_TITLE_STRIP = " \t-–—:|,;>*_"
+
+# Level assigned to headings that are not Markdown headings (plain, bold and setext)
+_NO_LEVEL = 7
+
+
+class Reference:
+    """One citation of a URL in the report."""
+
+    __slots__ = ("number", "title", "url", "position", "in_section")
+
+    def __init__(self, url: str, position: int, number: Optional[int] = None,
+                 title: Optional[str] = None, in_section: bool = True):
+        """
+        Args:
+            url: The cited URL
+            position: Character offset of the URL in the report
+            number: Entry number ([3], 3., [^3]) when the citation is numbered
+            title: Link text, or the entry text around a bare URL
+            in_section: Whether the citation is in a reference section or a
+                        footnote definition, rather than inline in the body
+        """
+        self.url = url
+        self.position = position
+        self.number = number
+        self.title = title
+        self.in_section = in_section
+
+    def __eq__(self, other):
+        if not isinstance(other, Reference):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self):
+        return (f"Reference(url={self.url!r}, position={self.position}, number={self.number}, "
+                f"title={self.title!r}, in_section={self.in_section})")
+
+
+class ReferenceParser:
+    """
+    Incremental reference parser: feed() text in chunks, then close().
+
+    Each call returns the references completed so far, so a caller can act
+    on them (e.g. start fetching) before the rest of the report is read.
+    """
+
+    def __init__(self):
+        self.found_section = False
+        self.found_definitions = False
+        self._section_level = None
+        self._section_start = None
+        self._pending: List[str] = []
+        self._offset = 0
+        self._previous_line = ""
+        self._previous_offset = 0
+        self._body_links: List[Reference] = []
+        self._closed = False
+
+    def feed(self, chunk: str) -> List[Reference]:
+        """
+        Parse the complete lines of chunk (the rest is kept for the next call).
+
+        Args:
+            chunk: The next piece of the report
+
+        Returns:
+            References found in the completed lines
+        """
+        if self._closed:
+            raise ValueError("feed() called after close()")
+        found = []
+        start = 0
+        newline = chunk.find("\n")
+        while newline != -1:
+            if self._pending:
+                self._pending.append(chunk[start:newline])
+                line = "".join(self._pending)
+                self._pending = []
+            else:
+                line = chunk[start:newline]
+            self._parse_line(line, found)
+            self._offset += len(line) + 1
+            start = newline + 1
+            newline = chunk.find("\n", start)
+        if start < len(chunk):
+            self._pending.append(chunk[start:])
+        return found
+
+    def close(self) -> List[Reference]:
+        """
+        Parse the last line and finish.
+
+        Returns:
+            References found in the last line, followed by every body link
+            when the report had no reference section
+        """
+        found = []
+        if not self._closed:
+            self._closed = True
+            if self._pending:
+                line = "".join(self._pending)
+                self._pending = []
+                self._parse_line(line, found)
+                self._offset += len(line)
+            if not (self.found_section or self.found_definitions):
+                found.extend(self._body_links)
+            self._body_links = []
+        return found
+
+    def _parse_line(self, line: str, found: List[Reference]) -> None:
+        stripped = line.strip()
+        if stripped and stripped[0] in "=-" and _SETEXT_UNDERLINE_RE.match(stripped):
+            self._setext_underline(stripped)
+            self._previous_line, self._previous_offset = stripped, self._offset
+            return
+        
+        heading_level = self._heading_level(stripped)
+        if heading_level is not None:
+            self._previous_line, self._previous_offset = stripped, self._offset
+            if heading_level > 0:
+                self._section_level = heading_level
+                self._section_start = self._offset
+                self.found_section = True
+            elif self._section_level is not None and -heading_level <= self._section_level:
+                # Another heading of the same or a higher level ends the section
+                self._section_level = None
+            if heading_level > 0 or "://" not in line:
+                return
+
+        if "://" in line:
+            definition = _DEFINITION_RE.match(stripped) is not None
+            self.found_definitions = self.found_definitions or definition
+            in_section = self._section_level is not None or definition
+            references = self._links(line, in_section)
+            if in_section:
+                found.extend(references)
+            else:
+                self._body_links.extend(references)
+        self._previous_line, self._previous_offset = stripped, self._offset
+
+    def _setext_underline(self, stripped: str) -> None:
+        """Apply a "===" / "---" line that underlines the previous line as a heading."""
+        previous = self._previous_line
+        if not previous or "://" in previous or _SETEXT_UNDERLINE_RE.match(previous):
+            return  # a horizontal rule, not a heading underline
+        level = 1 if stripped[0] == "=" else 2
+        if self._section_start == self._previous_offset and self._section_level is not None:
+            # The section title itself: its level is now known
+            self._section_level = level
+        elif self._section_level is not None and level <= self._section_level:
+            self._section_level = None
+
+    def _heading_level(self, stripped: str) -> Optional[int]:
+        """
+        Classify a line as a heading.
+
+        Returns:
+            The heading level if it starts a reference section, minus the
+            level if it is any other heading, or None for other lines
+        """
+        if not stripped or len(stripped) > 200:
+            return None
+        first = stripped[0]
+        if first == "#":
+            match = _MD_HEADING_RE.match(stripped)
+            if match:
+                level = len(match.group(1))
+                return level if _SECTION_TITLE_RE.match(match.group(2)) else -level
+            return None
+        if first == "<":
+            match = _HTML_HEADING_RE.match(stripped)
+            if match:
+                level = int(match.group(1))
+                return level if _SECTION_TITLE_RE.match(match.group(2)) else -level
+            return None
+        if _SECTION_TITLE_RE.match(stripped):
+            return _NO_LEVEL
+        return None
+
+    def _links(self, line: str, in_section: bool) -> List[Reference]:
+        """Tokenize the links of one line into Reference records."""
+        number_match = _NUMBER_RE.match(line.lstrip())
+        number = None
+        if number_match:
+            number = int(number_match.group(1) or number_match.group(2))
+
+        references = []
+        bare_spans = []
+        for match in _LINK_RE.finditer(line):
+            if match.group("md_url"):
+                url, title, start = match.group("md_url"), match.group("md_text"), match.start("md_url")
+            elif match.group("href"):
+                url, title, start = match.group("href"), match.group("a_text"), match.start("href")
+            else:
+                url, title, start = match.group("bare"), None, match.start("bare")
+                bare_spans.append(match.span("bare"))
+            title = title.strip(_TITLE_STRIP) if title else None
+            references.append(Reference(url, self._offset + start, number, title or None, in_section))
+
+        # A bare URL in a numbered or single-link entry is titled by the entry text around it
+        if in_section and bare_spans and (number is not None or len(references) == 1):
+            text = line.lstrip()
+            definition = _DEFINITION_RE.match(text)
+            if number_match:
+                text = text[number_match.end():]
+            elif definition:
+                text = text[definition.end():]
+            for span in bare_spans:
+                text = text.replace(line[span[0]:span[1]], " ")
+            text = re.sub(r'\s+', " ", text).strip(_TITLE_STRIP + '"\'<>')
+            if not text and definition and not number_match:
+                text = definition.group(1)
+            for reference in references:
+                if reference.title is None:
+                    reference.title = text or None
+        return references
+
+
+def iter_references(chunks: Iterable[str]) -> Iterator[Reference]:
+    """
+    Yield the references of a report read in chunks, as soon as each is parsed.
+
+    Args:
+        chunks: Pieces of the report in order, e.g. lines of a file or stdin
+
+    Yields:
+        Reference records; body links only at the end, and only when the
+        report has no reference section or footnote definitions
+    """
+    parser = ReferenceParser()
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.close()
+
+
+def parse_references(report_text: str, chunk_size: int = 1 << 20) -> List[Reference]:
+    """
+    Parse the references of a whole report.
+
+    Args:
+        report_text: The report text
+        chunk_size: Characters handed to the parser at a time
+
+    Returns:
+        Reference records in report order
+    """
+    return list(iter_references(report_text[i:i + chunk_size]
+                                for i in range(0, len(report_text), chunk_size)))
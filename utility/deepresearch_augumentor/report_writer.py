@@ -0,0 +1,120 @@
+"""
+Streaming writer for augmented reports.
+
+Instead of assembling the whole document in memory, StreamingReportWriter
+writes the original report and appendix header up front, appends each
+reference section as soon as its extraction finishes, and writes the table
+of contents as a trailer when the run is closed. Every section is flushed
+to disk, so a crash leaves all completed references in the file.
+
+When the report itself is still being read (pipelined runs), it is passed
+through with write_original() and the URL list grows as references are
+found; sections finished before begin_appendix() are held until then.
+"""
+from typing import Dict, List, Optional, Tuple
+
+from utils import APPENDIX_HEADER, APPENDIX_FOOTER, format_toc, format_reference_section
+
+
+class StreamingReportWriter:
+    """Incrementally writes an augmented report to a file."""
+    
+    def __init__(self, path: str, original_content: Optional[str], urls: List[str], max_buffered: int = 16,
+                 aliases: Optional[Dict[str, List[str]]] = None):
+        """
+        Args:
+            path: Output file path (truncated on open)
+            original_content: The original report text, written immediately;
+                              None when it is passed in with write_original()
+            urls: Reference URLs in report order, used for numbering and the
+                  TOC. The caller may append to this list during the run.
+            max_buffered: Completed sections held back to preserve report order.
+                          When exceeded, buffered sections are written out of
+                          order (they keep their report numbering and anchors).
+            aliases: Optional mapping of each URL to the original spellings
+                     merged into it, listed under its section heading
+        """
+        self.path = path
+        self.urls = urls
+        self.aliases = aliases or {}
+        self.max_buffered = max(0, max_buffered)
+        self._buffer: Dict[int, Tuple[Optional[str], Optional[str]]] = {}
+        self._written = set()
+        self._next_index = 0
+        self.sections_written = 0
+        self._appendix_started = False
+        self._file = open(path, 'w', encoding='utf-8')
+        if original_content is not None:
+            self._file.write(original_content)
+            self.begin_appendix()
+    
+    def write_original(self, text: str) -> None:
+        """Append the next piece of the original report (before begin_appendix)."""
+        if self._appendix_started:
+            raise ValueError("The appendix has already started")
+        self._file.write(text)
+    
+    def begin_appendix(self) -> None:
+        """End the original report, write the appendix header and any sections held back."""
+        if self._appendix_started:
+            return
+        self._appendix_started = True
+        self._file.write(APPENDIX_HEADER)
+        self._write_ready()
+        self._file.flush()
+    
+    def add(self, index: int, url: str, content: Optional[str], error: Optional[str]) -> None:
+        """
+        Queue the result for the reference at 0-based index and write what can be written.
+        
+        Args:
+            index: 0-based position of the reference in the report
+            url: The reference URL
+            content: Extracted content, or None on failure
+            error: Error message if extraction failed
+        """
+        self._buffer[index] = (content, error)
+        if not self._appendix_started:
+            return
+        self._write_ready()
+        self._file.flush()
+    
+    def _write_ready(self) -> None:
+        # Write every section that is next in report order
+        while self._next_index in self._buffer:
+            self._write(self._next_index)
+            self._advance()
+        
+        # Keep memory bounded: spill the buffer if a slow reference holds it up
+        if len(self._buffer) > self.max_buffered:
+            for buffered_index in sorted(self._buffer):
+                self._write(buffered_index)
+    
+    def close(self) -> None:
+        """Write remaining sections, the table of contents trailer and the footer."""
+        if self._file.closed:
+            return
+        self.begin_appendix()
+        for index in sorted(self._buffer):
+            self._write(index)
+        self._file.write(format_toc(self.urls))
+        self._file.write(APPENDIX_FOOTER)
+        self._file.close()
+    
+    def _write(self, index: int) -> None:
+        content, error = self._buffer.pop(index)
+        url = self.urls[index]
+        self._file.write(format_reference_section(index + 1, url, content, error, self.aliases.get(url)))
+        self._written.add(index)
+        self.sections_written += 1
+    
+    def _advance(self) -> None:
+        while self._next_index < len(self.urls) and self._next_index in self._written:
+            self._next_index += 1
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
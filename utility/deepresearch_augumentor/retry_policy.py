@@ -0,0 +1,154 @@
+"""
+Retry policy for reference extraction.
+
+Failed extractions are classified as timeout, rate limited (429), server
+error (5xx), connection error or permanent. Retryable failures are retried
+with exponential backoff and full jitter, honouring Retry-After hints, and
+every retry draws from a per-run RetryBudget so a flaky provider cannot
+stretch a run indefinitely.
+
+Subclass RetryPolicy and pass it to augment_research_report to plug in a
+different classification or backoff strategy.
+"""
+import random
+import re
+import threading
+from typing import Optional
+
+from extractors.errors import TIMEOUT, RATE_LIMITED, SERVER_ERROR, CONNECTION, PERMANENT, kind_for_status
+
+RETRYABLE_KINDS = frozenset({TIMEOUT, RATE_LIMITED, SERVER_ERROR, CONNECTION})
+
+_STATUS_PATTERN = re.compile(r'\b(?:API error|HTTP error|HTTP Error):?\s*(\d{3})\b')
+
+
+class RetryBudget:
+    """Thread-safe count of retries still allowed in a run."""
+    
+    def __init__(self, max_retries: Optional[int]):
+        """
+        Args:
+            max_retries: Total retries allowed across all URLs (None = unlimited)
+        """
+        self.max_retries = max_retries
+        self.remaining = max_retries
+        self.used = 0
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def for_urls(cls, url_count: int, per_url_retries: int = 2) -> "RetryBudget":
+        """
+        Default budget for a run: enough to retry half of the URLs fully,
+        with a floor of 10 so small reports are never starved.
+        """
+        return cls(max(10, (url_count * per_url_retries) // 2))
+    
+    def extend_for_urls(self, url_count: int, per_url_retries: int = 2) -> None:
+        """Raise the budget to the for_urls() default when a run's URL count grows."""
+        with self._lock:
+            if self.max_retries is None:
+                return
+            target = max(10, (url_count * per_url_retries) // 2)
+            if target > self.max_retries:
+                self.remaining += target - self.max_retries
+                self.max_retries = target
+    
+    def try_acquire(self) -> bool:
+        """Take one retry from the budget; return False if it is exhausted."""
+        with self._lock:
+            if self.remaining is not None:
+                if self.remaining <= 0:
+                    return False
+                self.remaining -= 1
+            self.used += 1
+            return True
+    
+    @property
+    def exhausted(self) -> bool:
+        return self.remaining is not None and self.remaining <= 0
+
+
+class RetryPolicy:
+    """Classifies extraction failures and decides whether and when to retry."""
+    
+    def __init__(self, max_retries: int = 2, base_delay: float = 0.5, max_delay: float = 30.0,
+                 max_retry_after: float = 60.0, retry_kinds=RETRYABLE_KINDS):
+        """
+        Args:
+            max_retries: Retries allowed per URL after the first attempt
+            base_delay: Backoff delay before the first retry, in seconds
+            max_delay: Upper bound of the exponential backoff, in seconds
+            max_retry_after: Longest Retry-After the run is willing to wait;
+                             a longer server hint means the URL is not retried
+            retry_kinds: Failure kinds that are retried
+        """
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_retry_after = max_retry_after
+        self.retry_kinds = frozenset(retry_kinds)
+    
+    def classify(self, error, elapsed: float = 0.0, request_timeout: Optional[float] = None) -> str:
+        """
+        Classify a failure as timeout, rate_limited, server_error, connection or permanent.
+        
+        Structured ExtractionError kinds win; plain strings (from custom
+        extractors) fall back to matching the message.
+        """
+        kind = getattr(error, "kind", None)
+        if kind:
+            return kind
+        
+        message = str(error).lower()
+        match = _STATUS_PATTERN.search(str(error))
+        if match:
+            return kind_for_status(int(match.group(1)))
+        if "timeout" in message or "timed out" in message:
+            return TIMEOUT
+        if request_timeout and elapsed >= request_timeout * 0.9:
+            return TIMEOUT
+        if "too many requests" in message or "rate limit" in message:
+            return RATE_LIMITED
+        if "service unavailable" in message or "bad gateway" in message:
+            return SERVER_ERROR
+        if "connection" in message:
+            return CONNECTION
+        return PERMANENT
+    
+    def backoff(self, retry_number: int) -> float:
+        """Exponential backoff with full jitter for the given 1-based retry number."""
+        ceiling = min(self.max_delay, self.base_delay * (2 ** (retry_number - 1)))
+        return random.uniform(0, ceiling)
+    
+    def next_delay(self, error, retry_number: int, budget: Optional[RetryBudget] = None,
+                   elapsed: float = 0.0, request_timeout: Optional[float] = None):
+        """
+        Decide whether to retry a failed attempt.
+        
+        Args:
+            error: The error returned by the extractor (str or ExtractionError)
+            retry_number: 1-based number of the retry being considered
+            budget: Run-wide RetryBudget to draw from
+            elapsed: Duration of the failed attempt in seconds
+            request_timeout: Per-request timeout, used to spot silent timeouts
+        
+        Returns:
+            Tuple of (delay_seconds or None if not retrying, failure kind, reason)
+        """
+        kind = self.classify(error, elapsed, request_timeout)
+        if kind not in self.retry_kinds:
+            return None, kind, "not retryable"
+        if retry_number > self.max_retries:
+            return None, kind, "retries exhausted"
+        
+        retry_after = getattr(error, "retry_after", None)
+        if retry_after is not None and retry_after > self.max_retry_after:
+            return None, kind, f"Retry-After {retry_after:.0f}s exceeds limit"
+        
+        if budget is not None and not budget.try_acquire():
+            return None, kind, "run retry budget exhausted"
+        
+        delay = self.backoff(retry_number)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay, kind, None
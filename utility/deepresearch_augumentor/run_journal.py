@@ -0,0 +1,121 @@
+"""
+Checkpoint journal for resumable augmentation runs.
+
+Each input file gets an append-only JSON Lines journal under the
+ReferenceAugmentor config directory. The first line records the run
+settings; every following line is one finished (url, content, error)
+result, flushed as soon as it lands so an interrupted run can be resumed
+with --resume.
+"""
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+
+class RunJournal:
+    """Append-only journal of extraction results for one input file."""
+    
+    def __init__(self, path: str, settings: Dict, resume: bool = False):
+        """
+        Args:
+            path: Journal file path
+            settings: Run settings (extractor, mode); a journal written with
+                      different settings is not resumed
+            resume: Load existing results instead of starting a new journal
+        """
+        self.path = path
+        self.settings = settings
+        # Results loaded from the journal on resume; results recorded by this
+        # run are only written to disk, so page content is not held in memory
+        self.completed: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+        self._lock = threading.Lock()
+        
+        self._file = None
+        self.resuming = resume and self._load()
+        if not self.resuming:
+            self.completed = {}
+    
+    @classmethod
+    def for_input(cls, config_dir: str, input_file: str, settings: Dict, resume: bool = False) -> "RunJournal":
+        """
+        Open the journal belonging to input_file under config_dir/journals.
+        
+        Args:
+            config_dir: ConfigManager directory
+            input_file: Path of the report being augmented
+            settings: Run settings recorded in the journal header
+            resume: Load existing results instead of starting a new journal
+        """
+        input_path = os.path.abspath(input_file)
+        name = hashlib.sha1(input_path.encode('utf-8')).hexdigest()[:16]
+        return cls(os.path.join(config_dir, "journals", f"{name}.jsonl"), settings, resume=resume)
+    
+    def _load(self) -> bool:
+        """Read results from an existing journal; return False if it cannot be resumed."""
+        if not os.path.exists(self.path):
+            return False
+        with open(self.path, 'r', encoding='utf-8') as f:
+            lines = f.readlines()
+        if not lines:
+            return False
+        try:
+            header = json.loads(lines[0])
+        except ValueError:
+            return False
+        if header.get("settings") != self.settings:
+            return False
+        for line in lines[1:]:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # A torn final line from a crash mid-write
+                continue
+            self.completed[entry["url"]] = (entry.get("content"), entry.get("error"))
+        return True
+    
+    def _ends_with_newline(self) -> bool:
+        with open(self.path, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() == 0:
+                return True
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+    
+    def resumable(self, url: str) -> Optional[str]:
+        """Return content a previous run journaled for url if it was extracted successfully."""
+        content, _ = self.completed.get(url, (None, None))
+        return content
+    
+    def record(self, url: str, content: Optional[str], error: Optional[str]) -> None:
+        """Append one finished result and flush it to disk."""
+        with self._lock:
+            if self._file is None:
+                self._open()
+            # The new result supersedes a loaded one; neither is kept in memory
+            self.completed.pop(url, None)
+            self._write_line({"url": url, "content": content, "error": error})
+    
+    def _open(self) -> None:
+        """Open the journal on the first result: append when resuming, else start over."""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        if self.resuming:
+            self._file = open(self.path, 'a', encoding='utf-8')
+            if not self._ends_with_newline():
+                # Terminate a line torn by a crash so the next entry starts cleanly
+                self._file.write("\n")
+        else:
+            self._file = open(self.path, 'w', encoding='utf-8')
+            self._write_line({"settings": self.settings})
+    
+    def _write_line(self, entry: Dict) -> None:
+        self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+    
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
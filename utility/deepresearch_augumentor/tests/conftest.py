@@ -6,6 +6,23 @@ import pytest
 import tempfile
 from unittest.mock import patch
 
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "timing: asserts on wall-clock timings; run only when RUN_TIMING_BENCHMARKS is set"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    # Timings depend on the machine's load and core count, so the default
+    # suite only checks what the benchmarks compute, not how fast
+    if os.environ.get("RUN_TIMING_BENCHMARKS"):
+        return
+    skip = pytest.mark.skip(reason="timing benchmark; set RUN_TIMING_BENCHMARKS=1 to run")
+    for item in items:
+        if "timing" in item.keywords:
+            item.add_marker(skip)
+
 # Sample report text for testing
 @pytest.fixture
 def sample_report_no_urls():
@@ -0,0 +1,163 @@
+"""
+Integration tests for concurrent extraction in augment_research_report.
+"""
+import asyncio
+import threading
+import time
+import pytest
+from unittest.mock import patch, MagicMock
+from main import augment_research_report, augment_research_report_async
+
+
+REPORT = """Concurrent Report
+
+References
+https://example.com/slow
+https://example.com/fast
+https://example.com/timeout
+https://example.com/error
+"""
+
+
+@pytest.fixture
+def mock_extractor():
+    """Patch get_extractor with a mock whose extract_text simulates varied latency."""
+    with patch("main.get_extractor") as mock_get_extractor:
+        extractor = MagicMock()
+        mock_get_extractor.return_value = extractor
+        yield extractor
+
+
+def test_concurrent_output_order_is_deterministic(mock_extractor):
+    """Results are formatted in report order even when later URLs finish first."""
+    def extract_impl(url, **kwargs):
+        if url.endswith("/slow"):
+            time.sleep(0.2)
+        return f"Content of {url}", None
+
+    mock_extractor.extract_text.side_effect = extract_impl
+
+    with patch("utils.format_output") as mock_format:
+        augment_research_report(REPORT, verbose=False, concurrency=4)
+
+    _, url_contents = mock_format.call_args[0]
+    assert [url for url, _, _ in url_contents] == [
+        "https://example.com/slow",
+        "https://example.com/fast",
+        "https://example.com/timeout",
+        "https://example.com/error",
+    ]
+    assert all(content == f"Content of {url}" for url, content, _ in url_contents)
+
+
+def test_concurrent_requests_overlap(mock_extractor):
+    """Extractions actually run in parallel when concurrency > 1."""
+    in_flight = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def extract_impl(url, **kwargs):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        time.sleep(0.05)
+        with lock:
+            in_flight -= 1
+        return "ok", None
+
+    mock_extractor.extract_text.side_effect = extract_impl
+
+    augment_research_report(REPORT, verbose=False, concurrency=4)
+
+    assert peak > 1
+
+
+def test_concurrent_retry_semantics_preserved(mock_extractor):
+    """Timeouts are retried per URL, other errors are not."""
+    calls = {}
+    lock = threading.Lock()
+
+    def extract_impl(url, **kwargs):
+        with lock:
+            calls[url] = calls.get(url, 0) + 1
+        if url.endswith("/timeout"):
+            return None, "Timeout occurred"
+        if url.endswith("/error"):
+            return None, "API error: 404"
+        return "ok", None
+
+    mock_extractor.extract_text.side_effect = extract_impl
+
+    with patch("utils.format_output") as mock_format:
+        augment_research_report(REPORT, verbose=False, concurrency=3)
+
+    assert calls["https://example.com/timeout"] == 3  # First attempt + 2 retries
+    assert calls["https://example.com/error"] == 1
+    assert calls["https://example.com/fast"] == 1
+
+    _, url_contents = mock_format.call_args[0]
+    errors = {url: error for url, _, error in url_contents}
+    assert errors["https://example.com/timeout"] == "Timeout occurred"
+    assert errors["https://example.com/error"] == "API error: 404"
+
+
+def test_concurrent_progress_counters(mock_extractor, capsys):
+    """Final statistics count successes and failures correctly under concurrency."""
+    def extract_impl(url, **kwargs):
+        if url.endswith("/error") or url.endswith("/timeout"):
+            return None, "API error: 500"
+        return "ok", None
+
+    mock_extractor.extract_text.side_effect = extract_impl
+
+    augment_research_report(REPORT, verbose=True, concurrency=4)
+
+    output = capsys.readouterr().out
+    assert "Progress: 4/4 URLs processed" in output
+    assert "2 successful, 2 failed, 0 skipped" in output
+
+
+def test_async_pipeline_matches_sync_output_order(mock_extractor):
+    """augment_research_report_async keeps report order and retry semantics."""
+    calls = {}
+
+    async def extract_impl(url, **kwargs):
+        calls[url] = calls.get(url, 0) + 1
+        if url.endswith("/slow"):
+            await asyncio.sleep(0.05)
+        if url.endswith("/timeout"):
+            return None, "Timeout occurred"
+        return f"Content of {url}", None
+
+    mock_extractor.extract_text_async.side_effect = extract_impl
+
+    with patch("utils.format_output") as mock_format:
+        asyncio.run(augment_research_report_async(REPORT, verbose=False, concurrency=4))
+
+    _, url_contents = mock_format.call_args[0]
+    assert [url for url, _, _ in url_contents] == [
+        "https://example.com/slow",
+        "https://example.com/fast",
+        "https://example.com/timeout",
+        "https://example.com/error",
+    ]
+    assert calls["https://example.com/timeout"] == 3
+    assert url_contents[0][1] == "Content of https://example.com/slow"
+
+
+def test_async_worker_exception_fails_only_its_url(mock_extractor):
+    """An unexpected error in one worker does not abort the run or lose finished results."""
+    async def extract_url(ctx, url, log, session=None):
+        if url.endswith("/timeout"):
+            raise RuntimeError("boom")
+        return f"Content of {url}", None, 1, False
+
+    with patch("main._extract_url_async", side_effect=extract_url), patch("utils.format_output") as mock_format:
+        asyncio.run(augment_research_report_async(REPORT, verbose=False, concurrency=4))
+
+    _, url_contents = mock_format.call_args[0]
+    assert [text for _, text, _ in url_contents] == [
+        "Content of https://example.com/slow", "Content of https://example.com/fast",
+        None, "Content of https://example.com/error"]
+    assert "RuntimeError: boom" in url_contents[2][2]
@@ -0,0 +1,116 @@
+"""
+Integration tests for the fetch-while-parsing pipeline.
+"""
+import io
+import threading
+import pytest
+from unittest.mock import patch, MagicMock
+from main import augment_research_report, augment_research_report_pipelined
+from pipeline import ReferenceStream, read_report_chunks
+from retry_policy import RetryBudget
+
+
+REPORT = """Pipelined Report
+
+Body text with an inline link https://inline.example/context.
+
+References
+https://example.com/one
+http://www.example.com/one/?utm_source=feed
+https://example.com/two
+https://example.org/three
+"""
+
+
+@pytest.fixture
+def mock_extractor():
+    with patch("main.get_extractor") as mock_get_extractor:
+        extractor = MagicMock()
+        extractor.extract_text.side_effect = lambda url, **kwargs: (f"Content of {url}", None)
+        mock_get_extractor.return_value = extractor
+        yield extractor
+
+
+def test_fetching_starts_before_input_ends(mock_extractor):
+    """The first reference is fetched while the producer is still writing the report."""
+    first_fetched = threading.Event()
+
+    def extract_impl(url, **kwargs):
+        first_fetched.set()
+        return f"Content of {url}", None
+
+    mock_extractor.extract_text.side_effect = extract_impl
+
+    def slow_producer():
+        yield "Report\n\nReferences\n"
+        yield "https://example.com/one\n"
+        # Without overlap nothing is fetched until the input ends, and this times out
+        assert first_fetched.wait(timeout=5)
+        yield "https://example.com/two\n"
+
+    output = augment_research_report_pipelined(slow_producer(), verbose=False, concurrency=2)
+
+    assert "Content of https://example.com/one" in output
+    assert "Content of https://example.com/two" in output
+
+
+def test_matches_batch_output(mock_extractor):
+    chunks = [REPORT[i:i + 7] for i in range(0, len(REPORT), 7)]
+
+    pipelined = augment_research_report_pipelined(chunks, verbose=False, concurrency=3)
+    fetched = sorted(call.kwargs["url"] for call in mock_extractor.extract_text.call_args_list)
+    batch = augment_research_report(REPORT, verbose=False)
+
+    assert pipelined == batch
+    # Variants are merged on the fly; inline body links are not fetched
+    assert fetched == ["https://example.com/one", "https://example.com/two", "https://example.org/three"]
+    assert "<http://www.example.com/one/?utm_source=feed>" in pipelined
+
+
+def test_stream_to_passes_report_through(mock_extractor, tmp_path):
+    output_path = str(tmp_path / "out.md")
+
+    result = augment_research_report_pipelined(REPORT.splitlines(keepends=True), verbose=False,
+                                               concurrency=2, stream_to=output_path)
+
+    with open(output_path, encoding="utf-8") as f:
+        written = f.read()
+    assert result == output_path
+    assert written.startswith(REPORT + "\n\n## Reference Content Appendix")
+    assert written.index("Reference 1: [https://example.com/one]") < written.index("Reference 3: [https://example.org/three]")
+    assert "### Table of Contents" in written
+
+
+def test_body_links_used_without_reference_section(mock_extractor):
+    output = augment_research_report_pipelined(["See https://a.example/x\n", "and https://b.example/y"],
+                                               verbose=False)
+    assert "Content of https://a.example/x" in output
+    assert "Content of https://b.example/y" in output
+
+
+def test_reference_stream_reports_new_pages_once():
+    stream = ReferenceStream()
+    assert stream.feed("References\nhttps://example.com/a\nhttps://www.example.com/a/\n") == ["https://example.com/a"]
+    assert stream.feed("https://example.com/b\nhttps://example.com/a#top\n") == ["https://example.com/b"]
+    assert stream.close() == []
+    assert stream.fetches_saved == 2
+    assert stream.aliases["https://example.com/a"] == [
+        "https://example.com/a", "https://www.example.com/a/", "https://example.com/a#top"]
+
+
+def test_default_retry_budget_grows_with_urls(mock_extractor):
+    references = "".join(f"https://example.com/{n}\n" for n in range(40))
+    with patch("retry_policy.RetryBudget.extend_for_urls", autospec=True,
+               side_effect=RetryBudget.extend_for_urls) as extend:
+        augment_research_report_pipelined(["References\n", references], verbose=False)
+    budget = extend.call_args[0][0]
+    assert budget.max_retries == 40
+
+
+def test_read_report_chunks(tmp_path):
+    path = tmp_path / "report.txt"
+    path.write_text(REPORT, encoding="utf-8")
+    assert "".join(read_report_chunks(str(path), chunk_size=16)) == REPORT
+
+    with patch("sys.stdin", io.StringIO(REPORT)):
+        assert list(read_report_chunks("-")) == REPORT.splitlines(keepends=True)
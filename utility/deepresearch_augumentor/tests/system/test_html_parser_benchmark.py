@@ -0,0 +1,131 @@
+"""
+Benchmark of the HTML parser backends used by local extraction.
+
+Converts a synthetic corpus of pages (shaped like an encyclopedia article,
+a documentation page and a news story, with heavy navigation, sidebars and
+footers) with every installed backend, parsing the whole
+tree and only the parts each built-in extraction mode selects (its targets
+and the elements it removes), and converts many pages from
+concurrent download threads with and without the process pool. Run with -s
+to see the timings; the timing comparisons only run when
+RUN_TIMING_BENCHMARKS is set.
+"""
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from unittest.mock import patch
+from extractors import html_parsing
+from extractors.html_parsing import available_backends
+from extractors.html_markdown import html_to_markdown
+from extractors.parse_pool import ParsePool
+from main import EXTRACTION_MODES
+
+# The built-in extraction modes that select part of a page, as configured
+SELECTOR_MODES = {name: mode for name, mode in EXTRACTION_MODES.items() if mode.get("target_selector")}
+
+
+def _page(nav_links: int, paragraphs: int, sidebar_items: int) -> str:
+    nav = "".join(f'<li><a href="/wiki/Topic_{n}" title="Topic {n}">Topic {n}</a></li>' for n in range(nav_links))
+    body = "".join(f'<p>Paragraph {n} with <a href="/wiki/Link_{n}">a link</a>, <b>bold</b> and '
+                   f'<sup><a href="#cite-{n}">[{n}]</a></sup> a citation.</p>' for n in range(paragraphs))
+    sidebar = "".join(f'<div class="box"><h3>Box {n}</h3><ul><li><a href="/b/{n}">Item</a></li></ul></div>'
+                      for n in range(sidebar_items))
+    return (f"<html><head><title>Page</title><script>{'var x = 1;' * 500}</script></head><body>"
+            f"<header><nav><ul>{nav}</ul></nav></header>"
+            f'<div id="content"><h1>Title</h1>{body}</div>'
+            f'<aside class="sidebar">{sidebar}</aside>'
+            f"<footer><ul>{nav}</ul></footer></body></html>")
+
+
+def _corpus():
+    return {
+        "encyclopedia": _page(nav_links=3000, paragraphs=400, sidebar_items=300),
+        "docs": _page(nav_links=1500, paragraphs=150, sidebar_items=600),
+        "news": _page(nav_links=400, paragraphs=40, sidebar_items=100),
+    }
+
+
+def _best_time(convert, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        convert()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _partial_and_full(html: str, backend: str, mode: str):
+    selectors = SELECTOR_MODES[mode]
+    args = (html, "https://site.example/", selectors["target_selector"], selectors.get("remove_selector"))
+
+    def partial():
+        return html_to_markdown(*args, parser=backend)
+
+    def full():
+        with patch.object(html_parsing, "content_strainer", return_value=None):
+            return html_to_markdown(*args, parser=backend)
+
+    return partial, full
+
+
+@pytest.mark.parametrize("backend", available_backends())
+@pytest.mark.parametrize("mode", SELECTOR_MODES)
+def test_partial_parsing_is_equivalent(backend, mode):
+    for html in _corpus().values():
+        partial, full = _partial_and_full(html, backend, mode)
+        assert partial() == full()
+
+
+@pytest.mark.timing
+@pytest.mark.parametrize("backend", available_backends())
+@pytest.mark.parametrize("mode", [name for name, mode in SELECTOR_MODES.items() if mode["target_selector"] != "body"])
+def test_partial_parsing_is_faster(backend, mode):
+    """Modes that target the whole body gain nothing from a partial parse and are left out."""
+    full_total = partial_total = 0.0
+    print()
+    for name, html in _corpus().items():
+        partial, full = _partial_and_full(html, backend, mode)
+        partial_time, full_time = _best_time(partial), _best_time(full)
+        partial_total += partial_time
+        full_total += full_time
+        print(f"{backend:>11} {mode:<16} {name:<14} {len(html) / 1024:7.0f} KB  "
+              f"full {full_time * 1000:7.1f} ms  partial {partial_time * 1000:7.1f} ms")
+    assert partial_total < full_total
+
+
+@pytest.mark.timing
+def test_backends_compared():
+    corpus = _corpus()
+    timings = {}
+    for backend in available_backends():
+        timings[backend] = sum(_best_time(lambda: html_to_markdown(html, parser=backend))
+                               for html in corpus.values())
+    print("\n" + "  ".join(f"{backend}: {seconds * 1000:.1f} ms" for backend, seconds in timings.items()))
+    if "lxml" not in timings:
+        pytest.skip("lxml is not installed; only html.parser was measured")
+    assert timings["lxml"] < timings["html.parser"]
+
+
+@pytest.mark.timing
+@pytest.mark.skipif((os.cpu_count() or 1) < 2, reason="needs several CPU cores")
+def test_parse_pool_uses_several_cores():
+    raw = _page(nav_links=1500, paragraphs=150, sidebar_items=600).encode("utf-8")
+    cores = min(os.cpu_count(), 8)
+    pages = 4 * cores
+
+    def run(pool):
+        with ThreadPoolExecutor(max_workers=pages) as downloads:
+            start = time.perf_counter()
+            list(downloads.map(lambda n: pool.convert(raw, "utf-8", f"https://site.example/{n}", {}), range(pages)))
+            return time.perf_counter() - start
+
+    in_threads = run(ParsePool(workers=0))
+    pool = ParsePool(workers=cores)
+    try:
+        pool.convert(raw, "utf-8", "https://site.example/", {})  # start the workers
+        in_processes = run(pool)
+    finally:
+        pool.close()
+    print(f"\n{pages} pages: {in_threads:.2f}s in download threads, {in_processes:.2f}s with {cores} workers")
+    assert in_processes < in_threads
@@ -0,0 +1,71 @@
+"""
+Benchmark of the reference parser on large reports.
+
+Parses synthetic deep-research exports of 1 MB and 10 MB and checks that
+time grows linearly with size, including on inputs that would make a
+backtracking pattern blow up. Run with -s to see the throughput figures;
+the timing checks only run when RUN_TIMING_BENCHMARKS is set.
+"""
+import time
+import pytest
+from reference_parser import parse_references
+
+MB = 1024 * 1024
+
+
+def _report(size: int) -> str:
+    """A report of about size characters: linked body paragraphs, then 1,000 references."""
+    paragraph = ("Adoption grew 14% year over year [3], driven by new entrants "
+                 "(see [the survey](https://inline.example/survey?id={n}) and https://inline.example/data/{n}). "
+                 "Costs fell, while <a href=\"https://inline.example/html/{n}\">regional markets</a> lagged.\n\n")
+    references = "".join(f"{n}. Author {n}. \"Title {n}.\" Publisher. https://ref.example/{n}\n" for n in range(1, 1001))
+    body = []
+    length = len(references)
+    n = 0
+    while length < size:
+        body.append(paragraph.format(n=n))
+        length += len(body[-1])
+        n += 1
+    return "# Report\n\n" + "".join(body) + "## References\n" + references
+
+
+def _best_time(text: str, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        references = parse_references(text)
+        best = min(best, time.perf_counter() - start)
+    assert len(references) == 1000
+    return best
+
+
+def test_parse_large_report():
+    assert len(parse_references(_report(1 * MB))) == 1000
+
+
+@pytest.mark.timing
+def test_parse_10mb_report_in_linear_time():
+    small = _report(1 * MB)
+    large = _report(10 * MB)
+
+    small_time = _best_time(small)
+    large_time = _best_time(large, repeat=1)
+
+    print(f"\nreference parser: 1 MB in {small_time:.3f}s, 10 MB in {large_time:.3f}s "
+          f"({len(large) / MB / large_time:.1f} MB/s)")
+    # Ten times the input should take about ten times as long, not a hundred
+    assert large_time < small_time * 25
+    assert large_time < 30
+
+
+@pytest.mark.timing
+@pytest.mark.parametrize("line", [
+    "<a " * 200_000,
+    "[" + "x" * 1_000_000,
+    "[a](" * 200_000,
+    "https://" + "a" * 1_000_000 + ".",
+])
+def test_pathological_lines_stay_linear(line):
+    start = time.perf_counter()
+    parse_references("## References\n" + line + "\n")
+    assert time.perf_counter() - start < 5
@@ -0,0 +1,152 @@
+"""
+Benchmark of the order in which concurrent runs dispatch references.
+
+A report's references differ widely in how long they take: a few large
+PDFs on a slow host next to many small pages. Workers take references in
+dispatch order and hold their worker while waiting for one of the host's
+slots, as with HostScheduler. The makespan (time until the last reference
+is done) of report order (FIFO), round-robin across hosts and
+longest-expected-first is compared in a deterministic simulation over
+seeded synthetic reports, then measured on a short real run with sleeping
+extractors. Estimates come from per-host history, so they are only as
+good as a host's mean: each URL's actual duration varies around it. Run
+with -s to see the timings; the real run only happens when
+RUN_TIMING_BENCHMARKS is set.
+"""
+import heapq
+import random
+import time
+import pytest
+from unittest.mock import MagicMock, patch
+from extractors.politeness import HostScheduler, interleave_by_host, longest_expected_first
+from latency_store import AdaptiveTimeouts, LatencyStore
+from main import augment_research_report
+
+WORKERS = 8
+MAX_PER_HOST = 2
+
+# host: (references, mean seconds)
+SLOW_HOSTS = {
+    "arxiv.org": (4, 12.0),            # full-text PDFs
+    "www.sec.gov": (3, 9.0),           # filings
+    "docs.example.org": (5, 4.0),
+    "www.who.int": (1, 20.0),          # single large reports
+    "www.imf.org": (1, 18.0),
+    "www.oecd.org": (2, 15.0),
+    "slow-blog.example": (2, 6.0),
+}
+
+
+def _workload(seed: int):
+    """Synthetic references: (urls, actual seconds, expected seconds from host history)."""
+    rng = random.Random(seed)
+    hosts = dict(SLOW_HOSTS)
+    for n in range(30):
+        hosts[f"site{n}.example"] = (rng.randint(1, 3), rng.uniform(0.3, 2.0))
+    jobs = []
+    for host, (count, mean) in hosts.items():
+        for n in range(count):
+            jobs.append((f"https://{host}/ref{n}", mean * rng.uniform(0.6, 1.4), mean))
+    rng.shuffle(jobs)
+    urls, actual, expected = zip(*jobs)
+    return list(urls), list(actual), list(expected)
+
+
+def _makespan(urls, durations, order, workers=WORKERS, max_per_host=MAX_PER_HOST) -> float:
+    """Finish time of the last job when workers take jobs in order."""
+    free_workers = [0.0] * workers
+    host_slots = {}
+    end = 0.0
+    for i in order:
+        worker_free = heapq.heappop(free_workers)
+        slots = host_slots.setdefault(HostScheduler.host_key(urls[i]), [0.0] * max_per_host)
+        slot_free = heapq.heappop(slots)
+        finish = max(worker_free, slot_free) + durations[i]
+        heapq.heappush(free_workers, finish)
+        heapq.heappush(slots, finish)
+        end = max(end, finish)
+    return end
+
+
+def _orders(urls, expected):
+    indexes = list(range(len(urls)))
+    return {
+        "fifo": indexes,
+        "round-robin": interleave_by_host(urls, indexes),
+        "longest-first": longest_expected_first(urls, indexes, dict(enumerate(expected)), MAX_PER_HOST),
+    }
+
+
+def test_simulated_makespan():
+    totals = {"fifo": 0.0, "round-robin": 0.0, "longest-first": 0.0}
+    seeds = range(50)
+    print()
+    for seed in seeds:
+        urls, actual, expected = _workload(seed)
+        for name, order in _orders(urls, expected).items():
+            totals[name] += _makespan(urls, actual, order)
+    # No order can beat the busiest host's work or an even split of all the work
+    bound = 0.0
+    for seed in seeds:
+        urls, actual, _ = _workload(seed)
+        per_host = {}
+        for url, seconds in zip(urls, actual):
+            per_host.setdefault(HostScheduler.host_key(url), []).append(seconds)
+        bound += max(sum(actual) / WORKERS,
+                     max(max(sum(s) / MAX_PER_HOST, max(s)) for s in per_host.values()))
+    means = {name: total / len(seeds) for name, total in totals.items()}
+    for name, mean in means.items():
+        print(f"{name:>14}: mean makespan {mean:6.1f}s ({mean / means['fifo']:.0%} of FIFO)")
+    print(f"{'lower bound':>14}: {bound / len(seeds):6.1f}s")
+
+    assert means["longest-first"] < min(means["round-robin"], means["fifo"])
+    assert means["longest-first"] < 0.85 * means["fifo"]
+
+
+def test_longest_first_never_much_worse():
+    """Per report, not only on average: bad estimates cost little."""
+    for seed in range(50):
+        urls, actual, expected = _workload(seed)
+        orders = _orders(urls, expected)
+        assert _makespan(urls, actual, orders["longest-first"]) <= 1.1 * _makespan(urls, actual, orders["fifo"])
+
+
+def _timed_run(urls, actual, timeouts, scale: float) -> float:
+    scheduler = HostScheduler(max_per_host=MAX_PER_HOST, min_interval=0, respect_robots=False)
+    durations = dict(zip(urls, actual))
+    extractor = MagicMock()
+    extractor.provider_host = None
+
+    def extract_text(url, **kwargs):
+        with scheduler.slot(url):
+            time.sleep(durations[url] * scale)
+        return "content", None
+    extractor.extract_text.side_effect = extract_text
+
+    report = "Report\n\nReferences\n" + "\n".join(urls) + "\n"
+    with patch("main.get_extractor", return_value=extractor):
+        start = time.perf_counter()
+        augment_research_report(report, extractor_type="jina", concurrency=WORKERS, verbose=False,
+                                politeness=scheduler, timeouts=timeouts)
+        return time.perf_counter() - start
+
+
+@pytest.mark.timing
+def test_real_run_makespan(tmp_path):
+    """Concurrent runs with sleeping extractors: 1 simulated second = 20 ms."""
+    urls, actual, expected = _workload(seed=7)
+    store = LatencyStore(str(tmp_path))
+    timeouts = AdaptiveTimeouts(store, default=15)
+    for url, seconds in set(zip(urls, expected)):
+        timeouts.record(url, "jina", seconds)
+    scale = 0.02
+
+    with patch("main._RunContext.dispatch_order", lambda self, urls, indexes: list(indexes)):
+        fifo = _timed_run(urls, actual, None, scale)
+    longest_first = _timed_run(urls, actual, timeouts, scale)
+    store.close()
+
+    simulated = {name: _makespan(urls, actual, order) * scale for name, order in _orders(urls, expected).items()}
+    print(f"\nFIFO {fifo:.2f}s (simulated {simulated['fifo']:.2f}s), "
+          f"longest-first {longest_first:.2f}s (simulated {simulated['longest-first']:.2f}s)")
+    assert longest_first < fifo
@@ -0,0 +1,169 @@
+"""
+Unit tests for provider and host circuit breakers
+"""
+import time
+import pytest
+from unittest.mock import patch, MagicMock
+from circuit_breaker import CircuitBreaker, CircuitBreakerRegistry, CLOSED, OPEN, HALF_OPEN
+from extractors.base import ContentExtractorInterface
+from extractors.chain_extractor import ExtractorChain
+from extractors.errors import ExtractionError, TIMEOUT, http_error
+from retry_policy import RetryPolicy
+from main import augment_research_report
+
+
+def test_opens_after_threshold_and_half_opens_with_single_probe():
+    breaker = CircuitBreaker("r.jina.ai", failure_threshold=2, cooldown=0.1)
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+
+    time.sleep(0.15)
+    assert breaker.allow()          # the probe
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow()      # only one probe at a time
+
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.allow()
+
+
+def test_failed_probe_reopens():
+    breaker = CircuitBreaker("host", failure_threshold=1, cooldown=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert breaker.times_opened == 2
+
+
+def test_permanent_errors_do_not_trip():
+    registry = CircuitBreakerRegistry(failure_threshold=2)
+    granted, _ = registry.acquire(["example.com"])
+    for _ in range(5):
+        registry.record(granted, None, http_error("HTTP error: 404", 404))
+    assert registry.get("example.com").state == CLOSED
+
+
+def test_keys_for():
+    assert CircuitBreakerRegistry.keys_for("https://Example.com/a", "r.jina.ai") == ["r.jina.ai", "example.com"]
+    assert CircuitBreakerRegistry.keys_for("https://example.com/a") == ["example.com"]
+
+
+def test_relayed_failures_are_charged_to_provider_or_target():
+    registry = CircuitBreakerRegistry(failure_threshold=2)
+    granted, _ = registry.acquire(["r.jina.ai", "healthy.com"])
+    for _ in range(2):
+        registry.record(granted, None, ExtractionError("Request timed out", kind=TIMEOUT), ["healthy.com"])
+    assert registry.get("r.jina.ai").state == OPEN
+    assert registry.get("healthy.com").consecutive_failures == 0
+
+    granted, _ = registry.acquire(["r.example", "down.com"])
+    for _ in range(2):
+        registry.record(granted, None, ExtractionError("Upstream 503", 503, upstream=True), ["down.com"])
+    assert registry.get("down.com").state == OPEN
+    assert registry.get("r.example").state == CLOSED
+
+    # Direct fetches share the outcome
+    granted, _ = registry.acquire(["direct.com"])
+    registry.record(granted, None, http_error("HTTP error: 503", 503))
+    assert registry.get("direct.com").consecutive_failures == 1
+
+
+def test_acquire_releases_probe_when_another_breaker_refuses():
+    registry = CircuitBreakerRegistry(failure_threshold=1, cooldown=0.05)
+    provider = registry.get("r.jina.ai")
+    provider.record_failure()
+    time.sleep(0.06)
+    host = registry.get("down.com")
+    host.record_failure()
+    host._opened_at = time.monotonic()
+
+    granted, refusal = registry.acquire(["r.jina.ai", "down.com"])
+    assert granted == []
+    assert "down.com" in refusal
+    # The provider's probe slot is free again
+    assert provider.allow()
+
+
+@patch("main.time.sleep")
+@patch("main.get_extractor")
+def test_augment_fast_fails_open_host(mock_get_extractor, mock_sleep, capsys):
+    """Once a host's breaker opens, its remaining URLs are not fetched."""
+    report = "Report\n\nReferences\n" + "".join(f"https://down.com/{i}\n" for i in range(6)) + "https://up.com/x\n"
+    extractor = MagicMock()
+    extractor.provider_host = None
+    extractor.extract_text.side_effect = lambda url, **kwargs: (
+        (None, http_error("HTTP error: 503", 503)) if "down.com" in url else ("ok", None)
+    )
+    mock_get_extractor.return_value = extractor
+
+    breakers = CircuitBreakerRegistry(failure_threshold=3, cooldown=60, retry_policy=RetryPolicy(max_retries=0))
+    augment_research_report(report, verbose=True, retry_policy=RetryPolicy(max_retries=0), breakers=breakers)
+
+    fetched = [call.kwargs["url"] for call in extractor.extract_text.call_args_list]
+    assert sum("down.com" in url for url in fetched) == 3
+    assert "https://up.com/x" in fetched
+    output = capsys.readouterr().out
+    assert "Circuit open for down.com" in output
+    assert "down.com: open, opened 1x, 3 requests fast-failed" in output
+
+
+@patch("main.time.sleep")
+@patch("main.get_extractor")
+def test_provider_outage_does_not_trip_host_breakers(mock_get_extractor, mock_sleep):
+    report = "Report\n\nReferences\n" + "".join(f"https://healthy.com/{i}\n" for i in range(6))
+    extractor = MagicMock()
+    extractor.provider_host = "r.jina.ai"
+    extractor.extract_text.return_value = (None, http_error("API error: 502", 502))
+    mock_get_extractor.return_value = extractor
+
+    breakers = CircuitBreakerRegistry(failure_threshold=3, cooldown=60, retry_policy=RetryPolicy(max_retries=0))
+    augment_research_report(report, extractor_type="jina", verbose=False,
+                            retry_policy=RetryPolicy(max_retries=0), breakers=breakers)
+
+    assert breakers.get("r.jina.ai").state == OPEN
+    assert breakers.get("healthy.com").state == CLOSED
+    assert breakers.get("healthy.com").consecutive_failures == 0
+
+
+class FakeProvider(ContentExtractorInterface):
+    provider_host = "r.jina.ai"
+
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def extract_text(self, url, api_key=None, **kwargs):
+        self.calls += 1
+        return None, http_error("API error: 502", 502)
+
+
+class FakeLocal(ContentExtractorInterface):
+    def extract_text(self, url, api_key=None, **kwargs):
+        return f"local {url}", None
+
+
+def test_chain_reroutes_around_open_provider():
+    provider = FakeProvider()
+    chain = ExtractorChain([("jina", provider), ("local_bs4", FakeLocal())])
+    chain.breakers = CircuitBreakerRegistry(failure_threshold=2, cooldown=60)
+
+    for i in range(5):
+        assert chain.extract_text(f"https://a.com/{i}") == (f"local https://a.com/{i}", None)
+
+    # Jina was only called until its breaker opened
+    assert provider.calls == 2
+    assert chain.breakers.get("r.jina.ai").fast_failed == 3
+
+
+def test_chain_marks_errors_of_direct_members_as_upstream():
+    local_down = FakeLocal()
+    local_down.extract_text = lambda url, api_key=None, **kwargs: (None, http_error("HTTP error: 503", 503))
+    text, error = ExtractorChain([("jina", FakeProvider()), ("local_bs4", local_down)]).extract_text("https://a.com/")
+    assert error.upstream
+    text, error = ExtractorChain([("jina", FakeProvider())]).extract_text("https://a.com/")
+    assert not error.upstream
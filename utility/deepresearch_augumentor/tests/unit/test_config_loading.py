@@ -116,8 +116,28 @@ def test_extraction_mode_config(mock_parse_report, mock_extractor):
     assert kwargs["target_selector"] == "test-selector"
     assert kwargs["remove_selector"] == "test-remover"
 
-def test_extraction_mode_ignored_for_non_jina(mock_parse_report, mock_extractor):
-    """Test that extraction mode is ignored for non-Jina extractors."""
+def test_extraction_mode_applied_for_local_bs4(mock_parse_report, mock_extractor):
+    """Test that extraction mode is applied natively by the local BeautifulSoup extractor."""
+    mock_modes = {
+        "test-mode": {
+            "target_selector": "test-selector",
+            "remove_selector": "test-remover"
+        }
+    }
+
+    with patch("main.EXTRACTION_MODES", mock_modes):
+        augment_research_report(
+            "Test report",
+            extractor_type="local_bs4",
+            extraction_mode="test-mode"
+        )
+
+    _, kwargs = mock_extractor.call_args
+    assert kwargs["target_selector"] == "test-selector"
+    assert kwargs["remove_selector"] == "test-remover"
+
+def test_extraction_mode_ignored_for_firecrawl(mock_parse_report, mock_extractor):
+    """Test that extraction mode is ignored for extractors without selector support."""
     # Define a mock for EXTRACTION_MODES
     mock_modes = {
         "test-mode": {
@@ -128,14 +148,14 @@ def test_extraction_mode_ignored_for_non_jina(mock_parse_report, mock_extractor)
     
     # Patch the EXTRACTION_MODES dictionary
     with patch("main.EXTRACTION_MODES", mock_modes):
-        # Call with a non-Jina extractor
+        # Call with an extractor that does not support modes
         augment_research_report(
             "Test report", 
-            extractor_type="local_bs4",
+            extractor_type="firecrawl",
             extraction_mode="test-mode"
         )
     
     # Check that target_selector and remove_selector were not passed
     _, kwargs = mock_extractor.call_args
     assert "target_selector" not in kwargs or kwargs["target_selector"] is None
-    assert "remove_selector" not in kwargs or kwargs["remove_selector"] is None 
\ No newline at end of file
+    assert "remove_selector" not in kwargs or kwargs["remove_selector"] is None 
@@ -0,0 +1,137 @@
+"""
+Unit tests for the run-wide --deadline
+"""
+import asyncio
+import time
+import pytest
+from unittest.mock import patch, MagicMock
+from deadline import Deadline, DEADLINE_REACHED
+from main import augment_research_report, augment_research_report_async
+
+REPORT = "Report\n\nReferences\nhttps://a.com/1\nhttps://b.com/2\nhttps://c.com/3\nhttps://d.com/4\n"
+
+
+@pytest.fixture
+def mock_extractor():
+    with patch("main.get_extractor") as mock_get_extractor:
+        extractor = MagicMock()
+        mock_get_extractor.return_value = extractor
+        yield extractor
+
+
+def test_request_timeout_shrinks_near_deadline():
+    deadline = Deadline(5)
+    assert deadline.request_timeout(15) == 4
+    assert deadline.request_timeout(2) == 2
+    assert not deadline.expired
+
+
+def test_request_timeout_never_outlives_the_deadline():
+    deadline = Deadline(5)
+    with patch.object(Deadline, "remaining", return_value=4.1):
+        assert deadline.request_timeout(15) == 4
+        assert deadline.request_timeout(None) == 4
+    with patch.object(Deadline, "remaining", return_value=0.4):
+        assert deadline.request_timeout(15) == 1
+
+
+def test_expired_deadline():
+    deadline = Deadline(0.5)
+    assert deadline.expired
+    assert not deadline.allows_wait(0)
+
+
+def test_sequential_run_returns_partial_report(mock_extractor):
+    """URLs not reached before the deadline are marked, the report stays complete."""
+    def extract_impl(url, **kwargs):
+        time.sleep(0.8)
+        return f"Content of {url}", None
+
+    mock_extractor.extract_text.side_effect = extract_impl
+
+    start = time.time()
+    result = augment_research_report(REPORT, verbose=False, deadline=1.5)
+
+    assert time.time() - start < 3
+    assert "Content of https://a.com/1" in result
+    assert DEADLINE_REACHED in result
+    assert "### Reference 4: [https://d.com/4]" in result
+    assert result.endswith("_Content processed by Reference Augmentor_\n")
+
+
+def test_timeout_passed_to_extractor_is_capped(mock_extractor):
+    mock_extractor.extract_text.return_value = ("ok", None)
+
+    augment_research_report(REPORT, verbose=False, request_timeout=15, deadline=4)
+
+    assert all(call.kwargs["timeout"] <= 4 for call in mock_extractor.extract_text.call_args_list)
+
+
+def test_concurrent_run_stops_waiting_at_deadline(mock_extractor):
+    finished = []
+    timeouts = []
+
+    def extract_impl(url, **kwargs):
+        if "d.com" in url:
+            # A slow page, cut off by the shrunken request timeout
+            timeouts.append(kwargs["timeout"])
+            time.sleep(min(3, kwargs["timeout"]))
+            finished.append(url)
+            return None, "Request timed out"
+        finished.append(url)
+        return f"Content of {url}", None
+
+    mock_extractor.extract_text.side_effect = extract_impl
+    closed_with = []
+
+    with patch("utils.format_output") as mock_format, \
+            patch("main._RunContext.close", lambda ctx: closed_with.append(list(finished))):
+        start = time.time()
+        augment_research_report(REPORT, verbose=False, concurrency=4, deadline=1.5)
+        elapsed = time.time() - start
+
+    assert elapsed < 2.5
+    _, url_contents = mock_format.call_args[0]
+    assert url_contents[0] == ("https://a.com/1", "Content of https://a.com/1", None)
+    # The slow request is given only the time left, so it ends by the deadline
+    assert timeouts == [1]
+    assert url_contents[3] == ("https://d.com/4", None, "Request timed out")
+    # The run's resources are only closed once the request in flight is done
+    assert "https://d.com/4" in closed_with[0]
+
+
+def test_unexpected_worker_exception_fails_only_its_url(mock_extractor):
+    mock_extractor.extract_text.return_value = ("ok", None)
+
+    def extract_url(ctx, url, log):
+        if "b.com" in url:
+            raise RuntimeError("boom")
+        return "Content", None, 1, False
+
+    with patch("main._extract_url", side_effect=extract_url), patch("utils.format_output") as mock_format:
+        augment_research_report(REPORT, verbose=False, concurrency=4)
+
+    _, url_contents = mock_format.call_args[0]
+    assert [text for _, text, _ in url_contents] == ["Content", None, "Content", "Content"]
+    assert "RuntimeError: boom" in url_contents[1][2]
+
+
+def test_async_run_cancels_outstanding_fetches(mock_extractor):
+    async def extract_impl(url, **kwargs):
+        if "d.com" in url:
+            await asyncio.sleep(10)
+        return f"Content of {url}", None
+
+    mock_extractor.extract_text_async.side_effect = extract_impl
+
+    with patch("utils.format_output") as mock_format:
+        start = time.time()
+        asyncio.run(augment_research_report_async(REPORT, verbose=False, deadline=1.5))
+        elapsed = time.time() - start
+
+    assert elapsed < 2.5
+    _, url_contents = mock_format.call_args[0]
+    assert [content for _, content, _ in url_contents[:3]] == [
+        "Content of https://a.com/1", "Content of https://b.com/2", "Content of https://c.com/3"
+    ]
+    assert url_contents[3] == ("https://d.com/4", None, DEADLINE_REACHED)
@@ -54,7 +54,7 @@ class MockResponse:
 class TestNetworkErrors:
     """Test how the system handles network-related errors"""
     
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_connection_timeout(self, mock_post):
         """Test that connection timeouts are properly handled"""
         # Configure mock to raise timeout exception
@@ -68,7 +68,7 @@ class TestNetworkErrors:
         assert result is None
         assert "Connection timed out" in error
     
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_connection_error(self, mock_post):
         """Test that connection errors are properly handled"""
         # Configure mock to raise connection error
@@ -82,7 +82,7 @@ class TestNetworkErrors:
         assert result is None
         assert "connection" in error.lower()
     
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_dns_failure(self, mock_post):
         """Test that DNS resolution failures are properly handled"""
         # Configure mock to raise DNS resolution error
@@ -100,7 +100,7 @@ class TestNetworkErrors:
 class TestAPIErrors:
     """Test how the system handles API-specific errors"""
     
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_invalid_api_key(self, mock_post):
         """Test that invalid API keys are properly handled"""
         # Configure mock to return unauthorized response
@@ -119,7 +119,7 @@ class TestAPIErrors:
         assert result is None
         assert "API" in error and "key" in error.lower() or "unauthorized" in error.lower() or "401" in error
     
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_rate_limit_exceeded(self, mock_post):
         """Test that rate limit errors are properly handled"""
         # Configure mock to return rate limit response
@@ -138,7 +138,7 @@ class TestAPIErrors:
         assert result is None
         assert "rate limit" in error.lower() or "429" in error or "too many requests" in error.lower()
     
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_quota_exceeded(self, mock_post):
         """Test that quota exhaustion errors are properly handled"""
         # Configure mock to return quota exceeded response
@@ -157,7 +157,7 @@ class TestAPIErrors:
         assert result is None
         assert "quota" in error.lower() or "403" in error or "forbidden" in error.lower()
     
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_server_error(self, mock_post):
         """Test that server errors are properly handled"""
         # Configure mock to return server error
@@ -180,7 +180,7 @@ class TestAPIErrors:
 class TestMalformedResponses:
     """Test how the system handles malformed API responses"""
     
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_invalid_json_response(self, mock_post):
         """Test handling of invalid JSON responses"""
         # Configure mock to return valid status but invalid JSON
@@ -200,7 +200,7 @@ class TestMalformedResponses:
         assert result is None
         assert "json" in error.lower() or "parse" in error.lower() or "decode" in error.lower()
     
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_missing_data_in_response(self, mock_post):
         """Test handling of responses missing expected data fields"""
         # Configure mock to return valid status but missing expected fields
@@ -223,7 +223,7 @@ class TestMalformedResponses:
 class TestTimeoutScenarios:
     """Test how the system handles various timeout scenarios"""
     
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_request_exceeds_timeout(self, mock_post):
         """Test that requests exceeding timeout are properly handled"""
         # Configure mock to raise timeout exception
@@ -237,7 +237,7 @@ class TestTimeoutScenarios:
         assert result is None
         assert "timed out" in error.lower() or "timeout" in error.lower()
     
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_slow_but_successful_response(self, mock_post):
         """Test handling of slow but eventually successful responses"""
         # Configure mock to simulate a slow but successful response
@@ -0,0 +1,169 @@
+"""
+Unit tests for the persistent ExtractionCache
+"""
+import asyncio
+import os
+import pytest
+from unittest.mock import patch, MagicMock
+from extraction_cache import ExtractionCache
+from main import augment_research_report, augment_research_report_async
+from utils import normalize_url
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Return an ExtractionCache stored in a temporary directory."""
+    cache = ExtractionCache(str(tmp_path))
+    yield cache
+    cache.close()
+
+
+def test_normalize_url():
+    """Scheme/host case, fragments and default ports do not change the key URL."""
+    assert normalize_url("HTTPS://Example.COM:443/Page#section") == "https://example.com/Page"
+    assert normalize_url("http://example.com:80") == "http://example.com/"
+    assert normalize_url("https://example.com/a?b=1") == "https://example.com/a?b=1"
+
+
+def test_key_depends_on_url_extractor_and_mode():
+    """Keys match for equivalent URLs and differ for extractor or mode settings."""
+    base = ExtractionCache.make_key("https://example.com/a", "jina", {"target_selector": "main"})
+    assert base == ExtractionCache.make_key("https://EXAMPLE.com/a#x", "jina", {"target_selector": "main", "api_key": "k"})
+    assert base != ExtractionCache.make_key("https://example.com/a", "local_bs4", {"target_selector": "main"})
+    for setting in ({"html_parser": "lxml"}, {"max_bytes": 1024}, {"max_pdf_pages": 5}):
+        assert base != ExtractionCache.make_key("https://example.com/a", "jina", dict(setting, target_selector="main"))
+    assert base != ExtractionCache.make_key("https://example.com/a", "jina", {"target_selector": "article"})
+    assert base != ExtractionCache.make_key("https://example.com/a", "jina",
+                                            {"target_selector": "main", "links_handling": "discarded"})
+
+
+def test_put_and_get(cache):
+    """Stored content is returned on lookup."""
+    key = cache.make_key("https://example.com", "jina")
+    cache.put(key, "https://example.com", "jina", "cached content")
+
+    assert cache.get(key) == "cached content"
+    assert cache.get("missing") is None
+
+
+def test_persists_across_instances(tmp_path):
+    """Entries survive reopening the cache directory."""
+    first = ExtractionCache(str(tmp_path))
+    key = first.make_key("https://example.com", "jina")
+    first.put(key, "https://example.com", "jina", "persisted")
+    first.close()
+
+    second = ExtractionCache(str(tmp_path))
+    assert second.get(key) == "persisted"
+    second.close()
+
+
+def test_ttl_expiry(tmp_path):
+    """Entries older than the TTL are treated as missing."""
+    cache = ExtractionCache(str(tmp_path), ttl_seconds=10)
+    key = cache.make_key("https://example.com", "jina")
+    with patch("extraction_cache.time.time", return_value=1000.0):
+        cache.put(key, "https://example.com", "jina", "old")
+    with patch("extraction_cache.time.time", return_value=1005.0):
+        assert cache.get(key) == "old"
+    with patch("extraction_cache.time.time", return_value=1011.0):
+        assert cache.get(key) is None
+    cache.close()
+
+
+def test_lru_eviction(tmp_path):
+    """The least recently used entry is evicted when the size cap is exceeded."""
+    cache = ExtractionCache(str(tmp_path), max_bytes=25)
+    with patch("extraction_cache.time.time", return_value=1000.0):
+        cache.put("a", "https://a.com", "jina", "a" * 10)
+    with patch("extraction_cache.time.time", return_value=1001.0):
+        cache.put("b", "https://b.com", "jina", "b" * 10)
+    with patch("extraction_cache.time.time", return_value=1002.0):
+        cache.get("a")  # "a" is now more recently used than "b"
+    with patch("extraction_cache.time.time", return_value=1003.0):
+        cache.put("c", "https://c.com", "jina", "c" * 10)
+
+        assert cache.get("a") == "a" * 10
+        assert cache.get("b") is None
+        assert cache.get("c") == "c" * 10
+    assert cache.stats() == {"entries": 2, "bytes": 20}
+    cache.close()
+
+
+def test_refresh_skips_lookup_but_stores(tmp_path):
+    """A refreshing cache ignores existing entries but still writes new ones."""
+    cache = ExtractionCache(str(tmp_path))
+    cache.put("k", "https://example.com", "jina", "old")
+    cache.close()
+
+    refreshing = ExtractionCache(str(tmp_path), refresh=True)
+    assert refreshing.get("k") is None
+    refreshing.put("k", "https://example.com", "jina", "new")
+    refreshing.close()
+
+    cache = ExtractionCache(str(tmp_path))
+    assert cache.get("k") == "new"
+    cache.close()
+
+
+def assert_closed(cache):
+    with pytest.raises(Exception, match="closed"):
+        cache.get("k")
+
+
+def test_augment_uses_cache(cache):
+    """A second run is served from the cache without calling the extractor."""
+    report = "Report\n\nReferences\nhttps://example.com/a\nhttps://example.com/b\n"
+    with patch("main.get_extractor") as mock_get_extractor:
+        extractor = MagicMock()
+        extractor.extract_text.side_effect = lambda url, **kwargs: (None, "API error: 404") if url.endswith("/b") else (f"Content of {url}", None)
+        mock_get_extractor.return_value = extractor
+
+        first = augment_research_report(report, verbose=False, cache=cache)
+        assert extractor.extract_text.call_count == 2
+        # The run closes its cache; the next one opens the same directory again
+        assert_closed(cache)
+
+        second = augment_research_report(report, verbose=False,
+                                         cache=ExtractionCache(os.path.dirname(cache.path)))
+
+    # Only the failed URL is fetched again
+    assert extractor.extract_text.call_count == 3
+    assert "Content of https://example.com/a" in second
+    assert first == second
+
+
+def test_async_run_closes_cache(cache):
+    with patch("main.get_extractor") as mock_get_extractor:
+        mock_get_extractor.return_value.extract_text.return_value = ("Content", None)
+        asyncio.run(augment_research_report_async("Report\n\nReferences\nhttps://example.com/a\n",
+                                                  verbose=False, cache=cache))
+    assert_closed(cache)
+
+
+@pytest.mark.parametrize("concurrency", [1, 4])
+def test_failed_run_still_closes_cache(cache, concurrency):
+    report = "Report\n\nReferences\nhttps://example.com/a\nhttps://example.com/b\n"
+    with patch("main.get_extractor"), \
+            patch("main._ExtractionProgress.record", side_effect=RuntimeError("disk full")):
+        with pytest.raises(RuntimeError):
+            augment_research_report(report, verbose=False, cache=cache, concurrency=concurrency)
+    assert_closed(cache)
+
+
+def test_cli_saves_run_state_when_the_run_fails(tmp_path):
+    import main
+    report = tmp_path / "report.txt"
+    report.write_text("Report\n\nReferences\nhttps://example.com/a\n", encoding="utf-8")
+    with patch("sys.argv", ["main.py", str(report)]), \
+            patch("main.augment_research_report", side_effect=RuntimeError("boom")), \
+            patch("run_journal.RunJournal.close") as close_journal, \
+            patch("key_pool.KeyUsage.save") as save_key_usage, \
+            patch("latency_store.AdaptiveTimeouts.close") as close_timeouts, \
+            patch("extraction_cache.ExtractionCache.close") as close_cache:
+        with pytest.raises(SystemExit):
+            main.main()
+    close_journal.assert_called_once()
+    save_key_usage.assert_called_once()
+    close_timeouts.assert_called_once()
+    close_cache.assert_called_once()
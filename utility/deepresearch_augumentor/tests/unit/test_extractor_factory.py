@@ -35,4 +35,16 @@ def test_get_extractor_invalid():
 def test_get_extractor_case_sensitive():
     """Test that extractor type is case sensitive."""
     with pytest.raises(ValueError):
-        get_extractor("JINA")  # Should be lowercase "jina" 
\ No newline at end of file
+        get_extractor("JINA")  # Should be lowercase "jina" 
+def test_get_extractor_chain():
+    """A comma-separated type builds an ExtractorChain with members in order."""
+    from extractors import ExtractorChain
+    extractor = get_extractor("jina,local_bs4", chain_mode="hedge", hedge_percentile=90)
+    assert isinstance(extractor, ExtractorChain)
+    assert extractor.names == ["jina", "local_bs4"]
+    assert extractor.mode == "hedge"
+    assert isinstance(extractor.members[1][1], BeautifulSoupExtractor)
+
+def test_get_extractor_chain_invalid_member():
+    with pytest.raises(ValueError, match="Unsupported extractor type: bogus"):
+        get_extractor("jina,bogus")
@@ -0,0 +1,151 @@
+"""
+Unit tests for the asyncio implementations of the extractors (extract_text_async)
+"""
+import asyncio
+import json
+import pytest
+from unittest.mock import patch
+from extractors.base import ContentExtractorInterface
+from extractors.jina_extractor import JinaAIExtractor
+from extractors.firecrawl_extractor import FirecrawlExtractor
+from extractors.local_bs4_extractor import BeautifulSoupExtractor
+
+
+class FakeStream:
+    """Minimal stand-in for aiohttp.StreamReader."""
+
+    def __init__(self, body):
+        self._body = body
+
+    async def iter_chunked(self, size):
+        for start in range(0, len(self._body), size):
+            yield self._body[start:start + size]
+
+
+class FakeResponse:
+    """Minimal stand-in for aiohttp.ClientResponse."""
+
+    def __init__(self, status, body, headers=None):
+        self.status = status
+        self.headers = headers or {}
+        self._body = body if isinstance(body, str) else json.dumps(body)
+        self.content = FakeStream(self._body.encode("utf-8"))
+
+    async def text(self, **kwargs):
+        return self._body
+
+    async def json(self, **kwargs):
+        return json.loads(self._body)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+
+class FakeSession:
+    """Records requests and returns a canned FakeResponse or raises an exception."""
+
+    def __init__(self, status=200, body="", exc=None):
+        self.status = status
+        self.body = body
+        self.exc = exc
+        self.calls = []
+
+    def _request(self, method, url, **kwargs):
+        self.calls.append((method, url, kwargs))
+        if self.exc is not None:
+            raise self.exc
+        return FakeResponse(self.status, self.body)
+
+    def post(self, url, **kwargs):
+        return self._request("POST", url, **kwargs)
+
+    def get(self, url, **kwargs):
+        return self._request("GET", url, **kwargs)
+
+
+def test_jina_async_success(mock_jina_response_success):
+    """Jina async extraction returns the content field."""
+    session = FakeSession(200, mock_jina_response_success)
+    text, error = asyncio.run(JinaAIExtractor().extract_text_async(
+        "https://example.com", api_key="test-api-key", session=session, target_selector="main"
+    ))
+
+    assert error is None
+    assert text == mock_jina_response_success["data"]["content"]
+    method, url, kwargs = session.calls[0]
+    assert method == "POST"
+    assert kwargs["json"] == {"url": "https://example.com"}
+    assert kwargs["headers"]["X-Target-Selector"] == "main"
+
+
+def test_jina_async_api_error(mock_jina_response_error):
+    """Jina async extraction reports API errors like the sync version."""
+    session = FakeSession(401, mock_jina_response_error)
+    text, error = asyncio.run(JinaAIExtractor().extract_text_async(
+        "https://example.com", api_key="test-api-key", session=session
+    ))
+
+    assert text is None
+    assert "API error: 401" in error
+
+
+def test_jina_async_timeout():
+    """Timeouts surface as a timeout error message."""
+    session = FakeSession(exc=asyncio.TimeoutError())
+    text, error = asyncio.run(JinaAIExtractor().extract_text_async(
+        "https://example.com", api_key="test-api-key", session=session, timeout=5
+    ))
+
+    assert text is None
+    assert "timed out after 5 seconds" in error
+
+
+def test_firecrawl_async_success(mock_firecrawl_response_success):
+    """Firecrawl async extraction returns the content field."""
+    session = FakeSession(200, mock_firecrawl_response_success)
+    text, error = asyncio.run(FirecrawlExtractor().extract_text_async(
+        "https://example.com", api_key="test-api-key", session=session
+    ))
+
+    assert error is None
+    assert text == mock_firecrawl_response_success["content"]
+
+
+def test_bs4_async_success(mock_html_content):
+    """BeautifulSoup async extraction downloads and converts HTML to text."""
+    session = FakeSession(200, mock_html_content)
+    text, error = asyncio.run(BeautifulSoupExtractor().extract_text_async(
+        "https://example.com", session=session
+    ))
+
+    assert error is None
+    assert "Main Article Title" in text
+    assert "This should be removed" not in text
+
+
+def test_bs4_async_http_error():
+    """Non-200 responses are reported as HTTP errors."""
+    session = FakeSession(404, "Not found")
+    text, error = asyncio.run(BeautifulSoupExtractor().extract_text_async(
+        "https://example.com", session=session
+    ))
+
+    assert text is None
+    assert "HTTP error: 404" in error
+
+
+def test_default_async_falls_back_to_sync():
+    """Extractors without a native coroutine run extract_text in a thread."""
+    class SyncOnlyExtractor(ContentExtractorInterface):
+        def extract_text(self, url, api_key=None, **kwargs):
+            return f"sync:{url}:{kwargs.get('timeout')}", None
+
+    text, error = asyncio.run(SyncOnlyExtractor().extract_text_async(
+        "https://example.com", session=object(), timeout=3
+    ))
+
+    assert error is None
+    assert text == "sync:https://example.com:3"
@@ -15,12 +15,13 @@ def test_extract_text_success(extractor, mock_html_content):
     """Test successful text extraction."""
     url = "https://example.com"
     
-    # Mock requests.get to return our test HTML
+    # Mock Session.get to return our test HTML
     mock_response = MagicMock()
     mock_response.status_code = 200
     mock_response.text = mock_html_content
+    mock_response.iter_content.return_value = [mock_html_content.encode("utf-8")]
     
-    with patch("requests.get", return_value=mock_response):
+    with patch("requests.Session.get", return_value=mock_response):
         text, error = extractor.extract_text(url)
     
     # Check that extraction was successful
@@ -42,11 +43,11 @@ def test_extract_text_http_error(extractor):
     """Test handling of HTTP error."""
     url = "https://example.com"
     
-    # Mock requests.get to return 404
+    # Mock Session.get to return 404
     mock_response = MagicMock()
     mock_response.status_code = 404
     
-    with patch("requests.get", return_value=mock_response):
+    with patch("requests.Session.get", return_value=mock_response):
         text, error = extractor.extract_text(url)
     
     # Check that error was returned properly
@@ -58,8 +59,8 @@ def test_extract_text_connection_error(extractor):
     """Test handling of connection error."""
     url = "https://example.com"
     
-    # Mock requests.get to raise ConnectionError
-    with patch("requests.get", side_effect=requests.ConnectionError("Failed to connect")):
+    # Mock Session.get to raise ConnectionError
+    with patch("requests.Session.get", side_effect=requests.ConnectionError("Failed to connect")):
         text, error = extractor.extract_text(url)
     
     # Check that error was returned properly
@@ -72,8 +73,8 @@ def test_extract_text_timeout(extractor):
     """Test handling of timeout."""
     url = "https://example.com"
     
-    # Mock requests.get to raise Timeout
-    with patch("requests.get", side_effect=requests.Timeout("Request timed out")):
+    # Mock Session.get to raise Timeout
+    with patch("requests.Session.get", side_effect=requests.Timeout("Request timed out")):
         text, error = extractor.extract_text(url)
     
     # Check that error was returned properly
@@ -86,12 +87,12 @@ def test_extract_text_empty_content(extractor):
     """Test handling of empty content."""
     url = "https://example.com"
     
-    # Mock requests.get to return empty HTML
+    # Mock Session.get to return empty HTML
     mock_response = MagicMock()
     mock_response.status_code = 200
     mock_response.text = "<html><body></body></html>"
     
-    with patch("requests.get", return_value=mock_response):
+    with patch("requests.Session.get", return_value=mock_response):
         text, error = extractor.extract_text(url)
     
     # Check that extraction returns empty string, not error
@@ -103,15 +104,15 @@ def test_extract_text_custom_timeout(extractor):
     url = "https://example.com"
     timeout = 30
     
-    # Mock requests.get
+    # Mock Session.get
     mock_response = MagicMock()
     mock_response.status_code = 200
     mock_response.text = "<html><body>Test</body></html>"
     
-    with patch("requests.get", return_value=mock_response) as mock_get:
+    with patch("requests.Session.get", return_value=mock_response) as mock_get:
         extractor.extract_text(url, timeout=timeout)
     
-    # Check that timeout was passed to requests.get
+    # Check that timeout was passed to Session.get
     args, kwargs = mock_get.call_args
     assert kwargs["timeout"] == timeout
 
@@ -120,12 +121,12 @@ def test_extract_text_custom_user_agent(extractor):
     url = "https://example.com"
     user_agent = "Custom User Agent"
     
-    # Mock requests.get
+    # Mock Session.get
     mock_response = MagicMock()
     mock_response.status_code = 200
     mock_response.text = "<html><body>Test</body></html>"
     
-    with patch("requests.get", return_value=mock_response) as mock_get:
+    with patch("requests.Session.get", return_value=mock_response) as mock_get:
         extractor.extract_text(url, user_agent=user_agent)
     
     # Check that user agent was passed in headers
@@ -0,0 +1,155 @@
+"""
+Unit tests for ExtractorChain fallback and hedged modes
+"""
+import asyncio
+import time
+import pytest
+from extractors.base import ContentExtractorInterface
+from extractors.chain_extractor import ExtractorChain, LatencyTracker
+from extractors.errors import ExtractionError, http_error, TIMEOUT, SKIPPED, PERMANENT
+
+
+class FakeExtractor(ContentExtractorInterface):
+    """Extractor returning a fixed result after a delay, recording its calls."""
+
+    def __init__(self, result, delay=0.0):
+        super().__init__()
+        self.result = result
+        self.delay = delay
+        self.calls = []
+        self.cancelled = False
+
+    def extract_text(self, url, api_key=None, **kwargs):
+        self.calls.append(api_key)
+        time.sleep(self.delay)
+        return self.result
+
+    async def extract_text_async(self, url, api_key=None, **kwargs):
+        self.calls.append(api_key)
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return self.result
+
+
+def test_fallback_uses_secondary_after_failure():
+    primary = FakeExtractor((None, "API error: 500"))
+    secondary = FakeExtractor(("local text", None))
+    chain = ExtractorChain([("jina", primary), ("local_bs4", secondary)])
+
+    assert chain.extract_text("https://a.com", api_key="k") == ("local text", None)
+    assert primary.calls == ["k"]
+    # The primary's key is not sent to other members
+    assert secondary.calls == [None]
+
+
+def test_fallback_stops_at_first_success():
+    primary = FakeExtractor(("jina text", None))
+    secondary = FakeExtractor(("local text", None))
+    chain = ExtractorChain([("jina", primary), ("local_bs4", secondary)])
+
+    assert chain.extract_text("https://a.com") == ("jina text", None)
+    assert secondary.calls == []
+
+
+def test_per_member_api_keys():
+    primary = FakeExtractor((None, "API error: 401"))
+    secondary = FakeExtractor(("text", None))
+    chain = ExtractorChain([("jina", primary), ("firecrawl", secondary)])
+
+    chain.extract_text("https://a.com", api_keys={"jina": "j", "firecrawl": "f"})
+    assert primary.calls == ["j"]
+    assert secondary.calls == ["f"]
+
+
+def test_combined_error_keeps_retryable_kind():
+    chain = ExtractorChain([
+        ("jina", FakeExtractor((None, http_error("API error: 404", 404)))),
+        ("local_bs4", FakeExtractor((None, http_error("HTTP error: 503", 503)))),
+    ])
+    text, error = chain.extract_text("https://a.com")
+    assert text is None
+    assert "jina: API error: 404" in error and "local_bs4: HTTP error: 503" in error
+    assert error.kind == "server_error"
+
+
+@pytest.mark.parametrize("errors, kind", [
+    ([ExtractionError("Skipped: application/pdf", kind=SKIPPED), ExtractionError("Timeout", kind=TIMEOUT)], TIMEOUT),
+    ([ExtractionError("Timeout", kind=TIMEOUT), ExtractionError("Skipped: too large", kind=SKIPPED)], TIMEOUT),
+    ([http_error("API error: 404", 404), ExtractionError("Skipped: application/pdf", kind=SKIPPED)], SKIPPED),
+    ([http_error("API error: 404", 404), http_error("HTTP error: 410", 410)], PERMANENT),
+    ([ExtractionError("Skipped: application/pdf", kind=SKIPPED), "Timeout occurred"], None),
+])
+def test_combined_error_ranks_transient_kinds_above_skipped(errors, kind):
+    """A member skipping the page does not hide another member's transient failure from retries."""
+    chain = ExtractorChain([(f"member{n}", FakeExtractor((None, error))) for n, error in enumerate(errors)])
+    _, error = chain.extract_text("https://a.com/report.pdf")
+    assert error.kind == kind
+
+
+def test_hedge_starts_secondary_when_primary_is_slow():
+    primary = FakeExtractor(("slow", None), delay=1.0)
+    secondary = FakeExtractor(("fast", None))
+    chain = ExtractorChain([("jina", primary), ("local_bs4", secondary)], mode="hedge", hedge_delay=0.1)
+
+    start = time.time()
+    assert chain.extract_text("https://a.com") == ("fast", None)
+    assert time.time() - start < 0.5
+    chain.close()
+
+
+def test_hedge_does_not_start_secondary_for_fast_primary():
+    primary = FakeExtractor(("fast", None))
+    secondary = FakeExtractor(("other", None))
+    chain = ExtractorChain([("jina", primary), ("local_bs4", secondary)], mode="hedge", hedge_delay=0.5)
+
+    assert chain.extract_text("https://a.com") == ("fast", None)
+    assert secondary.calls == []
+    chain.close()
+
+
+def test_async_hedge_cancels_loser():
+    primary = FakeExtractor(("slow", None), delay=5.0)
+    secondary = FakeExtractor(("fast", None))
+    chain = ExtractorChain([("jina", primary), ("local_bs4", secondary)], mode="hedge", hedge_delay=0.1)
+
+    result = asyncio.run(chain.extract_text_async("https://a.com"))
+    assert result == ("fast", None)
+    assert primary.cancelled
+
+
+def test_hedge_win_records_slow_primary_latency():
+    primary = FakeExtractor(("slow", None), delay=0.4)
+    secondary = FakeExtractor(("fast", None), delay=0.1)
+    chain = ExtractorChain([("jina", primary), ("local_bs4", secondary)], mode="hedge", hedge_delay=0.1)
+
+    assert chain.extract_text("https://a.com") == ("fast", None)
+    assert asyncio.run(chain.extract_text_async("https://a.com")) == ("fast", None)
+    # The primary had been running for at least the hedge delay plus the secondary's time
+    assert len(chain.latency.samples) == 2
+    assert all(seconds >= 0.2 for seconds in chain.latency.samples)
+    chain.close()
+
+
+def test_async_fallback():
+    chain = ExtractorChain([
+        ("jina", FakeExtractor((None, "Timeout occurred"))),
+        ("local_bs4", FakeExtractor(("text", None))),
+    ])
+    assert asyncio.run(chain.extract_text_async("https://a.com")) == ("text", None)
+
+
+def test_latency_percentile():
+    tracker = LatencyTracker(min_samples=3, default=9.0)
+    assert tracker.percentile(95) == 9.0
+    for seconds in (1.0, 2.0, 3.0, 4.0, 5.0):
+        tracker.record(seconds)
+    assert tracker.percentile(50) == 3.0
+    assert tracker.percentile(100) == 5.0
+
+
+def test_invalid_mode():
+    with pytest.raises(ValueError):
+        ExtractorChain([("jina", FakeExtractor(("x", None)))], mode="race")
@@ -0,0 +1,67 @@
+"""
+Unit tests for charset resolution of downloaded pages
+"""
+import codecs
+import pytest
+from unittest.mock import patch
+from extractors import charset
+from extractors.charset import resolve_encoding, decode_page, normalize_encoding
+from extractors.html_parsing import available_backends
+from extractors.parse_pool import render_download
+
+
+def test_bom_wins_over_header():
+    raw = codecs.BOM_UTF8 + "Café".encode("utf-8")
+    assert resolve_encoding(raw, "iso-8859-1") == ("utf-8-sig", "bom")
+    assert decode_page(raw, "iso-8859-1") == "Café"
+    assert decode_page(codecs.BOM_UTF16_LE + "Café".encode("utf-16-le")) == "Café"
+
+
+def test_header_charset():
+    assert resolve_encoding(b"<html>", "Shift_JIS") == ("shift_jis", "header")
+    # As in browsers, Latin-1 and ASCII labels mean windows-1252
+    assert resolve_encoding(b"<html>", "ISO-8859-1") == ("cp1252", "header")
+
+
+@pytest.mark.parametrize("head, expected", [
+    (b'<meta charset="windows-1251">', "cp1251"),
+    (b"<META CHARSET=euc-kr>", "euc_kr"),
+    (b'<meta http-equiv="Content-Type" content="text/html; charset=iso-8859-2">', "iso8859-2"),
+    (b'<?xml version="1.0" encoding="koi8-r"?>', "koi8-r"),
+    (b'<meta charset="utf-16">', "utf-8"),
+])
+def test_meta_charset(head, expected):
+    assert resolve_encoding(b"<html><head>" + head + b"</head>", None) == (expected, "meta")
+
+
+def test_meta_beyond_sniff_window_is_ignored():
+    raw = b"<html><!--" + b"x" * 5000 + b'--><meta charset="koi8-r">'
+    assert resolve_encoding(raw, None) == ("utf-8", "utf-8")
+
+
+def test_utf8_sample_is_checked_before_detection():
+    raw = ("Ünïcödé " * 20000).encode("utf-8")
+    with patch.object(charset.chardet, "detect") as detect:
+        assert resolve_encoding(raw, None) == ("utf-8", "utf-8")
+    detect.assert_not_called()
+
+
+def test_detection_only_sees_a_bounded_sample():
+    raw = ("Привет, мир. " * 50000).encode("cp1251")
+    with patch.object(charset.chardet, "detect", wraps=charset.chardet.detect) as detect:
+        encoding, source = resolve_encoding(raw, None)
+    assert source == "detected"
+    assert len(detect.call_args[0][0]) == charset.DETECT_SAMPLE_BYTES
+    assert codecs.lookup(encoding).name == encoding
+
+
+def test_unknown_labels():
+    assert normalize_encoding("no-such-charset") is None
+    assert resolve_encoding(b"abc", "no-such-charset") == ("utf-8", "utf-8")
+
+
+@pytest.mark.parametrize("backend", available_backends())
+def test_render_download_decodes_legacy_pages(backend):
+    html = '<html><head><meta charset="windows-1251"></head><body><p>Привет</p></body></html>'
+    text = render_download(html.encode("cp1251"), None, "https://x.example/", {"html_parser": backend})
+    assert text == "Привет"
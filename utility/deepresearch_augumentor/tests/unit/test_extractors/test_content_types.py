@@ -0,0 +1,106 @@
+"""
+Unit tests for content-type dispatch: HTML, plain text, Markdown and PDF
+"""
+import pytest
+from unittest.mock import patch, MagicMock
+from extractors import content_types
+from extractors.content_types import HTML, TEXT, PDF, content_kind, normalize_text, pdf_to_text
+from extractors.download import check_headers, read_body
+from extractors.errors import SKIPPED
+from extractors.local_bs4_extractor import BeautifulSoupExtractor
+from extractors.parse_pool import render_download
+
+
+def make_pdf(page_texts):
+    """A minimal PDF with one line of text per page."""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None,
+               b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for text in page_texts:
+        stream = b"BT /F1 12 Tf 72 720 Td (" + text.encode("latin-1") + b") Tj ET"
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % len(objects))
+        kids.append(b"%d 0 R" % len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(kids), len(kids))
+    pdf, offsets = b"%PDF-1.4\n", []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(pdf))
+        pdf += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(pdf)
+    pdf += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    pdf += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    pdf += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return pdf
+
+
+@pytest.mark.parametrize("media_type, kind", [
+    ("text/html", HTML),
+    ("application/xhtml+xml", HTML),
+    ("text/plain", TEXT),
+    ("text/markdown", TEXT),
+    ("text/x-rst", TEXT),
+    ("application/json", TEXT),
+    ("video/mp4", None),
+    ("application/zip", None),
+])
+def test_content_kind(media_type, kind):
+    assert content_kind(media_type) == kind
+
+
+def test_pdf_support_depends_on_pypdf():
+    with patch.object(content_types, "PDF_AVAILABLE", True):
+        assert content_kind("application/pdf") == PDF
+        assert check_headers({"Content-Type": "application/pdf"}, 0) is None
+    with patch.object(content_types, "PDF_AVAILABLE", False):
+        assert content_kind("application/pdf") is None
+        error = check_headers({"Content-Type": "application/pdf"}, 0)
+        assert error.kind == SKIPPED and "pypdf" in error
+        download, error = read_body({}, [b"%PDF-1.4 ..."], 0)
+        assert download is None and "pypdf" in error
+
+
+def test_normalize_text():
+    assert normalize_text("# Title  \r\n\r\n\r\n\r\nBody\ttext \n") == "# Title\n\nBody\ttext"
+
+
+def test_plain_text_and_markdown_pass_through():
+    markdown = "# Notes\r\n\r\nSee <b>this</b> & [that](x.md).\r\n"
+    text = render_download(markdown.encode("utf-8"), None, "https://x.example/n.md", {}, "text/markdown")
+    assert text == "# Notes\n\nSee <b>this</b> & [that](x.md)."
+    assert render_download("Grüße".encode("cp1252"), "iso-8859-1", "", {}, "text/plain") == "Grüße"
+
+
+def test_pdf_pages_are_capped():
+    reader = MagicMock()
+    reader.pages = [MagicMock(**{"extract_text.return_value": f"Page {n}"}) for n in range(10)]
+    with patch.object(content_types, "pypdf") as pypdf:
+        pypdf.PdfReader.return_value = reader
+        text = pdf_to_text(b"%PDF-", max_pages=3)
+    assert text == "Page 0\n\nPage 1\n\nPage 2\n\n[PDF truncated: first 3 of 10 pages extracted]"
+    for page in reader.pages[3:]:
+        page.extract_text.assert_not_called()
+
+
+def test_real_pdf():
+    pytest.importorskip("pypdf")
+    pdf = make_pdf(["First page", "Second page", "Third page"])
+    text = render_download(pdf, None, "https://x.example/a.pdf", {"max_pdf_pages": 2}, "application/pdf")
+    assert "First page" in text and "Second page" in text
+    assert "Third page" not in text
+    assert text.endswith("[PDF truncated: first 2 of 3 pages extracted]")
+    assert "Third page" in pdf_to_text(pdf, max_pages=0)
+
+
+@pytest.mark.parametrize("content_type, body, expected", [
+    ("text/markdown; charset=utf-8", b"# Readme\n\nUse `pip install x`.\n", "# Readme\n\nUse `pip install x`."),
+    ("text/plain", b"line one\nline two", "line one\nline two"),
+])
+def test_extractor_handles_text_types(content_type, body, expected):
+    response = MagicMock(status_code=200)
+    response.headers = {"Content-Type": content_type}
+    response.iter_content.return_value = [body]
+    with patch("requests.Session.get", return_value=response):
+        text, error = BeautifulSoupExtractor().extract_text("https://raw.example/README.md")
+    assert error is None
+    assert text == expected
@@ -0,0 +1,151 @@
+"""
+Unit tests for bounded, streamed page downloads
+"""
+import asyncio
+import pytest
+from unittest.mock import patch, MagicMock
+from extractors.download import (
+    check_headers, read_body, sniff_content_type, declared_charset, fetch, fetch_async, format_size,
+)
+from extractors.errors import ExtractionError, SKIPPED
+from extractors.local_bs4_extractor import BeautifulSoupExtractor
+from main import augment_research_report
+
+MB = 1024 * 1024
+
+
+def streamed_response(chunks, content_type="text/html; charset=utf-8", status_code=200, **headers):
+    response = MagicMock(status_code=status_code)
+    response.headers = dict(headers, **({"Content-Type": content_type} if content_type else {}))
+    response.iter_content.return_value = iter(chunks)
+    return response
+
+
+@pytest.mark.parametrize("head, expected", [
+    (b"%PDF-1.7\n", "application/pdf"),
+    (b"\x00\x00\x00\x18ftypmp42", "video/mp4"),
+    (b"PK\x03\x04rest", "application/zip"),
+    (b"\x00" * 0x8001 + b"CD001", "application/x-iso9660-image"),
+    (b"\xef\xbb\xbf<!DOCTYPE html><html>", "text/html"),
+    (b"  <html lang=en>", "text/html"),
+    (b"# Title\n\nSome text", "text/plain"),
+    (b"\x01\x02\x00\x03binary", "application/octet-stream"),
+])
+def test_sniff_content_type(head, expected):
+    assert sniff_content_type(head) == expected
+
+
+@pytest.mark.parametrize("headers, refused", [
+    ({"Content-Type": "text/html; charset=utf-8"}, False),
+    ({"Content-Type": "application/xhtml+xml"}, False),
+    ({"Content-Type": "text/plain"}, False),
+    ({"Content-Type": "application/octet-stream"}, False),
+    ({}, False),
+    ({"Content-Type": "video/mp4"}, True),
+    ({"Content-Type": "application/zip"}, True),
+    ({"Content-Type": "text/html", "Content-Length": str(300 * MB)}, True),
+])
+def test_check_headers(headers, refused):
+    error = check_headers(headers, 10 * MB)
+    assert (error is not None) == refused
+    if refused:
+        assert error.kind == SKIPPED and error.startswith("Skipped: ")
+
+
+def test_declared_charset():
+    assert declared_charset({"Content-Type": 'text/html; Charset="ISO-8859-1"'}) == "iso-8859-1"
+    assert declared_charset({"Content-Type": "text/html"}) is None
+
+
+def test_download_abandoned_at_size_cap():
+    consumed = []
+
+    def chunks():
+        for n in range(1000):
+            consumed.append(n)
+            yield b"x" * 1024
+
+    download, error = read_body({"Content-Type": "text/html"}, chunks(), max_bytes=10 * 1024)
+    assert download is None
+    assert error.kind == SKIPPED and "10.0 KB" in error
+    assert len(consumed) == 11
+
+
+def test_generic_type_is_sniffed_from_first_chunk():
+    download, error = read_body({"Content-Type": "application/octet-stream"}, [b"PK\x03\x04..."], 0)
+    assert download is None and "application/zip" in error
+
+    download, error = read_body({}, [b"<html><body>Hi</body></html>"], 0)
+    assert error is None
+    assert download.media_type == "text/html" and download.body == b"<html><body>Hi</body></html>"
+
+
+def test_fetch_streams_and_closes():
+    session = MagicMock()
+    session.get.return_value = streamed_response([b"<html>", b"<p>a</p></html>"], "text/html; charset=latin-1")
+
+    download, error = fetch(session, "https://x.example/", {}, 5)
+
+    assert error is None
+    assert download.body == b"<html><p>a</p></html>" and download.charset == "latin-1"
+    assert session.get.call_args.kwargs["stream"] is True
+    session.get.return_value.close.assert_called_once()
+
+
+def test_fetch_does_not_read_refused_body():
+    session = MagicMock()
+    session.get.return_value = streamed_response([], "video/mp4", **{"Content-Length": str(300 * MB)})
+
+    download, error = fetch(session, "https://x.example/movie", {}, 5)
+
+    assert download is None and "video/mp4 content is not text" in error
+    session.get.return_value.iter_content.assert_not_called()
+
+
+def test_fetch_async():
+    class Stream:
+        async def iter_chunked(self, size):
+            yield b"x" * 2048
+            yield b"x" * 2048
+
+    class Response:
+        status = 200
+        headers = {"Content-Type": "text/plain"}
+        content = Stream()
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *args):
+            return False
+
+    session = MagicMock()
+    session.get.return_value = Response()
+    download, error = asyncio.run(fetch_async(session, "https://x.example/", {}, None, max_bytes=3000))
+    assert download is None and error.kind == SKIPPED
+
+
+def test_extractor_reports_non_text_as_skipped():
+    with patch("requests.Session.get", return_value=streamed_response([b"\x00\x00\x00\x18ftypmp42"], None)):
+        text, error = BeautifulSoupExtractor().extract_text("https://x.example/video")
+    assert text is None
+    assert error.kind == SKIPPED and "video/mp4" in error
+
+
+def test_skipped_references_are_counted_and_kept_with_reason(capsys):
+    reason = ExtractionError("Skipped: video/mp4 content is not text", kind=SKIPPED)
+    with patch("main.get_extractor") as mock_get_extractor, patch("utils.format_output") as mock_format:
+        extractor = mock_get_extractor.return_value
+        extractor.extract_text.side_effect = lambda url, **kwargs: (
+            (None, reason) if url.endswith(".mp4") else ("text", None))
+        augment_research_report("References\nhttps://x.example/a\nhttps://x.example/b.mp4\n")
+
+    _, url_contents = mock_format.call_args[0]
+    assert url_contents[1] == ("https://x.example/b.mp4", None, reason)
+    assert extractor.extract_text.call_count == 2  # not retried
+    assert "1 successful, 0 failed, 1 skipped" in capsys.readouterr().out
+
+
+def test_format_size():
+    assert format_size(512) == "512 bytes"
+    assert format_size(300 * MB) == "300.0 MB"
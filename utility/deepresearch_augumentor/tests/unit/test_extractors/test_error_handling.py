@@ -30,6 +30,12 @@ class MockResponse:
         self.elapsed.total_seconds.return_value = 0.1
         self.content = text.encode('utf-8') if text else b""
         
+    def iter_content(self, chunk_size=1):
+        return iter([self.content])
+        
+    def close(self):
+        pass
+        
     def json(self):
         if self._json_data is None:
             raise ValueError("No JSON data available")
@@ -62,7 +68,7 @@ class TestJinaExtractorErrorHandling:
         # Verify our environment mock was called with the right key
         mock_env_get.assert_called_with("JINA_API_KEY")
     
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_api_returns_error_message(self, mock_post):
         """Test handling when API returns an explicit error message"""
         # Configure mock to return error message from API
@@ -85,7 +91,7 @@ class TestJinaExtractorErrorHandling:
         assert result is None
         assert "422" in error  # Checking for status code in error message
     
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_correct_extraction_mode_parameters(self, mock_post):
         """Test that extraction modes correctly set API parameters"""
         # We'll verify parameters for "article" mode
@@ -102,7 +108,7 @@ class TestJinaExtractorErrorHandling:
         # or within the request body, not necessarily in headers
         assert mock_post.call_count == 1
     
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_retry_on_temporary_error(self, mock_post):
         """Test retry behavior on temporary errors"""
         # Configure mock to simulate a temporary error then success
@@ -158,7 +164,7 @@ class TestFirecrawlExtractorErrorHandling:
         # Verify our environment mock was called with the right key
         mock_env_get.assert_called_with("FIRECRAWL_API_KEY")
     
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_non_200_response(self, mock_post):
         """Test that non-200 HTTP responses are properly handled"""
         # Configure mock to return non-200 response
@@ -176,7 +182,7 @@ class TestFirecrawlExtractorErrorHandling:
         assert result is None
         assert "404" in error or "Not found" in error
     
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_api_returns_empty_content(self, mock_post):
         """Test handling when API returns empty content"""
         # Configure mock to return empty content
@@ -194,7 +200,7 @@ class TestFirecrawlExtractorErrorHandling:
         assert result is None
         assert error is not None  # Just check for any error message
     
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_timeout_parameter_passed_correctly(self, mock_post):
         """Test that timeout parameter is passed correctly to the API"""
         # We'll verify the request was made with the right parameters
@@ -209,7 +215,7 @@ class TestFirecrawlExtractorErrorHandling:
 class TestBeautifulSoupExtractorErrorHandling:
     """Tests for error handling in the BeautifulSoup extractor"""
     
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_connection_error(self, mock_get):
         """Test that connection errors are properly handled"""
         # Configure mock to raise connection error
@@ -222,7 +228,7 @@ class TestBeautifulSoupExtractorErrorHandling:
         assert result is None
         assert "connection" in error.lower()
     
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_timeout_error(self, mock_get):
         """Test that timeout errors are properly handled"""
         # Configure mock to raise timeout error
@@ -235,7 +241,7 @@ class TestBeautifulSoupExtractorErrorHandling:
         assert result is None
         assert "timed out" in error.lower() or "timeout" in error.lower()
     
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_non_200_response(self, mock_get):
         """Test that non-200 HTTP responses are properly handled"""
         # Configure mock to return non-200 response
@@ -252,7 +258,7 @@ class TestBeautifulSoupExtractorErrorHandling:
         assert result is None
         assert "404" in error or "not found" in error.lower()
     
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_empty_response(self, mock_get):
         """Test handling of empty responses"""
         # Configure mock to return empty response
@@ -268,7 +274,7 @@ class TestBeautifulSoupExtractorErrorHandling:
         # Verify proper handling of empty content
         assert result is None or result == ""
         
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_malformed_html(self, mock_get):
         """Test handling of malformed HTML responses"""
         # Configure mock to return malformed HTML
@@ -18,12 +18,12 @@ def test_extract_text_success(extractor, mock_firecrawl_response_success):
     url = "https://example.com"
     api_key = "test-api-key"
     
-    # Mock successful requests.post
+    # Mock successful Session.post
     mock_response = MagicMock()
     mock_response.status_code = 200
     mock_response.json.return_value = mock_firecrawl_response_success
     
-    with patch("requests.post", return_value=mock_response):
+    with patch("requests.Session.post", return_value=mock_response):
         text, error = extractor.extract_text(url, api_key=api_key)
     
     # Check that extraction was successful
@@ -55,7 +55,7 @@ def test_extract_text_api_error(extractor, mock_firecrawl_response_error):
     mock_response.json.return_value = mock_firecrawl_response_error
     mock_response.text = json.dumps(mock_firecrawl_response_error)
     
-    with patch("requests.post", return_value=mock_response):
+    with patch("requests.Session.post", return_value=mock_response):
         text, error = extractor.extract_text(url, api_key=api_key)
     
     # Check that error was returned properly
@@ -68,8 +68,8 @@ def test_extract_text_connection_error(extractor):
     url = "https://example.com"
     api_key = "test-api-key"
     
-    # Mock requests.post to raise ConnectionError
-    with patch("requests.post", side_effect=requests.ConnectionError("Failed to connect")):
+    # Mock Session.post to raise ConnectionError
+    with patch("requests.Session.post", side_effect=requests.ConnectionError("Failed to connect")):
         text, error = extractor.extract_text(url, api_key=api_key)
     
     # Check that error was returned properly
@@ -83,8 +83,8 @@ def test_extract_text_timeout(extractor):
     url = "https://example.com"
     api_key = "test-api-key"
     
-    # Mock requests.post to raise Timeout
-    with patch("requests.post", side_effect=requests.Timeout("Request timed out")):
+    # Mock Session.post to raise Timeout
+    with patch("requests.Session.post", side_effect=requests.Timeout("Request timed out")):
         text, error = extractor.extract_text(url, api_key=api_key)
     
     # Check that error was returned properly
@@ -103,7 +103,7 @@ def test_extract_text_invalid_response_format(extractor):
     mock_response.status_code = 200
     mock_response.json.return_value = {"status": "success"}  # Missing content field
     
-    with patch("requests.post", return_value=mock_response):
+    with patch("requests.Session.post", return_value=mock_response):
         text, error = extractor.extract_text(url, api_key=api_key)
     
     # Check that error was returned properly
@@ -117,18 +117,15 @@ def test_extract_text_with_timeout_parameter(extractor):
     api_key = "test-api-key"
     timeout = 30
     
-    # Mock successful requests.post
+    # Mock successful Session.post
     mock_response = MagicMock()
     mock_response.status_code = 200
     mock_response.json.return_value = {"content": "Extracted content"}
     
-    # The current implementation doesn't pass timeout to requests.post
-    # Instead, we'll just verify that the parameter is accepted
-    with patch("requests.post", return_value=mock_response) as mock_post:
-        # Call should not raise an error
+    with patch("requests.Session.post", return_value=mock_response) as mock_post:
         text, error = extractor.extract_text(url, api_key=api_key, timeout=timeout)
         
-    # Verify requests.post was called correctly (the implementation currently doesn't use timeout) 
+    # Verify the timeout was passed through to the request
     assert mock_post.called
+    assert mock_post.call_args.kwargs["timeout"] == timeout
     assert error is None
-    assert text == "Extracted content" 
\ No newline at end of file
@@ -0,0 +1,104 @@
+"""
+Unit tests for the local HTML to Markdown conversion
+"""
+import pytest
+from unittest.mock import patch, MagicMock
+from extractors.html_markdown import html_to_markdown
+from extractors.local_bs4_extractor import BeautifulSoupExtractor
+from main import EXTRACTION_MODES
+
+PAGE = """<html><head><title>T</title><style>p { color: red; }</style></head>
+<body>
+<nav class="menu"><a href="/home">Home</a></nav>
+<article>
+  <h1>Headline</h1>
+  <p>Intro with <b>bold</b> text and a <a href="/more">relative link</a>.</p>
+  <img src="/chart.png" alt="Chart">
+  <ul><li>First</li><li>Second <a href="https://other.example/x">ref</a></li></ul>
+  <table><tr><th>Year</th><th>Value</th></tr><tr><td>2024</td><td>42</td></tr></table>
+  <pre><code>x  =  1
+y = 2</code></pre>
+</article>
+<footer>Copyright</footer>
+<script>var hidden = 1;</script>
+</body></html>"""
+
+BASE = "https://site.example/page"
+
+
+def test_default_conversion():
+    markdown = html_to_markdown(PAGE, BASE)
+    assert "# Headline" in markdown
+    assert "Intro with **bold** text and a [relative link](https://site.example/more)." in markdown
+    assert "![Chart](https://site.example/chart.png)" in markdown
+    assert "- First\n- Second [ref](https://other.example/x)" in markdown
+    assert "| Year | Value |\n| --- | --- |\n| 2024 | 42 |" in markdown
+    assert "```\nx  =  1\ny = 2\n```" in markdown
+    assert "Copyright" in markdown
+    assert "hidden" not in markdown and "color: red" not in markdown
+
+
+def test_selectors():
+    markdown = html_to_markdown(PAGE, BASE, target_selector="article", remove_selector="table, img")
+    assert markdown.startswith("# Headline")
+    assert "Home" not in markdown and "Copyright" not in markdown
+    assert "| Year" not in markdown and "Chart" not in markdown
+
+
+def test_target_selector_falls_back_to_body():
+    markdown = html_to_markdown(PAGE, BASE, target_selector="main, .content")
+    assert "Home" in markdown and "# Headline" in markdown
+
+
+def test_discarded_links_keep_text_only():
+    markdown = html_to_markdown(PAGE, BASE, target_selector="article", links_handling="discarded")
+    assert "a relative link." in markdown
+    assert "](" not in markdown
+
+
+def test_referenced_links():
+    markdown = html_to_markdown(PAGE, BASE, target_selector="article", links_handling="referenced")
+    assert "[relative link][1]" in markdown
+    assert "[ref][2]" in markdown
+    assert markdown.endswith("[1]: https://site.example/more\n[2]: https://other.example/x")
+
+
+def test_links_summary():
+    markdown = html_to_markdown(PAGE, BASE, links_summary=True)
+    assert markdown.split("Links/Buttons:\n")[1].splitlines() == [
+        "- [Home](https://site.example/home)",
+        "- [relative link](https://site.example/more)",
+        "- [ref](https://other.example/x)",
+    ]
+
+
+def test_unknown_links_handling():
+    with pytest.raises(ValueError):
+        html_to_markdown(PAGE, BASE, links_handling="inline")
+
+
+@pytest.fixture
+def page_response():
+    response = MagicMock()
+    response.status_code = 200
+    response.text = PAGE
+    response.headers = {"Content-Type": "text/html; charset=utf-8"}
+    response.iter_content.return_value = [PAGE.encode("utf-8")]
+    with patch("requests.Session.get", return_value=response):
+        yield response
+
+
+def test_extractor_applies_extraction_mode(page_response):
+    mode = dict(EXTRACTION_MODES["clean-article"])
+    text, error = BeautifulSoupExtractor().extract_text(BASE, **mode)
+    assert error is None
+    assert text.startswith("# Headline")
+    assert "Home" not in text and "Copyright" not in text
+    assert "](" not in text
+
+
+def test_extractor_without_options_returns_plain_text(page_response):
+    text, error = BeautifulSoupExtractor().extract_text(BASE)
+    assert error is None
+    assert "Headline" in text and "# Headline" not in text
+    assert "Home" in text
@@ -0,0 +1,149 @@
+"""
+Unit tests for the HTML parser backends and partial parsing
+"""
+import pytest
+from unittest.mock import patch
+from extractors import html_parsing
+from extractors.html_parsing import (available_backends, resolve_backend, content_strainer, element_matcher,
+                                     parse_html)
+from extractors.html_markdown import html_to_markdown
+from main import augment_research_report, EXTRACTION_MODES
+
+PAGE = """<html><body>
+<nav><a href="/">Home</a></nav>
+<div id="content" class="wrapper main-area"><p>Main <em>text</em>.</p>
+  <aside class="ad">Buy now</aside>
+  <article><p>Nested article</p></article>
+</div>
+<section class="post"><p>A post</p></section>
+<footer>Footer</footer>
+</body></html>"""
+
+
+def test_auto_prefers_lxml_when_installed():
+    with patch.object(html_parsing, "LXML_AVAILABLE", True):
+        assert resolve_backend() == "lxml"
+        assert resolve_backend("auto") == "lxml"
+    with patch.object(html_parsing, "LXML_AVAILABLE", False):
+        assert resolve_backend() == "html.parser"
+        assert available_backends() == ["html.parser"]
+        with pytest.raises(ValueError, match="not installed"):
+            resolve_backend("lxml")
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError, match="Unsupported HTML parser"):
+        resolve_backend("html5lib")
+
+
+@pytest.mark.parametrize("selector", ["article", "#content", ".post", "div.main-area", "main, .post, #content"])
+def test_simple_selectors_allow_partial_parsing(selector):
+    assert content_strainer(selector) is not None
+
+
+@pytest.mark.parametrize("selector", [None, "", "div > p", "article p", "[role=main]", "p:first-child"])
+def test_complex_selectors_need_full_tree(selector):
+    assert content_strainer(selector) is None
+
+
+def test_partial_parse_keeps_outermost_matches():
+    soup, partial = parse_html(PAGE, "html.parser", "#content, article, .post")
+    assert partial
+    assert [tag.get("id") or tag["class"] for tag in soup.find_all(True, recursive=False)] == ["content", ["post"]]
+    assert "Home" not in soup.get_text() and "Footer" not in soup.get_text()
+    assert "Nested article" in soup.get_text()
+
+
+def test_partial_parse_falls_back_when_nothing_matches():
+    soup, partial = parse_html(PAGE, "html.parser", "main")
+    assert not partial
+    assert "Home" in soup.get_text()
+
+
+@pytest.mark.parametrize("backend", available_backends())
+@pytest.mark.parametrize("target, remove", [
+    ("#content, .post", ".ad"),
+    ("main", None),
+    ("#content", "#content"),
+    ("div > p", None),
+    (".ad, article", "#content"),
+])
+def test_markdown_same_with_and_without_partial_parsing(backend, target, remove):
+    partial = html_to_markdown(PAGE, "https://x.example/", target, remove, parser=backend)
+    with patch.object(html_parsing, "content_strainer", return_value=None):
+        full = html_to_markdown(PAGE, "https://x.example/", target, remove, parser=backend)
+    assert partial == full
+
+
+@pytest.mark.parametrize("backend", available_backends())
+def test_targets_inside_removed_elements_are_removed(backend):
+    page = ("<html><body><aside class='sidebar'><div class='content'>Sidebar promo</div></aside>"
+            "<nav><article>Nav teaser</article></nav>"
+            "<div class='content'>Real content</div></body></html>")
+    markdown = html_to_markdown(page, "https://x.example/", ".content, article", "aside, nav", parser=backend)
+    assert "Real content" in markdown
+    assert "Sidebar promo" not in markdown and "Nav teaser" not in markdown
+
+
+MESSY_PAGE = """<html><body>
+<div class="sidebar"><div><div class="content">Nested in a removed div</div></div></div>
+<div class="content">Kept <br> after a break<img src="/x.png"></div>
+<section><aside>Unclosed aside</section><article>After the section</article>
+<nav><ul><li>One<li><div class="post">Inside an unclosed item</div></ul></nav>
+<main>Main text</main>
+</body></html>"""
+
+
+@pytest.mark.parametrize("backend", available_backends())
+@pytest.mark.parametrize("target, remove", [
+    (".content, article, .post, main", ".sidebar, aside, nav"),
+    ("article, .post", "aside, li"),
+    (".content", "div"),
+])
+def test_removed_ancestors_tracked_like_the_full_tree(backend, target, remove):
+    """Implied and unclosed end tags nest targets the same way in a partial parse."""
+    partial = html_to_markdown(MESSY_PAGE, "https://x.example/", target, remove, parser=backend)
+    with patch.object(html_parsing, "content_strainer", return_value=None):
+        full = html_to_markdown(MESSY_PAGE, "https://x.example/", target, remove, parser=backend)
+    assert partial == full
+
+
+def test_complex_remove_selector_needs_full_tree():
+    _, partial = parse_html(PAGE, "html.parser", "#content", remove_selector="div > .ad")
+    assert not partial
+
+
+SELECTOR_MODES = {name: mode for name, mode in EXTRACTION_MODES.items() if mode.get("target_selector")}
+
+
+@pytest.mark.parametrize("mode", SELECTOR_MODES)
+def test_built_in_modes_parse_partially(mode):
+    """Every built-in mode's selectors are simple enough for a partial parse."""
+    selectors = SELECTOR_MODES[mode]
+    assert content_strainer(selectors["target_selector"]) is not None
+    assert element_matcher(selectors["remove_selector"]) is not None
+    _, partial = parse_html(PAGE, "html.parser", selectors["target_selector"],
+                            remove_selector=selectors.get("remove_selector"))
+    assert partial
+
+
+@pytest.mark.parametrize("backend", available_backends())
+@pytest.mark.parametrize("mode", SELECTOR_MODES)
+def test_built_in_modes_same_with_and_without_partial_parsing(backend, mode):
+    selectors = SELECTOR_MODES[mode]
+    page = PAGE.replace("<footer>", "<aside class='sidebar'><article>Teaser</article></aside><footer>")
+    args = (page, "https://x.example/", selectors["target_selector"], selectors.get("remove_selector"))
+    partial = html_to_markdown(*args, parser=backend)
+    with patch.object(html_parsing, "content_strainer", return_value=None):
+        full = html_to_markdown(*args, parser=backend)
+    assert partial == full
+    assert "Teaser" not in partial
+
+
+def test_html_parser_option_reaches_extractor():
+    with patch("main.get_extractor") as mock_get_extractor:
+        extractor = mock_get_extractor.return_value
+        extractor.extract_text.return_value = ("text", None)
+        augment_research_report("References\nhttps://example.com/a\n", verbose=False,
+                                extractor_config={"html_parser": "html.parser"})
+    assert extractor.extract_text.call_args.kwargs["html_parser"] == "html.parser"
@@ -0,0 +1,70 @@
+"""
+Unit tests for the pooled HTTP sessions shared by the extractors
+"""
+import pytest
+from unittest.mock import patch, MagicMock
+from extractors.http import create_session
+from extractors.jina_extractor import JinaAIExtractor
+from extractors.local_bs4_extractor import BeautifulSoupExtractor
+from main import get_extractor
+
+
+def test_create_session_pool_size_and_compression():
+    """Sessions mount adapters sized to the pool and accept compressed responses."""
+    session = create_session(pool_size=16)
+    adapter = session.get_adapter("https://r.jina.ai/")
+
+    assert adapter._pool_maxsize == 16
+    assert adapter._pool_connections == 16
+    assert "gzip" in session.headers["Accept-Encoding"]
+    session.close()
+
+
+def test_extractor_reuses_one_session():
+    """The same session serves every call made by an extractor."""
+    extractor = BeautifulSoupExtractor(pool_size=4)
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.text = "<html><body>Test</body></html>"
+
+    sessions = []
+    def record_session(self, url, **kwargs):
+        sessions.append(self)
+        return mock_response
+
+    with patch("requests.Session.get", autospec=True, side_effect=record_session):
+        extractor.extract_text("https://example.com/a")
+        extractor.extract_text("https://example.com/b")
+
+    assert len(sessions) == 2
+    assert sessions[0] is sessions[1] is extractor.session
+    assert extractor.session.get_adapter("https://example.com")._pool_maxsize == 4
+
+
+def test_close_releases_session():
+    """close() drops the session so the next call creates a fresh one."""
+    extractor = JinaAIExtractor()
+    first = extractor.session
+    extractor.close()
+
+    assert extractor.session is not first
+
+
+def test_get_extractor_pool_size_follows_concurrency():
+    """get_extractor passes the pool size to the extractor."""
+    extractor = get_extractor("jina", pool_size=8)
+
+    assert extractor.pool_size == 8
+
+
+def test_extract_with_mode_reuses_shared_extractor():
+    """extract_with_mode reuses one pooled extractor across calls."""
+    import extraction_mode_main
+
+    with patch.object(JinaAIExtractor, "extract_text", autospec=True, return_value=("content", None)) as mock_extract:
+        extraction_mode_main.extract_with_mode("https://example.com/a", "default", "key", verbose=False)
+        extraction_mode_main.extract_with_mode("https://example.com/b", "article", "key", verbose=False)
+
+    first_self = mock_extract.call_args_list[0].args[0]
+    second_self = mock_extract.call_args_list[1].args[0]
+    assert first_self is second_self is extraction_mode_main.get_shared_extractor()
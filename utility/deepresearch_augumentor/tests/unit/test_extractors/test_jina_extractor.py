@@ -18,12 +18,12 @@ def test_extract_text_success(extractor, mock_jina_response_success):
     url = "https://example.com"
     api_key = "test-api-key"
     
-    # Mock successful requests.post
+    # Mock successful Session.post
     mock_response = MagicMock()
     mock_response.status_code = 200
     mock_response.json.return_value = mock_jina_response_success
     
-    with patch("requests.post", return_value=mock_response):
+    with patch("requests.Session.post", return_value=mock_response):
         text, error = extractor.extract_text(url, api_key=api_key)
     
     # Check that extraction was successful
@@ -55,7 +55,7 @@ def test_extract_text_api_error(extractor, mock_jina_response_error):
     mock_response.json.return_value = mock_jina_response_error
     mock_response.text = json.dumps(mock_jina_response_error)
     
-    with patch("requests.post", return_value=mock_response):
+    with patch("requests.Session.post", return_value=mock_response):
         text, error = extractor.extract_text(url, api_key=api_key)
     
     # Check that error was returned properly
@@ -68,8 +68,8 @@ def test_extract_text_connection_error(extractor):
     url = "https://example.com"
     api_key = "test-api-key"
     
-    # Mock requests.post to raise ConnectionError
-    with patch("requests.post", side_effect=requests.ConnectionError("Failed to connect")):
+    # Mock Session.post to raise ConnectionError
+    with patch("requests.Session.post", side_effect=requests.ConnectionError("Failed to connect")):
         text, error = extractor.extract_text(url, api_key=api_key)
     
     # Check that error was returned properly
@@ -83,8 +83,8 @@ def test_extract_text_timeout(extractor):
     url = "https://example.com"
     api_key = "test-api-key"
     
-    # Mock requests.post to raise Timeout
-    with patch("requests.post", side_effect=requests.Timeout("Request timed out")):
+    # Mock Session.post to raise Timeout
+    with patch("requests.Session.post", side_effect=requests.Timeout("Request timed out")):
         text, error = extractor.extract_text(url, api_key=api_key)
     
     # Check that error was returned properly
@@ -103,7 +103,7 @@ def test_extract_text_invalid_response_format(extractor):
     mock_response.status_code = 200
     mock_response.json.return_value = {"code": 200, "status": 20000}  # Missing data/content
     
-    with patch("requests.post", return_value=mock_response):
+    with patch("requests.Session.post", return_value=mock_response):
         text, error = extractor.extract_text(url, api_key=api_key)
     
     # Check that error was returned properly
@@ -117,7 +117,7 @@ def test_extract_text_with_target_selector(extractor):
     api_key = "test-api-key"
     target_selector = "main,article"
     
-    # Mock successful requests.post
+    # Mock successful Session.post
     mock_response = MagicMock()
     mock_response.status_code = 200
     mock_response.json.return_value = {
@@ -129,7 +129,7 @@ def test_extract_text_with_target_selector(extractor):
         }
     }
     
-    with patch("requests.post", return_value=mock_response) as mock_post:
+    with patch("requests.Session.post", return_value=mock_response) as mock_post:
         text, error = extractor.extract_text(
             url, 
             api_key=api_key,
@@ -148,7 +148,7 @@ def test_extract_text_with_remove_selector(extractor):
     api_key = "test-api-key"
     remove_selector = "nav,footer,header"
     
-    # Mock successful requests.post
+    # Mock successful Session.post
     mock_response = MagicMock()
     mock_response.status_code = 200
     mock_response.json.return_value = {
@@ -160,7 +160,7 @@ def test_extract_text_with_remove_selector(extractor):
         }
     }
     
-    with patch("requests.post", return_value=mock_response) as mock_post:
+    with patch("requests.Session.post", return_value=mock_response) as mock_post:
         text, error = extractor.extract_text(
             url, 
             api_key=api_key,
@@ -179,7 +179,7 @@ def test_extract_text_with_timeout_parameter(extractor):
     api_key = "test-api-key"
     timeout = 30
     
-    # Mock successful requests.post
+    # Mock successful Session.post
     mock_response = MagicMock()
     mock_response.status_code = 200
     mock_response.json.return_value = {
@@ -191,7 +191,7 @@ def test_extract_text_with_timeout_parameter(extractor):
         }
     }
     
-    with patch("requests.post", return_value=mock_response) as mock_post:
+    with patch("requests.Session.post", return_value=mock_response) as mock_post:
         text, error = extractor.extract_text(
             url, 
             api_key=api_key,
@@ -0,0 +1,116 @@
+"""
+Unit tests for converting pages in a process pool
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from unittest.mock import patch, MagicMock
+from extractors import parse_pool
+from extractors.parse_pool import ParsePool, render_page
+from extractors.local_bs4_extractor import BeautifulSoupExtractor
+from main import _make_run_context
+
+PAGE = "<html><body><nav>Menu</nav><article><h1>Café</h1><p>Body <a href='/x'>link</a></p></article></body></html>"
+MODE = {"target_selector": "article", "links_handling": "referenced"}
+
+
+@pytest.fixture
+def pool():
+    pool = ParsePool(workers=2)
+    yield pool
+    pool.close()
+
+
+def test_worker_output_matches_in_thread_conversion(pool):
+    raw = PAGE.encode("utf-8")
+    assert pool.convert(raw, "utf-8", "https://s.example/", MODE) == render_page(PAGE, "https://s.example/", MODE)
+    assert pool.convert(raw, "utf-8", "https://s.example/", {}) == render_page(PAGE, "https://s.example/", {})
+    assert pool._executor is not None
+
+
+def test_workers_are_spawned_not_forked():
+    # Forking a process with download threads running can deadlock the child
+    pool = ParsePool(workers=2)
+    pool.start()
+    assert pool._executor._mp_context.get_start_method() == "spawn"
+    pool.close()
+
+
+def test_only_conversion_options_are_sent(pool):
+    # An aiohttp session or lock in the options cannot be pickled
+    options = dict(MODE, session=threading.Lock(), timeout=5)
+    assert "[link][1]" in pool.convert(PAGE.encode("utf-8"), "utf-8", "https://s.example/", options)
+
+
+def test_zero_workers_converts_in_thread():
+    pool = ParsePool(workers=0)
+    assert "Café" in pool.convert(PAGE.encode("utf-8"), "utf-8", "https://s.example/", {})
+    assert pool._executor is None
+
+
+def test_pending_pages_are_bounded():
+    pool = ParsePool(workers=4, max_pending=2)
+    inside = peak = 0
+    lock = threading.Lock()
+
+    def slow_render(*args):
+        nonlocal inside, peak
+        with lock:
+            inside += 1
+            peak = max(peak, inside)
+        time.sleep(0.05)
+        with lock:
+            inside -= 1
+        return "text"
+
+    # Threads stand in for worker processes so the patched renderer is used
+    with patch.object(parse_pool, "render_download", side_effect=slow_render), \
+            patch.object(parse_pool, "ProcessPoolExecutor",
+                         lambda max_workers, mp_context: ThreadPoolExecutor(max_workers)):
+        threads = [threading.Thread(target=pool.convert, args=(b"", None, "u", {})) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    pool.close()
+    assert peak == 2
+
+
+def test_extractor_hands_raw_bytes_to_pool():
+    response = MagicMock(status_code=200, headers={"Content-Type": "text/html; charset=utf-8"})
+    response.iter_content.return_value = [PAGE.encode("utf-8")]
+    pool = MagicMock()
+    pool.convert.return_value = "converted"
+    extractor = BeautifulSoupExtractor()
+    extractor.use_parse_pool(pool)
+
+    with patch("requests.Session.get", return_value=response):
+        text, error = extractor.extract_text("https://s.example/", **MODE)
+
+    assert (text, error) == ("converted", None)
+    raw, encoding, url, options, media_type = pool.convert.call_args[0]
+    assert raw == PAGE.encode("utf-8") and encoding == "utf-8" and options["target_selector"] == "article"
+    assert media_type == "text/html"
+
+
+@pytest.mark.parametrize("extractor_type, concurrency, workers", [
+    ("local_bs4", 4, 4),
+    ("local_bs4", 32, 8),
+    ("jina,local_bs4", 16, 8),
+    ("local_bs4", 1, None),
+    ("jina", 16, None),
+])
+def test_default_pool_for_run(extractor_type, concurrency, workers):
+    extractor = MagicMock()
+    with patch("os.cpu_count", return_value=8):
+        ctx = _make_run_context(extractor, extractor_type, {}, 10, 5, concurrency=concurrency)
+    if workers is None:
+        assert ctx.parse_pool is None
+        extractor.use_parse_pool.assert_not_called()
+    else:
+        assert ctx.parse_pool.workers == workers
+        # Created before any download thread starts
+        assert ctx.parse_pool._executor is not None
+        extractor.use_parse_pool.assert_called_once_with(ctx.parse_pool)
+        ctx.parse_pool.close()
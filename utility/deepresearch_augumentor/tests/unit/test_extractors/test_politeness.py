@@ -0,0 +1,143 @@
+"""
+Unit tests for the per-host politeness scheduler
+"""
+import asyncio
+import threading
+import time
+import pytest
+from unittest.mock import patch, MagicMock
+from extractors.politeness import HostScheduler, interleave_by_host, longest_expected_first
+from extractors.local_bs4_extractor import BeautifulSoupExtractor
+
+ROBOTS = """User-agent: *
+Disallow: /private/
+Crawl-delay: 1
+"""
+
+
+def scheduler_with_robots(text=ROBOTS, status_code=200, **kwargs):
+    scheduler = HostScheduler(**kwargs)
+    scheduler._session = MagicMock()
+    scheduler._session.get.return_value = MagicMock(status_code=status_code, text=text)
+    return scheduler
+
+
+def test_robots_disallow_and_single_fetch():
+    scheduler = scheduler_with_robots()
+
+    assert scheduler.check("https://example.com/public/page") is None
+    error = scheduler.check("https://example.com/private/page")
+    assert error == "Disallowed by robots.txt"
+    assert error.kind == "permanent"
+    # robots.txt is fetched once per host
+    scheduler._session.get.assert_called_once_with("https://example.com/robots.txt", timeout=5.0)
+    assert scheduler.disallowed == 1
+
+
+def test_forbidden_robots_disallows_everything():
+    scheduler = scheduler_with_robots(text="", status_code=403)
+    assert scheduler.check("https://example.com/anything") is not None
+
+
+def test_missing_robots_allows_everything():
+    scheduler = scheduler_with_robots(text="Not found", status_code=404)
+    assert scheduler.check("https://example.com/private/page") is None
+
+
+def test_ignore_robots():
+    scheduler = scheduler_with_robots(respect_robots=False)
+    assert scheduler.check("https://example.com/private/page") is None
+    scheduler._session.get.assert_not_called()
+
+
+def test_crawl_delay_spaces_requests():
+    scheduler = scheduler_with_robots(min_interval=0.0)
+    scheduler.check("https://example.com/a")
+
+    starts = []
+    for path in ("a", "b"):
+        with scheduler.slot(f"https://example.com/{path}"):
+            starts.append(time.monotonic())
+
+    assert starts[1] - starts[0] >= 0.95
+
+
+def test_per_host_concurrency_cap():
+    scheduler = HostScheduler(max_per_host=2, min_interval=0.0, respect_robots=False)
+    in_flight = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def fetch():
+        nonlocal in_flight, peak
+        with scheduler.slot("https://arxiv.org/abs/1"):
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(0.05)
+            with lock:
+                in_flight -= 1
+
+    threads = [threading.Thread(target=fetch) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert peak == 2
+
+
+def test_hosts_do_not_wait_for_each_other():
+    scheduler = HostScheduler(max_per_host=1, min_interval=1.0, respect_robots=False)
+    start = time.monotonic()
+    with scheduler.slot("https://a.com/1"):
+        pass
+    with scheduler.slot("https://b.com/1"):
+        pass
+    assert time.monotonic() - start < 0.5
+
+
+def test_async_slot_spacing():
+    scheduler = HostScheduler(max_per_host=2, min_interval=0.2, respect_robots=False)
+    starts = []
+
+    async def fetch():
+        async with scheduler.slot_async("https://a.com/x"):
+            starts.append(time.monotonic())
+
+    async def run():
+        await asyncio.gather(fetch(), fetch(), fetch())
+
+    asyncio.run(run())
+    starts.sort()
+    assert starts[2] - starts[0] >= 0.38
+
+
+def test_interleave_by_host():
+    urls = ["https://arxiv.org/1", "https://arxiv.org/2", "https://arxiv.org/3",
+            "https://a.com/1", "https://b.com/1"]
+    assert interleave_by_host(urls, [0, 1, 2, 3, 4]) == [0, 3, 4, 1, 2]
+
+
+def test_longest_expected_first():
+    urls = ["https://fast.com/1", "https://pdfs.org/1", "https://pdfs.org/2", "https://pdfs.org/3",
+            "https://big.com/1", "https://fast.com/2"]
+    expected = {0: 1.0, 1: 4.0, 2: 12.0, 3: 4.0, 4: 7.0, 5: 1.0}
+    # pdfs.org has 20s of work that runs one URL at a time: its longest job
+    # starts first and the next one is due before big.com's
+    assert longest_expected_first(urls, list(range(6)), expected) == [2, 1, 4, 3, 0, 5]
+    # With two slots per host the rest of pdfs.org's work takes ~4s
+    assert longest_expected_first(urls, list(range(6)), expected, max_per_host=2) == [2, 4, 1, 3, 0, 5]
+    assert longest_expected_first(urls, [5, 0, 3], expected, max_per_host=2) == [3, 5, 0]
+
+
+@patch('requests.Session.get')
+def test_bs4_extractor_respects_robots(mock_get):
+    extractor = BeautifulSoupExtractor()
+    extractor.use_politeness(scheduler_with_robots())
+
+    text, error = extractor.extract_text("https://example.com/private/page")
+
+    assert text is None
+    assert "robots.txt" in error
+    mock_get.assert_not_called()
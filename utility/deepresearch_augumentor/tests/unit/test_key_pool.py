@@ -0,0 +1,141 @@
+"""
+Unit tests for API key pool rotation
+"""
+import time
+import pytest
+from unittest.mock import patch, MagicMock
+from key_pool import KeyPool, KeyUsage, key_fingerprint, pools_from_config
+from config_manager import ConfigManager
+from extractors.jina_extractor import JinaAIExtractor
+from extractors.errors import RATE_LIMITED, PERMANENT
+
+
+def test_least_recently_used_rotation():
+    pool = KeyPool(["key-a", "key-b", "key-c"])
+
+    picked = [pool.acquire() for _ in range(6)]
+
+    assert picked == ["key-a", "key-b", "key-c", "key-a", "key-b", "key-c"]
+
+
+def test_unauthorized_key_is_quarantined_for_the_run():
+    pool = KeyPool(["key-a", "key-b"])
+    pool.report("key-a", 401)
+
+    assert [pool.acquire() for _ in range(3)] == ["key-b"] * 3
+    assert pool.quarantines == 1
+
+
+def test_rate_limited_key_returns_after_retry_after():
+    pool = KeyPool(["key-a", "key-b"])
+    pool.report("key-a", 429, retry_after=0.05)
+
+    assert pool.acquire() == "key-b"
+    assert pool.acquire() == "key-b"
+    time.sleep(0.06)
+    assert pool.acquire() == "key-a"
+
+
+def test_all_quarantined():
+    pool = KeyPool(["key-a"])
+    pool.report("key-a", 429, retry_after=30)
+    assert pool.acquire() is None
+    assert 0 < pool.available_in() <= 30
+
+    pool.report("key-a", 402)
+    assert pool.available_in() is None
+
+
+def test_extractor_reports_all_keys_quarantined():
+    pool = KeyPool(["key-a"])
+    extractor = JinaAIExtractor()
+    extractor.use_key_pools({"r.jina.ai": pool})
+
+    pool.report("key-a", 429, retry_after=10)
+    key, error = extractor._choose_api_key("configured-key")
+    assert key is None
+    assert error.kind == RATE_LIMITED
+    assert error.retry_after == pytest.approx(10, abs=1)
+
+    pool.report("key-a", 401)
+    _, error = extractor._choose_api_key(None)
+    assert error.kind == PERMANENT
+
+
+def test_jina_requests_rotate_and_quarantine():
+    pool = KeyPool(["key-a", "key-b"])
+    extractor = JinaAIExtractor()
+    extractor.use_key_pools({"r.jina.ai": pool})
+
+    unauthorized = MagicMock(status_code=401, headers={}, text="Unauthorized")
+    unauthorized.json.return_value = {"message": "Invalid API key"}
+    ok = MagicMock(status_code=200, headers={})
+    ok.json.return_value = {"code": 200, "data": {"content": "Page text"}}
+
+    with patch("requests.Session.post", side_effect=[unauthorized, ok, ok]) as mock_post:
+        extractor.extract_text("https://example.com/1")
+        extractor.extract_text("https://example.com/2")
+        text, error = extractor.extract_text("https://example.com/3")
+
+    used = [call.kwargs["headers"]["Authorization"] for call in mock_post.call_args_list]
+    assert used == ["Bearer key-a", "Bearer key-b", "Bearer key-b"]
+    assert text == "Page text" and error is None
+
+
+def test_usage_counters_persist(tmp_path):
+    path = str(tmp_path / "key_usage.json")
+    usage = KeyUsage(path)
+    pool = KeyPool(["key-a", "key-b"], usage)
+
+    pool.acquire()
+    pool.report("key-a", 200)
+    pool.acquire()
+    pool.report("key-b", 429)
+    usage.save()
+
+    second_run = KeyUsage(path)
+    KeyPool(["key-a"], second_run).acquire()
+    second_run.save()
+
+    assert KeyUsage(path).for_key("key-a")["requests"] == 2
+    assert KeyUsage(path).for_key("key-a")["ok"] == 1
+    assert KeyUsage(path).for_key("key-b")["http_429"] == 1
+    assert "key-a" not in (tmp_path / "key_usage.json").read_text()
+    assert key_fingerprint("key-a") in (tmp_path / "key_usage.json").read_text()
+
+
+def test_config_manager_key_lists(tmp_path):
+    with patch("config_manager.Path.home", return_value=tmp_path):
+        config = ConfigManager()
+        config.set_api_keys("JINA_API_KEY", ["key-a", "key-b", "key-a"])
+
+        assert config.get_api_keys("JINA_API_KEY") == ["key-a", "key-b"]
+        assert config.get_api_key("JINA_API_KEY") == "key-a"
+
+        config.set_api_key("FIRECRAWL_API_KEY", "fc-key")
+        assert config.get_api_keys("FIRECRAWL_API_KEY") == ["fc-key"]
+
+        pools = pools_from_config(config)
+        assert len(pools["r.jina.ai"]) == 2
+        assert len(pools["api.firecrawl.dev"]) == 1
+
+
+def test_run_attaches_politeness_rate_limits_and_key_pools():
+    """The schedulers built by the CLI reach the extractor in sync and async runs."""
+    from main import augment_research_report, augment_research_report_async
+    import asyncio
+
+    politeness, rate_limits, key_pools = MagicMock(), MagicMock(), {"r.jina.ai": KeyPool(["key-a"])}
+    options = dict(verbose=False, politeness=politeness, rate_limits=rate_limits, key_pools=key_pools)
+    report = "References\nhttps://example.com/a\n"
+    with patch("main.get_extractor") as mock_get_extractor:
+        extractor = mock_get_extractor.return_value
+        extractor.extract_text.return_value = ("Text", None)
+        extractor.extract_text_async = MagicMock(side_effect=lambda *a, **k: asyncio.sleep(0, ("Text", None)))
+
+        augment_research_report(report, **options)
+        asyncio.run(augment_research_report_async(report, **options))
+
+    assert extractor.use_politeness.call_args_list == [((politeness,),)] * 2
+    assert extractor.use_rate_limits.call_args_list == [((rate_limits,),)] * 2
+    assert extractor.use_key_pools.call_args_list == [((key_pools,),)] * 2
@@ -0,0 +1,162 @@
+"""
+Unit tests for the latency store and adaptive per-host timeouts
+"""
+import pytest
+from unittest.mock import patch, MagicMock
+from extractors.errors import ExtractionError, TIMEOUT
+from latency_store import AdaptiveTimeouts, LatencyStore, percentile
+from main import augment_research_report
+from retry_policy import RetryPolicy
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = LatencyStore(str(tmp_path), max_samples=20)
+    yield store
+    store.close()
+
+
+def test_percentile():
+    samples = [float(n) for n in range(1, 101)]
+    assert percentile(samples, 95) == 95.0
+    assert percentile([3.0], 95) == 3.0
+
+
+def test_store_keeps_recent_samples_per_key(tmp_path, store):
+    for n in range(30):
+        store.record("a.example", "jina", float(n))
+    store.record("a.example", "local_bs4", 0.5)
+    assert store.samples("a.example", "jina") == [float(n) for n in range(10, 30)]
+    assert store.samples("a.example", "local_bs4") == [0.5]
+
+    reopened = LatencyStore(str(tmp_path))
+    assert len(reopened.samples("a.example", "jina")) == 20
+    reopened.close()
+
+
+def test_default_until_enough_history(store):
+    timeouts = AdaptiveTimeouts(store, default=15, min_samples=5)
+    for _ in range(4):
+        timeouts.record("https://fast.example/a", "local_bs4", 0.4)
+    assert timeouts.timeout_for("https://fast.example/b", "local_bs4") == 15
+    timeouts.record("https://fast.example/c", "local_bs4", 0.4)
+    assert timeouts.timeout_for("https://FAST.example/d", "local_bs4") == 3      # floor
+    assert timeouts.timeout_for("https://fast.example/d", "jina") == 15          # per extractor
+
+
+def test_learned_timeout_is_clamped_percentile(store):
+    timeouts = AdaptiveTimeouts(store, default=15, factor=1.5, floor=3, ceiling=60)
+    for seconds in (8.0, 9.0, 10.0, 10.0, 12.0):
+        timeouts.record("https://slow.example/x", "local_bs4", seconds)
+    assert timeouts.timeout_for("https://slow.example/y", "local_bs4") == 18     # 12 * 1.5
+    for _ in range(5):
+        timeouts.record("https://huge.example/x", "local_bs4", 100.0)
+    assert timeouts.timeout_for("https://huge.example/y", "local_bs4") == 60     # ceiling
+
+
+def test_explicit_timeout_caps_learned_timeouts(tmp_path):
+    config = MagicMock(config_dir=str(tmp_path))
+    config.get_setting.side_effect = lambda name, default=None: default
+    timeouts = AdaptiveTimeouts.from_config(config, 10, ceiling=10)
+    for seconds in (30.0, 1.0):
+        for _ in range(5):
+            timeouts.record(f"https://h{int(seconds)}.example/", "jina", seconds)
+    assert timeouts.timeout_for("https://h30.example/", "jina") == 10
+    assert timeouts.timeout_for("https://h1.example/", "jina") == 3
+    timeouts.close()
+
+    timeouts = AdaptiveTimeouts.from_config(config, 2, ceiling=2)
+    assert timeouts.timeout_for("https://h1.example/", "jina") == 2      # below the floor
+    timeouts.close()
+    timeouts = AdaptiveTimeouts.from_config(config, 15)
+    assert timeouts.timeout_for("https://h30.example/", "jina") == 45
+    timeouts.close()
+
+
+def test_history_is_shared_between_runs(store):
+    first = AdaptiveTimeouts(store, default=15)
+    for _ in range(5):
+        first.record("https://fast.example/", "jina", 1.0)
+    assert AdaptiveTimeouts(store, default=15).timeout_for("https://fast.example/", "jina") == 3
+
+
+def test_learned_rows(store):
+    timeouts = AdaptiveTimeouts(store, default=15)
+    for _ in range(5):
+        timeouts.record("https://fast.example/", "jina", 2.5)
+    timeouts.timeout_for("https://new.example/", "jina")
+    assert timeouts.learned() == [
+        {"host": "fast.example", "extractor": "jina", "samples": 5, "p95_seconds": 2.5,
+         "timeout": 4, "source": "learned"},
+        {"host": "new.example", "extractor": "jina", "samples": 0, "p95_seconds": None,
+         "timeout": 15, "source": "default"},
+    ]
+
+
+@patch("main.get_extractor")
+def test_run_uses_and_records_learned_timeouts(mock_get_extractor, store):
+    timeouts = AdaptiveTimeouts(store, default=15)
+    for _ in range(5):
+        timeouts.record("https://fast.example/old", "jina", 1.0)
+
+    extractor = MagicMock()
+    extractor.provider_host = None
+
+    def extract_text(url, **kwargs):
+        if "hangs" in url:
+            return None, ExtractionError("Request timed out", kind=TIMEOUT)
+        if "missing" in url:
+            return None, ExtractionError("HTTP error: 404", 404)
+        return "content", None
+    extractor.extract_text.side_effect = extract_text
+    mock_get_extractor.return_value = extractor
+
+    report = ("Report\n\nReferences\nhttps://fast.example/page\nhttps://other.example/page\n"
+              "https://other.example/hangs\nhttps://other.example/missing\n")
+    augment_research_report(report, extractor_type="jina", request_timeout=15, verbose=False,
+                            retry_policy=RetryPolicy(max_retries=0), timeouts=timeouts)
+
+    used = {call.kwargs["url"]: call.kwargs["timeout"] for call in extractor.extract_text.call_args_list}
+    assert used == {"https://fast.example/page": 3, "https://other.example/page": 15,
+                    "https://other.example/hangs": 15, "https://other.example/missing": 15}
+    # Successes and timeouts are recorded; other failures say nothing about latency
+    assert len(store.samples("fast.example", "jina")) == 6
+    assert len(store.samples("other.example", "jina")) == 2
+
+
+def test_expected_seconds(store):
+    timeouts = AdaptiveTimeouts(store, default=15)
+    for seconds in (1.0, 3.0):
+        timeouts.record("https://fast.example/", "jina", seconds)
+    for host, seconds in (("mid.example", 5.0), ("slow.example", 20.0)):
+        timeouts.record(f"https://{host}/", "jina", seconds)
+    assert timeouts.expected_seconds([
+        ("https://fast.example/a", "jina"), ("https://slow.example/a", "jina"),
+        ("https://new.example/a", "jina"), ("https://fast.example/a", "local_bs4"),
+    ]) == [2.0, 20.0, 5.0, 1.0]
+
+
+def test_dispatch_order_starts_slowest_hosts_first(store):
+    from main import _RunContext
+    timeouts = AdaptiveTimeouts(store, default=15)
+    timeouts.record("https://slow.example/", "jina", 20.0)
+    timeouts.record("https://fast.example/", "jina", 0.5)
+    timeouts.record("https://mid.example/", "jina", 5.0)
+    urls = ["https://fast.example/1", "https://fast.example/2", "https://slow.example/1", "https://new.example/1"]
+
+    ctx = _RunContext(MagicMock(), "jina", {}, 15, timeouts=timeouts)
+    # new.example has no history and is assumed typical (5s)
+    assert ctx.dispatch_order(urls, [0, 1, 2, 3]) == [2, 3, 0, 1]
+    # Without latency history, hosts are interleaved in report order
+    assert _RunContext(MagicMock(), "jina", {}, 15).dispatch_order(urls, [0, 1, 2, 3]) == [0, 2, 3, 1]
+
+
+def test_deadline_still_caps_learned_timeout(store):
+    from main import _RunContext
+    from deadline import Deadline
+    timeouts = AdaptiveTimeouts(store, default=15)
+    for _ in range(5):
+        timeouts.record("https://slow.example/", "jina", 30.0)
+    ctx = _RunContext(MagicMock(), "jina", {}, 15, deadline=Deadline(10), timeouts=timeouts)
+    assert ctx.attempt_timeout("https://slow.example/") == 9  # whole seconds left, rounded down
+    assert _RunContext(MagicMock(), "jina", {}, 15, timeouts=timeouts).attempt_timeout("https://slow.example/") == 45
@@ -0,0 +1,154 @@
+"""
+Unit tests for the provider token-bucket rate limiter
+"""
+import asyncio
+import json
+import multiprocessing
+import time
+import pytest
+from unittest.mock import patch, MagicMock
+from rate_limiter import TokenBucket, RateLimits
+from extractors.jina_extractor import JinaAIExtractor
+
+
+@pytest.fixture
+def bucket_path(tmp_path):
+    return str(tmp_path / "ratelimits" / "r.jina.ai.json")
+
+
+def test_burst_then_paced(bucket_path):
+    bucket = TokenBucket(bucket_path, requests_per_minute=600, burst=3)  # 10 per second
+
+    delays = [bucket.reserve() for _ in range(5)]
+
+    assert delays[:3] == [0.0, 0.0, 0.0]
+    assert delays[3] == pytest.approx(0.1, abs=0.02)
+    assert delays[4] == pytest.approx(0.2, abs=0.02)
+
+
+def test_bucket_refills(bucket_path):
+    bucket = TokenBucket(bucket_path, requests_per_minute=6000, burst=1)  # 100 per second
+    assert bucket.reserve() == 0.0
+    time.sleep(0.05)
+    assert bucket.reserve() == 0.0
+
+
+def test_state_is_shared_through_the_file(bucket_path):
+    """Two limiters on the same file (e.g. two runs) draw from one budget."""
+    first = TokenBucket(bucket_path, requests_per_minute=600, burst=2)
+    second = TokenBucket(bucket_path, requests_per_minute=600, burst=2)
+
+    assert first.reserve() == 0.0
+    assert second.reserve() == 0.0
+    assert first.reserve() > 0.0
+
+
+def _reserve_many(path, count, queue):
+    bucket = TokenBucket(path, requests_per_minute=600, burst=5)
+    queue.put([bucket.reserve() for _ in range(count)])
+
+
+def test_budget_shared_across_processes(bucket_path):
+    TokenBucket(bucket_path, requests_per_minute=600, burst=5)
+    queue = multiprocessing.Queue()
+    workers = [multiprocessing.Process(target=_reserve_many, args=(bucket_path, 5, queue)) for _ in range(2)]
+    for worker in workers:
+        worker.start()
+    delays = sorted(queue.get(timeout=10) + queue.get(timeout=10))
+    for worker in workers:
+        worker.join()
+
+    # 10 reservations at 10/s from one shared bucket of 5: the last waits ~0.5s
+    assert delays[-1] == pytest.approx(0.5, abs=0.1)
+
+
+def test_debt_is_capped_at_one_burst(bucket_path):
+    bucket = TokenBucket(bucket_path, requests_per_minute=600, burst=2)  # 10 per second
+
+    results = [bucket.try_reserve() for _ in range(5)]
+
+    assert [reserved for reserved, _ in results] == [True, True, True, True, False]
+    assert results[3][1] == pytest.approx(0.2, abs=0.02)
+    # No token was taken: the caller is told when there will be room
+    assert results[4][1] == pytest.approx(0.1, abs=0.02)
+    with open(bucket_path) as f:
+        assert json.load(f)["tokens"] == pytest.approx(-2, abs=0.2)
+
+
+def test_deep_debt_in_the_file_is_clamped(bucket_path):
+    """State left by many processes queueing at once cannot stall a new run for long."""
+    bucket = TokenBucket(bucket_path, requests_per_minute=600, burst=2)
+    with open(bucket_path, "w") as f:
+        json.dump({"tokens": -1000.0, "updated": time.time()}, f)
+
+    reserved, delay = bucket.try_reserve()
+
+    assert not reserved
+    assert delay == pytest.approx(0.1, abs=0.02)
+
+
+def test_acquire_waits_for_room_when_in_debt(bucket_path):
+    """Another run has taken the burst and its debt: wait for room, then for the token."""
+    other = TokenBucket(bucket_path, requests_per_minute=1200, burst=1)  # 20 per second
+    assert [other.try_reserve()[0] for _ in range(3)] == [True, True, False]
+    limits = RateLimits({"r.jina.ai": TokenBucket(bucket_path, requests_per_minute=1200, burst=1)})
+
+    waited = limits.acquire("r.jina.ai")
+
+    assert waited == pytest.approx(0.1, abs=0.02)
+    assert limits.waited["r.jina.ai"] == waited
+
+
+def test_from_config(tmp_path):
+    config = MagicMock()
+    config.config_dir = str(tmp_path)
+    settings = {"JINA_REQUESTS_PER_MINUTE": 100, "FIRECRAWL_REQUESTS_PER_MINUTE": 0}
+    config.get_setting.side_effect = lambda name, default=None: settings.get(name, default)
+
+    limits = RateLimits.from_config(config)
+
+    assert set(limits.buckets) == {"r.jina.ai"}
+    assert limits.buckets["r.jina.ai"].rate == pytest.approx(100 / 60)
+    assert limits.acquire("example.com") == 0.0
+
+
+@pytest.mark.parametrize("burst", [0, 0.5])
+def test_burst_below_one_token_still_admits_requests(bucket_path, burst):
+    bucket = TokenBucket(bucket_path, requests_per_minute=600, burst=burst)  # 10 per second
+
+    assert bucket.capacity == 1.0
+    assert bucket.try_reserve() == (True, 0.0)
+    reserved, delay = bucket.try_reserve()
+    assert reserved and delay == pytest.approx(0.1, abs=0.02)
+
+
+def test_negative_burst_setting_is_rejected(tmp_path):
+    config = MagicMock()
+    config.config_dir = str(tmp_path)
+    settings = {"JINA_BURST": -1}
+    config.get_setting.side_effect = lambda name, default=None: settings.get(name, default)
+
+    with pytest.raises(ValueError, match="JINA_BURST"):
+        RateLimits.from_config(config)
+
+
+def test_acquire_waits(bucket_path):
+    limits = RateLimits({"r.jina.ai": TokenBucket(bucket_path, requests_per_minute=1200, burst=1)})
+    start = time.monotonic()
+    limits.acquire("r.jina.ai")
+    limits.acquire("r.jina.ai")
+    asyncio.run(limits.acquire_async("r.jina.ai"))
+    assert time.monotonic() - start >= 0.09
+    assert limits.waited["r.jina.ai"] > 0
+
+
+@patch('requests.Session.post')
+def test_jina_extractor_is_paced(mock_post, bucket_path):
+    mock_post.return_value = MagicMock(status_code=200, json=lambda: {"data": {"content": "ok"}})
+    limits = MagicMock()
+    extractor = JinaAIExtractor()
+    extractor.use_rate_limits(limits)
+
+    extractor.extract_text("https://example.com", api_key="key")
+
+    limits.acquire.assert_called_once_with("r.jina.ai")
@@ -0,0 +1,108 @@
+"""
+Unit tests for the single-pass reference parser
+"""
+import pytest
+from reference_parser import ReferenceParser, Reference, parse_references, iter_references
+from utils import parse_report
+
+REPORT = """# Market Report
+
+Growth was strong (see https://inline.example/chart and [this post](https://inline.example/post)) [1][2].
+
+## Analysis
+More inline context: <a href="https://inline.example/html">page</a>.
+
+## Sources
+1. Smith, J. "Market outlook." Analyst Weekly, 2024. https://a.example/outlook
+2. [Quarterly filing](https://b.example/filing)
+- <a href="https://c.example/deck">Investor deck</a>
+[4] https://d.example/report.pdf - Annual report (PDF)
+
+## Appendix
+Raw data: https://appendix.example/data
+"""
+
+
+def test_only_reference_section_is_used():
+    urls = [reference.url for reference in parse_references(REPORT)]
+    assert urls == [
+        "https://a.example/outlook",
+        "https://b.example/filing",
+        "https://c.example/deck",
+        "https://d.example/report.pdf",
+    ]
+
+
+def test_structured_records():
+    references = parse_references(REPORT)
+
+    assert references[0].number == 1
+    assert references[0].title == 'Smith, J. "Market outlook." Analyst Weekly, 2024.'
+    assert references[1] == Reference("https://b.example/filing", REPORT.index("https://b.example/filing"),
+                                      number=2, title="Quarterly filing")
+    assert references[2].number is None and references[2].title == "Investor deck"
+    assert references[3].number == 4 and references[3].title == "Annual report (PDF)"
+    for reference in references:
+        assert REPORT[reference.position:].startswith(reference.url)
+
+
+@pytest.mark.parametrize("heading", [
+    "References", "References:", "**Sources**", "### Bibliography", "## 5. Works Cited",
+    "<h2>References</h2>", "SOURCES",
+])
+def test_section_headings(heading):
+    report = f"Body https://inline.example/x\n\n{heading}\nhttps://ref.example/1\n"
+    assert [r.url for r in parse_references(report)] == ["https://ref.example/1"]
+
+
+def test_setext_headings_bound_the_section():
+    report = ("Title\n=====\nhttps://inline.example/x\n\nReferences\n----------\nhttps://ref.example/1\n\n"
+              "Appendix\n--------\nhttps://appendix.example/2\n")
+    assert [r.url for r in parse_references(report)] == ["https://ref.example/1"]
+
+
+def test_subheadings_stay_in_section():
+    report = "## References\n### Papers\nhttps://ref.example/1\n### Web\nhttps://ref.example/2\n## Appendix\nhttps://x.example/\n"
+    assert [r.url for r in parse_references(report)] == ["https://ref.example/1", "https://ref.example/2"]
+
+
+def test_footnote_definitions_anywhere():
+    report = "Claim one.[^1] Claim two [see](https://inline.example/x).\n\n[^1]: https://ref.example/1 The source\n"
+    references = parse_references(report)
+    assert len(references) == 1
+    assert references[0].number == 1 and references[0].title == "The source"
+
+
+def test_all_links_used_without_reference_section():
+    report = "See https://a.example/1 and [b](https://b.example/2).\n"
+    references = parse_references(report)
+    assert [r.url for r in references] == ["https://a.example/1", "https://b.example/2"]
+    assert not any(r.in_section for r in references)
+
+
+def test_chunking_does_not_change_result():
+    expected = parse_references(REPORT)
+    for chunk_size in (1, 3, 17, 64):
+        assert parse_references(REPORT, chunk_size=chunk_size) == expected
+
+
+def test_incremental_feed_returns_section_references_early():
+    parser = ReferenceParser()
+    assert parser.feed("Body https://inline.example/x\n## References\n") == []
+    found = parser.feed("https://ref.example/1\nhttps://ref.exa")
+    assert [r.url for r in found] == ["https://ref.example/1"]
+    assert [r.url for r in parser.close()] == ["https://ref.exa"]
+    with pytest.raises(ValueError):
+        parser.feed("more")
+
+
+def test_iter_references_from_lines():
+    lines = REPORT.splitlines(keepends=True)
+    assert list(iter_references(lines)) == parse_references(REPORT)
+
+
+def test_parse_report_uses_reference_section():
+    content, urls = parse_report(REPORT)
+    assert content == REPORT
+    assert urls[0] == "https://a.example/outlook"
+    assert "https://inline.example/chart" not in urls
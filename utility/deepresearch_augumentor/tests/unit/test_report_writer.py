@@ -0,0 +1,95 @@
+"""
+Unit tests for the StreamingReportWriter
+"""
+import pytest
+from unittest.mock import patch, MagicMock
+from report_writer import StreamingReportWriter
+from utils import format_output, format_toc
+from main import augment_research_report
+
+URLS = ["https://a.com/1", "https://b.com/2", "https://c.com/3"]
+
+
+def read(path):
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def test_stream_matches_format_output_with_toc_trailer(tmp_path):
+    """Streamed output has the same sections as format_output, with the TOC at the end."""
+    path = str(tmp_path / "out.md")
+    results = [(URLS[0], "First", None), (URLS[1], None, "HTTP error: 404"), (URLS[2], "Third", None)]
+
+    with StreamingReportWriter(path, "Original report", URLS) as writer:
+        for i, (url, content, error) in enumerate(results):
+            writer.add(i, url, content, error)
+
+    streamed = read(path)
+    expected = format_output("Original report", results)
+    toc = format_toc(URLS)
+    assert streamed.replace(toc, "") == expected.replace(toc, "")
+    assert streamed.index(toc) > streamed.index("### Reference 3:")
+
+
+def test_sections_written_before_close(tmp_path):
+    """Completed sections are on disk before the run finishes."""
+    path = str(tmp_path / "out.md")
+    writer = StreamingReportWriter(path, "Original report", URLS)
+    writer.add(0, URLS[0], "First content", None)
+
+    partial = read(path)
+    assert partial.startswith("Original report")
+    assert "First content" in partial
+    assert "Table of Contents" not in partial
+    writer.close()
+
+
+def test_out_of_order_results_are_reordered(tmp_path):
+    """Sections finishing out of order are buffered and written in report order."""
+    path = str(tmp_path / "out.md")
+    writer = StreamingReportWriter(path, "Report", URLS)
+    writer.add(2, URLS[2], "Third", None)
+    writer.add(1, URLS[1], "Second", None)
+
+    assert "Second" not in read(path)
+    writer.add(0, URLS[0], "First", None)
+    writer.close()
+
+    text = read(path)
+    assert text.index("### Reference 1:") < text.index("### Reference 2:") < text.index("### Reference 3:")
+
+
+def test_buffer_spills_when_full(tmp_path):
+    """A slow reference cannot hold more than max_buffered sections in memory."""
+    path = str(tmp_path / "out.md")
+    writer = StreamingReportWriter(path, "Report", URLS, max_buffered=1)
+    writer.add(1, URLS[1], "Second", None)
+    writer.add(2, URLS[2], "Third", None)
+
+    # Buffer exceeded: later sections are written ahead of the slow first one
+    text = read(path)
+    assert "Second" in text and "Third" in text
+    writer.add(0, URLS[0], "First", None)
+    writer.close()
+
+    text = read(path)
+    assert text.count("### Reference 1:") == 1
+    assert writer.sections_written == 3
+
+
+def test_augment_stream_to(tmp_path):
+    """augment_research_report streams to a file and returns its path."""
+    path = str(tmp_path / "out.md")
+    report = "Report\n\nReferences\nhttps://a.com/1\nhttps://b.com/2\n"
+    with patch("main.get_extractor") as mock_get_extractor:
+        extractor = MagicMock()
+        extractor.extract_text.side_effect = lambda url, **kwargs: (f"Content of {url}", None)
+        mock_get_extractor.return_value = extractor
+
+        result = augment_research_report(report, verbose=False, concurrency=2, stream_to=path)
+
+    assert result == path
+    text = read(path)
+    assert "Content of https://a.com/1" in text
+    assert "Content of https://b.com/2" in text
+    assert text.endswith("_Content processed by Reference Augmentor_\n")
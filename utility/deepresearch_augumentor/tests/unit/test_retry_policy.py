@@ -0,0 +1,111 @@
+"""
+Unit tests for the retry policy, retry budget and structured extraction errors
+"""
+import pytest
+from unittest.mock import patch, MagicMock
+from extractors.errors import ExtractionError, http_error, parse_retry_after
+from retry_policy import RetryPolicy, RetryBudget
+from main import augment_research_report
+
+REPORT = "Report\n\nReferences\nhttps://a.com/1\nhttps://b.com/2\n"
+
+
+@pytest.mark.parametrize("error,kind", [
+    (http_error("API error: 429", 429), "rate_limited"),
+    (http_error("API error: 503", 503), "server_error"),
+    (http_error("API error: 404", 404), "permanent"),
+    (ExtractionError("Request timed out", kind="timeout"), "timeout"),
+    ("API error: 502", "server_error"),
+    ("HTTP error: 403", "permanent"),
+    ("Request timed out", "timeout"),
+    ("Connection refused", "connection"),
+    ("Unsupported content type: image/png", "permanent"),
+])
+def test_classify(error, kind):
+    assert RetryPolicy().classify(error) == kind
+
+
+def test_slow_failure_classified_as_timeout():
+    """An attempt that used up the request timeout is treated as a timeout."""
+    assert RetryPolicy().classify("Unknown failure", elapsed=14.0, request_timeout=15) == "timeout"
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("120") == 120.0
+    assert parse_retry_after("garbage") is None
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+
+def test_http_error_reads_retry_after_header():
+    error = http_error("API error: 429", 429, {"Retry-After": "3"})
+    assert error == "API error: 429"
+    assert error.retry_after == 3.0
+
+
+def test_backoff_is_bounded():
+    policy = RetryPolicy(base_delay=1.0, max_delay=4.0)
+    for retry_number in range(1, 8):
+        assert 0 <= policy.backoff(retry_number) <= min(4.0, 2 ** (retry_number - 1))
+
+
+def test_next_delay_honours_retry_after():
+    policy = RetryPolicy(base_delay=0.01)
+    delay, kind, _ = policy.next_delay(http_error("API error: 429", 429, {"Retry-After": "5"}), 1)
+    assert kind == "rate_limited"
+    assert delay == 5.0
+
+
+def test_next_delay_refuses_long_retry_after():
+    policy = RetryPolicy(max_retry_after=10)
+    delay, _, reason = policy.next_delay(http_error("API error: 429", 429, {"Retry-After": "600"}), 1)
+    assert delay is None
+    assert "Retry-After" in reason
+
+
+def test_next_delay_stops_after_max_retries():
+    policy = RetryPolicy(max_retries=2)
+    assert policy.next_delay("API error: 500", 2)[0] is not None
+    assert policy.next_delay("API error: 500", 3)[0] is None
+
+
+def test_budget_is_shared():
+    budget = RetryBudget(2)
+    policy = RetryPolicy(max_retries=5)
+    assert policy.next_delay("API error: 500", 1, budget)[0] is not None
+    assert policy.next_delay("API error: 500", 1, budget)[0] is not None
+    delay, _, reason = policy.next_delay("API error: 500", 1, budget)
+    assert delay is None
+    assert reason == "run retry budget exhausted"
+    assert budget.used == 2
+    assert budget.exhausted
+
+
+@patch("main.time.sleep")
+@patch("main.get_extractor")
+def test_augment_backs_off_and_respects_budget(mock_get_extractor, mock_sleep):
+    """5xx errors are retried with backoff until the run budget runs out."""
+    extractor = MagicMock()
+    extractor.extract_text.return_value = (None, http_error("API error: 503", 503, {"Retry-After": "2"}))
+    mock_get_extractor.return_value = extractor
+
+    augment_research_report(REPORT, verbose=False,
+                            retry_policy=RetryPolicy(max_retries=2), retry_budget=RetryBudget(3))
+
+    # 2 first attempts + 3 budgeted retries
+    assert extractor.extract_text.call_count == 5
+    assert mock_sleep.call_count == 3
+    assert all(call.args[0] >= 2.0 for call in mock_sleep.call_args_list)
+
+
+@patch("main.time.sleep")
+@patch("main.get_extractor")
+def test_augment_does_not_retry_permanent_errors(mock_get_extractor, mock_sleep):
+    extractor = MagicMock()
+    extractor.extract_text.return_value = (None, http_error("API error: 404", 404))
+    mock_get_extractor.return_value = extractor
+
+    augment_research_report(REPORT, verbose=False)
+
+    assert extractor.extract_text.call_count == 2
+    mock_sleep.assert_not_called()
@@ -0,0 +1,140 @@
+"""
+Unit tests for the RunJournal used by --resume
+"""
+import io
+import os
+import pytest
+from unittest.mock import patch, MagicMock
+from run_journal import RunJournal
+import main
+from main import augment_research_report
+
+SETTINGS = {"extractor": "jina", "mode": "default"}
+REPORT = "Report\n\nReferences\nhttps://a.com/1\nhttps://b.com/2\nhttps://c.com/3\n"
+
+
+@pytest.fixture
+def journal_path(tmp_path):
+    return str(tmp_path / "journals" / "run.jsonl")
+
+
+def test_record_and_resume(journal_path):
+    """Successful results recorded in one run are available to a resumed run."""
+    journal = RunJournal(journal_path, SETTINGS)
+    journal.record("https://a.com/1", "content a", None)
+    journal.record("https://b.com/2", None, "HTTP error: 500")
+    journal.close()
+
+    resumed = RunJournal(journal_path, SETTINGS, resume=True)
+    assert resumed.resuming
+    assert resumed.resumable("https://a.com/1") == "content a"
+    # Failed URLs are fetched again
+    assert resumed.resumable("https://b.com/2") is None
+    resumed.close()
+
+
+def test_settings_mismatch_starts_over(journal_path):
+    """A journal written with different settings is not resumed."""
+    journal = RunJournal(journal_path, SETTINGS)
+    journal.record("https://a.com/1", "content a", None)
+    journal.close()
+
+    other = RunJournal(journal_path, {"extractor": "local_bs4", "mode": "default"}, resume=True)
+    assert not other.resuming
+    assert other.resumable("https://a.com/1") is None
+    other.close()
+
+
+def test_torn_last_line_is_ignored(journal_path):
+    """A partially written final entry from a crash does not break resuming."""
+    journal = RunJournal(journal_path, SETTINGS)
+    journal.record("https://a.com/1", "content a", None)
+    journal.close()
+    with open(journal_path, "a", encoding="utf-8") as f:
+        f.write('{"url": "https://b.com/2", "cont')
+
+    resumed = RunJournal(journal_path, SETTINGS, resume=True)
+    assert resumed.resumable("https://a.com/1") == "content a"
+    resumed.record("https://c.com/3", "content c", None)
+    resumed.close()
+
+    again = RunJournal(journal_path, SETTINGS, resume=True)
+    assert again.resumable("https://c.com/3") == "content c"
+    again.close()
+
+
+def test_for_input_is_stable_per_file(tmp_path):
+    """The same input file always maps to the same journal path."""
+    first = RunJournal.for_input(str(tmp_path), "report.txt", SETTINGS)
+    second = RunJournal.for_input(str(tmp_path), os.path.abspath("report.txt"), SETTINGS)
+    other = RunJournal.for_input(str(tmp_path), "other.txt", SETTINGS)
+
+    assert first.path == second.path
+    assert first.path != other.path
+
+
+def test_augment_resumes_from_journal(journal_path):
+    """An interrupted run is completed by fetching only the missing URLs."""
+    with patch("main.get_extractor") as mock_get_extractor:
+        extractor = MagicMock()
+        mock_get_extractor.return_value = extractor
+
+        # First run: c.com fails permanently
+        extractor.extract_text.side_effect = lambda url, **kwargs: (None, "API error: 404") if "c.com" in url else (f"Content of {url}", None)
+        journal = RunJournal(journal_path, SETTINGS)
+        augment_research_report(REPORT, verbose=False, journal=journal)
+        journal.close()
+        assert extractor.extract_text.call_count == 3
+
+        # Resumed run: only c.com is fetched again
+        extractor.extract_text.side_effect = lambda url, **kwargs: (f"Content of {url}", None)
+        journal = RunJournal(journal_path, SETTINGS, resume=True)
+        result = augment_research_report(REPORT, verbose=False, journal=journal)
+        journal.close()
+
+    assert extractor.extract_text.call_count == 4
+    assert extractor.extract_text.call_args.kwargs["url"] == "https://c.com/3"
+    for url in ("https://a.com/1", "https://b.com/2", "https://c.com/3"):
+        assert f"Content of {url}" in result
+
+
+def test_standard_input_is_not_journaled():
+    """A report piped in on stdin cannot be read again, so it gets no journal."""
+    with patch("sys.argv", ["main.py", "-", "--no-cache"]), \
+            patch("sys.stdin", io.StringIO(REPORT)), \
+            patch("main.augment_research_report", return_value="augmented") as augment, \
+            patch("run_journal.RunJournal.for_input") as for_input, \
+            patch("builtins.print"):
+        main.main()
+
+    for_input.assert_not_called()
+    assert augment.call_args.kwargs["journal"] is None
+
+
+def test_resume_requires_an_input_file():
+    with patch("sys.argv", ["main.py", "-", "--resume"]), \
+            patch("run_journal.RunJournal.for_input") as for_input:
+        with pytest.raises(SystemExit) as exc_info:
+            main.main()
+
+    assert exc_info.value.code != 0
+    for_input.assert_not_called()
+
+
+def test_recorded_content_is_not_kept_in_memory(journal_path):
+    """Only results loaded for --resume stay in memory; new ones are only written out."""
+    journal = RunJournal(journal_path, SETTINGS)
+    journal.record("https://a.com/1", "content a" * 1000, None)
+    assert journal.completed == {}
+    journal.close()
+
+    resumed = RunJournal(journal_path, SETTINGS, resume=True)
+    resumed.record("https://a.com/1", "newer content", None)
+    resumed.record("https://b.com/2", "content b", None)
+    assert resumed.completed == {}
+    resumed.close()
+
+    again = RunJournal(journal_path, SETTINGS, resume=True)
+    assert again.resumable("https://a.com/1") == "newer content"
+    assert again.resumable("https://b.com/2") == "content b"
+    again.close()
@@ -0,0 +1,90 @@
+"""
+Unit tests for URL canonicalization and merging of reference variants
+"""
+import pytest
+from unittest.mock import patch, MagicMock
+from utils import canonicalize_url, clean_url, canonicalize_references, format_output
+from main import augment_research_report
+
+
+@pytest.mark.parametrize("variant", [
+    "http://example.com/article",
+    "https://www.example.com/article",
+    "https://example.com/article/",
+    "https://example.com/article#section-2",
+    "https://example.com/article?utm_source=newsletter&utm_medium=email",
+    "https://example.com/article?fbclid=IwAR0abc",
+    "https://m.example.com/article",
+    "https://example.com/article/amp/",
+    "https://example.com/amp/article",
+    "https://example.com/article?amp=1",
+    "https://www.google.com/amp/s/example.com/article",
+    "https://example-com.cdn.ampproject.org/c/s/example.com/article",
+    "HTTPS://EXAMPLE.COM:443/article",
+])
+def test_variants_share_canonical_key(variant):
+    assert canonicalize_url(variant) == canonicalize_url("https://example.com/article")
+
+
+@pytest.mark.parametrize("url, other", [
+    ("https://example.com/article?id=1", "https://example.com/article?id=2"),
+    ("https://example.com/a", "https://example.org/a"),
+    ("https://example.com/#!/inbox", "https://example.com/#!/settings"),
+    ("https://example.com:8080/a", "https://example.com/a"),
+])
+def test_distinct_pages_stay_distinct(url, other):
+    assert canonicalize_url(url) != canonicalize_url(other)
+
+
+def test_query_order_is_ignored():
+    assert canonicalize_url("https://example.com/s?b=2&a=1") == canonicalize_url("https://example.com/s?a=1&b=2")
+
+
+def test_clean_url_only_drops_tracking_and_fragment():
+    cleaned = clean_url("http://www.example.com/a/?path=x/y&utm_campaign=spring&q=a%20b#top")
+    assert cleaned == "http://www.example.com/a/?path=x/y&q=a%20b"
+
+
+def test_references_are_merged_with_aliases():
+    cited = [
+        "http://www.example.com/article?utm_source=x",
+        "https://other.org/page",
+        "https://example.com/article",
+        "https://m.example.com/article/amp",
+    ]
+
+    urls, aliases = canonicalize_references(cited)
+
+    # The https, non-mobile spelling is fetched; the page keeps its first-citation position
+    assert urls == ["https://example.com/article", "https://other.org/page"]
+    assert aliases["https://example.com/article"] == [cited[0], cited[2], cited[3]]
+    assert aliases["https://other.org/page"] == ["https://other.org/page"]
+
+
+def test_appendix_lists_every_spelling():
+    aliases = {"https://example.com/article": ["http://example.com/article#intro", "https://example.com/article"]}
+    output = format_output("Report", [("https://example.com/article", "Text", None)], aliases=aliases)
+
+    assert "### Reference 1: [https://example.com/article]" in output
+    assert "_Cited as: <http://example.com/article#intro>_" in output
+
+
+def test_run_fetches_each_page_once(capsys):
+    report = ("See http://example.com/a?utm_source=feed, https://www.example.com/a/ "
+              "and https://example.com/a#results, plus https://example.org/b.")
+    with patch("main.get_extractor") as mock_get_extractor:
+        extractor = MagicMock()
+        extractor.extract_text.return_value = ("Page text", None)
+        mock_get_extractor.return_value = extractor
+
+        output = augment_research_report(report, verbose=True)
+        fetched = [call.kwargs["url"] for call in extractor.extract_text.call_args_list]
+
+        assert sorted(fetched) == ["https://example.org/b", "https://www.example.com/a/"]
+        assert "<http://example.com/a?utm_source=feed>" in output
+        assert "<https://example.com/a#results>" in output
+        assert "2 fetches saved" in capsys.readouterr().out
+
+        extractor.extract_text.reset_mock()
+        augment_research_report(report, verbose=False, canonicalize_urls=False)
+        assert extractor.extract_text.call_count == 4
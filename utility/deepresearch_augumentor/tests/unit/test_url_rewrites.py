@@ -0,0 +1,131 @@
+"""
+Unit tests for URL rewrite rules
+"""
+import pytest
+from unittest.mock import patch, MagicMock
+from extractors.local_bs4_extractor import BeautifulSoupExtractor
+from main import augment_research_report
+from url_rewrites import BUILTIN_RULES, RewriteRule, UrlRewriter
+
+
+def config_with(**settings):
+    config = MagicMock()
+    config.get_setting.side_effect = lambda name, default=None: settings.get(name, default)
+    return config
+
+
+@pytest.mark.parametrize("url, expected, rule", [
+    ("https://github.com/psf/requests/blob/main/README.md#L10",
+     "https://raw.githubusercontent.com/psf/requests/main/README.md", "github-raw"),
+    ("https://arxiv.org/abs/2401.01234v2",
+     "https://export.arxiv.org/api/query?id_list=2401.01234v2", "arxiv-api"),
+    ("http://arxiv.org/abs/hep-th/9901001/",
+     "https://export.arxiv.org/api/query?id_list=hep-th/9901001", "arxiv-api"),
+    ("https://en.m.wikipedia.org/wiki/Python_(programming_language)",
+     "https://en.wikipedia.org/w/index.php?title=Python_(programming_language)&action=raw", "wikipedia-raw"),
+    ("https://www.youtube.com/watch?t=5&v=dQw4w9WgXcQ",
+     "https://www.youtube.com/oembed?format=json&url=https%3A//www.youtube.com/watch%3Fv%3DdQw4w9WgXcQ",
+     "youtube-oembed"),
+    ("https://youtu.be/dQw4w9WgXcQ",
+     "https://www.youtube.com/oembed?format=json&url=https%3A//www.youtube.com/watch%3Fv%3DdQw4w9WgXcQ",
+     "youtube-oembed"),
+])
+def test_builtin_rules(url, expected, rule):
+    rewriter = UrlRewriter()
+    rewritten, applied = rewriter.rewrite(url)
+    assert rewritten == expected
+    assert applied.name == rule and applied.direct
+
+
+@pytest.mark.parametrize("url", [
+    "https://github.com/psf/requests",
+    "https://github.com/psf/requests/issues/1",
+    "https://arxiv.org/list/cs.LG/recent",
+    "https://en.wikipedia.org/w/index.php?search=python",
+    "https://www.youtube.com/@channel",
+    "https://example.com/wiki/Page",
+])
+def test_unmatched_urls_are_left_alone(url):
+    assert UrlRewriter().rewrite(url) == (url, None)
+
+
+def test_config_rules_take_precedence():
+    config = config_with(URL_REWRITE_RULES=[
+        {"name": "docs-source", "pattern": r"^https://docs\.example\.com/(.+)\.html$",
+         "replace": r"https://docs.example.com/_sources/\1.txt", "direct": True, "page_bytes": 80000},
+        {"name": "github-raw", "pattern": r"^https://github\.com/(.+)$", "replace": r"https://mirror.example/\1",
+         "page_bytes": 300000},
+        {"name": "youtube-oembed", "enabled": False},
+    ])
+    rewriter = UrlRewriter.from_config(config)
+    assert [rule.name for rule in rewriter.rules] == ["docs-source", "github-raw", "arxiv-api", "wikipedia-raw"]
+    assert rewriter.rewrite("https://docs.example.com/api/index.html")[0] == \
+        "https://docs.example.com/_sources/api/index.txt"
+    url, rule = rewriter.rewrite("https://github.com/a/b/blob/main/x.py")
+    assert url == "https://mirror.example/a/b/blob/main/x.py" and not rule.direct
+    assert rewriter.rewrite("https://youtu.be/dQw4w9WgXcQ")[1] is None
+
+    assert UrlRewriter.from_config(config, builtin=False).rules[-1].name == "github-raw"
+    assert len(UrlRewriter.from_config(config_with()).rules) == len(BUILTIN_RULES)
+
+
+@pytest.mark.parametrize("entry", [
+    {"pattern": "^x", "replace": "y"},
+    {"name": "no-pattern", "replace": "y"},
+    {"name": "bad-regex", "pattern": "(", "replace": "y", "page_bytes": 1000},
+    {"name": "no-size", "pattern": "^x", "replace": "y"},
+    {"name": "zero-size", "pattern": "^x", "replace": "y", "page_bytes": 0},
+    {"name": "text-size", "pattern": "^x", "replace": "y", "page_bytes": "80000"},
+])
+def test_malformed_config_rules(entry):
+    with pytest.raises(ValueError):
+        UrlRewriter.from_config(config_with(URL_REWRITE_RULES=[entry]))
+
+
+def test_hits_and_bytes_saved():
+    rule = RewriteRule("small", r"^https://heavy\.example/(.*)", r"https://light.example/\1", page_bytes=10000)
+    rewriter = UrlRewriter([rule])
+    for path in ("a", "b", "c"):
+        rewriter.rewrite(f"https://heavy.example/{path}")
+    rewriter.record(rule, "x" * 1000)
+    rewriter.record(rule, None)
+    rewriter.record(rule, "x" * 20000)
+    assert rewriter.stats["small"].hits == 3
+    assert rewriter.stats["small"].bytes_saved == 9000
+    assert rewriter.summary_lines() == ["small: 3 hits, ~8.8 KB saved (estimated)"]
+    assert UrlRewriter([rule]).summary_lines() == []
+
+
+@patch("main.get_extractor")
+def test_direct_rules_bypass_api_extractor(mock_get_extractor, capsys):
+    """Rewritten URLs are fetched locally; the cited URL stays in the report."""
+    report = ("Report\n\nReferences\n"
+              "https://github.com/psf/requests/blob/main/README.md\n"
+              "https://example.com/page\n")
+    api_extractor = MagicMock()
+    api_extractor.provider_host = "r.jina.ai"
+    api_extractor.extract_text.return_value = ("api content", None)
+    mock_get_extractor.return_value = api_extractor
+
+    with patch.object(BeautifulSoupExtractor, "extract_text", return_value=("# Requests", None)) as local:
+        result = augment_research_report(report, extractor_type="jina", verbose=True)
+
+    assert [call.kwargs["url"] for call in api_extractor.extract_text.call_args_list] == ["https://example.com/page"]
+    assert local.call_args.kwargs["url"] == "https://raw.githubusercontent.com/psf/requests/main/README.md"
+    assert "https://github.com/psf/requests/blob/main/README.md" in result
+    assert "# Requests" in result
+    output = capsys.readouterr().out
+    assert "Rewritten by github-raw" in output
+    assert "github-raw: 1 hit" in output
+
+
+@patch("main.get_extractor")
+def test_rewrites_can_be_disabled(mock_get_extractor):
+    extractor = MagicMock()
+    extractor.provider_host = None
+    extractor.extract_text.return_value = ("content", None)
+    mock_get_extractor.return_value = extractor
+
+    augment_research_report("Report\n\nReferences\nhttps://youtu.be/dQw4w9WgXcQ\n", verbose=False,
+                            url_rewrites=UrlRewriter([]))
+    assert extractor.extract_text.call_args.kwargs["url"] == "https://youtu.be/dQw4w9WgXcQ"
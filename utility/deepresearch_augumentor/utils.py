@@ -1,9 +1,12 @@
 import re
-from typing import Tuple, List, Optional
+from typing import Tuple, List, Optional, Dict
 import os
 from datetime import datetime
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
 from dotenv import load_dotenv
 
+from reference_parser import parse_references
+
 
 def load_api_keys():
     """
@@ -17,86 +20,272 @@ def parse_report(report_text: str) -> Tuple[str, List[str]]:
     """
     Parse a research report to extract original content and reference URLs.
     
+    Use reference_parser.parse_references for the structured records
+    (number, title, position) behind the URLs.
+    
     Args:
         report_text: The text of the research report
     
     Returns:
         Tuple of (original_content, list_of_urls)
     """
-    # This is a simplified implementation. In a real application,
-    # you might want to use more sophisticated methods to identify 
-    # the reference section.
-    
-    # Regular expression to match URLs
-    url_pattern = r'https?://[^\s()<>]+(?:\([\w\d]+\)|(?:[^,.;:!?()"\'\s<>]))'
-    
-    # Find all URLs in the text
-    all_urls = re.findall(url_pattern, report_text)
+    # Only the reference section is used when the report has one; inline
+    # links in the body are context (see reference_parser)
+    references = parse_references(report_text)
     
     # Deduplicate URLs
-    unique_urls = list(dict.fromkeys(all_urls))
+    unique_urls = list(dict.fromkeys(reference.url for reference in references))
     
-    # For simplicity, we'll consider the original content to be the entire report
-    # In a real-world scenario, you might want to separate the references section
+    # The original content is the entire report, reference section included
     original_content = report_text
     
     return original_content, unique_urls
 
 
-def format_output(original_content: str, url_contents: List[Tuple[str, Optional[str], Optional[str]]]) -> str:
+def normalize_url(url: str) -> str:
+    """
+    Normalize a URL for use as a lookup key.
+    
+    Lowercases the scheme and host, drops the fragment and default ports,
+    and uses "/" for an empty path. The query string is kept as-is.
+    
+    Args:
+        url: The URL to normalize
+    
+    Returns:
+        The normalized URL string
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    netloc = parts.netloc.lower()
+    if (scheme == "http" and netloc.endswith(":80")) or (scheme == "https" and netloc.endswith(":443")):
+        netloc = netloc.rsplit(":", 1)[0]
+    path = parts.path or "/"
+    return urlunsplit((scheme, netloc, path, parts.query, ""))
+
+
+# Query parameters that only track the click and never change the page
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "gbraid", "wbraid", "msclkid", "yclid", "twclid", "igshid",
+    "mc_cid", "mc_eid", "_ga", "_gl", "_hsenc", "_hsmi", "mkt_tok", "oly_anon_id", "oly_enc_id",
+    "vero_id", "ref_src", "ref_url",
+}
+TRACKING_PREFIXES = ("utm_",)
+
+# Host prefixes of www / mobile / AMP mirrors of the same site
+MIRROR_HOST_PREFIXES = ("www.", "m.", "mobile.", "amp.")
+
+# Query parameters that only select the AMP rendering of a page
+AMP_PARAMS = {("amp", ""), ("amp", "1"), ("amp", "true"), ("outputtype", "amp")}
+
+
+def _is_tracking_param(name: str) -> bool:
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+
+def _unwrap_amp_cache(parts):
+    """Map Google AMP viewer / AMP cache URLs back to the publisher URL they wrap."""
+    host = parts.hostname or ""
+    path = parts.path
+    if host.endswith(".cdn.ampproject.org") or ((host == "google.com" or host.startswith("www.google."))
+                                                and path.startswith("/amp/")):
+        # /amp/s/example.com/page, /c/s/example.com/page, /v/s/example.com/page
+        match = re.match(r"^/(?:amp|[cv])/(s/)?([^/]+)(/.*)?$", path)
+        if match:
+            scheme = "https" if match.group(1) else "http"
+            return urlsplit(urlunsplit((scheme, match.group(2), match.group(3) or "/", parts.query, parts.fragment)))
+    return parts
+
+
+def clean_url(url: str) -> str:
+    """
+    Remove the parts of a URL that never change the fetched page.
+    
+    Drops tracking parameters (utm_*, fbclid, gclid, ...) and the fragment
+    (except "#!" routes), and unwraps Google AMP cache links. Everything
+    else is kept as written, so the result is still a URL the site serves.
+    
+    Args:
+        url: The URL to clean
+    
+    Returns:
+        The cleaned URL
+    """
+    parts = _unwrap_amp_cache(urlsplit(url.strip()))
+    # Filter the raw "name=value" pairs so the kept ones stay encoded as written
+    query = "&".join(pair for pair in parts.query.split("&")
+                     if pair and not _is_tracking_param(pair.split("=", 1)[0]))
+    fragment = parts.fragment if parts.fragment.startswith("!") else ""
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, query, fragment))
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Reduce a URL to a key shared by every spelling of the same page.
+    
+    On top of clean_url this ignores the http/https scheme, "www." and
+    mobile/AMP host prefixes, default ports, a trailing slash, AMP path and
+    query markers and the order of query parameters. The key is for
+    comparison only and may not be fetchable itself.
+    
+    Args:
+        url: The URL to canonicalize
+    
+    Returns:
+        The canonical key
+    """
+    parts = urlsplit(clean_url(url))
+    host = (parts.hostname or "").rstrip(".")
+    for prefix in MIRROR_HOST_PREFIXES:
+        if host.startswith(prefix) and host.count(".") > 1:
+            host = host[len(prefix):]
+            break
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+    
+    path = parts.path
+    path = re.sub(r"/amp/?$", "/", path)
+    path = re.sub(r"^/amp(/.+)$", r"\1", path)
+    path = re.sub(r"\.amp(\.html?)$", r"\1", path)
+    path = path.rstrip("/") or "/"
+    
+    query = sorted((name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+                   if (name.lower(), value.lower()) not in AMP_PARAMS)
+    fragment = parts.fragment if parts.fragment.startswith("!") else ""
+    return urlunsplit(("https", host, path, urlencode(query) if query else "", fragment))
+
+
+def _variant_rank(url: str) -> Tuple[bool, bool, bool]:
+    """Sort key preferring https, non-mirror, non-AMP spellings of a page."""
+    parts = urlsplit(url)
+    host = (parts.hostname or "").lower()
+    mirror = host.startswith(MIRROR_HOST_PREFIXES[1:]) or host.endswith(".cdn.ampproject.org")
+    amp = "amp" in parts.path.lower().split("/") or ".amp." in parts.path.lower() or "amp=" in parts.query.lower()
+    return parts.scheme.lower() != "https", mirror, amp
+
+
+def canonicalize_references(urls: List[str]) -> Tuple[List[str], Dict[str, List[str]]]:
+    """
+    Collapse spellings of the same page so that each page is fetched once.
+    
+    Args:
+        urls: Reference URLs in report order, as written in the report
+    
+    Returns:
+        Tuple of (urls_to_fetch, aliases). urls_to_fetch holds one cleaned
+        URL per page, in order of first citation, preferring an https,
+        non-mobile, non-AMP spelling. aliases maps each of them to every
+        original spelling that was merged into it, in report order.
+    """
+    groups: Dict[str, List[str]] = {}
+    for url in urls:
+        groups.setdefault(canonicalize_url(url), []).append(url)
+    
+    urls_to_fetch = []
+    aliases = {}
+    for spellings in groups.values():
+        best = min(spellings, key=_variant_rank)  # min() keeps the first of equal ranks
+        fetch_url = clean_url(best)
+        urls_to_fetch.append(fetch_url)
+        aliases[fetch_url] = spellings
+    return urls_to_fetch, aliases
+
+
+APPENDIX_HEADER = (
+    "\n\n## Reference Content Appendix\n\n"
+    "_This appendix contains content extracted from the referenced sources to provide additional context._\n\n"
+)
+APPENDIX_FOOTER = "\n\n_Content processed by Reference Augmentor_\n"
+
+
+def format_toc(urls: List[str]) -> str:
+    """
+    Format the appendix table of contents linking to each reference section.
+    
+    Args:
+        urls: Reference URLs in report order
+    
+    Returns:
+        Markdown table of contents, or an empty string if there are no URLs
+    """
+    if not urls:
+        return ""
+    
+    parts = ["### Table of Contents\n\n"]
+    for i, url in enumerate(urls, 1):
+        # Create a simplified URL for the TOC by removing protocols and common prefixes
+        display_url = url.replace("https://", "").replace("http://", "").split("/")[0]
+        # Create a link to the reference section
+        parts.append(f"{i}. [{display_url}](#reference-{i})\n")
+    parts.append("\n---\n\n")
+    return "".join(parts)
+
+
+def format_reference_section(index: int, url: str, content: Optional[str], error: Optional[str],
+                             cited_as: Optional[List[str]] = None) -> str:
+    """
+    Format the appendix section for a single reference.
+    
+    Args:
+        index: 1-based position of the reference in the report
+        url: The reference URL
+        content: Extracted content, or None on failure
+        error: Error message if extraction failed
+        cited_as: Original spellings of the URL in the report; those that
+                  differ from url are listed under the heading
+    
+    Returns:
+        Markdown for the reference section, ending with a horizontal rule
+    """
+    # Create a section for each reference with anchor for navigation
+    ref_id = f"reference-{index}"
+    # Add an anchor point for linking and use a proper markdown heading
+    parts = [
+        f'<a id="{ref_id}"></a>\n',
+        f'### Reference {index}: [{url}]({url})\n\n',
+        f"_Retrieved: {datetime.now().strftime('%Y-%m-%d')}_\n\n"
+    ]
+    other_spellings = [spelling for spelling in (cited_as or []) if spelling != url]
+    if other_spellings:
+        parts.append("_Cited as: " + ", ".join(f"<{spelling}>" for spelling in other_spellings) + "_\n\n")
+    
+    if content:
+        # Format the content as a blockquote for better readability
+        parts.append('\n'.join(f'> {line}' if line.strip() else '>' for line in content.split('\n')))
+    elif error:
+        parts.append(f"**Error:** {error}\n")
+    else:
+        parts.append("_No content available_\n")
+    
+    # Add a horizontal rule between references
+    parts.append("\n\n---\n\n")
+    return "".join(parts)
+
+
+def format_output(original_content: str, url_contents: List[Tuple[str, Optional[str], Optional[str]]],
+                  aliases: Optional[Dict[str, List[str]]] = None) -> str:
     """
     Format the final output by combining original content with extracted references in a beautiful Markdown format.
     
     Args:
         original_content: The original research report text
         url_contents: List of tuples (url, extracted_content, error_message)
+        aliases: Optional mapping of each url to the original spellings merged
+                 into it (see canonicalize_references)
     
     Returns:
         Combined text in Markdown format suitable for LLM consumption
     """
-    # Start with the original content
-    output = original_content
-    
-    # Add a reference appendix header with proper Markdown formatting
-    output += "\n\n## Reference Content Appendix\n\n"
-    output += "_This appendix contains content extracted from the referenced sources to provide additional context._\n\n"
-    
-    # Create a table of contents for the references
-    if url_contents:
-        output += "### Table of Contents\n\n"
-        
-        for i, (url, _, _) in enumerate(url_contents, 1):
-            # Create a simplified URL for the TOC by removing protocols and common prefixes
-            display_url = url.replace("https://", "").replace("http://", "").split("/")[0]
-            # Create a link to the reference section
-            ref_id = f"reference-{i}"
-            output += f"{i}. [{display_url}](#{ref_id})\n"
-        
-        output += "\n---\n\n"
+    # Collect the pieces and join once instead of repeatedly concatenating
+    parts = [original_content, APPENDIX_HEADER, format_toc([url for url, _, _ in url_contents])]
     
     # Add content for each reference URL
+    aliases = aliases or {}
     for i, (url, content, error) in enumerate(url_contents, 1):
-        # Create a section for each reference with anchor for navigation
-        ref_id = f"reference-{i}"
-        # Add an anchor point for linking and use a proper markdown heading
-        output += f'<a id="{ref_id}"></a>\n'
-        output += f'### Reference {i}: [{url}]({url})\n\n'
-        output += f"_Retrieved: {datetime.now().strftime('%Y-%m-%d')}_\n\n"
-        
-        if content:
-            # Format the content as a blockquote for better readability
-            content_lines = content.split('\n')
-            formatted_content = '\n'.join([f'> {line}' if line.strip() else '>' for line in content_lines])
-            output += formatted_content
-        elif error:
-            output += f"**Error:** {error}\n"
-        else:
-            output += "_No content available_\n"
-            
-        # Add a horizontal rule between references
-        output += "\n\n---\n\n"
+        parts.append(format_reference_section(i, url, content, error, aliases.get(url)))
     
     # Add attribution footer
-    output += "\n\n_Content processed by Reference Augmentor_\n"
+    parts.append(APPENDIX_FOOTER)
     
-    return output 
\ No newline at end of file
+    return "".join(parts)